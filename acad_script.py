@@ -0,0 +1,204 @@
+# acad_script.py
+# Çok büyük çizimler için AutoCAD komut dizisi (.scr betiği) üretimi.
+#
+# Varlık başına COM çağrısı (toplu gönderimde bile) on binlerce varlıkta çok yavaştır. Bu
+# modül çizim işini (drawing_batch.DrawingBatch veya drawing_backends API'si) AutoCAD komut
+# satırı metnine derler ve AutoCAD'e tek seferde verir (purge_drawing'in _-PURGE'ü gibi):
+#   "script": betik dosyaya akışlı yazılır, tek SendCommand ile _.SCRIPT çalıştırılır
+#   "stream": komutlar parça parça (config.ACAD_SCRIPT_CHUNK_SIZE varlık) SendCommand ile gönderilir
+# Aynı iş render() ile "com" veya "dxf" arka ucuna da verilebilir. Betik modunda handle
+# döndürülmez (AutoCAD betiği yanıt vermez); handle gerekiyorsa "com" veya "dxf" kullanın.
+# Blok örnekleri betikte geometri olarak açılır (blok tanımı için "com" veya "dxf").
+#
+# Betik, nesne kenetlemeyi (OSMODE) ve komut yankısını (CMDECHO) kapatır, sonda eski
+# değerlerine döndürür: açık OSNAP, yazılan koordinatları yakındaki nesnelere çekerdi.
+# Katmansız varlıklar, önceki varlığın katmanında değil başlangıç katmanında (CLAYER) kalır.
+
+import os
+import tempfile
+
+import config
+import drawing_backends
+from drawing_batch import LINE, CIRCLE, POLYLINE, TEXT
+
+SCRIPT_ENCODING = "cp1254" # AutoCAD betikleri ANSI kod sayfasıyla okunur
+TARGETS = ("script", "stream", "com", "dxf")
+
+
+# ==================================
+# DERLEME
+# ==================================
+class ScriptCompiler:
+    """Varlıkları AutoCAD komut satırı metnine çevirir. Her değer ayrı satırda (Enter) verilir;
+    yazılarda boşluk olabilir. Katman değişimi yalnızca katman farklıysa yazılır; katmansız
+    varlıklar betiğin başladığı katmana (CLAYER) çizilir."""
+
+    def __init__(self):
+        self.base_layer = None # Başlangıç katmanı (bilinmiyorsa betik kendisi saklar)
+        self.current_layer = None
+
+    @staticmethod
+    def setvars(values):
+        return "".join("_.SETVAR\n%s\n%s\n" % (name, value) for name, value in values.items())
+
+    def prologue(self, settings=None, layer=None):
+        """layer: betik başladığında etkin katman (CLAYER). Verilmezse betik AutoLISP ile kendisi okur."""
+        self.base_layer = self.current_layer = layer
+        text = self.setvars(settings or {"CMDECHO": 0, "OSMODE": 0})
+        if layer is None: text += '(setq engpy:clayer (getvar "CLAYER"))\n'
+        return text
+
+    def epilogue(self, restore=None):
+        text = self.setvars(restore) if restore else ""
+        self.base_layer = self.current_layer = None
+        return text
+
+    def item(self, kind, layer, data):
+        parts = []
+        layer = layer or self.base_layer
+        if layer != self.current_layer:
+            if layer: parts.append("_.-LAYER\n_M\n%s\n\n" % layer) # Yoksa oluştur, aktif yap
+            else: parts.append('(setvar "CLAYER" engpy:clayer)\n') # Başlangıç katmanına dön
+            self.current_layer = layer
+        if kind == LINE:
+            (x1, y1), (x2, y2) = data
+            parts.append("_.LINE\n%.6f,%.6f\n%.6f,%.6f\n\n" % (x1, y1, x2, y2))
+        elif kind == CIRCLE:
+            (x, y), radius = data
+            parts.append("_.CIRCLE\n%.6f,%.6f\n%.6f\n" % (x, y, radius))
+        elif kind == POLYLINE:
+            points, closed = data
+            parts.append("_.PLINE\n" + "".join("%.6f,%.6f\n" % point for point in points) + ("_C\n" if closed else "\n"))
+        elif kind == TEXT:
+            (x, y), height, value = data
+            # Yükseklik istemi yalnızca yazı stilinin yüksekliği 0 ise gelir (Standard stili)
+            parts.append("_.TEXT\n%.6f,%.6f\n%.6f\n0\n%s\n" % (x, y, height, " ".join(value.splitlines())))
+        else: raise ValueError(f"Bilinmeyen varlık türü: {kind}")
+        return "".join(parts)
+
+
+class ScriptBackend(drawing_backends.DrawingBackend):
+    """Varlıkları .scr dosyasına akışlı yazan arka uç (bellek kullanımı varlık sayısından bağımsız).
+    restore: betik sonunda geri yüklenecek sistem değişkenleri ({"OSMODE": 4133, ...})."""
+
+    name = "script"
+
+    def __init__(self, target, default_layer=None, restore=None, job=None, total=None):
+        super().__init__(default_layer)
+        self.compiler = ScriptCompiler()
+        self.restore = restore
+        self.job = job; self.total = total # İlerleme bildirimi için (isteğe bağlı)
+        self._own_file = isinstance(target, str)
+        self.path = target if self._own_file else getattr(target, "name", None)
+        self._file = open(target, "w", encoding=SCRIPT_ENCODING, errors="replace", newline="\r\n") if self._own_file else target
+        self._closed = False
+        self._file.write(self.compiler.prologue(layer=(restore or {}).get("CLAYER")))
+
+    def _add(self, kind, layer, data):
+        if self._closed: raise ValueError("Betik dosyası kapatıldı.")
+        self._file.write(self.compiler.item(kind, layer or self.default_layer, data))
+        self.count += 1
+        if self.job is not None and self.count % config.ACAD_SCRIPT_CHUNK_SIZE == 0:
+            self.job.check_cancelled()
+            self.job.progress(self.count / self.total if self.total else None, f"{self.count} varlık derlendi")
+        return self.count - 1
+
+    def close(self):
+        if self._closed: return []
+        self._file.write(self.compiler.epilogue(self.restore))
+        self._closed = True
+        if self._own_file: self._file.close()
+        else: self._file.flush()
+        print(f"AutoCAD script written: {self.count} entities{f' -> {self.path}' if self.path else ''}.")
+        return []
+
+    def abort(self):
+        if self._closed: return
+        self._closed = True
+        if self._own_file:
+            self._file.close()
+            try: os.remove(self.path)
+            except OSError: pass
+
+
+def write_script(batch, path=None, restore=None, job=None):
+    """DrawingBatch'i .scr dosyasına derler; dosya yolunu döndürür."""
+    if path is None:
+        fd, path = tempfile.mkstemp(prefix="engpy_", suffix=".scr"); os.close(fd)
+    planned = batch.plan(expand_blocks=True) # Katmanlara göre gruplu, uç uca çizgiler birleşik: daha az komut
+    with ScriptBackend(path, restore=restore, job=job, total=len(planned)) as backend:
+        for layer, kind, data, _ in planned: backend._add(kind, layer, data)
+    return path
+
+
+# ==================================
+# AUTOCAD'E GÖNDERİM (com_worker işleri)
+# ==================================
+def _document():
+    import autocad_interface
+    acad = autocad_interface.get_acad_instance()
+    if not acad: raise RuntimeError("AutoCAD bağlantısı kurulamadı.")
+    return autocad_interface, acad.doc
+
+
+def _current_settings(autocad_interface):
+    """Betik sonunda geri yüklenecek değerler (sistem değişkeni önbelleğinden)."""
+    values = autocad_interface.get_autocad_variables(["CMDECHO", "OSMODE", "FILEDIA", "CLAYER"])
+    return {name: value for name, value in values.items() if value is not None}
+
+
+def run_script(job, batch, path=None):
+    """Betiği yazar ve tek SendCommand ile _.SCRIPT olarak çalıştırır. Betik yolunu döndürür."""
+    autocad_interface, doc = _document()
+    restore = _current_settings(autocad_interface)
+    path = write_script(batch, path, restore=restore, job=job)
+    if job is not None: job.check_cancelled()
+    # FILEDIA 0: _.SCRIPT dosya diyaloğu açmadan yolu komut satırından alır (betik sonunda geri yüklenir)
+    doc.SendCommand('_.SETVAR\nFILEDIA\n0\n_.SCRIPT\n"%s"\n' % os.path.abspath(path).replace("\\", "/"))
+    autocad_interface.sysvars.invalidate() # Betik değişkenleri değiştirip geri yükler
+    if job is not None: job.progress(1.0, "Betik AutoCAD'e verildi")
+    return path
+
+
+def stream_commands(job, batch, chunk_size=None):
+    """Komutları parça parça SendCommand ile gönderir; her parçada ilerleme bildirir ve iptali
+    kontrol eder. Gönderilen varlık sayısını döndürür."""
+    chunk_size = chunk_size or config.ACAD_SCRIPT_CHUNK_SIZE
+    autocad_interface, doc = _document()
+    restore = {name: value for name, value in _current_settings(autocad_interface).items() if name != "FILEDIA"}
+    compiler = ScriptCompiler()
+    planned = batch.plan(expand_blocks=True)
+    total = len(planned); sent = 0; parts = [compiler.prologue(layer=restore.get("CLAYER"))]
+    try:
+        for layer, kind, data, _ in planned:
+            parts.append(compiler.item(kind, layer, data)); sent += 1
+            if sent % chunk_size == 0:
+                if job is not None: job.check_cancelled()
+                doc.SendCommand("".join(parts)); parts = []
+                if job is not None: job.progress(sent / total, f"{sent}/{total} varlık gönderildi")
+        parts.append(compiler.epilogue(restore))
+        doc.SendCommand("".join(parts)); parts = []
+    finally:
+        if parts and restore: # İptal/hata: değişkenleri yine de geri yükle
+            try: doc.SendCommand(compiler.epilogue(restore))
+            except Exception as e: print(f"Warning: Could not restore AutoCAD variables after script stream: {e}")
+        autocad_interface.sysvars.invalidate()
+    print(f"AutoCAD command stream sent: {sent} entities.")
+    return sent
+
+
+def render(job, batch, target="script", path=None):
+    """Aynı çizim işini seçilen hedefe verir (com_worker işi olarak çalıştırılmalı; "dxf" hariç).
+    script -> betik yolu, stream -> varlık sayısı, com -> handle listesi, dxf -> dosya yolu."""
+    if target == "script": return run_script(job, batch, path)
+    if target == "stream": return stream_commands(job, batch)
+    if target == "com":
+        backend = drawing_backends.ComBackend(default_layer=batch.default_layer, merge_lines=batch.merge_lines)
+        backend.add_batch(batch)
+        return backend.flush(job=job)
+    if target == "dxf":
+        if not path: raise ValueError("DXF hedefi için dosya yolu gerekli.")
+        with drawing_backends.DxfBackend(path, default_layer=batch.default_layer, keep_handles=False) as backend:
+            backend.add_batch(batch)
+        return path
+    raise ValueError(f"Bilinmeyen hedef '{target}' (geçerli: {', '.join(TARGETS)})")
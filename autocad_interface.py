@@ -2,100 +2,306 @@
 # AutoCAD ile etkileşim kurmak için fonksiyonları içerir.
 
 import sys
+import time
+import functools
+import threading
 try:
-    from pyautocad import Autocad, APoint
+    from pyautocad import Autocad, APoint, aDouble
 except ImportError:
     Autocad = None
     APoint = None
+    aDouble = None
     print("Warning: 'pyautocad' library not found. AutoCAD interaction will be disabled. Install with 'pip install pyautocad'")
 
+import config
+import com_worker
+import persistence
+import handle_registry
+
 # --- Global Değişkenler (Bu modül içinde geçici) ---
 # TODO: Sınıf yapısında bu global değişkenler yerine sınıf özellikleri kullanılacak
 acad_instance = None
 connected_autocad_doc_name = None
+PLATFORM_SUPPORTED = sys.platform == "win32" # fake_autocad.install() yerel sahte AutoCAD için açar
+
+# --- Bağlantı Yönetimi ---
+class AcadConnection:
+    """Doğrulanmış AutoCAD bağlantısını config.ACAD_CONNECTION_TTL_SECONDS boyunca önbellekte tutar.
+    Süre içinde her yardımcı fonksiyon bağlantıyı COM üzerinden yoklamadan kullanır; bir COM
+    hatası bildirilince (invalidate) sonraki kullanımda bağlantı doğrulanır, gerekirse yeniden kurulur."""
+
+    def __init__(self, ttl=None):
+        self.ttl = config.ACAD_CONNECTION_TTL_SECONDS if ttl is None else ttl
+        self.acad = None
+        self.doc_name = None
+        self.verified_at = None # time.monotonic() değeri; None: doğrulanmadı
+        self.last_error = None
+        self.message = "Bağlantı henüz kontrol edilmedi."
+
+    def is_fresh(self):
+        return self.acad is not None and self.verified_at is not None and time.monotonic() - self.verified_at < self.ttl
+
+    def invalidate(self, error=None):
+        """COM hatası sonrası çağrılır: bir sonraki kullanımda bağlantı yeniden doğrulanır."""
+        self.verified_at = None
+        if error is not None: self.last_error = str(error)
+
+    def get(self, force_verify=False):
+        """Bağlantıyı döndürür (yoksa None). TTL dolmadıysa COM çağrısı yapılmaz."""
+        global acad_instance, connected_autocad_doc_name
+        if not Autocad or not PLATFORM_SUPPORTED:
+            self.acad = None; self.doc_name = None
+            self.message = "Bağlantı kontrolü için 'pyautocad' kütüphanesi gerekli." if not Autocad else "AutoCAD bağlantı kontrolü sadece Windows'ta desteklenir."
+            acad_instance = None; connected_autocad_doc_name = None
+            return None
+        if not force_verify and self.is_fresh(): return self.acad
+        if self.acad is not None and not self._verify():
+            print("AutoCAD connection lost, reconnecting...")
+            self.acad = None
+        if self.acad is None:
+            try:
+                print("Attempting to connect to AutoCAD...")
+                self.acad = Autocad(create_if_not_exists=False)
+                print("Connected to AutoCAD instance.")
+                self._verify()
+            except Exception as e:
+                print(f"Failed to get/verify AutoCAD instance: {e}")
+                self.acad = None; self.doc_name = None; self.verified_at = None; self.last_error = str(e)
+                self.message = "Çalışan AutoCAD bulunamadı veya bağlantı kurulamadı."
+        acad_instance = self.acad; connected_autocad_doc_name = self.doc_name
+        return self.acad
+
+    def _verify(self):
+        """Tek COM yoklaması (aktif doküman adı). Uygulama yanıt veriyorsa True döner."""
+        try:
+            self.doc_name = self.acad.doc.Name
+            self.message = f"Bağlantı Başarılı (Doküman: {self.doc_name})"
+            sysvars.check_document(self.doc_name) # Çizim değiştiyse değişken önbelleği boşaltılır
+        except Exception as e:
+            self.doc_name = None; self.last_error = str(e)
+            try: _ = self.acad.app.Name # Uygulama yaşıyor mu, yoksa yalnızca aktif doküman mı yok?
+            except Exception: self.verified_at = None; return False
+            self.message = "Bağlantı kuruldu ancak aktif doküman yok/bilgisi alınamadı."
+        self.verified_at = time.monotonic()
+        return True
+
+    def state(self):
+        """Bağlantı durumu (COM çağrısı yapmaz)."""
+        age = None if self.verified_at is None else time.monotonic() - self.verified_at
+        return {"connected": self.acad is not None, "doc_name": self.doc_name, "message": self.message,
+                "verified_age": age, "fresh": self.is_fresh(), "last_error": self.last_error}
+
+
+connection = AcadConnection()
+
+def _on_com_thread(func):
+    """COM'a dokunan yardımcıyı com_worker iş parçacığında çalıştırır (bağlantı o iş parçacığına
+    aittir). Başka iş parçacığından çağrılırsa sonucu bekler; uzun işler (nokta seçimi, toplu çizim)
+    çağıran tarafta com_worker.get_worker().submit ile kuyruğa verilmelidir."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if Autocad is None or com_worker.in_worker_thread(): return func(*args, **kwargs)
+        try: return com_worker.get_worker().call(func, *args, timeout=config.ACAD_CALL_TIMEOUT_SECONDS, **kwargs)
+        except com_worker.TimeoutError:
+            print(f"Warning: AutoCAD call '{func.__name__}' timed out (COM worker busy).")
+            return None
+    return wrapper
 
 # --- Bağlantı ve Temel İşlemler ---
+@_on_com_thread
 def get_acad_instance():
-    """Çalışan AutoCAD örneğini döndürür, yoksa None döndürür."""
-    global acad_instance
-    if not Autocad or sys.platform != "win32":
-        acad_instance = None
-        return None
-    try:
-        # Bağlantıyı test etmek için basit bir özellik okuması yapılabilir
-        if acad_instance and acad_instance.doc:
-            _ = acad_instance.doc.Name # Bağlantı hala geçerli mi?
-            return acad_instance
-        # Yeni bağlantı dene
-        print("Attempting to connect to AutoCAD...")
-        acad_instance = Autocad(create_if_not_exists=False)
-        print("Connected to AutoCAD instance.")
-        return acad_instance
-    except Exception as e:
-        print(f"Failed to get/verify AutoCAD instance: {e}")
-        acad_instance = None
-        return None
+    """Çalışan AutoCAD örneğini döndürür, yoksa None döndürür (doğrulama TTL ile önbelleklenir)."""
+    return connection.get()
+
+def get_connection_state():
+    """Son bilinen bağlantı durumu; AutoCAD yoklanmaz."""
+    return connection.state()
 
+@_on_com_thread
 def check_autocad_connection():
-    """Çalışan bir AutoCAD örneği olup olmadığını kontrol eder ve durumu döndürür."""
-    global connected_autocad_doc_name, acad_instance
-    acad = get_acad_instance() # Önce bağlantıyı almayı dene/yenile
-    if acad:
-        try:
-            doc_name = acad.doc.Name # Doküman adını almayı dene
-            connected_autocad_doc_name = doc_name
-            print(f"ACAD connected. Doc: {doc_name}")
-            return f"Bağlantı Başarılı (Doküman: {doc_name})"
-        except Exception as e:
-            # Bağlantı var ama doküman adı alınamıyor (örn. başlangıç ekranı)
-            connected_autocad_doc_name = None
-            print(f"ACAD Error (could not get doc name): {e}")
-            return "Bağlantı kuruldu ancak aktif doküman yok/bilgisi alınamadı."
-    else:
-        # Bağlantı tamamen başarısız
-        connected_autocad_doc_name = None
-        if not Autocad: return "Bağlantı kontrolü için 'pyautocad' kütüphanesi gerekli."
-        if sys.platform != "win32": return "AutoCAD bağlantı kontrolü sadece Windows'ta desteklenir."
-        return "Çalışan AutoCAD bulunamadı veya bağlantı kurulamadı."
+    """Bağlantıyı (tek COM yoklamasıyla) hemen doğrular ve durum mesajını döndürür."""
+    acad = connection.get(force_verify=True)
+    if acad and connection.doc_name: print(f"ACAD connected. Doc: {connection.doc_name}")
+    sysvars.invalidate() # Kullanıcı açıkça yeniledi: değişkenler AutoCAD'de değişmiş olabilir
+    return connection.message
+
+def submit_connection_check(on_done=None, on_error=None):
+    """check_autocad_connection'ı COM kuyruğuna verir ve hemen döner (ComJob).
+    on_done(durum mesajı) / on_error(istisna) Tk iş parçacığında çağrılır."""
+    return com_worker.get_worker().submit(lambda job: check_autocad_connection(), name="Bağlantı kontrolü", on_done=on_done, on_error=on_error)
+
+# --- Sistem Değişkenleri ---
+# Bilinen değişkenlerin tipleri: yazmadan önce tipi öğrenmek için GetVariable gerekmez.
+# Listede olmayanların tipi ilk okumada öğrenilir.
+SYSVAR_TYPES = {
+    "GRIDMODE": int, "SNAPMODE": int, "ORTHOMODE": int, "OSMODE": int, "AUTOSNAP": int, "POLARMODE": int,
+    "INSUNITS": int, "LUNITS": int, "LUPREC": int, "FILEDIA": int, "CMDECHO": int, "PICKBOX": int,
+    "LTSCALE": float, "DIMSCALE": float, "TEXTSIZE": float, "POLARANG": float,
+    "CLAYER": str, "CECOLOR": str, "TEXTSTYLE": str, "DWGNAME": str,
+}
+
+
+class SysVarCache:
+    """AutoCAD sistem değişkenleri için doküman başına önbellek ve birleştirilmiş yazma.
+    Okunan değerler doküman değişene veya invalidate() çağrılana kadar önbellekten döner.
+    stage() yazmaları biriktirir; kullanıcı config.ACAD_SYSVAR_FLUSH_DELAY_SECONDS boyunca
+    değiştirmeyi bırakınca hepsi tek COM işinde yazılır (her değişkene son değer bir kez)."""
+
+    def __init__(self, delay=None):
+        self._values = {}   # ad -> son bilinen değer
+        self._types = dict(SYSVAR_TYPES)
+        self._pending = {}  # ad -> yazılacak değer
+        self._doc_name = None
+        self._lock = threading.Lock()
+        self._writer = persistence.WriteBehindWriter("sysvars", self._flush_pending, delay=config.ACAD_SYSVAR_FLUSH_DELAY_SECONDS if delay is None else delay)
+
+    # --- Önbellek ---
+    def invalidate(self, name=None):
+        with self._lock:
+            if name is None: self._values.clear()
+            else: self._values.pop(name.upper(), None)
+
+    def check_document(self, doc_name):
+        """Aktif doküman değiştiyse önbelleği boşaltır (bekleyen yazmalar eski dokümana aitti).
+        doc_name o an AutoCAD'den okunmuş ad olmalı (connection.doc_name TTL boyunca eski kalabilir).
+        Önbellek boşaltıldıysa True döner."""
+        with self._lock:
+            if doc_name == self._doc_name: return False
+            if self._doc_name is not None and self._pending:
+                print(f"Warning: Dropping {len(self._pending)} staged system variable writes (document changed).")
+                self._pending.clear()
+            self._values.clear(); self._doc_name = doc_name
+            return True
+
+    def coerce(self, name, value):
+        value_type = self._types.get(name)
+        return value_type(value) if value_type is not None else value
+
+    # --- Okuma ---
+    def get_many(self, names, default=None):
+        """Değişkenleri okur; önbellekte olmayanlar tek COM işinde alınır. {ad: değer} döndürür."""
+        names = [name.upper() for name in names]
+        if Autocad is not None and not com_worker.in_worker_thread():
+            try: return com_worker.get_worker().call(self.get_many, names, default, timeout=config.ACAD_CALL_TIMEOUT_SECONDS)
+            except com_worker.TimeoutError: print("Warning: AutoCAD variable read timed out (COM worker busy)."); return {name: default for name in names}
+        acad = get_acad_instance()
+        result = self.cached(names)
+        if result is not None: return result
+        doc = acad.doc if acad else None
+        if doc is not None:
+            # İlk önbellek ıskasında doküman adı AutoCAD'den okunur: çizim değiştiyse eski değerler atılır
+            try: self.check_document(doc.Name)
+            except Exception as e: print(f"Error reading active document name: {e}"); connection.invalidate(e)
+        result = {}; missing = []
+        with self._lock:
+            for name in names:
+                if name in self._pending: result[name] = self._pending[name]
+                elif name in self._values: result[name] = self._values[name]
+                else: missing.append(name)
+        if missing and doc is not None:
+            for name in missing:
+                try: value = doc.GetVariable(name)
+                except Exception as e: print(f"Error getting ACAD var '{name}': {e}"); connection.invalidate(e); continue
+                with self._lock:
+                    self._values[name] = value; self._types.setdefault(name, type(value))
+                result[name] = value
+        for name in names: result.setdefault(name, default)
+        return result
+
+    def get(self, name, default=None):
+        return self.get_many([name], default)[name.upper()]
+
+    def cached(self, names):
+        """Değişkenlerin hepsi önbellekte (veya bekleyen yazmalarda) ise {ad: değer}, değilse None. COM yok."""
+        result = {}
+        with self._lock:
+            for name in (name.upper() for name in names):
+                if name in self._pending: result[name] = self._pending[name]
+                elif name in self._values: result[name] = self._values[name]
+                else: return None
+        return result
+
+    def submit_get_many(self, names, on_done, on_error=None, default=None):
+        """get_many'nin bloklamayan sürümü: değerler önbellekteyse on_done hemen çağrılır (None döner),
+        değilse okuma COM kuyruğuna verilir ve ComJob döner; on_done({ad: değer}) Tk iş parçacığında çağrılır."""
+        names = [name.upper() for name in names]
+        values = self.cached(names)
+        if values is not None: on_done(values); return None
+        return com_worker.get_worker().submit(lambda job: self.get_many(names, default), name="Sistem değişkenleri", on_done=on_done, on_error=on_error)
+
+    # --- Yazma ---
+    def stage(self, name, value):
+        """Yazmayı biriktirir ve hemen döner; arka planda gecikmeli olarak yazılır."""
+        name = name.upper()
+        value = self.coerce(name, value)
+        with self._lock: self._pending[name] = value
+        self._writer.schedule()
+
+    def set(self, name, value):
+        """Değişkeni hemen yazar (bekleyen yazmalarla birlikte). Başarılıysa True."""
+        self.stage(name, value)
+        return self.flush()
+
+    def flush(self):
+        """Bekleyen yazmaları hemen yapar."""
+        if Autocad is not None and not com_worker.in_worker_thread():
+            try: return com_worker.get_worker().call(self._write_pending, timeout=config.ACAD_CALL_TIMEOUT_SECONDS)
+            except com_worker.TimeoutError: print("Warning: AutoCAD variable write timed out (COM worker busy)."); return False
+        return self._write_pending()
+
+    def _flush_pending(self):
+        # WriteBehindWriter iş parçacığından: yazma COM iş parçacığında yapılır. Bağlantı yoksa
+        # bekleyen değerler kalır ve bir sonraki stage/flush ile tekrar denenir.
+        self.flush()
+
+    def _write_pending(self):
+        with self._lock:
+            if not self._pending: return True
+        acad = get_acad_instance()
+        if not acad: print("Cannot set ACAD var, not connected."); return False
+        doc = acad.doc
+        try: self.check_document(doc.Name) # Yazmadan hemen önce: değerler başka çizime yazılmasın
+        except Exception as e: print(f"Error reading active document name: {e}"); connection.invalidate(e); return False
+        with self._lock: pending = self._pending; self._pending = {}
+        if not pending: return True
+        ok = True
+        for name, value in pending.items():
+            try:
+                doc.SetVariable(name, value)
+                with self._lock: self._values[name] = value
+            except Exception as e:
+                print(f"Error setting ACAD var '{name}': {e}"); connection.invalidate(e); self.invalidate(name); ok = False
+        print(f"Set ACAD vars: {', '.join(f'{name}={value}' for name, value in pending.items())}")
+        return ok
+
+
+sysvars = SysVarCache()
 
 def get_autocad_variable(var_name, default_value):
-    """AutoCAD'den bir sistem değişkenini okur."""
-    acad = get_acad_instance()
-    if acad:
-        try:
-            return acad.doc.GetVariable(var_name)
-        except Exception as e:
-            print(f"Error getting ACAD var '{var_name}': {e}")
-            return default_value
-    return default_value
+    """AutoCAD'den bir sistem değişkenini okur (önbellekli)."""
+    return sysvars.get(var_name, default_value)
+
+def get_autocad_variables(var_names, default_value=None):
+    """Birden fazla sistem değişkenini tek seferde okur: {AD: değer}."""
+    return sysvars.get_many(var_names, default_value)
+
+def submit_get_autocad_variables(var_names, on_done, on_error=None, default_value=None):
+    """Sistem değişkenlerini arayüzü bekletmeden okur (bkz. SysVarCache.submit_get_many)."""
+    return sysvars.submit_get_many(var_names, on_done, on_error, default_value)
 
 def set_autocad_variable(var_name, value):
-    """AutoCAD'de bir sistem değişkenini ayarlar."""
-    acad = get_acad_instance()
-    if acad:
-        try:
-            # Değişken tipini kontrol etmeye çalışalım
-            current_val = acad.doc.GetVariable(var_name)
-            if isinstance(current_val, float):
-                value = float(value)
-            elif isinstance(current_val, int):
-                 # OSMODE gibi bit kodları için int olmalı
-                 value = int(value)
-            # Diğer tipler (string vb.) için doğrudan atama yapılabilir
-            acad.doc.SetVariable(var_name, value)
-            print(f"Set ACAD var '{var_name}' to {value}")
-            return True
-        except Exception as e:
-            print(f"Error setting ACAD var '{var_name}': {e}")
-            return False
-    else:
-        print("Cannot set ACAD var, not connected.")
-        return False
+    """AutoCAD'de bir sistem değişkenini hemen ayarlar."""
+    return sysvars.set(var_name, value)
+
+def stage_autocad_variable(var_name, value):
+    """Sistem değişkeni yazmasını biriktirir; kullanıcı değiştirmeyi bırakınca toplu yazılır."""
+    sysvars.stage(var_name, value)
 
 # --- Çizim Fonksiyonları (Temel) ---
 # Not: Bu fonksiyonlar APoint nesneleri veya koordinat demetleri alabilir.
-# Hata yönetimi eklendi.
+# Hata yönetimi eklendi. Çok sayıda varlık için drawing_batch.DrawingBatch kullanın (tek tek çağrı her varlık için ayrı COM gönderimi demektir).
 
+@_on_com_thread
 def draw_line(start_point, end_point):
     """Verilen iki nokta arasına çizgi çizer."""
     acad = get_acad_instance()
@@ -107,10 +313,11 @@ def draw_line(start_point, end_point):
             print(f"Line drawn from {p1} to {p2}")
             return True
         except Exception as e:
-            print(f"Error drawing line: {e}")
+            print(f"Error drawing line: {e}"); connection.invalidate(e)
             return False
     return False
 
+@_on_com_thread
 def draw_circle(center_point, radius):
     """Verilen merkez ve yarıçapta daire çizer."""
     acad = get_acad_instance()
@@ -121,10 +328,11 @@ def draw_circle(center_point, radius):
             print(f"Circle drawn at {cp} with radius {radius}")
             return True
         except Exception as e:
-            print(f"Error drawing circle: {e}")
+            print(f"Error drawing circle: {e}"); connection.invalidate(e)
             return False
     return False
 
+@_on_com_thread
 def draw_lwpolyline(vertices):
     """Verilen köşe noktalarıyla hafif polyline çizer."""
     # vertices: [(x1, y1), (x2, y2), ...] veya [x1, y1, x2, y2, ...] formatında olabilir.
@@ -133,15 +341,16 @@ def draw_lwpolyline(vertices):
     if acad:
         try:
             # Gelen verteks listesini düzleştir ve float yap
-            flat_vertices = tuple(float(coord) for point in vertices for coord in point[:2]) # Sadece X,Y al
-            acad.ActiveDocument.ModelSpace.AddLwPolyline(flat_vertices)
+            flat_vertices = [float(coord) for point in vertices for coord in point[:2]] # Sadece X,Y al
+            acad.ActiveDocument.ModelSpace.AddLightWeightPolyline(aDouble(*flat_vertices)) # COM double dizisi bekler
             print(f"LwPolyline drawn with {len(vertices)} vertices.")
             return True
         except Exception as e:
-            print(f"Error drawing lwpolyline: {e}")
+            print(f"Error drawing lwpolyline: {e}"); connection.invalidate(e)
             return False
     return False
 
+@_on_com_thread
 def prompt_user(message):
     """AutoCAD komut satırında kullanıcıya mesaj gösterir."""
     acad = get_acad_instance()
@@ -150,10 +359,11 @@ def prompt_user(message):
             acad.prompt(message)
             return True
         except Exception as e:
-            print(f"Error prompting user: {e}")
+            print(f"Error prompting user: {e}"); connection.invalidate(e)
             return False
     return False
 
+@_on_com_thread
 def get_point_from_user(prompt_message="Nokta seçin:"):
     """Kullanıcıdan bir nokta seçmesini ister ve koordinatları döndürür."""
     acad = get_acad_instance()
@@ -163,7 +373,39 @@ def get_point_from_user(prompt_message="Nokta seçin:"):
             point = acad.doc.Utility.GetPoint() # Hata fırlatabilir
             return tuple(point) # Tuple olarak döndür
         except Exception as e:
-            print(f"Error getting point from user: {e}")
+            print(f"Error getting point from user: {e}"); connection.invalidate(e) # İptal de buraya düşer; sonraki çağrı yalnızca bir kez yoklar
             return None # Hata veya iptal durumunda None döndür
     return None
 
+
+# --- COM İş Parçacığı İşleri (com_worker.get_worker().submit ile) ---
+def pick_points(job, count, prompt="Lütfen {n}. noktayı seçin (İptal için Esc):"):
+    """Kullanıcıdan sırayla count nokta alır; her noktada ilerleme olayı gönderir.
+    Esc veya iptal isteği com_worker.JobCancelled fırlatır."""
+    if not get_acad_instance(): raise RuntimeError("AutoCAD bağlantısı kurulamadı.")
+    points = []
+    try:
+        for n in range(1, count + 1):
+            job.check_cancelled()
+            point = get_point_from_user(prompt.format(n=n))
+            if point is None: raise com_worker.JobCancelled("Kullanıcı iptal etti.")
+            points.append(point)
+            job.progress(n / count, f"{n}. Nokta: {point}")
+    finally: prompt_user("\n")
+    return points
+
+def submit_batch(job, batch):
+    """drawing_batch.DrawingBatch tamponunu gönderir (ilerleme ve iptal job üzerinden)."""
+    acad = get_acad_instance()
+    if not acad: raise RuntimeError("AutoCAD bağlantısı kurulamadı.")
+    try: return batch.submit(acad, job=job)
+    except com_worker.JobCancelled: raise
+    except Exception as e: connection.invalidate(e); raise
+
+def update_batch(job, batch, registry):
+    """Yalnızca handle kaydına (handle_registry.HandleRegistry) göre değişen varlıkları günceller."""
+    acad = get_acad_instance()
+    if not acad: raise RuntimeError("AutoCAD bağlantısı kurulamadı.")
+    try: return handle_registry.update(acad, batch, registry, job=job)
+    except com_worker.JobCancelled: raise
+    except Exception as e: connection.invalidate(e); raise
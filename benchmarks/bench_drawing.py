@@ -0,0 +1,194 @@
+# benchmarks/bench_drawing.py
+# Çizim yollarının hız ölçümü: sahte AutoCAD (fake_autocad) üzerinde varlık/saniye ve
+# işlem başına COM çağrısı. AutoCAD veya Windows gerektirmez.
+#
+# Çalıştırma (proje kök dizininde):
+#     python benchmarks/bench_drawing.py
+#     python benchmarks/bench_drawing.py --shapes 2000 --latency-ms 0.5
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fake_autocad
+import autocad_interface
+import com_worker
+import drawing_batch
+import drawing_backends
+import acad_script
+import block_manager
+import layout_generator
+
+
+def _grid_rectangles(count, size=100.0, gap=20.0):
+    """Izgaraya dizilmiş count kare (4 köşe)."""
+    per_row = max(1, int(count ** 0.5))
+    for i in range(count):
+        x = (i % per_row) * (size + gap); y = (i // per_row) * (size + gap)
+        yield x, y, x + size, y + size
+
+
+# ==================================
+# SENARYOLAR
+# ==================================
+# Her senaryo (ad, fonksiyon(shapes, recorder) -> (varlık sayısı, işlem sayısı)). İşlem = bir kare.
+def bench_helpers_per_line(shapes, recorder):
+    """Eski yol: her kenar için autocad_interface.draw_line (kare = 4 çizgi, 4 ayrı gönderim)."""
+    for x0, y0, x1, y1 in _grid_rectangles(shapes):
+        for start, end in (((x0, y0), (x1, y0)), ((x1, y0), (x1, y1)), ((x1, y1), (x0, y1)), ((x0, y1), (x0, y0))):
+            autocad_interface.draw_line(start, end)
+    return shapes * 4, shapes
+
+
+def bench_helpers_lwpolyline(shapes, recorder):
+    """Kare başına bir autocad_interface.draw_lwpolyline çağrısı."""
+    for x0, y0, x1, y1 in _grid_rectangles(shapes):
+        autocad_interface.draw_lwpolyline([(x0, y0), (x1, y0), (x1, y1), (x0, y1), (x0, y0)])
+    return shapes, shapes
+
+
+def bench_batch_com(shapes, recorder):
+    """drawing_batch + ComBackend: tek gönderim, kare = tek kapalı polyline, COM iş parçacığında."""
+    backend = drawing_backends.ComBackend()
+    for x0, y0, x1, y1 in _grid_rectangles(shapes): backend.rectangle(x0, y0, x1, y1, layer="KARE")
+    handles = backend.close()
+    return sum(1 for h in handles if h), shapes
+
+
+def bench_batch_lines_merged(shapes, recorder):
+    """Kenarları tek tek çizgi olarak ekleyen kod: batch uç uca çizgileri birleştirir."""
+    batch = drawing_batch.DrawingBatch(default_layer="KARE")
+    for x0, y0, x1, y1 in _grid_rectangles(shapes):
+        batch.line((x0, y0), (x1, y0)); batch.line((x1, y0), (x1, y1)); batch.line((x1, y1), (x0, y1)); batch.line((x0, y1), (x0, y0))
+    entities = len(batch.plan())
+    com_worker.get_worker().call(autocad_interface.submit_batch, None, batch)
+    return entities, shapes
+
+
+def bench_connector(shapes, recorder):
+    """AutoCADConnector (win32com yolu) + ConnectorBackend."""
+    connector = fake_autocad.FakeConnector(application=fake_autocad.FakeApplication(recorder))
+    connector.connect()
+    recorder.reset()
+    with drawing_backends.ConnectorBackend(connector) as backend:
+        for x0, y0, x1, y1 in _grid_rectangles(shapes): backend.rectangle(x0, y0, x1, y1, layer="KARE")
+    return shapes, shapes
+
+
+def bench_dxf(shapes, recorder):
+    """DxfBackend: COM yok, dosyaya akışlı yazım."""
+    fd, path = tempfile.mkstemp(suffix=".dxf"); os.close(fd)
+    try:
+        with drawing_backends.DxfBackend(path, keep_handles=False) as backend:
+            for x0, y0, x1, y1 in _grid_rectangles(shapes): backend.rectangle(x0, y0, x1, y1, layer="KARE")
+    finally: os.remove(path)
+    return shapes, shapes
+
+
+def _rectangle_batch(shapes):
+    batch = drawing_batch.DrawingBatch(default_layer="KARE")
+    for x0, y0, x1, y1 in _grid_rectangles(shapes): batch.rectangle(x0, y0, x1, y1)
+    return batch
+
+
+def bench_script(shapes, recorder):
+    """acad_script: .scr betiği + tek SendCommand (_.SCRIPT)."""
+    path = com_worker.get_worker().call(acad_script.run_script, None, _rectangle_batch(shapes))
+    os.remove(path)
+    return shapes, shapes
+
+
+def bench_command_stream(shapes, recorder):
+    """acad_script: parça başına bir SendCommand."""
+    com_worker.get_worker().call(acad_script.stream_commands, None, _rectangle_batch(shapes))
+    return shapes, shapes
+
+
+def bench_columns_geometry(shapes, recorder):
+    """Kolon sembolü (dikdörtgen + iki köşegen) her örnekte ayrı geometri olarak, ComBackend."""
+    backend = drawing_backends.ComBackend()
+    for x0, y0, x1, y1 in _grid_rectangles(shapes):
+        backend.rectangle(x0, y0, x1, y1, layer="KOLON")
+        backend.line((x0, y0), (x1, y1), layer="KOLON"); backend.line((x0, y1), (x1, y0), layer="KOLON")
+    backend.close()
+    return shapes * 3, shapes
+
+
+def bench_columns_blocks(shapes, recorder):
+    """Aynı kolonlar block_manager ile: bir blok tanımı + örnek başına tek InsertBlock."""
+    backend = drawing_backends.ComBackend()
+    blocks = block_manager.BlockManager(backend)
+    blocks.place_many("column_rect", ((x0 + 50.0, y0 + 50.0) for x0, y0, _, _ in _grid_rectangles(shapes)), layer="KOLON", b=100, h=100)
+    backend.close()
+    return shapes, shapes
+
+
+def bench_layout(shapes, recorder):
+    """layout_generator: kare aks sistemi (~shapes kolon) + kolon ve kirişler, ComBackend'e tek gönderim."""
+    spans = max(1, int(shapes ** 0.5) - 1)
+    layout = layout_generator.generate([6000.0] * spans, [5000.0] * spans, column_b=400, column_h=400, beam_width=250)
+    backend = drawing_backends.ComBackend()
+    layout_generator.emit(layout, backend)
+    backend.close()
+    return backend.count, len(layout.columns)
+
+
+SCENARIOS = [
+    ("draw_line x4 (eski)", bench_helpers_per_line),
+    ("draw_lwpolyline", bench_helpers_lwpolyline),
+    ("DrawingBatch (çizgi birleştirme)", bench_batch_lines_merged),
+    ("ComBackend", bench_batch_com),
+    ("ConnectorBackend", bench_connector),
+    ("Betik (.scr)", bench_script),
+    ("Komut akışı (SendCommand)", bench_command_stream),
+    ("DxfBackend", bench_dxf),
+    ("Kolonlar: geometri", bench_columns_geometry),
+    ("Kolonlar: blok (InsertBlock)", bench_columns_blocks),
+    ("Yerleşim (layout_generator)", bench_layout),
+]
+
+
+def run(shapes=500, latency=fake_autocad.DEFAULT_LATENCY, only=None):
+    """Senaryoları çalıştırır; [(ad, süre s, varlık, işlem, COM çağrısı)] döndürür."""
+    recorder = fake_autocad.install(latency=latency)
+    results = []
+    try:
+        autocad_interface.check_autocad_connection() # Bağlantı kurulumu ölçüme katılmaz
+        for name, func in SCENARIOS:
+            if only and only.lower() not in name.lower(): continue
+            recorder.reset()
+            start = time.perf_counter()
+            entities, operations = func(shapes, recorder)
+            elapsed = time.perf_counter() - start
+            results.append((name, elapsed, entities, operations, recorder.total))
+    finally:
+        com_worker.get_worker().stop()
+        fake_autocad.uninstall()
+    return results
+
+
+def format_results(results, latency):
+    lines = [f"Gecikme: {latency * 1000:.2f} ms/COM çağrısı",
+             f"{'Senaryo':<34}{'Süre (s)':>10}{'Varlık':>9}{'Varlık/s':>11}{'COM çağrısı':>13}{'Çağrı/işlem':>13}"]
+    for name, elapsed, entities, operations, calls in results:
+        rate = entities / elapsed if elapsed > 0 else float("inf")
+        lines.append(f"{name:<34}{elapsed:>10.3f}{entities:>9}{rate:>11.0f}{calls:>13}{calls / max(operations, 1):>13.2f}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Çizim hız ölçümü (sahte AutoCAD üzerinde).")
+    parser.add_argument("--shapes", type=int, default=500, help="Senaryo başına kare sayısı")
+    parser.add_argument("--latency-ms", type=float, default=fake_autocad.DEFAULT_LATENCY * 1000, help="COM çağrısı başına gecikme (ms)")
+    parser.add_argument("--only", default=None, help="Yalnızca adı bu metni içeren senaryolar")
+    args = parser.parse_args(argv)
+    latency = args.latency_ms / 1000.0
+    print(format_results(run(args.shapes, latency, args.only), latency))
+
+
+if __name__ == "__main__":
+    main()
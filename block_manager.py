@@ -0,0 +1,133 @@
+# block_manager.py
+# Tekrarlayan semboller (kolonlar, aks balonları, donatı pozları, kesit okları) için blok
+# tanımlarının yeniden kullanımı.
+#
+# Yerleşim çizimlerinde aynı sembol yüzlerce kez tekrarlanır. Her örnek ayrı geometri olarak
+# çizilirse maliyet ve dosya boyutu toplam varlık sayısıyla büyür. BlockManager her farklı
+# sembolü (tür + parametreler) bir kez blok olarak tanımlar ve örnekleri tek INSERT ile
+# yerleştirir; maliyet farklı sembol sayısıyla büyür. Blok adı parametrelerin içerik
+# özetinden türetilir (record_pool.record_id): aynı parametreler -> aynı ad. Canlı AutoCAD'de
+# dokümanda zaten olan blok yeniden tanımlanmaz (drawing_batch.DrawingBatch._submit_blocks).
+#
+# Örnek:
+#     with drawing_backends.DxfBackend("kolonlar.dxf") as backend:
+#         blocks = block_manager.BlockManager(backend)
+#         blocks.place_many("column_rect", points, layer="KOLON", b=300, h=500)
+
+import math
+
+import drawing_batch
+import record_pool
+
+BLOCK_PREFIX = "ENGPY"
+
+
+# ==================================
+# SEMBOLLER
+# ==================================
+# Her sembol parametrelerden taban noktası (0, 0) etrafında bir DrawingBatch üretir.
+def column_rect(b, h):
+    """Dikdörtgen kolon (b x h), köşegenlerle taranmış."""
+    batch = drawing_batch.DrawingBatch()
+    x, y = b / 2.0, h / 2.0
+    batch.rectangle(-x, -y, x, y)
+    batch.line((-x, -y), (x, y)); batch.line((-x, y), (x, -y))
+    return batch
+
+
+def column_circle(d):
+    """Dairesel kolon (çap d), köşegenlerle taranmış."""
+    batch = drawing_batch.DrawingBatch()
+    r = d / 2.0; c = r / math.sqrt(2.0)
+    batch.circle((0, 0), r)
+    batch.line((-c, -c), (c, c)); batch.line((-c, c), (c, -c))
+    return batch
+
+
+def axis_bubble(radius):
+    """Aks balonu (aks adı örnek başına ayrı yazı olarak eklenir)."""
+    batch = drawing_batch.DrawingBatch()
+    batch.circle((0, 0), radius)
+    return batch
+
+
+def bar_mark(radius):
+    """Donatı poz balonu: yatay çizgiyle bölünmüş daire (poz no / çap yazıları ayrı eklenir)."""
+    batch = drawing_batch.DrawingBatch()
+    batch.circle((0, 0), radius)
+    batch.line((-radius, 0), (radius, 0))
+    return batch
+
+
+def section_arrow(size):
+    """Kesit oku: kısa çizgi ve dolu olmayan üçgen uç (+y yönüne bakar)."""
+    batch = drawing_batch.DrawingBatch()
+    batch.line((0, 0), (0, size))
+    batch.polygon([(-size / 4.0, size), (size / 4.0, size), (0, size * 1.5)])
+    return batch
+
+
+SYMBOLS = {
+    "column_rect": column_rect,
+    "column_circle": column_circle,
+    "axis_bubble": axis_bubble,
+    "bar_mark": bar_mark,
+    "section_arrow": section_arrow,
+}
+
+
+# ==================================
+# BLOK YÖNETİCİSİ
+# ==================================
+class BlockManager:
+    """Bir çizim arka ucu (drawing_backends.DrawingBackend) için blok tanımı önbelleği.
+    symbols: ek/yerine geçen sembol üreticileri {tür: fonksiyon(**parametreler) -> DrawingBatch}."""
+
+    def __init__(self, backend, prefix=BLOCK_PREFIX, symbols=None):
+        self.backend = backend
+        self.prefix = prefix
+        self.symbols = dict(SYMBOLS)
+        if symbols: self.symbols.update(symbols)
+        self._names = {} # (tür, parametreler) -> blok adı
+        self.instances = 0
+
+    def block_name(self, kind, **params):
+        """Parametrelerden türetilen kararlı blok adı (ör. ENGPY_COLUMN_RECT_1a2b3c4d)."""
+        params = {key: _normalize(value) for key, value in params.items()}
+        return f"{self.prefix}_{kind.upper()}_{record_pool.record_id({'kind': kind, 'params': params})[:8]}"
+
+    def define(self, kind, **params):
+        """Sembolü gerekiyorsa tanımlar ve blok adını döndürür (aynı parametreler için bir kez)."""
+        key = (kind, tuple(sorted((k, _normalize(v)) for k, v in params.items())))
+        name = self._names.get(key)
+        if name is not None: return name
+        builder = self.symbols.get(kind)
+        if builder is None: raise KeyError(f"Bilinmeyen sembol: {kind}")
+        name = self.block_name(kind, **params)
+        if not self.backend.has_block(name): self.backend.define_block(name, builder(**params))
+        self._names[key] = name
+        return name
+
+    def place(self, kind, position, rotation=0.0, scale=1.0, layer=None, **params):
+        """Sembolün tek örneği (rotation: radyan). Arka ucun sıra numarasını döndürür."""
+        name = self.define(kind, **params)
+        self.instances += 1
+        return self.backend.insert(name, position, scale, rotation, layer)
+
+    def place_many(self, kind, positions, rotation=0.0, scale=1.0, layer=None, **params):
+        """Aynı sembolü birçok noktaya yerleştirir (tanım bir kez aranır). Sıra numaralarını döndürür."""
+        name = self.define(kind, **params)
+        insert = self.backend.insert
+        indices = [insert(name, position, scale, rotation, layer) for position in positions]
+        self.instances += len(indices)
+        return indices
+
+    def stats(self):
+        return {"definitions": len(self._names), "instances": self.instances}
+
+
+def _normalize(value):
+    # 300 ile 300.0 aynı bloğu vermeli; kayan nokta gürültüsü ayrı blok üretmemeli
+    if isinstance(value, bool): return value
+    if isinstance(value, (int, float)): return round(float(value), 6)
+    return value
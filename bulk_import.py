@@ -0,0 +1,185 @@
+# bulk_import.py
+# Malzeme ve kesitlerin CSV/XLSX dosyalarından toplu içe aktarımı.
+# Satırlar akış halinde okunur, bir kez derlenen şema ile doğrulanır ve
+# tüm parti profile tek seferde (tek kayıt, tek arayüz yenilemesi) işlenir.
+
+import os
+import csv
+
+import config
+import records
+import steel_catalog
+import profile_schema
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None # Yalnızca .xlsx içe aktarımı için gerekli
+
+# --- Sütun Şemaları ---
+# hedef alan: (kabul edilen başlık adları, dönüştürücü, zorunlu mu)
+def _text(value): return "" if value is None else str(value).strip()
+
+def _number(value):
+    if value is None: return None
+    if isinstance(value, (int, float)): return float(value)
+    text = str(value).strip().replace(",", ".") # Türkçe ondalık ayırıcıyı da kabul et
+    return float(text) if text else None
+
+def _flag(value):
+    return _text(value).lower() in ("1", "true", "evet", "e", "yes", "x", "özel")
+
+MATERIAL_SCHEMA = {
+    "user_name": (("user_name", "ad", "isim", "malzeme", "name"), _text, True),
+    "type": (("type", "tip", "malzeme tipi"), _text, True),
+    "class": (("class", "sınıf", "sinif"), _text, False),
+    "is_custom": (("is_custom", "özel", "ozel", "custom"), _flag, False),
+    "fck": (("fck",), _number, False),
+    "fyk": (("fyk",), _number, False),
+    "Es": (("es",), _number, False),
+    "Ec": (("ec",), _number, False),
+}
+SECTION_SCHEMA = {
+    "user_name": (("user_name", "ad", "isim", "kesit", "name"), _text, True),
+    "type": (("type", "tip", "kesit tipi"), _text, True),
+    "material_name": (("material_name", "malzeme", "material"), _text, False), # Çelik profilde isteğe bağlı
+    "b": (("b", "genişlik", "genislik"), _number, False),
+    "h": (("h", "yükseklik", "yukseklik"), _number, False),
+    "D": (("d", "çap", "cap"), _number, False),
+    "profile": (("profile", "profil", "çelik profil", "celik profil"), _text, False), # steel_catalog profil adı
+}
+
+
+class ImportResult:
+    """İçe aktarım partisi: geçerli kayıtlar ve satır bazlı hatalar."""
+    __slots__ = ("kind", "items", "errors", "row_count")
+
+    def __init__(self, kind):
+        self.kind = kind; self.items = []; self.errors = []; self.row_count = 0
+
+    @property
+    def ok(self): return not self.errors
+
+    def error_summary(self, max_lines=15):
+        lines = [f"Satır {row_no}: {message}" for row_no, message in self.errors[:max_lines]]
+        if len(self.errors) > max_lines: lines.append(f"... ve {len(self.errors) - max_lines} hata daha")
+        return "\n".join(lines)
+
+
+def compile_schema(schema, header):
+    """Başlık satırını şemaya bağlar; (alan, sütun indeksi, dönüştürücü, sütun adı) listesi döndürür."""
+    normalized = [_text(h).lower() for h in header]
+    compiled = []; missing = []
+    for field, (aliases, converter, required) in schema.items():
+        index = next((normalized.index(a) for a in aliases if a in normalized), None)
+        if index is None:
+            if required: missing.append(aliases[0])
+            continue
+        compiled.append((field, index, converter, _text(header[index])))
+    if missing: raise ValueError(f"Zorunlu sütun(lar) bulunamadı: {', '.join(missing)}")
+    return tuple(compiled)
+
+
+# --- Satır Okuyucular (akış halinde) ---
+def iter_rows(path):
+    """Dosyadaki satırları (liste olarak) sırayla üretir; ilk satır başlıktır."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".xlsx", ".xlsm"):
+        if not openpyxl: raise RuntimeError("Excel içe aktarımı için 'openpyxl' gerekli. Kurulum: pip install openpyxl")
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            for row in workbook.active.iter_rows(values_only=True): yield list(row)
+        finally: workbook.close()
+    else:
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            sample = f.read(4096); f.seek(0)
+            try: dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+            except csv.Error: dialect = csv.excel
+            yield from csv.reader(f, dialect)
+
+
+def _convert(row, compiled):
+    # Dönüştürücülerin ham hataları (float(): "could not convert string to float") satır mesajına çevrilir
+    values = {}
+    for field, index, converter, column in compiled:
+        raw = row[index] if index < len(row) else None
+        try: values[field] = converter(raw)
+        except (TypeError, ValueError): raise ValueError(f"'{column}' sütunu sayısal olmalı (değer: {_text(raw)!r}).") from None
+    return values
+
+
+def _read(path, schema, kind, build_item):
+    result = ImportResult(kind)
+    rows = iter_rows(path)
+    header = next(rows, None)
+    if header is None: raise ValueError("Dosya boş.")
+    compiled = compile_schema(schema, header)
+    seen_names = set()
+    for row_no, row in enumerate(rows, start=2):
+        if not any(cell not in (None, "") for cell in row): continue # Boş satırları atla
+        result.row_count += 1
+        try:
+            values = _convert(row, compiled)
+            item = build_item(values)
+            schema_errors = profile_schema.validate_record(kind, item, path=str(item.get("user_name", "")))
+            if schema_errors: raise ValueError("; ".join(f"{path}: {message}" for path, message in schema_errors))
+            if item["user_name"] in seen_names: raise ValueError(f"'{item['user_name']}' dosyada birden fazla kez tanımlı.")
+            seen_names.add(item["user_name"]); result.items.append(item)
+        except ValueError as e: result.errors.append((row_no, str(e)))
+    return result
+
+
+def read_materials(path):
+    """Malzeme dosyasını okur ve doğrular."""
+    def build(values):
+        mat_type = values.get("type"); mat_class = values.get("class", ""); is_custom = values.get("is_custom", False)
+        props = {key: values.get(key) for key in ("fck", "fyk", "Es", "Ec")}
+        if not is_custom:
+            # Standart sınıflarda eksik özellikleri config tablolarından tamamla
+            standard = config.CONCRETE_PROPS.get(mat_class) if mat_type == records.MATERIAL_TYPE_CONCRETE else config.REBAR_PROPS.get(mat_class)
+            if standard is None: raise ValueError(f"Bilinmeyen {mat_type} sınıfı: '{mat_class}' (özel malzeme ise 'is_custom' işaretleyin).")
+            for key, value in standard.items():
+                if props.get(key) is None: props[key] = value
+        else: mat_class = "Özel"
+        record = records.MaterialRecord(values.get("user_name"), mat_type, mat_class, is_custom, **props)
+        for key in records.MATERIAL_PROP_KEYS[record.type]:
+            if records.is_missing(getattr(record, key)): raise ValueError(f"'{key}' değeri eksik.")
+        data = record.to_dict()
+        data["props"] = {key: data["props"][key] for key in records.MATERIAL_PROP_KEYS[record.type]}
+        return data
+    return _read(path, MATERIAL_SCHEMA, "materials", build)
+
+
+def read_sections(path, profile):
+    """Kesit dosyasını okur; malzeme referanslarını profildeki beton malzemelere karşı çözer.
+    Çelik profil satırlarında 'profile' sütunu steel_catalog'da aranır, boyutlar katalogdan alınır."""
+    concrete_index = {m.get("user_name") for m in profile.get("materials", []) if m.get("type") == records.MATERIAL_TYPE_CONCRETE}
+    def build(values):
+        if values.get("type") == records.SECTION_TYPE_STEEL:
+            props = steel_catalog.get_steel_catalog().properties(values.get("profile"))
+            if props is None: raise ValueError(f"Çelik profil '{values.get('profile') or ''}' katalogda bulunamadı.")
+            material_name = values.get("material_name")
+            if material_name and material_name not in concrete_index: raise ValueError(f"Beton malzeme '{material_name}' profilde tanımlı değil.")
+            record = records.SectionRecord(values.get("user_name"), records.SECTION_TYPE_STEEL, material_name,
+                                           b=props["b"], h=props["h"], profile=props["name"])
+            return record.to_dict()
+        record = records.SectionRecord(values.get("user_name"), values.get("type"), values.get("material_name"),
+                                       b=values.get("b"), h=values.get("h"), D=values.get("D"))
+        for key in records.SECTION_DIM_KEYS[record.type]:
+            if not getattr(record, key) > 0: raise ValueError(f"'{key}' boyutu pozitif olmalı.")
+        if record.material_name not in concrete_index: raise ValueError(f"Beton malzeme '{record.material_name}' profilde tanımlı değil.")
+        return record.to_dict()
+    return _read(path, SECTION_SCHEMA, "sections", build)
+
+
+def commit(profile, result):
+    """Geçerli kayıtları tek işlemde profile uygular (aynı isimliler güncellenir).
+    Yeni liste önce tamamen kurulur, sonra tek atamayla yerine konur. (eklenen, güncellenen) döndürür."""
+    existing = profile.get(result.kind, [])
+    merged = {item.get("user_name"): item for item in existing}
+    updated = sum(1 for item in result.items if item["user_name"] in merged)
+    for item in result.items: merged[item["user_name"]] = item
+    new_list = sorted(merged.values(), key=lambda x: x.get("user_name", "").lower())
+    profile[result.kind] = new_list
+    print(f"Bulk import committed: {len(result.items) - updated} added, {updated} updated ({result.kind}).")
+    return len(result.items) - updated, updated
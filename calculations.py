@@ -0,0 +1,81 @@
+# calculations.py
+# Arayüzden bağımsız hesap motorları. Fonksiyonlar yalnızca sayısal girdiler alır ve
+# sonuçları adım adım açıklamalarıyla (steps) birlikte JSON'a çevrilebilir sözlük olarak
+# döndürür; böylece arayüz ve toplu hesaplar aynı motoru ve aynı önbelleği kullanır.
+
+import math
+
+import config
+import result_cache
+
+BENDING_ENGINE_VERSION = "1" # Hesap yöntemi değişince artırılmalı (eski önbellek kayıtları kullanılmaz)
+
+
+def _bending_parameters():
+    return dict(config.TS500_BENDING_PARAMETERS)
+
+
+@result_cache.cached_engine("ts500_bending_single", BENDING_ENGINE_VERSION, parameters=_bending_parameters)
+def calculate_bending_capacity(b, h, fck, fyk, n_top, phi_top, cover, stirrup_phi, Md_kNm, Es=None):
+    """Tek donatılı dikdörtgen kesitin eğilme momenti kapasitesi (TS 500 - Basitleştirilmiş).
+
+    Birimler: mm, MPa, kNm. Geçersiz girdide ValueError fırlatır.
+    Döndürür: {"Mr_kNm", "Md_kNm", "ratio", "status", "As", "d", "a", "c", "steps"}
+    """
+    params = _bending_parameters()
+    if not (b > 0 and h > 0): raise ValueError("Kesit boyutları (b, h) pozitif olmalı.")
+    if not fck > 0: raise ValueError("Beton karakteristik dayanımı (fck) pozitif olmalı.")
+    if not fyk > 0: raise ValueError("Donatı karakteristik akma dayanımı (fyk) pozitif olmalı.")
+    if n_top <= 0 or phi_top <= 0: raise ValueError("Üst donatı adedi ve çapı pozitif olmalı.")
+    if cover < 0: raise ValueError("Paspayı negatif olamaz.")
+    if stirrup_phi < 0: raise ValueError("Etriye çapı negatif olamaz.")
+    if Es is None or Es != Es: Es = params["Es_default"]
+    steps = []
+
+    # 1. Tasarım Değerleri
+    gamma_mc = params["gamma_mc"]; gamma_ms = params["gamma_ms"]
+    fcd = fck / gamma_mc
+    fyd = fyk / gamma_ms
+    epsilon_cu3 = params["epsilon_cu3"]
+    k1 = params["k1"]
+    steps.append(f"fcd = {fck:.1f} / {gamma_mc} = {fcd:.2f} MPa")
+    steps.append(f"fyd = {fyk:.0f} / {gamma_ms} = {fyd:.2f} MPa")
+    steps.append(f"Es = {Es:.0f} MPa, ε_cu3 = {epsilon_cu3:.4f}, k1 = {k1:.2f}")
+
+    # 2. Donatı Alanı ve Faydalı Yükseklik
+    As_top = n_top * math.pi * (phi_top / 2)**2 # mm² (Çekme donatısı)
+    d = h - cover - stirrup_phi - (phi_top / 2) # mm
+    if d <= 0: raise ValueError(f"Hesaplanan faydalı yükseklik (d={d:.1f} mm) geçersiz.")
+    steps.append(f"Çekme Donatı Alanı (As) = {As_top:.2f} mm²")
+    steps.append(f"Faydalı Yükseklik (d) = {h:.0f} - {cover:.0f} - {stirrup_phi:.0f} - {phi_top/2:.1f} = {d:.2f} mm")
+
+    # 3. Moment Kapasitesi (Mr) Hesabı (Tek Donatılı): As * fyd = 0.85 * fcd * b * a
+    a = (As_top * fyd) / (0.85 * fcd * b)
+    steps.append(f"Basınç Bloğu Derinliği (a) = ({As_top:.2f} * {fyd:.2f}) / (0.85 * {fcd:.2f} * {b:.0f}) = {a:.2f} mm")
+    c = a / k1
+    steps.append(f"Tarafsız Eksen Derinliği (c) = {a:.2f} / {k1:.2f} = {c:.2f} mm")
+    if a <= 0 or a > h: raise ValueError(f"Hesaplanan basınç bloğu derinliği (a={a:.1f}mm) geçersiz.")
+    if c > d: # Bu aslında çeliğin akmadığı anlamına gelebilir (daha detaylı kontrol lazım)
+        steps.append(f"UYARI: Tarafsız eksen (c={c:.1f}mm) faydalı yüksekliğin (d={d:.1f}mm) dışında. Hesap şüpheli olabilir.")
+    Mr_Nmm = As_top * fyd * (d - a / 2)
+    Mr_kNm = Mr_Nmm / 1e6
+    steps.append(f"Moment Kapasitesi (Mr) = {As_top:.2f} * {fyd:.2f} * ({d:.2f} - {a/2:.2f})")
+    steps.append(f"Mr = {Mr_Nmm:.2f} Nmm = {Mr_kNm:.2f} kNm")
+
+    # 4. Karşılaştırma
+    Md_Nmm = Md_kNm * 1e6
+    ratio = Mr_Nmm / Md_Nmm if Md_Nmm != 0 else None # JSON'da sonsuz yok; None = Md sıfır
+    status = "YETERLİ" if Mr_Nmm >= Md_Nmm else "YETERSİZ"
+    # TODO: Minimum ve maksimum donatı oranları kontrolü eklenebilir.
+    return {"Mr_kNm": Mr_kNm, "Md_kNm": Md_kNm, "ratio": ratio, "status": status,
+            "As": As_top, "d": d, "a": a, "c": c, "steps": steps}
+
+
+def calculate_bending_batch(cases, use_cache=True):
+    """Toplu hesap: her durum calculate_bending_capacity argümanlarını içeren bir sözlüktür.
+    Her durum için sonuç veya {"error": mesaj} döndürür."""
+    results = []
+    for case in cases:
+        try: results.append(calculate_bending_capacity(use_cache=use_cache, **case))
+        except ValueError as e: results.append({"error": str(e)})
+    return results
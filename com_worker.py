@@ -0,0 +1,223 @@
+# com_worker.py
+# AutoCAD COM çağrıları için tek, ayrılmış iş parçacığı (STA) ve iş kuyruğu.
+#
+# COM nesneleri oluşturuldukları iş parçacığına (apartment) bağlıdır; bu yüzden AutoCAD
+# bağlantısı yalnızca bu iş parçacığında kurulur ve kullanılır (kendi CoInitialize çağrısıyla,
+# AutoCADConnector.connect gibi). Arayüz işleri kuyruğa bırakır ve hemen döner; sonuçlar,
+# hatalar ve ilerleme olayları Tk iş parçacığına root.after() ile taşınır (Tk iş parçacığı
+# güvenli değildir, iş parçacığı Tk'ye hiç dokunmaz). Her iş bir concurrent.futures.Future
+# da taşır. İptal işbirlikçidir: iş adımlar arasında job.check_cancelled() çağırır
+# (AutoCAD'in beklediği tek bir GetPoint yarıda kesilemez; kullanıcı Esc ile çıkar).
+
+import queue
+import itertools
+import threading
+from concurrent.futures import Future, CancelledError, TimeoutError
+
+try:
+    import pythoncom
+except ImportError:
+    pythoncom = None # pywin32 yoksa pyautocad'in kullandığı comtypes denenir (bkz. _co_initialize)
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class JobCancelled(Exception):
+    """İş iptal edildiğinde check_cancelled() tarafından fırlatılır."""
+
+
+class ComJob:
+    """Kuyruktaki tek iş. Durum ve sonuç future üzerinden de izlenebilir."""
+
+    def __init__(self, worker, job_id, name, func, args, kwargs, on_done, on_error, on_progress):
+        self.worker = worker
+        self.id = job_id
+        self.name = name
+        self.func = func; self.args = args; self.kwargs = kwargs
+        self.on_done = on_done; self.on_error = on_error; self.on_progress = on_progress
+        self.state = PENDING
+        self.future = Future()
+        self._cancel = threading.Event()
+
+    def __repr__(self): return f"<ComJob {self.id} '{self.name}' {self.state}>"
+
+    # --- İptal ---
+    def cancel(self):
+        """İptal ister. Henüz başlamamış iş hiç çalıştırılmaz; çalışan iş bir sonraki kontrolde durur."""
+        self._cancel.set()
+        return self.state in (PENDING, RUNNING)
+
+    @property
+    def cancelled(self): return self._cancel.is_set()
+
+    def check_cancelled(self):
+        if self._cancel.is_set(): raise JobCancelled(f"'{self.name}' iptal edildi.")
+
+    # --- İş İçinden ---
+    def progress(self, fraction=None, message=""):
+        """İlerleme olayı (0..1 veya None) gönderir; on_progress Tk iş parçacığında çağrılır."""
+        if self.on_progress is not None: self.worker._post(self.on_progress, self, fraction, message)
+
+
+class ComWorker:
+    """Tek COM iş parçacığı. attach(root) sonrası geri çağrılar Tk iş parçacığında çalışır;
+    root bağlanmadıysa (başsız kullanım) doğrudan iş parçacığında çağrılır."""
+
+    def __init__(self, name="acad-com", poll_ms=50):
+        self.name = name
+        self.poll_ms = poll_ms
+        self._jobs = queue.Queue()
+        self._events = queue.SimpleQueue() # (geri çağrı, argümanlar) -> Tk iş parçacığı
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._root = None
+        self._pump_job = None
+        self._outstanding = 0 # Bitmemiş iş veya dağıtılmamış olay sayısı
+        self.current = None   # Çalışan iş
+
+    # --- Yaşam Döngüsü ---
+    def attach(self, root):
+        """Geri çağrıların teslim edileceği Tk kök penceresini ayarlar (Tk iş parçacığından çağrılmalı)."""
+        self._root = root
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout=2.0):
+        """Bekleyen işleri iptal eder, çalışan işin bitmesini en fazla timeout saniye bekler."""
+        if self.current is not None: self.current.cancel()
+        while True:
+            try: job = self._jobs.get_nowait()
+            except queue.Empty: break
+            if job is not None: job.cancel(); self._finish(job, CANCELLED, error=CancelledError())
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._jobs.put(None); thread.join(timeout)
+        self._root = None
+
+    def in_worker_thread(self):
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    @property
+    def pending(self):
+        """Kuyrukta bekleyen + çalışan iş sayısı."""
+        return self._jobs.qsize() + (1 if self.current is not None else 0)
+
+    # --- İş Gönderme ---
+    def submit(self, func, *args, name=None, on_done=None, on_error=None, on_progress=None, **kwargs):
+        """func(job, *args, **kwargs) işini kuyruğa ekler ve ComJob döndürür (hemen döner).
+        on_done(sonuç) / on_error(istisna) / on_progress(job, oran, mesaj) Tk iş parçacığında çağrılır;
+        iptal edilen iş on_error'a JobCancelled ile düşer."""
+        job = ComJob(self, next(self._ids), name or getattr(func, "__name__", "iş"), func, args, kwargs, on_done, on_error, on_progress)
+        with self._lock: self._outstanding += 1
+        self.start()
+        self._jobs.put(job)
+        self._schedule_pump()
+        return job
+
+    def call(self, func, *args, timeout=None, **kwargs):
+        """func(*args, **kwargs)'ı COM iş parçacığında çalıştırır ve sonucunu bekler (kısa işler için).
+        Zaten COM iş parçacığındaysa doğrudan çağırır."""
+        if self.in_worker_thread(): return func(*args, **kwargs)
+        job = self.submit(lambda _job: func(*args, **kwargs), name=getattr(func, "__name__", "çağrı"))
+        try: return job.future.result(timeout)
+        except TimeoutError:
+            job.cancel() # Hâlâ kuyruktaysa (ör. uzun bir seçim sürüyorsa) hiç çalıştırılmaz
+            raise
+
+    # --- İş Parçacığı ---
+    def _run(self):
+        _co_initialize()
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is None: break
+                if job.cancelled: self._finish(job, CANCELLED, error=JobCancelled(f"'{job.name}' başlamadan iptal edildi.")); continue
+                if not job.future.set_running_or_notify_cancel(): self._finish(job, CANCELLED, error=CancelledError()); continue
+                self.current = job; job.state = RUNNING
+                try: result = job.func(job, *job.args, **job.kwargs)
+                except JobCancelled as e: self._finish(job, CANCELLED, error=e)
+                except Exception as e:
+                    print(f"Error in COM job '{job.name}': {e}")
+                    self._finish(job, FAILED, error=e)
+                else: self._finish(job, DONE, result=result)
+                finally: self.current = None
+        finally: _co_uninitialize()
+
+    def _finish(self, job, state, result=None, error=None):
+        job.state = state
+        if not job.future.done():
+            if error is None: job.future.set_result(result)
+            else: job.future.set_exception(error)
+        if error is None:
+            if job.on_done is not None: self._post(job.on_done, result)
+        elif job.on_error is not None: self._post(job.on_error, error)
+        with self._lock: self._outstanding -= 1
+
+    # --- Tk'ye Teslim ---
+    def _post(self, callback, *args):
+        if self._root is None: _safe_call(callback, args); return # Başsız: iş parçacığında çağır
+        with self._lock: self._outstanding += 1
+        self._events.put((callback, args))
+
+    def _schedule_pump(self):
+        # Yalnızca Tk iş parçacığında (submit/pump) çalışır; iş parçacığı after() çağırmaz
+        if self._root is None or self._pump_job is not None or self.in_worker_thread(): return
+        try: self._pump_job = self._root.after(self.poll_ms, self._pump)
+        except Exception as e: print(f"Warning: COM worker could not schedule callbacks ({e})."); self._root = None
+
+    def _pump(self):
+        self._pump_job = None
+        while True:
+            try: callback, args = self._events.get_nowait()
+            except queue.Empty: break
+            with self._lock: self._outstanding -= 1
+            _safe_call(callback, args)
+        with self._lock: busy = self._outstanding > 0
+        if busy: self._schedule_pump()
+
+
+def _safe_call(callback, args):
+    try: callback(*args)
+    except Exception as e: print(f"Error in COM job callback: {e}")
+
+
+def _co_initialize():
+    if pythoncom is not None: pythoncom.CoInitialize(); return
+    try:
+        import comtypes
+        comtypes.CoInitialize()
+    except ImportError: pass # COM olmayan platform: işler yine çalışır (ör. DXF/başsız işler)
+    except Exception as e: print(f"Warning: CoInitialize failed in COM worker: {e}")
+
+
+def _co_uninitialize():
+    try:
+        if pythoncom is not None: pythoncom.CoUninitialize(); return
+        import comtypes
+        comtypes.CoUninitialize()
+    except Exception: pass
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_worker():
+    """Uygulama genelinde tek COM iş parçacığı."""
+    global _worker
+    with _worker_lock:
+        if _worker is None: _worker = ComWorker()
+        return _worker
+
+
+def in_worker_thread():
+    return _worker is not None and _worker.in_worker_thread()
@@ -6,6 +6,18 @@ import os
 # --- Ayarlar Dosyaları ---
 SETTINGS_FILE = "settings.json" # Genel uygulama ayarları (tema, pencere boyutu)
 PROFILE_FILE = "profiles.json" # Hesaplama profilleri (proje bilgisi, malzemeler, kesitler vb.)
+SECTION_CATALOG_DIR = "catalogs" # Sütun bazlı (.epsc) standart kesit katalogları
+STEEL_CATALOG_DIR = os.path.join(SECTION_CATALOG_DIR, "steel") # Çelik profil kataloğu (gömülü tablolardan ilk kullanımda üretilir)
+PROFILE_POLL_INTERVAL_MS = 3000 # Ortak profiles.json'un başka süreçlerce değiştirilip değiştirilmediği bu aralıkla kontrol edilir
+SAVE_DEBOUNCE_SECONDS = 0.5 # Kayıt istekleri bu kadar sessizlikten sonra arka planda tek yazmada birleştirilir
+PROFILE_SNAPSHOT_DIR = "snapshots" # Profil kütüphanesinin sürümlü anlık görüntüleri
+RESULT_CACHE_FILE = "results_cache.sqlite" # Hesap sonuçlarının kalıcı önbelleği
+RESULT_CACHE_MAX_MB = 50 # Önbellek bu boyutu aşınca en az kullanılan sonuçlar silinir
+UNDO_MEMORY_LIMIT_MB = 64 # Geri al geçmişinin kullanabileceği yaklaşık bellek; aşılınca en eski adımlar atılır
+ACAD_CONNECTION_TTL_SECONDS = 5.0 # Doğrulanmış AutoCAD bağlantısı bu süre boyunca COM üzerinden tekrar yoklanmaz
+ACAD_SYSVAR_FLUSH_DELAY_SECONDS = 0.4 # Sistem değişkeni değişiklikleri (OSNAP/GRID kutuları) bu kadar sessizlikten sonra toplu yazılır
+ACAD_SCRIPT_CHUNK_SIZE = 500 # Betik/komut akışı modunda ilerleme (ve akışta SendCommand) bu kadar varlıkta bir
+ACAD_CALL_TIMEOUT_SECONDS = 10.0 # Arayüzden beklenen kısa AutoCAD çağrıları (COM iş parçacığı meşgulse) en fazla bu kadar bekler
 
 # --- Tema Renkleri ---
 themes = {
@@ -49,6 +61,15 @@ REBAR_PROPS = {
     "B500C": {"fyk": 500, "Es": 200000},
 }
 
+# --- Yönetmelik Parametreleri (TS 500) ---
+# Değiştirildiğinde önbellekteki hesap sonuçları otomatik olarak geçersiz olur
+TS500_BENDING_PARAMETERS = {
+    "gamma_mc": 1.5, "gamma_ms": 1.15, # Malzeme katsayıları
+    "epsilon_cu3": 0.003, # Betonun birim kısalma sınırı
+    "k1": 0.85, # Eşdeğer basınç bloğu katsayısı (fck <= 50 MPa)
+    "Es_default": 200000.0, # Donatıda Es tanımlı değilse (MPa)
+}
+
 # --- Varsayılan Ayarlar ---
 DEFAULT_WINDOW_GEOMETRY = "1100x700+100+50"
 DEFAULT_PROFILE_NAME = "Varsayılan Profil"
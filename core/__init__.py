@@ -0,0 +1,62 @@
+# core/__init__.py
+# Arayüzsüz (headless) çekirdek: yapılandırma, malzeme/kesit kayıtları, profiller ve hesap
+# motorları. tkinter, pyautocad veya win32com içe aktarmaz; Linux'ta toplu hesap
+# işçileri, betikler ve ileride bir servis tarafından hızlıca içe aktarılabilir.
+#
+# Alt modüller ve adlar ilk erişimde yüklenir (PEP 562); "import core" yalnızca bu
+# dosyayı okur. Örnek:
+#     import core
+#     profiles, errors = core.load_profiles("profiles.json")
+#     result = core.calculate_bending_capacity(b=300, h=500, fck=30, fyk=420, ...)
+
+import importlib
+
+# Ad -> (modül, öznitelik). Öznitelik None ise modülün kendisi döner.
+_EXPORTS = {
+    # Yapılandırma
+    "config": ("config", None),
+    # Malzemeler ve kesitler
+    "records": ("records", None),
+    "MaterialRecord": ("records", "MaterialRecord"),
+    "SectionRecord": ("records", "SectionRecord"),
+    "ProjectInfo": ("records", "ProjectInfo"),
+    "MaterialTable": ("records", "MaterialTable"),
+    "SectionTable": ("records", "SectionTable"),
+    "section_catalog": ("section_catalog", None),
+    "steel_catalog": ("steel_catalog", None),
+    "get_steel_catalog": ("steel_catalog", "get_steel_catalog"),
+    # Profiller
+    "profiles": ("core.profiles", None),
+    "load_profiles": ("core.profiles", "load_profiles"),
+    "save_profiles": ("core.profiles", "save_profiles"),
+    "new_profile": ("core.profiles", "new_profile"),
+    "validate_record": ("profile_schema", "validate_record"),
+    "validate_profiles": ("core.profiles", "validate_profiles"),
+    "ProfileStore": ("profile_store", "ProfileStore"),
+    "ProjectFile": ("project_file", "ProjectFile"),
+    # Hesap motorları
+    "calculations": ("calculations", None),
+    "calculate_bending_capacity": ("calculations", "calculate_bending_capacity"),
+    "calculate_bending_batch": ("calculations", "calculate_bending_batch"),
+    "ProfileDesignGraph": ("dependency_graph", "ProfileDesignGraph"),
+    # Çizim (AutoCAD gerektirmeyen DXF çıktısı)
+    "drawing_backends": ("drawing_backends", None),
+    "DxfBackend": ("drawing_backends", "DxfBackend"),
+    "layout_generator": ("layout_generator", None),
+    "HandleRegistry": ("handle_registry", "HandleRegistry"),
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    target = _EXPORTS.get(name)
+    if target is None: raise AttributeError(f"module 'core' has no attribute {name!r}")
+    module = importlib.import_module(target[0])
+    value = module if target[1] is None else getattr(module, target[1])
+    globals()[name] = value # Sonraki erişimler doğrudan
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,51 @@
+# core/profiles.py
+# Arayüzsüz profil işlemleri: profiles.json okuma/yazma ve doğrulama.
+# utils'teki uygulama geneli durumdan (aktif profil, arka plan yazıcı, pencere) bağımsızdır;
+# aynı dosya kilidi ve kayıt havuzu biçimi kullanıldığından arayüzle aynı anda çalışabilir.
+
+import os
+import copy
+
+import config
+import profile_store
+import profile_schema
+import record_pool
+
+_stores = {} # mutlak yol -> ProfileStore (okunan sürümler kayıtta çakışma kontrolü için tutulur)
+
+
+def _store(path):
+    path = os.path.abspath(path or config.PROFILE_FILE)
+    store = _stores.get(path)
+    if store is None: store = _stores[path] = profile_store.ProfileStore(path)
+    return store
+
+
+def new_profile(project_name=None):
+    """Varsayılan profil verisinin bağımsız bir kopyası."""
+    profile = copy.deepcopy(config.DEFAULT_PROFILE_DATA)
+    if project_name is not None: profile["project_info"]["name"] = project_name
+    return profile
+
+
+def validate_profiles(profiles):
+    """Tüm profilleri şemaya göre doğrular; (yol, mesaj) hata listesi döndürür."""
+    return profile_schema.IncrementalValidator().validate_profiles(profiles)
+
+
+def load_profiles(path=None, validate=True):
+    """Profilleri kilitli okur; tekrarlanan kayıtlar bellekte paylaştırılır.
+    (profiller, şema hataları) döndürür. Dosya yoksa boş sözlük döner."""
+    store = _store(path)
+    if not os.path.exists(store.path): return {}, []
+    profiles = store.load()
+    record_pool.intern_profiles(profiles)
+    return profiles, (validate_profiles(profiles) if validate else [])
+
+
+def save_profiles(profiles, path=None):
+    """Değişen profilleri kilit altında hemen yazar; diskteki diğer profiller korunur.
+    Okunduktan sonra başka süreçte değişmiş profiller yazılmaz. (yazılanlar, çakışanlar) döndürür."""
+    store = _store(path)
+    written = store.save(profiles)
+    return written, set(store.conflicts)
@@ -0,0 +1,197 @@
+# dependency_graph.py
+# Malzeme -> kesit -> eleman tasarımı -> rapor bağımlılık grafiği.
+# Bir kayıt değiştiğinde yalnızca ondan etkilenen (aşağı akıştaki) düğümler kirli
+# işaretlenir; değerleri ilk istendiğinde ya da boşta kalan zamanda parça parça
+# yeniden hesaplanır. Değişmeyen tasarımların sonuçları olduğu gibi kullanılır.
+
+from collections import deque
+
+import calculations
+
+MATERIAL = "material"
+SECTION = "section"
+DESIGN = "design"
+REPORT = "report"
+REPORT_KEY = (REPORT, "designs") # Profil başına tek tasarım özeti raporu
+
+
+class DependencyGraph:
+    """Genel amaçlı, tembel yeniden hesaplanan bağımlılık grafiği.
+    Düğüm anahtarları hashable; compute(graph, key) düğüm değerini hesaplar."""
+
+    def __init__(self):
+        self._compute = {}     # düğüm -> hesap fonksiyonu
+        self._deps = {}        # düğüm -> bağlı olduğu düğümler (yukarı akış)
+        self._dependents = {}  # düğüm -> ona bağlı düğümler (aşağı akış)
+        self._values = {}
+        self._dirty = set()
+        self.recompute_count = 0
+
+    def __contains__(self, key): return key in self._compute
+
+    def set_node(self, key, compute, deps=()):
+        """Düğümü ekler veya bağımlılıklarını günceller; düğüm ve aşağı akışı kirlenir."""
+        for dep in self._deps.get(key, ()): self._dependents.get(dep, set()).discard(key)
+        self._compute[key] = compute; self._deps[key] = tuple(deps)
+        for dep in deps: self._dependents.setdefault(dep, set()).add(key)
+        self._dependents.setdefault(key, set())
+        return self.invalidate(key)
+
+    def remove_node(self, key):
+        affected = self.invalidate(key); affected.discard(key)
+        for dep in self._deps.pop(key, ()): self._dependents.get(dep, set()).discard(key)
+        self._compute.pop(key, None); self._values.pop(key, None); self._dirty.discard(key)
+        # Ona bağlı düğümler kalır (bağımlılık eksik olarak hesaplanır); kenarlar geri eklenince düzelir
+        return affected
+
+    def invalidate(self, key):
+        """Düğümü ve aşağı akıştaki tüm düğümleri kirli işaretler; işaretlenenleri döndürür."""
+        affected = set(); queue = deque([key])
+        while queue:
+            node = queue.popleft()
+            if node in affected: continue
+            affected.add(node)
+            queue.extend(self._dependents.get(node, ()))
+        self._dirty |= {node for node in affected if node in self._compute}
+        return affected
+
+    def is_dirty(self, key): return key in self._dirty or key not in self._values
+
+    @property
+    def dirty_count(self): return len(self._dirty)
+
+    def value(self, key):
+        """Düğüm değerini döndürür; kirliyse (önce kirli bağımlılıkları) yeniden hesaplar."""
+        if key not in self._compute: return None
+        if self.is_dirty(key):
+            for dep in self._deps.get(key, ()):
+                if dep in self._compute and self.is_dirty(dep): self.value(dep)
+            self._values[key] = self._compute[key](self, key)
+            self._dirty.discard(key); self.recompute_count += 1
+        return self._values[key]
+
+    def recompute_some(self, budget=50):
+        """En fazla 'budget' kirli düğümü hesaplar (arayüzü bloklamadan arka planda ilerlemek için).
+        Kalan kirli düğüm sayısını döndürür."""
+        for key in list(self._dirty)[:budget]:
+            if key in self._dirty: self.value(key)
+        return len(self._dirty)
+
+    def keys(self, kind=None):
+        return [key for key in self._compute if kind is None or key[0] == kind]
+
+
+class ProfileDesignGraph(DependencyGraph):
+    """Tek profilin malzeme/kesit/tasarım/rapor grafiği. Profil sözlüğüne referans tutar."""
+
+    def __init__(self, profile):
+        super().__init__()
+        self.profile = profile
+        self._records = {MATERIAL: {}, SECTION: {}, DESIGN: {}}
+        for kind, list_key in ((MATERIAL, "materials"), (SECTION, "sections"), (DESIGN, "designs")):
+            for item in profile.get(list_key, []): self._add_record(kind, item)
+        self._link_report()
+
+    # --- Düğüm Tanımları ---
+    def _add_record(self, kind, item):
+        name = item.get("user_name", "")
+        self._records[kind][name] = item
+        if kind == MATERIAL: return self.set_node((MATERIAL, name), _record_value)
+        if kind == SECTION: return self.set_node((SECTION, name), _record_value, [(MATERIAL, item.get("material_name", ""))])
+        deps = [(SECTION, item.get("section_name", "")), (MATERIAL, item.get("rebar_name", ""))]
+        section = self._records[SECTION].get(item.get("section_name", ""))
+        if section is not None: deps.append((MATERIAL, section.get("material_name", "")))
+        return self.set_node((DESIGN, name), _design_value, deps)
+
+    def _link_report(self):
+        self.set_node(REPORT_KEY, _report_value, [(DESIGN, name) for name in self._records[DESIGN]])
+
+    def record(self, kind, name): return self._records[kind].get(name)
+
+    # --- Değişiklik Bildirimi ---
+    def record_changed(self, kind, name, old_name=None):
+        """Kayıt eklendi/güncellendi/silindi. Profildeki güncel hali okunur; etkilenen düğümler döndürülür."""
+        return self.records_changed(kind, [(name, old_name)])
+
+    def records_changed(self, kind, changes):
+        """Birden çok değişikliği (isim, eski isim) tek geçişte işler (ör. toplu içe aktarım)."""
+        list_key = {MATERIAL: "materials", SECTION: "sections", DESIGN: "designs"}[kind]
+        current = {x.get("user_name", ""): x for x in self.profile.get(list_key, [])}
+        affected = set(); touched_sections = set()
+        for name, old_name in changes:
+            if old_name is not None and old_name != name:
+                self._records[kind].pop(old_name, None); affected |= self.remove_node((kind, old_name))
+            item = current.get(name)
+            if item is None: self._records[kind].pop(name, None); affected |= self.remove_node((kind, name))
+            else: affected |= self._add_record(kind, item)
+            touched_sections.update((name, old_name))
+        if kind == DESIGN: self._link_report()
+        if kind == SECTION:
+            # Kesitin betonu değişmiş olabilir: tasarımların bağımlılıklarını yenile
+            for design in list(self._records[DESIGN].values()):
+                if design.get("section_name") in touched_sections: affected |= self._add_record(DESIGN, design)
+        designs = sum(1 for key in affected if key[0] == DESIGN)
+        print(f"Info: {len(changes)} {kind} record(s) changed; {designs} of {len(self._records[DESIGN])} designs marked for recalculation.")
+        return affected
+
+    def report(self): return self.value(REPORT_KEY)
+
+
+def _record_value(graph, key):
+    return graph.record(*key)
+
+def _design_value(graph, key):
+    """Tasarımı (önbellekli) hesap motoruyla hesaplar; eksik tanım veya geçersiz girdi hatası sonuçta döner."""
+    design = graph.record(*key)
+    section = graph.value((SECTION, design.get("section_name", "")))
+    if section is None: return {"error": f"Kesit '{design.get('section_name')}' bulunamadı."}
+    if section.get("type") != "Dikdörtgen": return {"error": f"Kesit '{design.get('section_name')}' dikdörtgen betonarme kesit değil."}
+    concrete = graph.value((MATERIAL, section.get("material_name", "")))
+    rebar = graph.value((MATERIAL, design.get("rebar_name", "")))
+    if concrete is None or rebar is None: return {"error": "Kesitin betonu veya donatı malzemesi bulunamadı."}
+    dims = section.get("dimensions", {}); concrete_props = concrete.get("props", {}); rebar_props = rebar.get("props", {})
+    try:
+        result = calculations.calculate_bending_capacity(
+            b=dims.get("b", 0), h=dims.get("h", 0), fck=concrete_props.get("fck", 0), fyk=rebar_props.get("fyk", 0), Es=rebar_props.get("Es"),
+            n_top=design.get("n_top", 0), phi_top=design.get("phi_top", 0), cover=design.get("cover", 0),
+            stirrup_phi=design.get("stirrup_phi", 0), Md_kNm=design.get("Md_kNm", 0))
+    except (ValueError, TypeError) as e: return {"error": str(e)}
+    return {key: result[key] for key in ("Mr_kNm", "Md_kNm", "ratio", "status")}
+
+def _report_value(graph, key):
+    rows = []
+    for dep in graph._deps.get(key, ()):
+        result = graph.value(dep) or {"error": "Tasarım bulunamadı."}
+        rows.append((dep[1], result))
+    rows.sort(key=lambda row: row[0].lower())
+    failed = sum(1 for _, r in rows if r.get("status") == "YETERSİZ"); errors = sum(1 for _, r in rows if "error" in r)
+    return {"rows": rows, "total": len(rows), "failed": failed, "errors": errors}
+
+
+class GraphRegistry:
+    """Profil adı -> ProfileDesignGraph. Grafikler ilk kullanımda kurulur."""
+
+    def __init__(self, profiles_data):
+        self.profiles_data = profiles_data
+        self._graphs = {}
+
+    def get(self, profile_name):
+        profile = self.profiles_data.get(profile_name)
+        if profile is None: return None
+        graph = self._graphs.get(profile_name)
+        if graph is None or graph.profile is not profile: # Profil toptan değiştiyse (geri al, dış yükleme) yeniden kur
+            graph = self._graphs[profile_name] = ProfileDesignGraph(profile)
+        return graph
+
+    def records_changed(self, profile_name, kind, changes):
+        """changes: (isim, eski isim veya None) listesi. Grafik henüz kurulmadıysa bir şey yapmaz (kurulunca güncel olur)."""
+        graph = self._graphs.get(profile_name)
+        if graph is None or graph.profile is not self.profiles_data.get(profile_name): return set()
+        return graph.records_changed(kind, changes)
+
+    def reset(self, profile_name=None):
+        if profile_name is None: self._graphs.clear()
+        else: self._graphs.pop(profile_name, None)
+
+    def dirty_graphs(self):
+        return [graph for graph in self._graphs.values() if graph.dirty_count]
@@ -0,0 +1,308 @@
+# drawing_backends.py
+# Takılabilir çizim arka uçları: aynı çizim API'si canlı AutoCAD'e (COM) veya dosyaya (DXF).
+#
+# Şema çizimleri, test şekilleri ve ileride donatı detayları yalnızca DrawingBackend
+# metotlarını çağırır; hedef çağıran tarafta seçilir:
+#   ComBackend       -> autocad_interface (pyautocad, com_worker iş parçacığı üzerinden)
+#   ConnectorBackend -> src.interfaces.autocad.connector.AutoCADConnector (win32com)
+#   DxfBackend       -> AutoCAD gerektirmeyen, akışlı R12 (AC1009) ASCII DXF yazıcı
+# Varlık metotları eklenen varlığın sıra numarasını döndürür; flush() son flush'tan beri
+# eklenen varlıkların handle'larını aynı sırayla döndürür. COM arka uçları varlıkları
+# drawing_batch ile toplayıp flush'ta gönderir; DXF yazıcı her varlığı hemen geçici dosyaya yazar
+# (bellek kullanımı varlık sayısından bağımsızdır).
+# Bloklar: define_block(ad, DrawingBatch) + insert(ad, konum, ...). ComBackend ve DxfBackend
+# gerçek blok tanımı/INSERT üretir; diğer arka uçlar örneği geometri olarak açar.
+
+import math
+import shutil
+import tempfile
+
+import drawing_batch
+from drawing_batch import LINE, CIRCLE, POLYLINE, TEXT, INSERT
+
+DXF_DEFAULT_LAYER = "0"
+DXF_ENCODING = "cp1254" # R12 DXF ANSI kod sayfası ($DWGCODEPAGE ANSI_1254: Türkçe karakterler)
+
+
+def _xy(point):
+    return (float(point[0]), float(point[1]))
+
+
+class DrawingBackend:
+    """Ortak çizim API'si. Alt sınıflar _add(tür, katman, veri) ve gerekirse flush/close uygular."""
+
+    name = "base"
+
+    def __init__(self, default_layer=None):
+        self.default_layer = default_layer
+        self.count = 0 # Eklenen toplam varlık
+        self._blocks = {} # Blok adı -> tanım (DrawingBatch)
+
+    def __enter__(self): return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None: self.close()
+        else: self.abort()
+        return False
+
+    # --- Varlıklar ---
+    def line(self, start, end, layer=None):
+        return self._add(LINE, layer, (_xy(start), _xy(end)))
+
+    def circle(self, center, radius, layer=None):
+        return self._add(CIRCLE, layer, (_xy(center), float(radius)))
+
+    def polyline(self, vertices, closed=False, layer=None):
+        points = [_xy(p) for p in vertices]
+        if len(points) < 2: raise ValueError("Polyline en az iki nokta içermeli.")
+        if closed and len(points) > 2 and points[0] == points[-1]: points.pop()
+        return self._add(POLYLINE, layer, (tuple(points), bool(closed)))
+
+    def polygon(self, vertices, layer=None):
+        return self.polyline(vertices, closed=True, layer=layer)
+
+    def rectangle(self, x0, y0, x1, y1, layer=None):
+        return self.polygon([(x0, y0), (x1, y0), (x1, y1), (x0, y1)], layer=layer)
+
+    def text(self, position, height, value, layer=None):
+        return self._add(TEXT, layer, (_xy(position), float(height), str(value)))
+
+    # --- Bloklar ---
+    def define_block(self, name, definition):
+        """Blok tanımı ekler (definition: DrawingBatch, koordinatlar taban noktası 0,0'a göre)."""
+        self._blocks[name] = definition
+
+    def has_block(self, name): return name in self._blocks
+
+    def insert(self, name, position, scale=1.0, rotation=0.0, layer=None):
+        """Tanımlı bloğun örneğini ekler (rotation: radyan)."""
+        if name not in self._blocks: raise KeyError(f"Blok tanımlı değil: {name}")
+        return self._insert(name, _xy(position), float(scale), float(rotation), layer)
+
+    def _insert(self, name, position, scale, rotation, layer):
+        # Yerel blok desteği yok: geometri açılır; ilk varlığın sıra numarası döner
+        first = None
+        for kind, data in drawing_batch.expand_block(self._blocks[name], position, scale, rotation):
+            index = self._add(kind, layer, data)
+            if first is None: first = index
+        return first
+
+    def add_batch(self, batch):
+        """drawing_batch.DrawingBatch içeriğini bu arka uca aktarır (tampon değişmez)."""
+        for name, definition in batch.blocks.items():
+            if not self.has_block(name): self.define_block(name, definition)
+        for kind, layer, data in batch.items():
+            if kind == INSERT: self._insert(data[0], data[1], data[2], data[3], layer)
+            else: self._add(kind, layer, data)
+
+    def _add(self, kind, layer, data):
+        raise NotImplementedError
+
+    # --- Gönderim ---
+    def flush(self):
+        """Bekleyen varlıkları hedefe gönderir; son flush'tan beri eklenenlerin handle'larını döndürür."""
+        return []
+
+    def close(self):
+        """Kalan varlıkları gönderir ve hedefi kapatır. Son flush'ın handle'larını döndürür."""
+        return self.flush()
+
+    def abort(self):
+        """Hata durumunda: bekleyen varlıkları göndermeden bırakır."""
+
+
+# ==================================
+# COM ARKA UÇLARI
+# ==================================
+class ComBackend(DrawingBackend):
+    """autocad_interface bağlantısı (pyautocad). acad verilmezse gönderim com_worker iş parçacığında
+    bağlantının kendisiyle yapılır; verilirse (ör. zaten COM iş parçacığında) doğrudan ona gönderilir."""
+
+    name = "com"
+
+    def __init__(self, acad=None, default_layer=None, merge_lines=True):
+        super().__init__(default_layer)
+        self.acad = acad
+        self._batch = drawing_batch.DrawingBatch(default_layer, merge_lines)
+
+    def _add(self, kind, layer, data):
+        self._batch.add(kind, layer or self.default_layer, data)
+        self.count += 1
+        return self.count - 1
+
+    def define_block(self, name, definition):
+        super().define_block(name, definition)
+        self._batch.define_block(name, definition)
+
+    def _insert(self, name, position, scale, rotation, layer):
+        return self._add(INSERT, layer, (name, position, scale, rotation))
+
+    def flush(self, job=None):
+        if not len(self._batch): return []
+        if self.acad is not None: return self._batch.submit(self.acad, job=job)
+        import autocad_interface
+        import com_worker
+        if com_worker.in_worker_thread() or autocad_interface.Autocad is None: return autocad_interface.submit_batch(job, self._batch)
+        return com_worker.get_worker().call(autocad_interface.submit_batch, job, self._batch)
+
+    def abort(self):
+        self._batch.clear()
+        for name, definition in self._blocks.items(): self._batch.define_block(name, definition)
+
+
+class ConnectorBackend(DrawingBackend):
+    """AutoCADConnector (win32com) üzerinden çizim. Varlıklar toplanır; flush'ta aynı katmandakiler
+    art arda gönderilir ve uç uca çizgiler tek polyline'da birleştirilir (drawing_batch.plan)."""
+
+    name = "connector"
+
+    def __init__(self, connector, default_layer=None, merge_lines=True):
+        super().__init__(default_layer)
+        self.connector = connector
+        self._batch = drawing_batch.DrawingBatch(default_layer, merge_lines)
+
+    _add = ComBackend._add
+
+    def flush(self):
+        if not len(self._batch): return []
+        self.connector.ensure_connection()
+        doc = self.connector.acad.ActiveDocument
+        handles = [None] * len(self._batch)
+        original_layer = doc.ActiveLayer; current_layer = None
+        try:
+            for layer, kind, data, indices in self._batch.plan():
+                try:
+                    if layer != current_layer:
+                        doc.ActiveLayer = doc.Layers.Add(layer) if layer else original_layer
+                        current_layer = layer
+                    if kind == LINE: entity = self.connector.draw_line(data[0] + (0.0,), data[1] + (0.0,))
+                    elif kind == CIRCLE: entity = self.connector.draw_circle(data[0], data[1])
+                    elif kind == TEXT: entity = self.connector.add_text(data[2], data[0], data[1])
+                    else: entity = self.connector.draw_lwpolyline(data[0], closed=data[1])
+                    handle = entity.Handle
+                    for index in indices: handles[index] = handle
+                except Exception as e: print(f"Error drawing {kind} on layer '{layer or '-'}': {e}")
+        finally:
+            try:
+                if current_layer is not None: doc.ActiveLayer = original_layer
+            except Exception as e: print(f"Warning: Could not restore active layer: {e}")
+            self._batch.clear()
+        return handles
+
+    def abort(self): self._batch.clear()
+
+
+# ==================================
+# DXF ARKA UCU
+# ==================================
+class DxfBackend(DrawingBackend):
+    """Akışlı R12 ASCII DXF yazıcı. target: dosya yolu veya yazılabilir metin dosyası.
+    Varlıklar eklenirken geçici bir dosyaya yazılır; kapanışta başlık, BLOCKS ve ENTITIES bölümleri
+    hedefe birleştirilir (blok tanımları ENTITIES'ten önce gelmeli, $HANDSEED kesin değerle yazılır).
+    Handle'lar sırayla verilir (onaltılık "20", "21", ...). keep_handles=False ise flush() handle
+    listesi tutmaz (çok büyük çizimlerde sabit bellek)."""
+
+    name = "dxf"
+
+    def __init__(self, target, default_layer=None, keep_handles=True):
+        super().__init__(default_layer)
+        self.keep_handles = keep_handles
+        self._target = target
+        self._own_file = isinstance(target, str)
+        self.path = target if self._own_file else getattr(target, "name", None)
+        self._spool = tempfile.TemporaryFile("w+", encoding=DXF_ENCODING, errors="replace", newline="") # Çeviri yok: satır sonları hedefe yazılırken bir kez çevrilir
+        self._write = self._spool.write
+        self._next_handle = 0x20 # Küçük handle'lar tablolar için boş bırakılır
+        self._handles = []
+        self._layers = {} # Katman adı -> DXF'e uygun ad
+        self._block_text = {} # Blok adı -> BLOCK...ENDBLK metni (tanımlar küçük: bellekte tutulur)
+        self._closed = False
+
+    def _handle(self):
+        handle = "%X" % self._next_handle
+        self._next_handle += 1
+        return handle
+
+    def _layer(self, name):
+        layer = self._layers.get(name)
+        if layer is None: layer = self._layers[name] = _dxf_layer(name)
+        return layer
+
+    def _entity(self, handle, kind, layer, data):
+        if kind == LINE:
+            (x1, y1), (x2, y2) = data
+            return "0\nLINE\n5\n%s\n8\n%s\n10\n%.6f\n20\n%.6f\n30\n0.0\n11\n%.6f\n21\n%.6f\n31\n0.0\n" % (handle, layer, x1, y1, x2, y2)
+        if kind == CIRCLE:
+            (x, y), radius = data
+            return "0\nCIRCLE\n5\n%s\n8\n%s\n10\n%.6f\n20\n%.6f\n30\n0.0\n40\n%.6f\n" % (handle, layer, x, y, radius)
+        if kind == TEXT:
+            (x, y), height, value = data
+            value = " ".join(value.splitlines())
+            return "0\nTEXT\n5\n%s\n8\n%s\n10\n%.6f\n20\n%.6f\n30\n0.0\n40\n%.6f\n1\n%s\n" % (handle, layer, x, y, height, value)
+        if kind == POLYLINE:
+            points, closed = data
+            parts = ["0\nPOLYLINE\n5\n%s\n8\n%s\n66\n1\n10\n0.0\n20\n0.0\n30\n0.0\n70\n%d\n" % (handle, layer, 1 if closed else 0)]
+            for x, y in points: parts.append("0\nVERTEX\n5\n%s\n8\n%s\n10\n%.6f\n20\n%.6f\n30\n0.0\n" % (self._handle(), layer, x, y))
+            parts.append("0\nSEQEND\n5\n%s\n8\n%s\n" % (self._handle(), layer))
+            return "".join(parts)
+        if kind == INSERT:
+            name, (x, y), scale, rotation = data
+            return ("0\nINSERT\n5\n%s\n8\n%s\n2\n%s\n10\n%.6f\n20\n%.6f\n30\n0.0\n41\n%.6f\n42\n%.6f\n43\n%.6f\n50\n%.6f\n"
+                    % (handle, layer, _dxf_layer(name), x, y, scale, scale, scale, math.degrees(rotation)))
+        raise ValueError(f"Bilinmeyen varlık türü: {kind}")
+
+    def _add(self, kind, layer, data):
+        if self._closed: raise ValueError("DXF dosyası kapatıldı.")
+        handle = self._handle()
+        self._write(self._entity(handle, kind, self._layer(layer or self.default_layer), data))
+        if self.keep_handles: self._handles.append(handle)
+        self.count += 1
+        return self.count - 1
+
+    def define_block(self, name, definition):
+        if self._closed: raise ValueError("DXF dosyası kapatıldı.")
+        super().define_block(name, definition)
+        block = _dxf_layer(name)
+        # Blok içi varlıklar 0 katmanında: örnek eklendiği katmanın özelliklerini alır
+        parts = ["0\nBLOCK\n5\n%s\n8\n0\n2\n%s\n70\n0\n10\n0.0\n20\n0.0\n30\n0.0\n3\n%s\n" % (self._handle(), block, block)]
+        for kind, _, data in definition.items(): parts.append(self._entity(self._handle(), kind, DXF_DEFAULT_LAYER, data))
+        parts.append("0\nENDBLK\n5\n%s\n8\n0\n" % self._handle())
+        self._block_text[name] = "".join(parts)
+
+    def _insert(self, name, position, scale, rotation, layer):
+        return self._add(INSERT, layer, (name, position, scale, rotation))
+
+    def flush(self):
+        handles = self._handles; self._handles = []
+        return handles
+
+    def close(self):
+        if self._closed: return []
+        handles = self.flush()
+        self._closed = True
+        out = open(self._target, "w", encoding=DXF_ENCODING, errors="replace", newline="\r\n") if self._own_file else self._target
+        try:
+            out.write("0\nSECTION\n2\nHEADER\n9\n$ACADVER\n1\nAC1009\n9\n$DWGCODEPAGE\n3\nANSI_1254\n9\n$HANDLING\n70\n1\n9\n$HANDSEED\n5\n%X\n0\nENDSEC\n" % self._next_handle)
+            if self._block_text: out.write("0\nSECTION\n2\nBLOCKS\n" + "".join(self._block_text.values()) + "0\nENDSEC\n")
+            out.write("0\nSECTION\n2\nENTITIES\n")
+            self._spool.seek(0)
+            shutil.copyfileobj(self._spool, out, 1 << 20)
+            out.write("0\nENDSEC\n0\nEOF\n")
+        finally:
+            self._spool.close()
+            if self._own_file: out.close()
+            else: out.flush()
+        print(f"DXF written: {self.count} entities, {len(self._block_text)} blocks{f' -> {self.path}' if self.path else ''}.")
+        return handles
+
+    def abort(self):
+        """Hedefe hiçbir şey yazmadan bırakır (varlıklar yalnızca geçici dosyadaydı)."""
+        if self._closed: return
+        self._closed = True
+        self._spool.close()
+
+
+def _dxf_layer(name):
+    # DXF katman adında izin verilmeyen karakterler '_' ile değiştirilir
+    if not name: return DXF_DEFAULT_LAYER
+    return "".join("_" if c in '<>/\\":;?*|=\'\n' else c for c in str(name))
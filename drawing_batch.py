@@ -0,0 +1,218 @@
+# drawing_batch.py
+# AutoCAD'e toplu çizim: varlıklar önce Python'da toplanır, sonra en az COM çağrısıyla
+# gönderilir. Kapalı şekiller tek LwPolyline olur (kare = 1 varlık, 4 çizgi değil),
+# uç uca eklenen çizgiler tek polyline'da birleştirilir, katmanlar gruplanır (her katman
+# için aktif katman bir kez ayarlanır, varlık başına Layer ataması yapılmaz) ve ModelSpace
+# bir kez alınır. submit() oluşturulan varlıkların handle'larını ekleme sırasıyla döndürür.
+# Tekrarlayan semboller blok olarak tanımlanabilir (define_block + insert): tanım dokümanda
+# yoksa bir kez oluşturulur, her örnek tek InsertBlock çağrısıdır (bkz. block_manager).
+
+import math
+
+try:
+    from pyautocad import APoint, aDouble
+except ImportError:
+    APoint = None # Toplama (headless) pyautocad olmadan da çalışır; gönderim için gerekli
+    aDouble = None
+
+LINE = "line"
+CIRCLE = "circle"
+POLYLINE = "polyline"
+TEXT = "text"
+INSERT = "insert"
+MAX_CONSECUTIVE_ERRORS = 5 # Art arda bu kadar hata: bağlantı koptu sayılır, kalan varlıklar gönderilmez
+PROGRESS_EVERY = 50 # submit(job=...) bu kadar varlıkta bir ilerleme bildirir
+
+
+def _xy(point):
+    return (float(point[0]), float(point[1]))
+
+
+class DrawingBatch:
+    """Çizim komut tamponu. Koordinatlar (x, y) demetleri veya APoint olabilir."""
+
+    def __init__(self, default_layer=None, merge_lines=True):
+        self.default_layer = default_layer
+        self.merge_lines = merge_lines
+        self._items = [] # (tür, katman, veri), ekleme sırasıyla
+        self._blocks = {} # blok adı -> tanım (DrawingBatch, taban noktası 0,0)
+
+    def __len__(self): return len(self._items)
+
+    # --- Varlık Ekleme ---
+    def line(self, start, end, layer=None):
+        self._items.append((LINE, layer or self.default_layer, (_xy(start), _xy(end))))
+        return len(self._items) - 1
+
+    def circle(self, center, radius, layer=None):
+        self._items.append((CIRCLE, layer or self.default_layer, (_xy(center), float(radius))))
+        return len(self._items) - 1
+
+    def polyline(self, vertices, closed=False, layer=None):
+        points = [_xy(p) for p in vertices]
+        if len(points) < 2: raise ValueError("Polyline en az iki nokta içermeli.")
+        if closed and len(points) > 2 and points[0] == points[-1]: points.pop() # Kapanış noktası bayrakla verilir
+        self._items.append((POLYLINE, layer or self.default_layer, (tuple(points), bool(closed))))
+        return len(self._items) - 1
+
+    def polygon(self, vertices, layer=None):
+        """Kapalı şekil: tek kapalı LwPolyline."""
+        return self.polyline(vertices, closed=True, layer=layer)
+
+    def rectangle(self, x0, y0, x1, y1, layer=None):
+        return self.polygon([(x0, y0), (x1, y0), (x1, y1), (x0, y1)], layer=layer)
+
+    def text(self, position, height, value, layer=None):
+        self._items.append((TEXT, layer or self.default_layer, (_xy(position), float(height), str(value))))
+        return len(self._items) - 1
+
+    def define_block(self, name, definition):
+        """Blok tanımı ekler (definition: DrawingBatch, koordinatlar taban noktasına göre)."""
+        self._blocks[name] = definition
+
+    def insert(self, name, position, scale=1.0, rotation=0.0, layer=None):
+        """Tanımlı bloğun örneği (rotation: radyan)."""
+        if name not in self._blocks: raise KeyError(f"Blok tanımlı değil: {name}")
+        self._items.append((INSERT, layer or self.default_layer, (name, _xy(position), float(scale), float(rotation))))
+        return len(self._items) - 1
+
+    def has_block(self, name): return name in self._blocks
+
+    @property
+    def blocks(self): return self._blocks
+
+    def add(self, kind, layer, data):
+        """Hazır (normalize edilmiş) varlığı ekler; drawing_backends arka uçları kullanır."""
+        self._items.append((kind, layer, data))
+        return len(self._items) - 1
+
+    def items(self):
+        """Eklenen varlıklar (tür, katman, veri), ekleme sırasıyla (ör. başka bir arka uca aktarmak için)."""
+        return iter(self._items)
+
+    def clear(self):
+        self._items = []; self._blocks = {}
+
+    # --- Gönderim Planı ---
+    def plan(self, expand_blocks=False):
+        """Gönderilecek varlıklar: [(katman, tür, veri, kaynak indeksleri)], katmanlara göre gruplu.
+        Aynı katmanda uç uca eklenmiş çizgiler tek polyline'a (kapanıyorsa kapalı) dönüşür.
+        expand_blocks=True ise blok örnekleri geometri olarak açılır (blok desteklemeyen hedefler için)."""
+        groups = {}
+        for index, (kind, layer, data) in enumerate(self._items): groups.setdefault(layer, []).append((index, kind, data))
+        planned = []
+        for layer, items in groups.items():
+            if expand_blocks: items = [(index, *part) for index, kind, data in items for part in self._expand(kind, data)]
+            chain = [] # (indeks, (başlangıç, bitiş)) zinciri
+            for index, kind, data in items:
+                if kind == LINE and self.merge_lines:
+                    if chain and chain[-1][1][1] != data[0]: planned.append(self._flush_chain(layer, chain)); chain = []
+                    chain.append((index, data))
+                    if len(chain) > 2 and data[1] == chain[0][1][0]: planned.append(self._flush_chain(layer, chain)); chain = [] # Şekil kapandı
+                    continue
+                if chain: planned.append(self._flush_chain(layer, chain)); chain = []
+                planned.append((layer, kind, data, (index,)))
+            if chain: planned.append(self._flush_chain(layer, chain))
+        return planned
+
+    def _expand(self, kind, data):
+        if kind != INSERT: return ((kind, data),)
+        name, position, scale, rotation = data
+        return expand_block(self._blocks[name], position, scale, rotation)
+
+    @staticmethod
+    def _flush_chain(layer, chain):
+        indices = tuple(index for index, _ in chain)
+        if len(chain) == 1: return (layer, LINE, chain[0][1], indices)
+        points = [chain[0][1][0]] + [end for _, (_, end) in chain]
+        closed = points[0] == points[-1] and len(points) > 3
+        if closed: points.pop()
+        return (layer, POLYLINE, (tuple(points), closed), indices)
+
+    # --- Gönderim ---
+    def submit(self, acad, job=None):
+        """Tamponu AutoCAD'e gönderir (acad: pyautocad.Autocad). Her eklenen varlık için handle
+        döndürür (birleştirilen çizgiler aynı handle'ı paylaşır, başarısızlar None). Tampon boşaltılır.
+        job (com_worker.ComJob) verilirse varlıklar arasında iptal kontrol edilir ve ilerleme bildirilir."""
+        if APoint is None: raise RuntimeError("AutoCAD'e çizim için 'pyautocad' kütüphanesi gerekli.")
+        handles = [None] * len(self._items)
+        planned = self.plan()
+        doc = acad.doc
+        model_space = doc.ModelSpace
+        layers = doc.Layers
+        original_layer = doc.ActiveLayer
+        created = 0; errors = 0; consecutive = 0
+        current_layer = None
+        try:
+            if self._blocks:
+                used = {data[0] for kind, _, data in self._items if kind == INSERT}
+                if used:
+                    doc.ActiveLayer = layers.Add("0"); current_layer = "0" # Blok içi varlıklar 0 katmanında: örneğin katmanını alır
+                    self._submit_blocks(doc, used)
+            for position, (layer, kind, data, indices) in enumerate(planned):
+                if consecutive >= MAX_CONSECUTIVE_ERRORS: break
+                if job is not None:
+                    job.check_cancelled()
+                    if position % PROGRESS_EVERY == 0: job.progress(position / len(planned), f"{position}/{len(planned)} varlık")
+                try:
+                    if layer != current_layer:
+                        doc.ActiveLayer = layers.Add(layer) if layer else original_layer # Add: varsa mevcut katmanı döndürür
+                        current_layer = layer
+                    handle = _create(model_space, kind, data).Handle
+                    for index in indices: handles[index] = handle
+                    created += 1; consecutive = 0
+                except Exception as e:
+                    errors += 1; consecutive += 1
+                    print(f"Error drawing {kind} on layer '{layer or '-'}': {e}")
+        finally:
+            try:
+                if current_layer is not None: doc.ActiveLayer = original_layer
+            except Exception as e: print(f"Warning: Could not restore active layer: {e}")
+        skipped = len(planned) - created - errors
+        print(f"Drawing batch submitted: {created} entities from {len(self._items)} items ({errors} errors, {skipped} skipped).")
+        self._items = []
+        return handles
+
+    def _submit_blocks(self, doc, names):
+        """Dokümanda olmayan blok tanımlarını oluşturur (her blok için bir Blocks.Item yoklaması)."""
+        blocks = doc.Blocks
+        for name in sorted(names):
+            try: blocks.Item(name); continue # Önceki bir çizimden dokümanda zaten var
+            except Exception: pass
+            block = blocks.Add(APoint(0, 0, 0), name)
+            for _, kind, data, _ in self._blocks[name].plan():
+                try: _create(block, kind, data)
+                except Exception as e: print(f"Error defining block '{name}' ({kind}): {e}")
+            print(f"Block '{name}' defined.")
+
+
+def expand_block(definition, position, scale=1.0, rotation=0.0):
+    """Blok tanımının (DrawingBatch) varlıklarını konum/ölçek/dönüşle (radyan) dönüştürür:
+    [(tür, veri)]. Yazıların dönüşü korunmaz (yalnızca konum ve yükseklik dönüşür)."""
+    cos_r, sin_r = math.cos(rotation), math.sin(rotation)
+    px, py = position
+    def move(point):
+        x, y = point[0] * scale, point[1] * scale
+        return (px + x * cos_r - y * sin_r, py + x * sin_r + y * cos_r)
+    expanded = []
+    for kind, _, data in definition.items():
+        if kind == LINE: expanded.append((LINE, (move(data[0]), move(data[1]))))
+        elif kind == CIRCLE: expanded.append((CIRCLE, (move(data[0]), data[1] * scale)))
+        elif kind == POLYLINE: expanded.append((POLYLINE, (tuple(move(p) for p in data[0]), data[1])))
+        elif kind == TEXT: expanded.append((TEXT, (move(data[0]), data[1] * scale, data[2])))
+        else: raise ValueError(f"Blok içinde desteklenmeyen varlık türü: {kind}")
+    return expanded
+
+
+def _create(target, kind, data):
+    """ModelSpace veya blok tanımına tek varlık ekler (COM)."""
+    if kind == LINE: return target.AddLine(APoint(*data[0]), APoint(*data[1]))
+    if kind == CIRCLE: return target.AddCircle(APoint(*data[0]), data[1])
+    if kind == TEXT: return target.AddText(data[2], APoint(*data[0]), data[1])
+    if kind == INSERT:
+        name, (x, y), scale, rotation = data
+        return target.InsertBlock(APoint(x, y, 0), name, scale, scale, scale, rotation)
+    points, closed = data
+    entity = target.AddLightWeightPolyline(aDouble(*[c for p in points for c in p]))
+    if closed: entity.Closed = True
+    return entity
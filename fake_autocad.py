@@ -0,0 +1,374 @@
+# fake_autocad.py
+# Çizim hızını AutoCAD olmadan ölçmek için yerel, sahte AutoCAD COM nesne modeli.
+#
+# Application / ActiveDocument / ModelSpace / Layers / Utility nesneleri gerçek API'nin
+# kullandığımız kısmını taklit eder. Her COM üyesine erişim (özellik okuma/yazma veya
+# metot çağrısı = gerçek AutoCAD'de bir süreçler arası çağrı) CallRecorder'a sayılır ve
+# isteğe bağlı gecikme eklenir. Böylece çizim yollarının "varlık/saniye" ve "işlem başına
+# COM çağrısı" değerleri Linux'ta da ölçülebilir (bkz. benchmarks/bench_drawing.py).
+#
+# Kullanım:
+#     recorder = fake_autocad.install(latency=0.0005) # autocad_interface sahte AutoCAD'e bağlanır
+#     connector = fake_autocad.FakeConnector(recorder)   # AutoCADConnector yerine
+#     ...
+#     fake_autocad.uninstall()
+
+import time
+import itertools
+import threading
+from collections import Counter
+
+DEFAULT_LATENCY = 0.0003 # s; yerel AutoCAD'e tipik süreçler arası çağrı süresi (~0.1–1 ms)
+
+
+class CallRecorder:
+    """COM çağrılarını sayar ve her çağrıya gecikme ekler."""
+
+    def __init__(self, latency=DEFAULT_LATENCY, keep_log=False):
+        self.latency = latency
+        self.calls = Counter() # "Sınıf.Üye" -> adet
+        self.log = [] if keep_log else None
+        self._lock = threading.Lock()
+
+    @property
+    def total(self): return sum(self.calls.values())
+
+    def record(self, name):
+        with self._lock:
+            self.calls[name] += 1
+            if self.log is not None: self.log.append(name)
+        if self.latency: _wait(self.latency)
+
+    def reset(self):
+        with self._lock:
+            self.calls.clear()
+            if self.log is not None: self.log.clear()
+
+    def snapshot(self):
+        with self._lock: return Counter(self.calls)
+
+
+def _wait(seconds):
+    # time.sleep milisaniye altında kaba çalışır; kalan kısım aktif beklemeyle tamamlanır
+    end = time.perf_counter() + seconds
+    if seconds > 0.002: time.sleep(seconds - 0.001)
+    while time.perf_counter() < end: pass
+
+
+class _ComObject:
+    """Büyük harfle başlayan her üye erişimi bir COM çağrısı sayılır (okuma, yazma, metot)."""
+
+    def __init__(self, recorder):
+        object.__setattr__(self, "_recorder", recorder)
+
+    def __getattribute__(self, name):
+        if name[0].isupper(): _raw(self, "_recorder").record(f"{type(self).__name__[4:]}.{name}")
+        return _raw(self, name)
+
+    def __setattr__(self, name, value):
+        if name[0].isupper(): self._recorder.record(f"{type(self).__name__[4:]}.{name}=")
+        object.__setattr__(self, name, value)
+
+
+def _raw(obj, name):
+    """Sahte nesnenin iç erişimi (sayılmaz)."""
+    return object.__getattribute__(obj, name)
+
+
+def _point(value):
+    values = tuple(float(c) for c in value)
+    return values + (0.0,) * (3 - len(values)) if len(values) < 3 else values[:3]
+
+
+# ==================================
+# NESNE MODELİ
+# ==================================
+class FakeEntity(_ComObject):
+    def __init__(self, recorder, document, object_name, layer, **geometry):
+        super().__init__(recorder)
+        object.__setattr__(self, "_document", document)
+        object.__setattr__(self, "_geometry", geometry)
+        object.__setattr__(self, "Handle", document._new_handle())
+        object.__setattr__(self, "ObjectName", object_name)
+        object.__setattr__(self, "Layer", layer)
+        object.__setattr__(self, "Closed", False)
+
+    def __getattr__(self, name):
+        # Geometri özellikleri (StartPoint, Center, Radius, Coordinates, TextString ...)
+        geometry = _raw(self, "_geometry")
+        if name in geometry: return geometry[name]
+        raise AttributeError(name)
+
+    def Delete(self):
+        self._document._entities.pop(_raw(self, "Handle"), None)
+
+    def Update(self): pass
+
+
+class FakeBlock(_ComObject):
+    """ModelSpace ve blok tanımları: varlık ekleme metotları."""
+
+    def __init__(self, recorder, document, name):
+        super().__init__(recorder)
+        object.__setattr__(self, "_document", document)
+        object.__setattr__(self, "Name", name)
+        object.__setattr__(self, "_items", [])
+
+    def _add(self, object_name, **geometry):
+        document = _raw(self, "_document")
+        entity = FakeEntity(_raw(self, "_recorder"), document, object_name, document._active_layer, **geometry)
+        self._items.append(entity)
+        if _raw(self, "Name") == "*Model_Space": document._entities[_raw(entity, "Handle")] = entity
+        return entity
+
+    @property
+    def Count(self): return len(self._items)
+
+    def Item(self, index): return self._items[index]
+
+    def AddLine(self, start, end): return self._add("AcDbLine", StartPoint=_point(start), EndPoint=_point(end))
+
+    def AddCircle(self, center, radius): return self._add("AcDbCircle", Center=_point(center), Radius=float(radius))
+
+    def AddLightWeightPolyline(self, coordinates): return self._add("AcDbPolyline", Coordinates=tuple(float(c) for c in coordinates))
+
+    def AddPolyline(self, coordinates): return self._add("AcDb2dPolyline", Coordinates=tuple(float(c) for c in coordinates))
+
+    def AddText(self, text, position, height): return self._add("AcDbText", TextString=str(text), InsertionPoint=_point(position), Height=float(height))
+
+    def InsertBlock(self, position, name, x_scale=1.0, y_scale=1.0, z_scale=1.0, rotation=0.0):
+        document = _raw(self, "_document")
+        if name not in document._blocks: raise KeyError(f"Block '{name}' not defined")
+        return self._add("AcDbBlockReference", Name=name, InsertionPoint=_point(position), XScaleFactor=x_scale, YScaleFactor=y_scale, Rotation=rotation)
+
+
+class FakeBlocks(_ComObject):
+    def __init__(self, recorder, document):
+        super().__init__(recorder)
+        object.__setattr__(self, "_document", document)
+
+    @property
+    def Count(self): return len(self._document._blocks)
+
+    def Add(self, insertion_point, name):
+        document = _raw(self, "_document")
+        block = document._blocks.get(name)
+        if block is None: block = document._blocks[name] = FakeBlock(_raw(self, "_recorder"), document, name)
+        return block
+
+    def Item(self, name):
+        block = _raw(self, "_document")._blocks.get(name)
+        if block is None: raise KeyError(name)
+        return block
+
+
+class FakeLayer(_ComObject):
+    def __init__(self, recorder, name):
+        super().__init__(recorder)
+        object.__setattr__(self, "Name", name)
+
+
+class FakeLayers(_ComObject):
+    def __init__(self, recorder):
+        super().__init__(recorder)
+        object.__setattr__(self, "_layers", {"0": FakeLayer(recorder, "0")})
+
+    @property
+    def Count(self): return len(self._layers)
+
+    def Add(self, name):
+        layers = _raw(self, "_layers")
+        if name not in layers: layers[name] = FakeLayer(_raw(self, "_recorder"), name)
+        return layers[name]
+
+    def Item(self, name): return _raw(self, "_layers")[name]
+
+
+class FakeUtility(_ComObject):
+    def __init__(self, recorder, points):
+        super().__init__(recorder)
+        object.__setattr__(self, "_points", points)
+
+    def GetPoint(self, base_point=None, prompt=""):
+        return next(_raw(self, "_points"))
+
+    def Prompt(self, message): pass
+
+
+# Sistem değişkenleri: ad -> başlangıç değeri (tipler gerçek AutoCAD ile aynı)
+DEFAULT_VARIABLES = {"GRIDMODE": 0, "SNAPMODE": 0, "ORTHOMODE": 0, "OSMODE": 4133, "AUTOSNAP": 63,
+                     "POLARMODE": 0, "LTSCALE": 1.0, "DIMSCALE": 1.0, "TEXTSIZE": 2.5, "INSUNITS": 4,
+                     "CMDECHO": 1, "FILEDIA": 1, "CLAYER": "0", "DWGNAME": "Drawing1.dwg"}
+
+
+class FakeDocument(_ComObject):
+    def __init__(self, recorder, name, points=None):
+        super().__init__(recorder)
+        object.__setattr__(self, "Name", name)
+        object.__setattr__(self, "_handles", itertools.count(0x200))
+        object.__setattr__(self, "_entities", {}) # handle -> ModelSpace varlığı
+        object.__setattr__(self, "_blocks", {})
+        object.__setattr__(self, "_variables", dict(DEFAULT_VARIABLES, DWGNAME=name))
+        object.__setattr__(self, "_active_layer", "0")
+        object.__setattr__(self, "commands", []) # SendCommand ile gönderilen metinler
+        object.__setattr__(self, "Layers", FakeLayers(recorder))
+        object.__setattr__(self, "Blocks", FakeBlocks(recorder, self))
+        self._blocks["*Model_Space"] = FakeBlock(recorder, self, "*Model_Space")
+        object.__setattr__(self, "ModelSpace", self._blocks["*Model_Space"])
+        object.__setattr__(self, "Utility", FakeUtility(recorder, points or ((float(i), float(i), 0.0) for i in itertools.count())))
+
+    def _new_handle(self): return "%X" % next(self._handles)
+
+    @property
+    def ActiveLayer(self): return _raw(_raw(self, "Layers"), "_layers")[self._active_layer]
+
+    @ActiveLayer.setter
+    def ActiveLayer(self, layer): object.__setattr__(self, "_active_layer", _raw(layer, "Name") if isinstance(layer, FakeLayer) else str(layer))
+
+    def GetVariable(self, name):
+        name = name.upper()
+        if name == "CLAYER": return self._active_layer
+        if name not in self._variables: raise KeyError(f"Unknown system variable '{name}'")
+        return self._variables[name]
+
+    def SetVariable(self, name, value):
+        name = name.upper()
+        current = self._variables.get(name)
+        if current is not None and type(current) is not type(value) and not (isinstance(current, float) and isinstance(value, int)):
+            raise TypeError(f"Invalid type for '{name}': {type(value).__name__}") # AutoCAD de tip uyuşmazlığını reddeder
+        self._variables[name] = value
+
+    def SendCommand(self, text): self.commands.append(text)
+
+    def HandleToObject(self, handle):
+        entity = self._entities.get(handle)
+        if entity is None: raise KeyError(f"Unknown handle '{handle}'")
+        return entity
+
+    def Regen(self, which=0): pass
+
+
+class FakeDocuments(_ComObject):
+    def __init__(self, recorder, application):
+        super().__init__(recorder)
+        object.__setattr__(self, "_application", application)
+
+    @property
+    def Count(self): return len(self._application._documents)
+
+    def Add(self, name=None):
+        application = _raw(self, "_application")
+        return application._open(name or f"Drawing{len(application._documents) + 1}.dwg")
+
+    def Item(self, index): return _raw(self, "_application")._documents[index]
+
+
+class FakeApplication(_ComObject):
+    """AutoCAD.Application taklidi."""
+
+    def __init__(self, recorder=None, document_name="Drawing1.dwg", points=None):
+        recorder = recorder or CallRecorder()
+        super().__init__(recorder)
+        object.__setattr__(self, "Name", "AutoCAD")
+        object.__setattr__(self, "Version", "fake")
+        object.__setattr__(self, "Visible", True)
+        object.__setattr__(self, "_documents", [])
+        object.__setattr__(self, "_points", points)
+        object.__setattr__(self, "Documents", FakeDocuments(recorder, self))
+        object.__setattr__(self, "_active", self._open(document_name))
+
+    def _open(self, name):
+        document = FakeDocument(_raw(self, "_recorder"), name, _raw(self, "_points"))
+        self._documents.append(document)
+        object.__setattr__(self, "_active", document)
+        return document
+
+    @property
+    def ActiveDocument(self): return self._active
+
+    @ActiveDocument.setter
+    def ActiveDocument(self, document): object.__setattr__(self, "_active", document)
+
+    def ZoomExtents(self): pass
+
+
+# ==================================
+# ADAPTÖRLER
+# ==================================
+class FakePyAutocad:
+    """pyautocad.Autocad taklidi (app, doc, ActiveDocument, model, prompt). Bu katman COM değildir;
+    yalnızca alttaki nesnelere erişim sayılır."""
+
+    def __init__(self, application):
+        self.app = application
+
+    @property
+    def doc(self): return self.app.ActiveDocument
+
+    ActiveDocument = doc
+
+    @property
+    def model(self): return self.doc.ModelSpace
+
+    def prompt(self, text): self.doc.Utility.Prompt(text)
+
+
+def _connector_base():
+    from src.interfaces.autocad.connector import AutoCADConnector
+    return AutoCADConnector
+
+
+def FakeConnector(recorder=None, application=None):
+    """Sahte AutoCAD'e bağlanan AutoCADConnector (win32com gerektirmez)."""
+    base = _connector_base()
+
+    class _FakeConnector(base):
+        def connect(self):
+            self.acad = application or FakeApplication(recorder)
+            self.acad.Visible = True
+            return True
+
+        def _make_point(self, point_tuple): return tuple(float(c) for c in point_tuple)
+
+    return _FakeConnector()
+
+
+_saved = None
+
+
+def install(latency=DEFAULT_LATENCY, recorder=None, application=None):
+    """autocad_interface'i (ve drawing_batch'i) sahte AutoCAD'e bağlar; CallRecorder döndürür.
+    pyautocad kurulu olmasa da APoint/aDouble yerine düz demetler kullanılır."""
+    global _saved
+    import autocad_interface
+    import drawing_batch
+    recorder = recorder or CallRecorder(latency)
+    application = application or FakeApplication(recorder)
+    if _saved is None:
+        _saved = {(autocad_interface, "Autocad"): autocad_interface.Autocad, (autocad_interface, "APoint"): autocad_interface.APoint,
+                  (autocad_interface, "aDouble"): autocad_interface.aDouble, (autocad_interface, "PLATFORM_SUPPORTED"): autocad_interface.PLATFORM_SUPPORTED,
+                  (autocad_interface, "connection"): autocad_interface.connection,
+                  (drawing_batch, "APoint"): drawing_batch.APoint, (drawing_batch, "aDouble"): drawing_batch.aDouble}
+    autocad_interface.Autocad = lambda create_if_not_exists=False: FakePyAutocad(application)
+    autocad_interface.APoint = _tuple_point; autocad_interface.aDouble = _tuple_values
+    drawing_batch.APoint = _tuple_point; drawing_batch.aDouble = _tuple_values
+    autocad_interface.PLATFORM_SUPPORTED = True
+    autocad_interface.connection = autocad_interface.AcadConnection() # Önceki (gerçek) bağlantı durumu karışmasın
+    print(f"Info: Fake AutoCAD installed (latency {recorder.latency * 1000:.2f} ms/call).")
+    return recorder
+
+
+def uninstall():
+    global _saved
+    if _saved is None: return
+    for (module, name), value in _saved.items(): setattr(module, name, value)
+    _saved = None
+
+
+def _tuple_point(*coords):
+    if len(coords) == 1: coords = tuple(coords[0])
+    return _point(coords)
+
+
+def _tuple_values(*values):
+    return tuple(float(v) for v in values)
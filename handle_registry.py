@@ -0,0 +1,176 @@
+# handle_registry.py
+# EngPY'nin çizdiği varlıkların handle kaydı ve artımlı yeniden çizim (yalnızca değişenler).
+#
+# Bir çizim (ör. Şema sayfasındaki kolon yerleşimi) her üretildiğinde varlıkları bir
+# drawing_batch.DrawingBatch'e toplanır. Kayıt, önceki çizimdeki her varlık için imzayı
+# (tür + katman + geometri özeti) ve AutoCAD handle'ını çizim sırasıyla tutar. Yeni çizim
+# kayıtla karşılaştırılır (COM çağrısı yapılmadan, Python'da):
+#   aynı imza                           -> dokunulmaz
+#   kaybolan + yeni, aynı tür ve katman -> yerinde değiştirilir (HandleToObject + özellik yazma; handle korunur)
+#   fazladan kaybolan                   -> silinir (Delete)
+#   fazladan yeni                       -> eklenir (DrawingBatch.submit)
+# Tek aks aralığı değişince büyük bir planda yalnızca birkaç varlık COM'a gider.
+# Kayıt JSON'a uygun sözlüktür (to_dict/from_dict): proje dosyasının "drawings" bölümünde
+# saklanır. Kayıt bir dokümana aittir; başka dokümanda kayıt sıfırlanıp tam çizim yapılır.
+# Kullanıcının AutoCAD'de elle sildiği "değişmemiş" varlıklar fark edilmez (clear() + yeniden çiz).
+
+import json
+import hashlib
+from collections import deque
+
+import drawing_batch
+from drawing_batch import LINE, CIRCLE, POLYLINE, TEXT, INSERT
+
+
+def signature(kind, layer, data):
+    """Varlığın içerik özeti (aynı geometri -> aynı imza; 1e-6 altı kayan nokta farkları yok sayılır)."""
+    payload = json.dumps([kind, layer or "", _rounded(data)], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _rounded(value):
+    if isinstance(value, float): return round(value, 6)
+    if isinstance(value, (tuple, list)): return [_rounded(v) for v in value]
+    return value
+
+
+def _group(kind, layer, data):
+    # Yerinde değiştirilebilecek varlıklar: aynı tür ve katman (INSERT'te aynı blok; bloğu değiştirilemez)
+    return f"{kind}|{layer or ''}|{data[0]}" if kind == INSERT else f"{kind}|{layer or ''}"
+
+
+class RegistryDiff:
+    """Yeni çizim planının kayıtla farkı. Konumlar plan (DrawingBatch.plan) sırasındadır."""
+    __slots__ = ("planned", "signatures", "groups", "unchanged", "modified", "added", "deleted")
+
+    def __init__(self, planned):
+        self.planned = planned
+        self.signatures = []; self.groups = []
+        self.unchanged = [] # (konum, handle)
+        self.modified = []  # (konum, eski handle)
+        self.added = []     # konum
+        self.deleted = []   # handle
+
+    def summary(self):
+        return {"unchanged": len(self.unchanged), "modified": len(self.modified), "added": len(self.added), "deleted": len(self.deleted)}
+
+
+class HandleRegistry:
+    """Çizilen varlıkların [imza, grup, handle] listesi (çizim sırasıyla) ve ait olduğu doküman."""
+
+    def __init__(self, document=None, entries=None):
+        self.document = document
+        self.entries = [list(entry) for entry in entries or ()]
+
+    def __len__(self): return len(self.entries)
+
+    @classmethod
+    def from_dict(cls, data):
+        """to_dict() çıktısından (veya None/boş sözlükten: boş kayıt) kayıt oluşturur."""
+        if not data: return cls()
+        if not isinstance(data, dict): raise ValueError("Handle kaydı sözlük olmalı.")
+        return cls(data.get("document"), data.get("entities") or ())
+
+    def to_dict(self):
+        return {"document": self.document, "entities": self.entries}
+
+    def clear(self):
+        self.document = None; self.entries = []
+
+    def handles(self): return [entry[2] for entry in self.entries]
+
+    def diff(self, planned):
+        """planned: DrawingBatch.plan() çıktısı [(katman, tür, veri, indeksler)]. RegistryDiff döndürür."""
+        result = RegistryDiff(planned)
+        previous = {}
+        for entry in self.entries: previous.setdefault(entry[0], deque()).append(entry)
+        new = []; matched = set()
+        for position, (layer, kind, data, _) in enumerate(planned):
+            sig = signature(kind, layer, data)
+            result.signatures.append(sig); result.groups.append(_group(kind, layer, data))
+            bucket = previous.get(sig)
+            if bucket:
+                entry = bucket.popleft(); matched.add(id(entry))
+                result.unchanged.append((position, entry[2]))
+            else: new.append(position)
+        # Eşleşmeyen eski varlıklar, aynı gruptaki yeni varlıklarla çizim sırasıyla eşlenir
+        stale = {}
+        for entry in self.entries:
+            if id(entry) not in matched: stale.setdefault(entry[1], deque()).append(entry)
+        for position in new:
+            candidates = stale.get(result.groups[position])
+            if candidates: result.modified.append((position, candidates.popleft()[2]))
+            else: result.added.append(position)
+        result.deleted = [entry[2] for candidates in stale.values() for entry in candidates]
+        return result
+
+
+# ==================================
+# AUTOCAD'E UYGULAMA (COM iş parçacığında)
+# ==================================
+def update(acad, batch, registry, job=None):
+    """batch'i (drawing_batch.DrawingBatch) kayıtla karşılaştırıp yalnızca değişen varlıkları
+    AutoCAD'de siler/değiştirir/ekler; kaydı yeni handle'larla günceller. Tampon değişmez.
+    Sayıları ({"unchanged", "modified", "added", "deleted"}) döndürür."""
+    if drawing_batch.APoint is None: raise RuntimeError("AutoCAD'e çizim için 'pyautocad' kütüphanesi gerekli.")
+    doc = acad.doc
+    document = doc.Name
+    if registry.document not in (None, document):
+        print(f"Info: Handle registry belongs to '{registry.document}', redrawing fully in '{document}'.")
+        registry.clear()
+    planned = batch.plan()
+    diff = registry.diff(planned)
+    handles = [None] * len(planned)
+    for position, handle in diff.unchanged: handles[position] = handle
+
+    for handle in diff.deleted:
+        try: doc.HandleToObject(handle).Delete()
+        except Exception as e: print(f"Warning: Could not delete entity {handle} (already deleted?): {e}")
+    added = list(diff.added)
+    for position, handle in diff.modified:
+        if job is not None: job.check_cancelled()
+        layer, kind, data, _ = planned[position]
+        entity = None
+        try:
+            entity = doc.HandleToObject(handle)
+            _modify(entity, kind, data)
+            handles[position] = handle
+        except Exception as e:
+            print(f"Warning: Could not modify entity {handle}, redrawing it: {e}")
+            if entity is not None:
+                try: entity.Delete()
+                except Exception: pass
+            added.append(position)
+    if added:
+        fresh = drawing_batch.DrawingBatch(batch.default_layer, merge_lines=False) # Plan zaten birleştirilmiş
+        for name, definition in batch.blocks.items(): fresh.define_block(name, definition)
+        for position in added:
+            layer, kind, data, _ = planned[position]
+            fresh.add(kind, layer, data)
+        for position, handle in zip(added, fresh.submit(acad, job=job)): handles[position] = handle
+
+    registry.document = document
+    registry.entries = [[sig, group, handle] for sig, group, handle in zip(diff.signatures, diff.groups, handles) if handle]
+    summary = diff.summary()
+    print("Drawing updated: {unchanged} unchanged, {modified} modified, {added} added, {deleted} deleted.".format(**summary))
+    return summary
+
+
+def _modify(entity, kind, data):
+    """Var olan varlığın geometrisini yerinde günceller (tür ve katman aynı)."""
+    APoint = drawing_batch.APoint
+    if kind == LINE:
+        entity.StartPoint = APoint(*data[0]); entity.EndPoint = APoint(*data[1])
+    elif kind == CIRCLE:
+        entity.Center = APoint(*data[0]); entity.Radius = data[1]
+    elif kind == POLYLINE:
+        points, closed = data
+        entity.Coordinates = drawing_batch.aDouble(*[c for p in points for c in p]); entity.Closed = closed
+    elif kind == TEXT:
+        entity.InsertionPoint = APoint(*data[0]); entity.Height = data[1]; entity.TextString = data[2]
+    elif kind == INSERT:
+        _, (x, y), scale, rotation = data
+        entity.InsertionPoint = APoint(x, y, 0)
+        entity.XScaleFactor = scale; entity.YScaleFactor = scale; entity.ZScaleFactor = scale
+        entity.Rotation = rotation
+    else: raise ValueError(f"Bilinmeyen varlık türü: {kind}")
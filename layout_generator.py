@@ -0,0 +1,169 @@
+# layout_generator.py
+# Parametrik aks (grid), kolon ve kiriş yerleşimi üretimi (Şema sayfası: "Grid Sistemi",
+# "Kolon Yerleşimi", "Kiriş Yerleşimi").
+#
+# Aks aralıklarından ve eleman boyutlarından tüm aks çizgileri, aks balonları/yazıları,
+# kolon merkezleri ve kiriş dikdörtgenleri dizi olarak hesaplanır (numpy varsa vektörel,
+# yoksa saf Python listeleri; sonuç aynıdır). emit() sonucu herhangi bir çizim arka ucuna
+# (drawing_backends) verir: kolonlar ve aks balonları block_manager ile blok olarak
+# yerleştirilir, aks çizgileri ve kirişler tek seferde eklenir. Arayüzsüzdür (tkinter yok).
+#
+# Örnek:
+#     layout = layout_generator.generate(parse_spacings("3*6000"), parse_spacings("5000, 4500"),
+#                                        column_b=400, column_h=400, beam_width=250)
+#     with drawing_backends.DxfBackend("plan.dxf") as backend:
+#         layout_generator.emit(layout, backend)
+
+import block_manager
+
+try:
+    import numpy as np
+except ImportError:
+    np = None # Vektörel hesap için isteğe bağlı; yoksa saf Python listeleri kullanılır
+
+LAYER_AXIS = "AKS"
+LAYER_AXIS_TEXT = "AKS_YAZI"
+LAYER_COLUMN = "KOLON"
+LAYER_BEAM = "KIRIS"
+DEFAULT_OVERHANG = 1000.0 # Aks çizgilerinin dış akslardan taşma boyu (mm)
+
+
+def parse_spacings(text):
+    """"5000, 3*6000 4500" -> [5000.0, 6000.0, 6000.0, 6000.0, 4500.0] (mm). "n*a": n adet a aralığı."""
+    spacings = []
+    for token in str(text).replace(";", ",").replace(",", " ").split():
+        count, _, value = token.rpartition("*")
+        try: count = int(count) if count else 1; value = float(value)
+        except ValueError: raise ValueError(f"Geçersiz aks aralığı: {token!r}")
+        if count < 1 or value <= 0: raise ValueError(f"Aks aralığı pozitif olmalı: {token!r}")
+        spacings.extend([value] * count)
+    if not spacings: raise ValueError("En az bir aks aralığı girilmeli.")
+    return spacings
+
+
+def axis_labels(count, letters=False):
+    """Aks adları: 1, 2, 3 ... veya A, B, ..., Z, AA, AB ..."""
+    if not letters: return [str(i + 1) for i in range(count)]
+    labels = []
+    for i in range(count):
+        label = ""; i += 1
+        while i: i, rest = divmod(i - 1, 26); label = chr(65 + rest) + label
+        labels.append(label)
+    return labels
+
+
+class Layout:
+    """Üretilen yerleşim. Dizi alanları numpy varsa ndarray, yoksa demet listesidir:
+    grid_lines (x1, y1, x2, y2), columns (x, y) merkezler, beams (x0, y0, x1, y1) dikdörtgenler."""
+    __slots__ = ("x_axes", "y_axes", "grid_lines", "bubbles", "labels", "bubble_radius",
+                 "columns", "column_b", "column_h", "beams", "beam_width")
+
+    def counts(self):
+        return {"axes": len(self.x_axes) + len(self.y_axes), "columns": len(self.columns), "beams": len(self.beams)}
+
+    def __repr__(self):
+        return "Layout(%s)" % ", ".join(f"{key}={value}" for key, value in self.counts().items())
+
+
+# ==================================
+# ÜRETİM
+# ==================================
+def generate(x_spacings, y_spacings, column_b=None, column_h=None, beam_width=None,
+             overhang=DEFAULT_OVERHANG, bubble_radius=None, origin=(0.0, 0.0)):
+    """Aks aralıklarından (mm) yerleşim üretir. column_b/column_h verilmezse kolon, beam_width
+    verilmezse kiriş üretilmez. Kolon b boyutu X, h boyutu Y doğrultusundadır; kirişler kolon
+    yüzünden kolon yüzüne uzanır. X aksları 1, 2, 3..., Y aksları A, B, C... ile adlandırılır."""
+    x0, y0 = float(origin[0]), float(origin[1])
+    xs = [x0]; ys = [y0]
+    for spacing in x_spacings: xs.append(xs[-1] + float(spacing))
+    for spacing in y_spacings: ys.append(ys[-1] + float(spacing))
+    column_b = float(column_b or 0.0); column_h = float(column_h or column_b)
+    beam_width = float(beam_width or 0.0)
+    radius = float(bubble_radius) if bubble_radius else max(150.0, min(500.0, overhang * 0.3))
+    with_columns = column_b > 0 and column_h > 0
+
+    layout = Layout()
+    layout.x_axes = xs; layout.y_axes = ys
+    layout.column_b = column_b if with_columns else None; layout.column_h = column_h if with_columns else None
+    layout.beam_width = beam_width or None; layout.bubble_radius = radius
+    build = _build_numpy if np is not None else _build_python
+    layout.grid_lines, layout.columns, layout.beams = build(xs, ys, overhang, with_columns,
+                                                            column_b if with_columns else 0.0, column_h if with_columns else 0.0, beam_width)
+    # Balonlar: X aksları altta, Y aksları solda (az sayıda: saf Python)
+    offset = overhang + radius
+    layout.bubbles = [(x, ys[0] - offset) for x in xs] + [(xs[0] - offset, y) for y in ys]
+    layout.labels = axis_labels(len(xs)) + axis_labels(len(ys), letters=True)
+    return layout
+
+
+def _build_numpy(xs, ys, overhang, with_columns, column_b, column_h, beam_width):
+    xs = np.asarray(xs, dtype=float); ys = np.asarray(ys, dtype=float)
+    nx, ny = len(xs), len(ys)
+    bottom, top = ys[0] - overhang, ys[-1] + overhang
+    left, right = xs[0] - overhang, xs[-1] + overhang
+    grid_lines = np.vstack((np.column_stack((xs, np.full(nx, bottom), xs, np.full(nx, top))),
+                            np.column_stack((np.full(ny, left), ys, np.full(ny, right), ys))))
+    columns = np.empty((0, 2))
+    if with_columns:
+        cx, cy = np.meshgrid(xs, ys)
+        columns = np.column_stack((cx.ravel(), cy.ravel()))
+    beams = np.empty((0, 4))
+    if beam_width > 0:
+        half = beam_width / 2.0
+        # X doğrultusu: her Y aksında ardışık X aksları arası; Y doğrultusu: tersi
+        bx = np.column_stack((np.tile(xs[:-1] + column_b / 2.0, ny), np.repeat(ys - half, nx - 1),
+                              np.tile(xs[1:] - column_b / 2.0, ny), np.repeat(ys + half, nx - 1)))
+        by = np.column_stack((np.repeat(xs - half, ny - 1), np.tile(ys[:-1] + column_h / 2.0, nx),
+                              np.repeat(xs + half, ny - 1), np.tile(ys[1:] - column_h / 2.0, nx)))
+        beams = np.vstack((bx, by))
+        beams = beams[(beams[:, 2] > beams[:, 0]) & (beams[:, 3] > beams[:, 1])] # Kolonların örttüğü açıklıklar atlanır
+    return grid_lines, columns, beams
+
+
+def _build_python(xs, ys, overhang, with_columns, column_b, column_h, beam_width):
+    bottom, top = ys[0] - overhang, ys[-1] + overhang
+    left, right = xs[0] - overhang, xs[-1] + overhang
+    grid_lines = [(x, bottom, x, top) for x in xs] + [(left, y, right, y) for y in ys]
+    columns = [(x, y) for y in ys for x in xs] if with_columns else []
+    beams = []
+    if beam_width > 0:
+        half = beam_width / 2.0; cb = column_b / 2.0; ch = column_h / 2.0
+        beams = ([(xa + cb, y - half, xb - cb, y + half) for y in ys for xa, xb in zip(xs, xs[1:])] +
+                 [(x - half, ya + ch, x + half, yb - ch) for x in xs for ya, yb in zip(ys, ys[1:])])
+        beams = [beam for beam in beams if beam[2] > beam[0] and beam[3] > beam[1]]
+    return grid_lines, columns, beams
+
+
+# ==================================
+# ÇİZİM
+# ==================================
+def emit(layout, backend, use_blocks=True):
+    """Yerleşimi çizim arka ucuna verir. use_blocks: kolonlar ve aks balonları blok örneği olarak
+    (arka uç yerel blok desteklemiyorsa geometri olarak açılır). Eklenen öğe sayılarını döndürür."""
+    blocks = block_manager.BlockManager(backend) if use_blocks else None
+    line = backend.line; rectangle = backend.rectangle
+    for x1, y1, x2, y2 in _rows(layout.grid_lines): line((x1, y1), (x2, y2), layer=LAYER_AXIS)
+
+    radius = layout.bubble_radius; height = radius * 0.8
+    if blocks is not None: blocks.place_many("axis_bubble", layout.bubbles, layer=LAYER_AXIS, radius=radius)
+    else:
+        for center in layout.bubbles: backend.circle(center, radius, layer=LAYER_AXIS)
+    for (x, y), label in zip(layout.bubbles, layout.labels):
+        # Yazı ekleme noktası sol alt köşe: balonda yaklaşık ortalanır
+        backend.text((x - height * 0.35 * len(label), y - height / 2.0), height, label, layer=LAYER_AXIS_TEXT)
+
+    columns = _rows(layout.columns)
+    if columns:
+        b, h = layout.column_b, layout.column_h
+        if blocks is not None: blocks.place_many("column_rect", columns, layer=LAYER_COLUMN, b=b, h=h)
+        else:
+            for x, y in columns: rectangle(x - b / 2.0, y - h / 2.0, x + b / 2.0, y + h / 2.0, layer=LAYER_COLUMN)
+    for bx0, by0, bx1, by1 in _rows(layout.beams): rectangle(bx0, by0, bx1, by1, layer=LAYER_BEAM)
+    counts = layout.counts()
+    counts["blocks"] = blocks.stats()["definitions"] if blocks is not None else 0
+    return counts
+
+
+def _rows(array):
+    # ndarray satırlarını tek seferde Python demetlerine çevirir (satır satır indekslemeden hızlı)
+    return array.tolist() if hasattr(array, "tolist") else array
@@ -3,13 +3,22 @@
 
 import tkinter as tk
 from tkinter import ttk
-from tkinter import messagebox
+from tkinter import messagebox, filedialog
+import os
 
 # Diğer modüllerimizi import edelim
 import config
 import utils
 import autocad_interface
+import com_worker
 import ui_components
+import undo_history
+import project_file
+import dependency_graph
+import profile_schema
+import profile_snapshots
+import records
+import record_pool
 # Frame sınıflarını import edelim
 from section_frames import PanelFrame, AutoCADFrame, CalculationsFrame, SettingsFrame
 
@@ -29,6 +38,20 @@ class MainApp:
         self.app_settings = utils.app_settings
         self.profiles_data = utils.profiles_data
         self.current_profile_name = utils.current_profile_name
+        # Geri al / yinele geçmişi (ilk adım: yüklenen profiller)
+        self.history = undo_history.UndoHistory(config.UNDO_MEMORY_LIMIT_MB * 1024 * 1024)
+        self.history.commit("Başlangıç", self.profiles_data)
+        # Malzeme -> kesit -> tasarım -> rapor bağımlılık grafikleri (profil başına, ilk kullanımda kurulur)
+        self.design_graphs = dependency_graph.GraphRegistry(self.profiles_data)
+        # Hesap sayfalarının okuduğu sütun bazlı malzeme/kesit tabloları (aktif profil yüklemede kurulur)
+        self.record_tables = records.TableRegistry(self.profiles_data)
+        self.record_tables.get(self.current_profile_name)
+        self._design_recompute_job = None
+        # Profil kütüphanesinin sürümlü anlık görüntüleri
+        self.snapshot_store = profile_snapshots.SnapshotStore()
+        # Açık proje dosyası (.engpy) ve bağlı olduğu profil
+        self.project = None
+        self.project_profile_name = None
 
         # --- Pencere Ayarları ---
         self.root.title(config.APP_NAME)
@@ -53,6 +76,8 @@ class MainApp:
         # --- AutoCAD Durumu ---
         self.autocad_status_message = "Kontrol ediliyor..."
         self.connected_autocad_doc_name = None
+        self._connection_job = None # Süren bağlantı kontrolü (com_worker.ComJob)
+        com_worker.get_worker().attach(self.root) # AutoCAD işlerinin sonuçları Tk iş parçacığına after() ile döner
         # Bağlantı kontrolünü başlat (ama sonucu hemen kullanma)
         self.refresh_autocad_status_and_view(initial_load=True)
 
@@ -77,6 +102,16 @@ class MainApp:
         # --- Başlangıç Görünümünü Göster ---
         self.show_frame("Panel") # Başlangıçta Panel'i göster
 
+        # --- Geri Al / Yinele Kısayolları ---
+        self.root.bind_all("<Control-z>", lambda e: self.undo())
+        self.root.bind_all("<Control-y>", lambda e: self.redo())
+
+        # --- Profil Doğrulama Uyarısı ---
+        if utils.profile_validation_errors: self.root.after(200, self._show_profile_validation_errors)
+
+        # --- Ortak Profil Dosyası Takibi ---
+        self.root.after(config.PROFILE_POLL_INTERVAL_MS, self._poll_shared_profiles)
+
 
     def _create_menu(self):
         """Özel üst menü çubuğunu oluşturur."""
@@ -89,14 +124,23 @@ class MainApp:
         mb_file = tk.Menubutton(self.custom_menu_bar, text="Dosya", relief='flat', font=('Segoe UI', menu_font_size), padx=5, pady=2)
         self.menu_buttons['file'] = mb_file; mb_file.pack(side=tk.LEFT, padx=1)
         menu_file = tk.Menu(mb_file, tearoff=0); self.dropdown_menus['file'] = menu_file
-        menu_file.add_command(label="Yeni Proje", command=lambda: print("TODO: Yeni Proje"))
-        menu_file.add_command(label="Proje Aç", command=lambda: print("TODO: Proje Aç"))
-        menu_file.add_command(label="Proje Kaydet", command=self.save_current_profile)
-        menu_file.add_command(label="Projeyi Farklı Kaydet", command=lambda: print("TODO: Farklı Kaydet"))
+        menu_file.add_command(label="Yeni Proje", command=self.new_project)
+        menu_file.add_command(label="Proje Aç", command=self.open_project)
+        menu_file.add_command(label="Proje Kaydet", command=self.save_project)
+        menu_file.add_command(label="Projeyi Farklı Kaydet", command=self.save_project_as)
         menu_file.add_separator(); menu_file.add_command(label="Rapor Al", command=lambda: self.show_calculation_page("reporting"))
         menu_file.add_separator(); menu_file.add_command(label="Çıkış", command=self.quit_app)
         mb_file["menu"] = menu_file
 
+        # Düzen Menubutton
+        mb_edit = tk.Menubutton(self.custom_menu_bar, text="Düzen", relief='flat', font=('Segoe UI', menu_font_size), padx=5, pady=2)
+        self.menu_buttons['edit'] = mb_edit; mb_edit.pack(side=tk.LEFT, padx=1)
+        menu_edit = tk.Menu(mb_edit, tearoff=0); self.dropdown_menus['edit'] = menu_edit
+        menu_edit.add_command(label="Geri Al", accelerator="Ctrl+Z", command=self.undo)
+        menu_edit.add_command(label="Yinele", accelerator="Ctrl+Y", command=self.redo)
+        menu_edit.add_separator(); menu_edit.add_command(label="Düzenleme Geçmişi...", command=self.show_history_dialog)
+        mb_edit["menu"] = menu_edit
+
         # Tanımlamalar Menubutton
         mb_defs = tk.Menubutton(self.custom_menu_bar, text="Tanımlamalar", relief='flat', font=('Segoe UI', menu_font_size), padx=5, pady=2)
         self.menu_buttons['defs'] = mb_defs; mb_defs.pack(side=tk.LEFT, padx=1)
@@ -279,17 +323,37 @@ class MainApp:
             self.current_frame_widget.show_page(page_key)
         else: print("Error: Calculations frame not active.")
 
-    def refresh_autocad_status_and_view(self, initial_load=False):
-        """AutoCAD durumunu yeniler ve mevcut görünümü günceller (eğer varsa)."""
+    def refresh_autocad_status_and_view(self, initial_load=False, force_check=True):
+        """AutoCAD durumunu yeniler ve mevcut görünümü günceller (eğer varsa).
+        force_check=False ise bağlantı TTL içinde doğrulanmışsa AutoCAD yoklanmaz. Yoklama COM
+        iş parçacığında yapılır; arayüz beklemez, görünüm sonuç gelince yenilenir."""
         print("Refreshing AutoCAD status...")
-        self.autocad_status_message = autocad_interface.check_autocad_connection()
-        self.connected_autocad_doc_name = autocad_interface.connected_autocad_doc_name
+        state = autocad_interface.get_connection_state()
+        if not force_check and state["fresh"]: self._apply_autocad_state(state, initial_load); return
+        if self._connection_job is not None and self._connection_job.state in (com_worker.PENDING, com_worker.RUNNING):
+            print("Info: AutoCAD connection check already in progress."); return
+        self.autocad_status_message = "Kontrol ediliyor..."
 
-        if not initial_load and self.current_frame_widget:
+        def on_finished(_result):
+            self._connection_job = None
+            try: self.root.winfo_exists()
+            except tk.TclError: return # Pencere kapandı
+            self._apply_autocad_state(autocad_interface.get_connection_state(), initial_load)
+        def on_error(e):
+            print(f"Error checking AutoCAD connection: {e}"); on_finished(None)
+        self._connection_job = autocad_interface.submit_connection_check(on_done=on_finished, on_error=on_error)
+
+    def _apply_autocad_state(self, state, initial_load=False):
+        """Bağlantı durumunu uygular ve görünümü yeniler (ilk yüklemede yalnızca durum değiştiyse)."""
+        changed = (state["message"], state["doc_name"]) != (self.autocad_status_message, self.connected_autocad_doc_name)
+        self.autocad_status_message = state["message"]
+        self.connected_autocad_doc_name = state["doc_name"]
+
+        if initial_load and not changed: print("Initial load, view refresh skipped.")
+        elif self.current_frame_widget:
             frame_key = getattr(self.current_frame_widget, "_frame_key", None)
             if frame_key: print(f"Refreshing view for frame: {frame_key}"); self.show_frame(frame_key)
             else: print("Warning: Cannot refresh view, frame key not found.")
-        elif initial_load: print("Initial load, view refresh skipped.")
         else: print("No current view to refresh.")
 
     def get_autocad_status_message(self):
@@ -305,14 +369,203 @@ class MainApp:
              else: print("Save method not found for current calculation page.")
         else: messagebox.showinfo("Bilgi", "Kaydedilecek aktif bir hesaplama profili sayfası yok.")
 
+    def _show_profile_validation_errors(self):
+        errors = utils.profile_validation_errors
+        messagebox.showwarning("Profil Verisi Hatalı",
+            f"Profillerde {len(errors)} hatalı değer bulundu. Bu kayıtlar düzeltilene kadar hesaplarda hata verebilir:\n\n"
+            f"{profile_schema.format_errors(errors, max_lines=15)}", parent=self.root)
+
+    # --- Proje Dosyası (Yeni / Aç / Kaydet) ---
+    def _unique_profile_name(self, base_name):
+        name = base_name or config.DEFAULT_PROFILE_NAME; counter = 2
+        while name in self.profiles_data: name = f"{base_name} ({counter})"; counter += 1
+        return name
+
+    def _activate_project_profile(self, profile_name, label):
+        self.current_profile_name = profile_name; utils.current_profile_name = profile_name
+        self.project_profile_name = profile_name
+        utils.save_profiles(); self.record_undo_step(label, {profile_name})
+        self.root.title(f"{config.APP_NAME} - {os.path.basename(self.project.path) if self.project.path else profile_name}")
+        self.show_calculation_page("project_info")
+
+    def new_project(self):
+        """Yeni bir oturum profili oluşturup ona bağlı (henüz kaydedilmemiş) bir proje başlatır."""
+        if not self._confirm_unsaved_project(): return
+        profile_name = self._unique_profile_name("Yeni Proje")
+        self.profiles_data[profile_name] = utils.new_profile_data(profile_name)
+        utils.session_profiles[profile_name] = None # Yolu ilk kayıtta belli olur; profiles.json'a yazılmaz
+        self.project = project_file.new_project(self.profiles_data[profile_name])
+        self._activate_project_profile(profile_name, "Yeni proje")
+
+    def open_project(self):
+        """Proje dosyasını açar; yalnızca manifest ve profil bölümleri okunur, büyük bölümler ilk kullanımda yüklenir."""
+        path = filedialog.askopenfilename(parent=self.root, title="Proje Aç",
+                                          filetypes=[("EngPY Projesi", "*" + project_file.PROJECT_EXTENSION), ("Tümü", "*.*")])
+        if not path or not self._confirm_unsaved_project(): return
+        try: project = project_file.ProjectFile.open(path); profile = project.to_profile()
+        except Exception as e: messagebox.showerror("Hata", f"Proje açılamadı:\n{e}", parent=self.root); return
+        # Proje profili yalnızca oturumda tutulur (profiles.json'a kopyalanmaz); aynı dosya yeniden
+        # açılırsa aynı profil diskteki içerikle yenilenir, "Ad (2)" gibi kopyalar oluşmaz
+        profile_name = utils.session_profile_for(path)
+        if profile_name is None:
+            base_name = profile.get("project_info", {}).get("name") or os.path.splitext(os.path.basename(path))[0]
+            profile_name = self._unique_profile_name(base_name)
+        self.profiles_data[profile_name] = profile; self.project = project
+        utils.session_profiles[profile_name] = os.path.abspath(path)
+        self._activate_project_profile(profile_name, "Proje aç")
+
+    def save_project(self):
+        """Açık projeyi kaydeder (yalnızca değişen bölümler yazılır); yolu yoksa Farklı Kaydet'e yönlendirir."""
+        path = utils.session_profiles.get(self.current_profile_name)
+        if not path: self.save_project_as(); return
+        self._write_project(path)
+
+    def save_project_as(self):
+        path = self._ask_project_path(self.current_profile_name)
+        if path: self._write_project(path)
+
+    def _ask_project_path(self, profile_name):
+        default_name = self.profiles_data.get(profile_name, {}).get("project_info", {}).get("name") or profile_name
+        return filedialog.asksaveasfilename(parent=self.root, title="Projeyi Farklı Kaydet", initialfile=f"{default_name}{project_file.PROJECT_EXTENSION}",
+                                            defaultextension=project_file.PROJECT_EXTENSION,
+                                            filetypes=[("EngPY Projesi", "*" + project_file.PROJECT_EXTENSION), ("Tümü", "*.*")])
+
+    def _project_for(self, profile_name):
+        """Oturum profilinin proje dosyası: açık proje, yoksa diskten yeniden açılır (çizim/sonuç bölümleri korunur)."""
+        if self.project is not None and self.project_profile_name == profile_name: return self.project
+        path = utils.session_profiles.get(profile_name)
+        if path and os.path.exists(path): return project_file.ProjectFile.open(path)
+        return project_file.new_project(self.profiles_data[profile_name])
+
+    def _write_project(self, path, profile_name=None):
+        profile_name = profile_name or self.current_profile_name
+        profile = self.profiles_data.get(profile_name)
+        if profile is None: messagebox.showinfo("Bilgi", "Kaydedilecek aktif bir profil yok.", parent=self.root); return
+        copied = profile_name not in utils.session_profiles
+        # Açık proje başka profile bağlıysa kaydedilmemiş bölümleri (çizimler dahil) sormadan bırakma
+        if (copied or self.project_profile_name != profile_name) and not self._confirm_unsaved_project(): return
+        if copied:
+            # Kütüphane profili projeye kopyalanır: profiles.json'daki profil olduğu gibi kalır
+            profile_name = self._unique_profile_name(profile.get("project_info", {}).get("name") or os.path.splitext(os.path.basename(path))[0])
+            profile = self.profiles_data[profile_name] = record_pool.copy_profile(profile)
+            utils.session_profiles[profile_name] = None
+        if self.project_profile_name != profile_name:
+            self.project = self._project_for(profile_name); self.project_profile_name = profile_name
+        self.project.update_from_profile(profile)
+        try: self.project.save(path)
+        except Exception as e:
+            if copied: # Kopya yalnızca kayıt için oluşturuldu
+                self.profiles_data.pop(profile_name, None); utils.session_profiles.pop(profile_name, None)
+                self.project = None; self.project_profile_name = None
+            messagebox.showerror("Hata", f"Proje kaydedilemedi:\n{e}", parent=self.root); return
+        utils.session_profiles[profile_name] = os.path.abspath(path)
+        if copied: self._activate_project_profile(profile_name, "Projeyi kaydet")
+        elif profile_name == self.current_profile_name: self.root.title(f"{config.APP_NAME} - {os.path.basename(path)}")
+
+    # --- Bağımlı Tasarımların Arka Plan Hesabı ---
+    def schedule_design_recompute(self):
+        """Kirli tasarımları arayüz boştayken küçük parçalar halinde yeniden hesaplar."""
+        if self._design_recompute_job is None: self._design_recompute_job = self.root.after(50, self._recompute_designs_step)
+
+    def _recompute_designs_step(self):
+        self._design_recompute_job = None
+        remaining = 0
+        for graph in self.design_graphs.dirty_graphs():
+            try: remaining += graph.recompute_some(budget=25)
+            except Exception as e: print(f"Error recomputing designs: {e}")
+        if remaining: self.schedule_design_recompute()
+
+    # --- Geri Al / Yinele ---
+    def record_undo_step(self, label, touched=None):
+        """Profillerdeki değişikliği geri al geçmişine kaydeder (değişiklik yoksa bir şey yapmaz).
+        touched: değişmiş olabilecek profil adları (None: tüm profiller taranır)."""
+        try: self.history.commit(label, self.profiles_data, touched)
+        except Exception as e: print(f"Error recording undo step: {e}")
+
+    def _restore_history_state(self, label):
+        """Geçmişteki geçerli adımı profillere uygular, kaydeder ve açık sayfayı yeniler."""
+        self.history.apply(self.profiles_data)
+        if self.current_profile_name not in self.profiles_data and self.profiles_data:
+            self.current_profile_name = sorted(self.profiles_data.keys())[0]
+        utils.current_profile_name = self.current_profile_name
+        utils.save_profiles()
+        if isinstance(self.current_frame_widget, CalculationsFrame): self.current_frame_widget.refresh_after_external_change()
+        print(f"Info: History position {self.history.position} ({label}).")
+
+    def undo(self):
+        if not self.history.can_undo: print("Info: Nothing to undo."); return
+        undone = self.history.labels()[self.history.position]
+        self.history.undo(); self._restore_history_state(f"undone: {undone}")
+
+    def redo(self):
+        if not self.history.can_redo: print("Info: Nothing to redo."); return
+        self._restore_history_state(f"redone: {self.history.redo()}")
+
+    def show_history_dialog(self):
+        """Geçmiş adımlarını listeler; seçilen adıma doğrudan atlanır."""
+        dialog = tk.Toplevel(self.root); dialog.title("Düzenleme Geçmişi"); dialog.transient(self.root)
+        dialog.configure(bg=self.current_theme['content_bg'])
+        listbox = tk.Listbox(dialog, height=15, width=40, font=("Segoe UI", 13), relief='flat', bd=1, bg=self.current_theme['listbox_bg'], fg=self.current_theme['listbox_fg'], selectbackground=self.current_theme['listbox_select_bg'], selectforeground=self.current_theme['title_text'], highlightthickness=1, highlightbackground=self.current_theme['entry_border'], exportselection=False)
+        listbox.pack(expand=True, fill='both', padx=10, pady=10)
+        for i, label in enumerate(self.history.labels()): listbox.insert(tk.END, f"{i + 1}. {label}")
+        if self.history.position >= 0: listbox.selection_set(self.history.position); listbox.see(self.history.position)
+        def jump():
+            selection = listbox.curselection()
+            if selection and selection[0] != self.history.position: self._restore_history_state(f"jumped to: {self.history.goto(selection[0])}")
+            dialog.destroy()
+        ui_components.create_content_button(dialog, "Bu Adıma Dön", self.current_theme, command=jump).pack(pady=(0, 10))
+
+    def _poll_shared_profiles(self):
+        """Diğer EngPY süreçlerinin profiles.json'a yaptığı değişiklikleri uygular, çakışmaları sorar."""
+        try:
+            reloaded, conflicts = utils.poll_shared_profiles()
+            for name in sorted(conflicts):
+                keep_local = messagebox.askyesno("Profil Çakışması",
+                    f"'{name}' profili başka bir kullanıcı tarafından değiştirildi ve sizin kaydedilmemiş değişiklikleriniz var.\n\n"
+                    "Evet: Kendi sürümünüzü kaydedin (diğer değişikliklerin üzerine yazılır)\n"
+                    "Hayır: Diskteki sürümü yükleyin (sizin değişiklikleriniz kaybolur)", parent=self.root)
+                utils.resolve_profile_conflict(name, keep_local)
+                if not keep_local: reloaded.add(name)
+            if self.current_profile_name not in self.profiles_data and self.profiles_data:
+                self.current_profile_name = list(self.profiles_data.keys())[0]
+            # Aktif profil değiştiyse Hesaplamalar sayfasını yenile
+            if reloaded: self.record_undo_step("Dış değişiklik", reloaded)
+            if self.current_profile_name in reloaded and isinstance(self.current_frame_widget, CalculationsFrame):
+                self.current_frame_widget.refresh_after_external_change()
+        except Exception as e: print(f"Error polling shared profiles: {e}")
+        finally: self.root.after(config.PROFILE_POLL_INTERVAL_MS, self._poll_shared_profiles)
+
+    def _confirm_unsaved_project(self):
+        """Açık proje kaydedilmemiş değişiklik içeriyorsa sorar. İşlem sürecekse True."""
+        name = self.project_profile_name
+        if self.project is None or name not in utils.session_profiles or name not in self.profiles_data: return True
+        self.project.update_from_profile(self.profiles_data[name])
+        if not self.project.is_dirty: return True
+        path = utils.session_profiles[name]
+        answer = messagebox.askyesnocancel("Kaydedilmemiş Proje", f"'{os.path.basename(path) if path else name}' projesindeki değişiklikler kaydedilsin mi?", parent=self.root)
+        if answer is None: return False
+        if answer:
+            path = path or self._ask_project_path(name)
+            if not path: return False
+            self._write_project(path, name)
+        return True
+
     def quit_app(self):
         """Ayarları kaydedip uygulamayı kapatır."""
+        if not self._confirm_unsaved_project(): return
         print("Saving settings and exiting application...")
         try:
             current_geometry = self.root.winfo_geometry()
             self.app_settings['window_geometry'] = current_geometry
             utils.save_settings()
-            # utils.save_profiles() # İsteğe bağlı olarak profilleri de kapatırken kaydet
+            utils.flush_pending_writes() # Arka planda bekleyen ayar/profil kayıtlarını tamamla
         except Exception as e: print(f"Error saving settings on closing: {e}")
-        finally: self.root.destroy()
+        finally:
+            worker = com_worker.get_worker()
+            # Bekleyen OSNAP/GRID değişikliklerini yaz; COM iş parçacığı meşgulse (uzun çizim, nokta
+            # seçimi) kapanış beklemez, yazma atlanır
+            if worker.pending: print(f"Warning: COM worker busy ({worker.pending} job(s)), skipping system variable flush.")
+            else: autocad_interface.sysvars.flush()
+            worker.stop() # Bekleyen AutoCAD işlerini iptal et
+            self.root.destroy()
 
@@ -0,0 +1,100 @@
+# persistence.py
+# Ayar ve profil dosyaları için gecikmeli (write-behind) arka plan kaydı.
+# Art arda gelen kayıt istekleri kısa bir sessizlik süresi boyunca biriktirilir
+# ve ayrı bir iş parçacığında tek yazmaya dönüştürülür; arayüz diske beklemez.
+
+import os
+import time
+import threading
+
+
+def write_text_atomic(path, text):
+    """Metni önce geçici dosyaya yazar, sonra tek adımda yerine koyar (yarım dosya kalmaz)."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f: f.write(text)
+    os.replace(tmp_path, path)
+
+
+class WriteBehindWriter:
+    """İstekleri birleştirip 'delay' saniyelik sessizlikten sonra write_func'ı arka planda çağırır.
+
+    snapshot verilirse schedule() onu çağıran (arayüz) iş parçacığında çağırır ve yazma
+    write_func(son anlık görüntü) olarak yapılır: arka plan iş parçacığı arayüzün değiştirmeye
+    devam ettiği nesnelere hiç dokunmaz. snapshot yoksa write_func() veriyi kendisi okur;
+    serileştirme sırasında veri değişirse (RuntimeError) yazma bir sonraki tura ertelenir.
+    """
+
+    def __init__(self, name, write_func, delay=0.5, snapshot=None):
+        self.name = name
+        self.write_func = write_func
+        self.delay = delay
+        self.snapshot = snapshot
+        self._cond = threading.Condition()
+        self._data = None # Son anlık görüntü (snapshot kullanılıyorsa)
+        self._dirty = False
+        self._writing = False
+        self._last_request = 0.0
+        self._thread = None
+
+    def schedule(self):
+        """Yazma isteği bırakır; hemen döner (snapshot varsa veri burada, çağıranın iş parçacığında kopyalanır)."""
+        data = self.snapshot() if self.snapshot is not None else None
+        with self._cond:
+            self._data = data
+            self._dirty = True
+            self._last_request = time.monotonic()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=f"write-behind-{self.name}", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    @property
+    def pending(self):
+        with self._cond: return self._dirty or self._writing
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._dirty: self._cond.wait()
+                # Sessizlik süresi dolana kadar bekle (yeni istekler süreyi uzatır)
+                while self._dirty:
+                    remaining = self._last_request + self.delay - time.monotonic()
+                    if remaining <= 0: break
+                    self._cond.wait(remaining)
+                if not self._dirty: continue # flush() bu arada yazdı
+                data = self._take()
+            self._write_once(data)
+
+    def _take(self):
+        # Kilit altında çağrılır: bekleyen anlık görüntüyü yazıma alır
+        data = self._data; self._data = None
+        self._dirty = False; self._writing = True
+        return data
+
+    def _write_once(self, data=None):
+        try:
+            if self.snapshot is None: self.write_func()
+            else: self.write_func(data)
+        except RuntimeError as e:
+            # Örn. "dictionary changed size during iteration": veri yazılırken düzenlendi (snapshot yoksa)
+            print(f"Warning: {self.name} changed while saving ({e}); retrying.")
+            with self._cond:
+                if self._data is None: self._data = data
+                self._dirty = True; self._last_request = time.monotonic()
+        except Exception as e: print(f"Error in background save ({self.name}): {e}")
+        finally:
+            with self._cond: self._writing = False; self._cond.notify_all()
+
+    def flush(self, timeout=10.0):
+        """Bekleyen yazmayı hemen (çağıran iş parçacığında) yapar; süren yazmanın bitmesini bekler."""
+        deadline = time.monotonic() + timeout
+        for _ in range(3): # Serileştirme çakışırsa birkaç kez dene
+            with self._cond:
+                while self._writing:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0: print(f"Warning: Timed out waiting for {self.name} save."); return False
+                    self._cond.wait(remaining)
+                if not self._dirty: return True
+                data = self._take()
+            self._write_once(data)
+        with self._cond: return not self._dirty
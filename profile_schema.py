@@ -0,0 +1,179 @@
+# profile_schema.py
+# Profil verisi için şema doğrulaması. Şema bir kez derlenir (alan başına hazır kontrol
+# fonksiyonları), sonra kayıtlar tek geçişte ve tüm hatalar toplanarak doğrulanır.
+# IncrementalValidator daha önce doğrulanmış (değişmemiş) kayıtları tekrar kontrol etmez;
+# yalnızca düzenlenen/yeni kayıtlar doğrulanır.
+
+import math
+
+import records
+
+
+# ==================================
+# ŞEMA TANIMI
+# ==================================
+# Alan: (tip, zorunlu mu, ek kurallar). Sayısal aralıklar (alt, üst) dahil; birimler yorumlarda.
+def number(lo=None, hi=None, exclusive_lo=False, integer=False):
+    return ("number", {"lo": lo, "hi": hi, "exclusive_lo": exclusive_lo, "integer": integer})
+
+def text(nonempty=False, choices=None):
+    return ("text", {"nonempty": nonempty, "choices": choices})
+
+def flag():
+    return ("flag", {})
+
+def nested(fields, discriminator=None):
+    """İç içe sözlük. discriminator verilirse alanlar üst kaydın o alanının değerine göre seçilir."""
+    return ("nested", {"fields": fields, "discriminator": discriminator})
+
+MATERIAL_SCHEMA = {
+    "user_name": (text(nonempty=True), True),
+    "type": (text(choices=records.MATERIAL_TYPES), True),
+    "class": (text(), False),
+    "is_custom": (flag(), False),
+    "props": (nested({
+        records.MATERIAL_TYPE_CONCRETE: {"fck": (number(0, 150, exclusive_lo=True), True)}, # MPa
+        records.MATERIAL_TYPE_REBAR: {"fyk": (number(0, 2000, exclusive_lo=True), True),   # MPa
+                                      "Es": (number(0, 300000, exclusive_lo=True), False)}, # MPa
+    }, discriminator="type"), True),
+}
+SECTION_SCHEMA = {
+    "user_name": (text(nonempty=True), True),
+    "type": (text(choices=records.SECTION_TYPES), True),
+    "material_name": (text(), True),
+    "dimensions": (nested({
+        records.SECTION_TYPE_RECT: {"b": (number(0, 20000, exclusive_lo=True), True), "h": (number(0, 20000, exclusive_lo=True), True)}, # mm
+        records.SECTION_TYPE_CIRCLE: {"D": (number(0, 20000, exclusive_lo=True), True)}, # mm
+        records.SECTION_TYPE_STEEL: {"b": (number(0, 2000, exclusive_lo=True), True), "h": (number(0, 2000, exclusive_lo=True), True)}, # mm
+    }, discriminator="type"), True),
+    "profile": (text(), False), # Çelik Profil: steel_catalog'daki profil adı
+}
+DESIGN_SCHEMA = {
+    "user_name": (text(nonempty=True), True),
+    "section_name": (text(nonempty=True), True),
+    "rebar_name": (text(nonempty=True), True),
+    "n_top": (number(0, 200, exclusive_lo=True, integer=True), True), # adet
+    "phi_top": (number(0, 60, exclusive_lo=True), True),              # mm
+    "cover": (number(0, 200), True),                                   # mm
+    "stirrup_phi": (number(0, 40), True),                              # mm
+    "Md_kNm": (number(), True),                                        # kNm
+}
+PROJECT_INFO_SCHEMA = {key: (text(), False) for key in ("name", "desc", "engineer", "concrete_reg", "seismic_reg", "load_reg", "units")}
+LIST_SCHEMAS = {"materials": MATERIAL_SCHEMA, "sections": SECTION_SCHEMA, "designs": DESIGN_SCHEMA}
+
+
+# ==================================
+# DERLEME
+# ==================================
+def _compile_field(spec):
+    kind, opts = spec
+    if kind == "number":
+        lo = opts["lo"]; hi = opts["hi"]; exclusive_lo = opts["exclusive_lo"]; integer = opts["integer"]
+        def check(value, path, errors, parent):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                errors.append((path, f"sayı olmalı (değer: {value!r})")); return
+            if not math.isfinite(value): errors.append((path, "sonlu bir sayı olmalı")); return
+            if integer and value != int(value): errors.append((path, f"tam sayı olmalı (değer: {value})"))
+            if lo is not None and (value <= lo if exclusive_lo else value < lo):
+                errors.append((path, f"{'>' if exclusive_lo else '>='} {lo:g} olmalı (değer: {value:g})"))
+            if hi is not None and value > hi: errors.append((path, f"<= {hi:g} olmalı (değer: {value:g})"))
+        return check
+    if kind == "text":
+        nonempty = opts["nonempty"]; choices = frozenset(opts["choices"]) if opts["choices"] else None
+        def check(value, path, errors, parent):
+            if not isinstance(value, str): errors.append((path, f"metin olmalı (değer: {value!r})")); return
+            if nonempty and not value.strip(): errors.append((path, "boş olamaz"))
+            if choices is not None and value not in choices: errors.append((path, f"bilinmeyen değer '{value}' (geçerli: {', '.join(sorted(choices))})"))
+        return check
+    if kind == "flag":
+        def check(value, path, errors, parent):
+            if not isinstance(value, bool) and value not in (0, 1): errors.append((path, f"evet/hayır olmalı (değer: {value!r})"))
+        return check
+    if kind == "nested":
+        discriminator = opts["discriminator"]
+        if discriminator is None:
+            inner = compile_schema(opts["fields"])
+            def check(value, path, errors, parent):
+                if not isinstance(value, dict): errors.append((path, "sözlük olmalı")); return
+                inner(value, path, errors)
+        else:
+            variants = {variant: compile_schema(fields) for variant, fields in opts["fields"].items()}
+            def check(value, path, errors, parent):
+                if not isinstance(value, dict): errors.append((path, "sözlük olmalı")); return
+                inner = variants.get(parent.get(discriminator))
+                if inner is not None: inner(value, path, errors) # Bilinmeyen tip zaten üst alanda raporlanır
+        return check
+    raise ValueError(f"Bilinmeyen şema alan tipi: {kind}")
+
+
+def compile_schema(schema):
+    """Şemayı tek bir doğrulama fonksiyonuna derler: validate(record, path, errors)."""
+    fields = tuple((key, _compile_field(spec), required) for key, (spec, required) in schema.items())
+    def validate(record, path, errors):
+        if not isinstance(record, dict): errors.append((path, "sözlük olmalı")); return
+        for key, check, required in fields:
+            value = record.get(key)
+            if value is None:
+                if required: errors.append((f"{path}.{key}", "zorunlu alan eksik"))
+                continue
+            check(value, f"{path}.{key}", errors, record)
+    return validate
+
+
+_COMPILED_LISTS = {list_key: compile_schema(schema) for list_key, schema in LIST_SCHEMAS.items()}
+_COMPILED_PROJECT_INFO = compile_schema(PROJECT_INFO_SCHEMA)
+
+
+# ==================================
+# DOĞRULAMA
+# ==================================
+def validate_record(list_key, record, path=None):
+    """Tek kaydı doğrular; (yol, mesaj) hata listesini döndürür (boşsa geçerli)."""
+    errors = []
+    _COMPILED_LISTS[list_key](record, path or f"{list_key}[{record.get('user_name', '?') if isinstance(record, dict) else '?'}]", errors)
+    return errors
+
+
+def format_errors(errors, max_lines=20):
+    lines = [f"{path}: {message}" for path, message in errors[:max_lines]]
+    if len(errors) > max_lines: lines.append(f"... ve {len(errors) - max_lines} hata daha")
+    return "\n".join(lines)
+
+
+class IncrementalValidator:
+    """Profilleri doğrular; geçerli bulunan kayıt nesnelerini hatırlar ve tekrar kontrol etmez.
+    (Kayıt sözlükleri yerinde değiştirilmediği için aynı nesne = aynı içerik.)"""
+
+    def __init__(self):
+        self._valid = {} # id(kayıt) -> kayıt (nesne canlı kaldıkça id geçerli)
+        self.checked = 0
+
+    def validate_profile(self, name, profile, _live=None):
+        errors = []
+        if not isinstance(profile, dict): return [(name, "profil sözlük olmalı")]
+        info = profile.get("project_info")
+        if info is not None: _COMPILED_PROJECT_INFO(info, f"{name}.project_info", errors)
+        for list_key, validate in _COMPILED_LISTS.items():
+            items = profile.get(list_key)
+            if items is None: continue
+            if not isinstance(items, list): errors.append((f"{name}.{list_key}", "liste olmalı")); continue
+            seen = set()
+            for index, record in enumerate(items):
+                record_name = record.get("user_name") if isinstance(record, dict) else None
+                path = f"{name}.{list_key}[{record_name or index}]"
+                if record_name is not None:
+                    if record_name in seen: errors.append((path, "aynı isimli kayıt birden fazla kez tanımlı"))
+                    seen.add(record_name)
+                if _live is not None: _live.add(id(record))
+                if self._valid.get(id(record)) is record: continue
+                before = len(errors); validate(record, path, errors); self.checked += 1
+                if len(errors) == before: self._valid[id(record)] = record
+        return errors
+
+    def validate_profiles(self, profiles):
+        """Tüm profilleri tek geçişte doğrular; tüm hataları döndürür."""
+        errors = []; live = set()
+        for name, profile in profiles.items(): errors.extend(self.validate_profile(name, profile, live))
+        # Artık hiçbir profilde bulunmayan kayıtları bırak
+        if len(self._valid) > len(live): self._valid = {key: record for key, record in self._valid.items() if key in live}
+        return errors
@@ -0,0 +1,184 @@
+# profile_snapshots.py
+# Profil kütüphanesinin sürümlü anlık görüntüleri ve sürümler arası hızlı fark.
+#
+# Kayıtlar içerik özetleriyle (record_pool.record_id) adreslenen bir nesne deposunda
+# bir kez saklanır: snapshots/objects.pack (yalnızca sonuna eklenen paket). Her anlık görüntü
+# yalnızca "profil -> bölüm -> isim -> özet" manifestidir. İki sürümün farkı özet
+# kümeleri üzerinde küme işlemidir; yalnızca değişen kayıtların içeriği okunur.
+
+import os
+import json
+import time
+import getpass
+
+import config
+import persistence
+import record_pool
+
+SNAPSHOT_LISTS = ("materials", "sections", "designs")
+_LIST_TITLES = {"materials": "Malzeme", "sections": "Kesit", "designs": "Tasarım", "project_info": "Proje bilgisi"}
+
+
+class SnapshotStore:
+    """İçerik adresli kayıt deposu + anlık görüntü manifestleri."""
+
+    def __init__(self, directory=None):
+        self.directory = directory or config.PROFILE_SNAPSHOT_DIR
+        self.pack_path = os.path.join(self.directory, "objects.pack") # "özet<TAB>json" satırları, yalnızca eklenir
+        self._hash_cache = {} # id(kayıt) -> (kayıt, özet); değişmeyen kayıtlar tekrar özetlenmez (proje bilgisi hariç, yerinde düzenlenir)
+        self._offsets = None
+
+    # --- Nesne Deposu ---
+    def _index(self):
+        """Özet -> paket dosyasındaki ofset (ilk kullanımda paket bir kez taranır)."""
+        if self._offsets is None:
+            self._offsets = {}
+            if os.path.exists(self.pack_path):
+                with open(self.pack_path, "rb") as f:
+                    offset = 0
+                    for line in f:
+                        self._offsets[line[:16].decode("ascii")] = offset; offset += len(line)
+        return self._offsets
+
+    def _hash(self, record):
+        cached = self._hash_cache.get(id(record))
+        if cached is not None and cached[0] is record: return cached[1]
+        digest = record_pool.record_id(record)
+        self._hash_cache[id(record)] = (record, digest)
+        return digest
+
+    def _store_objects(self, records_by_digest):
+        """Depoda olmayan kayıtları paket dosyasının sonuna tek yazmada ekler. Eklenen sayıyı döndürür."""
+        index = self._index()
+        new = [(digest, record) for digest, record in records_by_digest.items() if digest not in index]
+        if not new: return 0
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.pack_path, "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            for digest, record in new:
+                line = (digest + "\t" + json.dumps(record, ensure_ascii=False, sort_keys=True) + "\n").encode("utf-8")
+                f.write(line); index[digest] = offset; offset += len(line)
+        return len(new)
+
+    def load_object(self, digest):
+        offset = self._index().get(digest)
+        if offset is None: raise KeyError(digest)
+        with open(self.pack_path, "rb") as f:
+            f.seek(offset); line = f.readline()
+        return json.loads(line[17:].decode("utf-8"))
+
+    # --- Anlık Görüntüler ---
+    def create(self, profiles_data, label=""):
+        """Tüm profillerin anlık görüntüsünü alır; yalnızca depoda olmayan kayıtlar yazılır. Manifest kimliğini döndürür."""
+        manifest = {"label": label, "created": time.strftime("%Y-%m-%d %H:%M:%S"), "author": _current_user(), "profiles": {}}
+        objects = {}; live = set()
+        for name, profile in profiles_data.items():
+            entry = {}
+            info = profile.get("project_info", {})
+            digest = record_pool.record_id(info); objects[digest] = info; entry["project_info"] = digest
+            for list_key in SNAPSHOT_LISTS:
+                names = {}
+                for record in profile.get(list_key, []):
+                    digest = self._hash(record); live.add(id(record))
+                    objects[digest] = record; names[record.get("user_name", "")] = digest
+                entry[list_key] = names
+            manifest["profiles"][name] = entry
+        new_objects = self._store_objects(objects)
+        # Bellekteki özet önbelleğini güncel kayıtlarla sınırla
+        self._hash_cache = {key: value for key, value in self._hash_cache.items() if key in live}
+        snapshot_id = time.strftime("%Y%m%d-%H%M%S")
+        os.makedirs(self.directory, exist_ok=True)
+        while os.path.exists(os.path.join(self.directory, snapshot_id + ".json")): snapshot_id += "_"
+        persistence.write_text_atomic(os.path.join(self.directory, snapshot_id + ".json"), json.dumps(manifest, ensure_ascii=False))
+        print(f"Profile snapshot '{snapshot_id}' created ({new_objects} new records stored).")
+        return snapshot_id
+
+    def list(self):
+        """(kimlik, etiket, tarih, kullanıcı) listesi, en yenisi sonda."""
+        if not os.path.isdir(self.directory): return []
+        result = []
+        for file_name in sorted(os.listdir(self.directory)):
+            if not file_name.endswith(".json"): continue
+            try:
+                with open(os.path.join(self.directory, file_name), "r", encoding="utf-8") as f: manifest = json.load(f)
+            except (OSError, ValueError) as e: print(f"Warning: Snapshot '{file_name}' unreadable ({e})."); continue
+            result.append((file_name[:-5], manifest.get("label", ""), manifest.get("created", ""), manifest.get("author", "")))
+        return result
+
+    def load_manifest(self, snapshot_id):
+        with open(os.path.join(self.directory, snapshot_id + ".json"), "r", encoding="utf-8") as f: return json.load(f)
+
+    def manifest_of(self, profiles_data):
+        """Güncel (kaydedilmemiş) durumun manifesti; nesneler depoya yazılmaz."""
+        profiles = {}
+        for name, profile in profiles_data.items():
+            entry = {"project_info": record_pool.record_id(profile.get("project_info", {}))}
+            for list_key in SNAPSHOT_LISTS:
+                entry[list_key] = {record.get("user_name", ""): self._hash(record) for record in profile.get(list_key, [])}
+            profiles[name] = entry
+        return {"label": "Güncel durum", "profiles": profiles}
+
+    # --- Fark ---
+    def diff(self, old_manifest, new_manifest, current_profiles=None):
+        """İki manifestin farkı: [(profil, bölüm, isim, durum, ayrıntı)]. durum: eklendi/silindi/değişti.
+        current_profiles verilirse depoda olmayan (güncel durumdaki) kayıtlar oradan okunur."""
+        changes = []
+        old_profiles = old_manifest.get("profiles", {}); new_profiles = new_manifest.get("profiles", {})
+        for name in sorted(set(old_profiles) - set(new_profiles)): changes.append((name, "profile", name, "silindi", ""))
+        for name in sorted(set(new_profiles) - set(old_profiles)): changes.append((name, "profile", name, "eklendi", ""))
+        for name in sorted(set(old_profiles) & set(new_profiles)):
+            old_entry = old_profiles[name]; new_entry = new_profiles[name]
+            if old_entry.get("project_info") != new_entry.get("project_info"):
+                detail = self._field_diff(old_entry.get("project_info"), new_entry.get("project_info"), current_profiles, name, "project_info", None)
+                changes.append((name, "project_info", "", "değişti", detail))
+            for list_key in SNAPSHOT_LISTS:
+                old_items = old_entry.get(list_key, {}); new_items = new_entry.get(list_key, {})
+                # (isim, özet) çiftleri üzerinde simetrik fark: değişmeyen kayıtlar hiç karşılaştırılmaz
+                changed = set(old_items.items()) ^ set(new_items.items())
+                for record_name in sorted({record_name for record_name, _ in changed}):
+                    if record_name not in new_items: changes.append((name, list_key, record_name, "silindi", ""))
+                    elif record_name not in old_items: changes.append((name, list_key, record_name, "eklendi", ""))
+                    else:
+                        detail = self._field_diff(old_items[record_name], new_items[record_name], current_profiles, name, list_key, record_name)
+                        changes.append((name, list_key, record_name, "değişti", detail))
+        return changes
+
+    def _resolve(self, digest, current_profiles, profile_name, list_key, record_name):
+        try: return self.load_object(digest)
+        except (KeyError, OSError): pass
+        profile = (current_profiles or {}).get(profile_name, {})
+        if list_key == "project_info": return profile.get("project_info", {})
+        return next((r for r in profile.get(list_key, []) if r.get("user_name") == record_name), {})
+
+    def _field_diff(self, old_digest, new_digest, current_profiles, profile_name, list_key, record_name):
+        old = _flatten(self._resolve(old_digest, current_profiles, profile_name, list_key, record_name))
+        new = _flatten(self._resolve(new_digest, current_profiles, profile_name, list_key, record_name))
+        parts = [f"{key}: {old.get(key, '-')} → {new.get(key, '-')}" for key in sorted(set(old) | set(new)) if old.get(key) != new.get(key)]
+        return ", ".join(parts)
+
+
+def format_diff(changes, old_manifest=None, new_manifest=None):
+    """Fark listesini okunur metne çevirir."""
+    lines = []
+    if old_manifest is not None and new_manifest is not None:
+        describe = lambda m: f"{m.get('label') or '-'} ({m.get('created', 'şimdi')}, {m.get('author', '')})".replace(", )", ")")
+        lines.append(f"Eski: {describe(old_manifest)}\nYeni: {describe(new_manifest)}\n")
+    if not changes: lines.append("Fark yok."); return "\n".join(lines)
+    for profile_name, list_key, record_name, status, detail in changes:
+        title = "Profil" if list_key == "profile" else _LIST_TITLES.get(list_key, list_key)
+        label = f"[{profile_name}] {title}" + (f" '{record_name}'" if record_name and list_key != "profile" else "")
+        lines.append(f"{label} {status}" + (f": {detail}" if detail else ""))
+    lines.append(f"\nToplam {len(changes)} değişiklik.")
+    return "\n".join(lines)
+
+
+def _flatten(record, prefix=""):
+    result = {}
+    for key, value in (record or {}).items():
+        if isinstance(value, dict): result.update(_flatten(value, f"{prefix}{key}."))
+        else: result[f"{prefix}{key}"] = value
+    return result
+
+def _current_user():
+    try: return getpass.getuser()
+    except Exception: return ""
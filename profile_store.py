@@ -0,0 +1,222 @@
+# profile_store.py
+# Ortak sürücüdeki profiles.json dosyasını birden çok EngPY sürecinin güvenle
+# paylaşabilmesi için dosya kilidi + profil bazlı sürüm damgası (iyimser eşzamanlılık).
+# Kaydederken yalnızca değişen profiller diskteki güncel içerikle birleştirilir;
+# başka bir süreç dosyayı değiştirdiğinde mtime/boyut kontrolüyle fark edilir ve
+# yalnızca sürümü değişen profiller belleğe alınır.
+
+import os
+import json
+import time
+import hashlib
+import threading
+
+import persistence
+import record_pool
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+REV_KEY = "_rev" # Diskteki her profilin sürüm damgası (bellekte tutulmaz)
+
+
+class FileLock:
+    """Süreçler arası özel kilit (POSIX: flock, Windows: msvcrt.locking)."""
+
+    def __init__(self, path, timeout=10.0, poll_interval=0.05):
+        self.path = path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._fd = None
+
+    def acquire(self):
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                if fcntl: fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                elif msvcrt: os.lseek(fd, 0, os.SEEK_SET); msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                self._fd = fd
+                return self
+            except OSError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise TimeoutError(f"Kilit alınamadı: {self.path}")
+                time.sleep(self.poll_interval)
+
+    def release(self):
+        if self._fd is None: return
+        try:
+            if fcntl: fcntl.flock(self._fd, fcntl.LOCK_UN)
+            elif msvcrt: os.lseek(self._fd, 0, os.SEEK_SET); msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd); self._fd = None
+
+    def __enter__(self): return self.acquire()
+
+    def __exit__(self, *exc): self.release()
+
+
+def profile_hash(profile):
+    """Profil içeriğinin (sürüm damgası hariç) özet değeri."""
+    content = {k: v for k, v in profile.items() if k != REV_KEY}
+    return hashlib.sha1(json.dumps(content, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class ProfileStore:
+    """profiles.json için kilitli, sürüm kontrollü okuma/yazma."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock_path = path + ".lock"
+        self.base_revs = {}    # Bellekteki her profilin dayandığı disk sürümü
+        self.base_hashes = {}  # ... ve o sürümün içerik özeti
+        self.conflicts = set() # Kaydedilemeyen (başkası tarafından değiştirilmiş) profiller
+        self._reported_conflicts = set()
+        self._signature = None # Son görülen (mtime_ns, boyut)
+        self._incoming = {}    # Kayıt sırasında diskte görülen, belleğe alınmamış yeni sürümler
+        self._state_lock = threading.Lock() # Arka plan yazıcısı ile arayüz iş parçacığı arasında
+
+    # --- Yardımcılar ---
+    def _stat_signature(self):
+        try: st = os.stat(self.path)
+        except FileNotFoundError: return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _read_disk(self):
+        if not os.path.exists(self.path): return {}
+        with open(self.path, "r", encoding="utf-8") as f: data = json.load(f)
+        if not isinstance(data, dict): raise ValueError("Profil dosyası geçersiz (sözlük bekleniyordu).")
+        return record_pool.decode_profiles(data) # Ortak kayıt havuzu başvurularını çöz (paylaşılan nesneler)
+
+    @staticmethod
+    def _strip(profile):
+        return {k: v for k, v in profile.items() if k != REV_KEY}
+
+    # --- Yükleme ---
+    def load(self):
+        """Dosyayı okur, sürüm damgalarını ayıklar ve profilleri döndürür."""
+        with FileLock(self.lock_path):
+            disk = self._read_disk()
+            signature = self._stat_signature()
+        profiles = {}
+        with self._state_lock:
+            self.base_revs = {}; self.base_hashes = {}; self._incoming = {}; self.conflicts = set(); self._reported_conflicts = set()
+            for name, profile in disk.items():
+                if not isinstance(profile, dict): continue
+                profiles[name] = self._strip(profile)
+                self.base_revs[name] = profile.get(REV_KEY, 0)
+                self.base_hashes[name] = profile_hash(profiles[name])
+            self._signature = signature
+        return profiles
+
+    # --- Kaydetme ---
+    def save(self, profiles, force=()):
+        """Yalnızca değişen/silinen profilleri diskteki güncel içerikle birleştirip yazar.
+
+        Okunduğundan beri başka süreçte değişmiş profiller yazılmaz, self.conflicts'e eklenir
+        ('force' içindekiler hariç). Kaydedilen profil isimlerini döndürür.
+        """
+        profiles = dict(profiles) # Arka plan iş parçacığında çalışırken isim listesi sabit kalsın
+        current_hashes = {name: profile_hash(profile) for name, profile in profiles.items()}
+        with self._state_lock:
+            changed = {name for name, h in current_hashes.items() if self.base_hashes.get(name) != h}
+            deleted = set(self.base_revs) - set(current_hashes)
+        if not changed and not deleted: return set()
+
+        with FileLock(self.lock_path):
+            try: disk = self._read_disk()
+            except ValueError as e: print(f"Warning: Profile file unreadable ({e}); it will be rewritten."); disk = {}
+            conflicts = set(); written = set()
+            with self._state_lock:
+                for name in changed | deleted:
+                    disk_rev = disk[name].get(REV_KEY, 0) if isinstance(disk.get(name), dict) else None
+                    base_rev = self.base_revs.get(name)
+                    if name in deleted and disk_rev is None: written.add(name); continue # İki taraf da silmiş
+                    if disk_rev != base_rev and name not in force: conflicts.add(name); continue
+                    if name in deleted: disk.pop(name, None)
+                    else:
+                        new_profile = dict(profiles[name]); new_profile[REV_KEY] = (disk_rev or 0) + 1
+                        disk[name] = new_profile
+                    written.add(name)
+                if written:
+                    persistence.write_text_atomic(self.path, json.dumps(record_pool.encode_profiles(disk), indent=4, ensure_ascii=False))
+                    self._signature = self._stat_signature()
+                for name in written:
+                    if name in deleted: self.base_revs.pop(name, None); self.base_hashes.pop(name, None)
+                    else: self.base_revs[name] = disk[name][REV_KEY]; self.base_hashes[name] = current_hashes[name]
+                    self.conflicts.discard(name)
+                self.conflicts |= conflicts
+                # Diğer süreçlerin yaptığı değişiklikleri arayüz iş parçacığına bırak
+                for name, profile in disk.items():
+                    if isinstance(profile, dict) and profile.get(REV_KEY, 0) != self.base_revs.get(name) and name not in conflicts:
+                        self._incoming[name] = profile
+                for name in set(self.base_revs) - set(disk) - written: self._incoming[name] = None
+        if conflicts: print(f"Warning: Profiles changed by another process, not saved: {', '.join(sorted(conflicts))}")
+        if written: print(f"Profiles saved to {self.path}: {', '.join(sorted(written))}")
+        return written
+
+    # --- Değişiklik Algılama ---
+    def poll(self, profiles):
+        """Dosya başka süreçte değiştiyse yalnızca sürümü değişen profilleri 'profiles' içine uygular.
+
+        Arayüz iş parçacığından çağrılmalıdır. 'profiles' yerinde güncellenir.
+        (güncellenen/silinen isimler, yeni çakışmalar) döndürür.
+        """
+        signature = self._stat_signature()
+        with self._state_lock:
+            incoming = self._incoming; self._incoming = {}
+            file_changed = signature != self._signature
+        if file_changed:
+            try:
+                with FileLock(self.lock_path, timeout=1.0):
+                    disk = self._read_disk(); signature = self._stat_signature()
+            except (TimeoutError, ValueError, json.JSONDecodeError) as e:
+                print(f"Warning: Could not re-read shared profiles ({e}); will retry."); return set(), set()
+            with self._state_lock:
+                self._signature = signature
+                for name, profile in disk.items():
+                    if isinstance(profile, dict) and profile.get(REV_KEY, 0) != self.base_revs.get(name): incoming[name] = profile
+                for name in set(self.base_revs) - set(disk): incoming[name] = None
+        applied = set()
+        with self._state_lock:
+            for name, disk_profile in incoming.items():
+                local = profiles.get(name)
+                locally_modified = local is not None and profile_hash(local) != self.base_hashes.get(name)
+                if locally_modified or (local is not None and name not in self.base_revs):
+                    # Bizde de kaydedilmemiş değişiklik var -> kullanıcı karar vermeli
+                    self.conflicts.add(name); continue
+                if disk_profile is None:
+                    profiles.pop(name, None); self.base_revs.pop(name, None); self.base_hashes.pop(name, None)
+                else:
+                    profiles[name] = self._strip(disk_profile)
+                    self.base_revs[name] = disk_profile.get(REV_KEY, 0); self.base_hashes[name] = profile_hash(profiles[name])
+                applied.add(name)
+            # Kayıt veya bu kontrol sırasında bulunan, henüz bildirilmemiş çakışmalar
+            new_conflicts = self.conflicts - self._reported_conflicts
+            self._reported_conflicts = set(self.conflicts)
+        if applied: print(f"Info: Reloaded profiles changed by another process: {', '.join(sorted(applied))}")
+        return applied, new_conflicts
+
+    def resolve_conflict(self, profiles, name, keep_local):
+        """Çakışmayı çözer: keep_local ise bir sonraki kayıtta bizim sürüm yazılır, değilse diskteki sürüm yüklenir."""
+        with FileLock(self.lock_path):
+            disk = self._read_disk()
+        disk_profile = disk.get(name) if isinstance(disk.get(name), dict) else None
+        with self._state_lock:
+            self.conflicts.discard(name); self._reported_conflicts.discard(name)
+            if keep_local:
+                # Diskteki sürümü temel al -> kayıt artık çakışma sayılmaz
+                if disk_profile is None: self.base_revs.pop(name, None); self.base_hashes.pop(name, None)
+                else: self.base_revs[name] = disk_profile.get(REV_KEY, 0); self.base_hashes[name] = profile_hash(self._strip(disk_profile))
+            elif disk_profile is None:
+                profiles.pop(name, None); self.base_revs.pop(name, None); self.base_hashes.pop(name, None)
+            else:
+                profiles[name] = self._strip(disk_profile)
+                self.base_revs[name] = disk_profile.get(REV_KEY, 0); self.base_hashes[name] = profile_hash(profiles[name])
@@ -0,0 +1,166 @@
+# project_file.py
+# Proje dosyası (.engpy): bölümlere (chunk) ayrılmış zip kabı.
+#
+# Her bölüm (proje bilgisi, malzemeler, kesitler, eleman tasarımları, analiz modeli, sonuçlar, çizimler)
+# ayrı bir zip girdisidir: "chunks/<bölüm>.<nesil>.json". Hangi girdinin güncel olduğunu
+# "manifest.<nesil>.json" söyler; güncel manifestin adı zip açıklamasında (comment) tutulur.
+# Açarken yalnızca zip dizini ve manifest okunur, bölümler ilk kullanımda yüklenir.
+# Kaydederken yalnızca değişen bölümler yeni nesil olarak dosyanın sonuna eklenir;
+# eski nesiller çok yer kaplamaya başlayınca dosya sıkıştırılarak yeniden yazılır.
+
+import os
+import json
+import zipfile
+import hashlib
+
+FORMAT_NAME = "EngPY-Project"
+FORMAT_VERSION = 1
+PROJECT_EXTENSION = ".engpy"
+CHUNK_NAMES = ("project_info", "materials", "sections", "designs", "analysis", "results", "drawings")
+PROFILE_CHUNKS = ("project_info", "materials", "sections", "designs") # Profil sözlüğüne karşılık gelen bölümler
+COMPACT_MIN_BYTES = 1024 * 1024 # Bu boyutun altındaki dosyalar sıkıştırılmaz
+COMPACT_DEAD_RATIO = 0.5 # Ölü (eski nesil) veri oranı bunu aşarsa dosya yeniden yazılır
+
+_EMPTY_CHUNKS = {"project_info": {}, "materials": [], "sections": [], "designs": [], "analysis": {}, "results": {}, "drawings": {}}
+
+
+def _encode(data):
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def _digest(payload):
+    return hashlib.sha1(payload).hexdigest()
+
+
+class ProjectFile:
+    """Tembel yüklenen, yalnızca değişen bölümleri yazan proje dosyası."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.generation = 0
+        self._entries = {}    # bölüm -> diskteki girdi adı
+        self._hashes = {}     # bölüm -> diskteki içeriğin özeti
+        self._loaded = {}     # bölüm -> bellekteki veri (yalnızca yüklenen/ayarlanan bölümler)
+        self._dirty = set()   # set() ile açıkça değiştirilen bölümler
+
+    # --- Açma ---
+    @classmethod
+    def open(cls, path):
+        """Yalnızca zip dizinini ve manifesti okur; bölümler get() ile ilk kullanımda yüklenir."""
+        project = cls(path)
+        with zipfile.ZipFile(path, "r") as zf:
+            manifest_name = zf.comment.decode("utf-8") if zf.comment else ""
+            if not manifest_name:
+                # Açıklama kaybolmuşsa (başka araçla düzenlenmiş) en yüksek nesilli manifesti kullan
+                candidates = [n for n in zf.namelist() if n.startswith("manifest.") and n.endswith(".json")]
+                if not candidates: raise ValueError(f"Geçerli bir proje dosyası değil: {path}")
+                manifest_name = max(candidates, key=lambda n: int(n.split(".")[1]))
+            manifest = json.loads(zf.read(manifest_name).decode("utf-8"))
+        if manifest.get("format") != FORMAT_NAME: raise ValueError(f"Geçerli bir proje dosyası değil: {path}")
+        if manifest.get("version", 0) > FORMAT_VERSION: raise ValueError(f"Desteklenmeyen proje dosyası sürümü: {manifest.get('version')}")
+        project.generation = manifest.get("generation", 0)
+        for chunk, info in manifest.get("chunks", {}).items():
+            project._entries[chunk] = info["entry"]; project._hashes[chunk] = info["sha1"]
+        print(f"Project opened: {path} ({len(project._entries)} chunks, generation {project.generation})")
+        return project
+
+    # --- Bölüm Erişimi ---
+    def is_loaded(self, chunk): return chunk in self._loaded
+
+    def get(self, chunk):
+        """Bölümü döndürür; gerekiyorsa diskten o an yükler."""
+        if chunk not in self._loaded:
+            entry = self._entries.get(chunk)
+            if entry is None or self.path is None: self._loaded[chunk] = json.loads(json.dumps(_EMPTY_CHUNKS.get(chunk, {})))
+            else:
+                with zipfile.ZipFile(self.path, "r") as zf: self._loaded[chunk] = json.loads(zf.read(entry).decode("utf-8"))
+                print(f"Project chunk loaded: {chunk}")
+        return self._loaded[chunk]
+
+    def set(self, chunk, data):
+        self._loaded[chunk] = data; self._dirty.add(chunk)
+
+    def to_profile(self):
+        """Profil bölümlerini profiles.json biçiminde bir profil sözlüğü olarak döndürür."""
+        return {chunk: self.get(chunk) for chunk in PROFILE_CHUNKS}
+
+    def update_from_profile(self, profile):
+        for chunk in PROFILE_CHUNKS: self.set(chunk, profile.get(chunk, _EMPTY_CHUNKS[chunk]))
+
+    def _dirty_payloads(self):
+        """İçeriği diskteki sürümden farklı olan yüklenmiş bölümlerin (bölüm, bayt, özet) listesi."""
+        result = []
+        for chunk, data in self._loaded.items():
+            payload = _encode(data); digest = _digest(payload)
+            if digest != self._hashes.get(chunk): result.append((chunk, payload, digest))
+        return result
+
+    @property
+    def is_dirty(self): return bool(self._dirty_payloads()) or self.path is None
+
+    # --- Kaydetme ---
+    def save(self, path=None):
+        """Değişen bölümleri kaydeder. Farklı bir yol verilirse (Farklı Kaydet) tam dosya yazılır."""
+        if path is not None and (self.path is None or os.path.abspath(path) != os.path.abspath(self.path)):
+            return self._write_full(path)
+        if self.path is None: raise ValueError("Proje dosyası yolu belirtilmedi.")
+        dirty = self._dirty_payloads()
+        if not dirty and self._entries: self._dirty.clear(); print("Project unchanged, nothing to save."); return 0
+        self.generation += 1
+        with zipfile.ZipFile(self.path, "a", compression=zipfile.ZIP_DEFLATED) as zf:
+            for chunk, payload, digest in dirty:
+                entry = f"chunks/{chunk}.{self.generation}.json"
+                zf.writestr(entry, payload); self._entries[chunk] = entry; self._hashes[chunk] = digest
+            manifest_name = self._write_manifest(zf)
+            zf.comment = manifest_name.encode("utf-8")
+        self._dirty.clear()
+        print(f"Project saved: {self.path} ({len(dirty)} chunk(s) written, generation {self.generation})")
+        self._compact_if_needed()
+        return len(dirty)
+
+    def _write_manifest(self, zf):
+        manifest = {"format": FORMAT_NAME, "version": FORMAT_VERSION, "generation": self.generation,
+                    "chunks": {chunk: {"entry": entry, "sha1": self._hashes[chunk]} for chunk, entry in self._entries.items()}}
+        manifest_name = f"manifest.{self.generation}.json"
+        zf.writestr(manifest_name, _encode(manifest))
+        return manifest_name
+
+    def _write_full(self, path):
+        """Tüm güncel bölümleri yeni dosyaya yazar; yüklenmemiş bölümler çözülmeden ham kopyalanır."""
+        loaded = {chunk: _encode(data) for chunk, data in self._loaded.items()}
+        old_path = self.path; tmp_path = path + ".tmp"
+        self.generation += 1
+        new_entries = {}; new_hashes = {}
+        source = zipfile.ZipFile(old_path, "r") if old_path and os.path.exists(old_path) else None
+        try:
+            with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+                for chunk in set(self._entries) | set(loaded):
+                    entry = f"chunks/{chunk}.{self.generation}.json"
+                    if chunk in loaded: payload = loaded[chunk]; new_hashes[chunk] = _digest(payload)
+                    else: payload = source.read(self._entries[chunk]); new_hashes[chunk] = self._hashes[chunk]
+                    zf.writestr(entry, payload); new_entries[chunk] = entry
+                self._entries = new_entries; self._hashes = new_hashes
+                zf.comment = self._write_manifest(zf).encode("utf-8")
+        finally:
+            if source is not None: source.close()
+        os.replace(tmp_path, path)
+        self.path = path; self._dirty.clear()
+        print(f"Project written: {path} ({len(new_entries)} chunks)")
+        return len(new_entries)
+
+    def _compact_if_needed(self):
+        """Eski nesillerin kapladığı yer fazlaysa dosyayı yalnızca güncel girdilerle yeniden yazar."""
+        size = os.path.getsize(self.path)
+        if size < COMPACT_MIN_BYTES: return
+        with zipfile.ZipFile(self.path, "r") as zf:
+            live = set(self._entries.values()) | {zf.comment.decode("utf-8")}
+            dead = sum(info.compress_size for info in zf.infolist() if info.filename not in live)
+        if dead / size > COMPACT_DEAD_RATIO:
+            print(f"Compacting project file ({dead} of {size} bytes are stale)...")
+            self._write_full(self.path)
+
+
+def new_project(profile):
+    """Profil verisinden (henüz diske yazılmamış) yeni bir proje oluşturur."""
+    project = ProjectFile()
+    project.update_from_profile(profile)
+    return project
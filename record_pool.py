@@ -0,0 +1,111 @@
+# record_pool.py
+# Profiller arasında tekrar eden malzeme/kesit/tasarım kayıtlarının tek kopya saklanması.
+#
+# Bellekte: aynı içerikli kayıtlar tek bir sözlük nesnesini paylaşır. Uygulama kayıt
+# sözlüklerini yerinde değiştirmez, düzenlemede listeye yeni sözlük koyar; bu yüzden
+# paylaşım kendiliğinden "yazarken kopyala" (copy-on-write) davranır.
+# Diskte: birden fazla yerde geçen kayıtlar profiles.json'un "_record_pool" bölümüne
+# içerik özetiyle (id) bir kez yazılır, profiller {"$ref": id} ile başvurur.
+
+import copy
+import json
+import hashlib
+
+POOL_KEY = "_record_pool"
+REF_KEY = "$ref"
+POOLED_LISTS = ("materials", "sections", "designs")
+
+
+def record_id(record):
+    """Kaydın içerik özeti (aynı içerik -> aynı id)."""
+    return hashlib.sha1(json.dumps(record, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+
+def _iter_records(profiles):
+    for name, profile in profiles.items():
+        if not isinstance(profile, dict): continue
+        for list_key in POOLED_LISTS:
+            items = profile.get(list_key)
+            if isinstance(items, list):
+                for item in items: yield item
+
+
+def encode_profiles(profiles):
+    """Diske yazılacak biçim: en az iki kez geçen kayıtlar havuza alınır, diğerleri satır içi kalır.
+    Girdi değiştirilmez; profiller yüzeysel kopyalanır."""
+    ids = {} # id(nesne) -> içerik özeti (paylaşılan nesneler bir kez özetlenir)
+    counts = {}
+    for item in _iter_records(profiles):
+        if not isinstance(item, dict): continue
+        key = ids.get(id(item))
+        if key is None: key = ids[id(item)] = record_id(item)
+        counts[key] = counts.get(key, 0) + 1
+    pool = {}; encoded = {}
+    for name, profile in profiles.items():
+        if not isinstance(profile, dict): encoded[name] = profile; continue
+        new_profile = dict(profile)
+        for list_key in POOLED_LISTS:
+            items = profile.get(list_key)
+            if not isinstance(items, list): continue
+            new_items = []
+            for item in items:
+                key = ids.get(id(item)) if isinstance(item, dict) else None
+                if key is not None and counts[key] > 1: pool.setdefault(key, item); new_items.append({REF_KEY: key})
+                else: new_items.append(item)
+            new_profile[list_key] = new_items
+        encoded[name] = new_profile
+    if pool: encoded[POOL_KEY] = pool
+    return encoded
+
+
+def decode_profiles(data):
+    """Diskten okunan veriyi çözer: başvurular havuzdaki (paylaşılan) sözlüklerle değiştirilir.
+    Havuz bölümü sonuçta yer almaz. Çözülemeyen başvuru ValueError fırlatır."""
+    pool = data.get(POOL_KEY) or {}
+    if not isinstance(pool, dict): raise ValueError("Kayıt havuzu geçersiz (sözlük bekleniyordu).")
+    profiles = {}
+    for name, profile in data.items():
+        if name == POOL_KEY: continue
+        if not isinstance(profile, dict) or not pool: profiles[name] = profile; continue
+        new_profile = dict(profile)
+        for list_key in POOLED_LISTS:
+            items = profile.get(list_key)
+            if not isinstance(items, list): continue
+            resolved = []
+            for item in items:
+                if isinstance(item, dict) and len(item) == 1 and REF_KEY in item:
+                    target = pool.get(item[REF_KEY])
+                    if target is None: raise ValueError(f"'{name}' profilinde çözülemeyen kayıt başvurusu: {item[REF_KEY]}")
+                    resolved.append(target)
+                else: resolved.append(item)
+            new_profile[list_key] = resolved
+        profiles[name] = new_profile
+    return profiles
+
+
+def intern_profiles(profiles):
+    """Bellekteki aynı içerikli kayıtları tek nesnede birleştirir (listeler yerinde güncellenir).
+    Birleştirilen kayıt sayısını döndürür."""
+    canonical = {}; seen_objects = {}; merged = 0
+    for profile in profiles.values():
+        if not isinstance(profile, dict): continue
+        for list_key in POOLED_LISTS:
+            items = profile.get(list_key)
+            if not isinstance(items, list): continue
+            for i, item in enumerate(items):
+                if not isinstance(item, dict): continue
+                key = seen_objects.get(id(item))
+                if key is None: key = seen_objects[id(item)] = record_id(item)
+                shared = canonical.setdefault(key, item)
+                if shared is not item: items[i] = shared; merged += 1
+    return merged
+
+
+def copy_profile(profile, new_name=None):
+    """Profilin kopyası: kayıt sözlükleri paylaşılır (yazarken kopyala), listeler ve proje bilgisi ayrıdır."""
+    new_profile = {}
+    for key, value in profile.items():
+        if key in POOLED_LISTS and isinstance(value, list): new_profile[key] = list(value)
+        else: new_profile[key] = copy.deepcopy(value)
+    if new_name is not None: new_profile.setdefault("project_info", {})["name"] = new_name
+    return new_profile
@@ -0,0 +1,358 @@
+# records.py
+# Malzeme, kesit ve proje bilgisi için kompakt (__slots__) kayıt sınıflarını içerir.
+# profiles.json'daki serbest biçimli sözlükler ile hesap motorları arasında tipli,
+# doğrulanmış bir katman sağlar. Hesap sayfaları profilin kayıtlarını sütun bazlı
+# (array('d')) tablolardan okur; tablolar profil listeleriyle kimlik karşılaştırmasıyla eşitlenir.
+
+import sys
+import math
+from array import array
+
+import config
+
+# --- Bilinen Tipler ---
+MATERIAL_TYPE_CONCRETE = sys.intern("Beton")
+MATERIAL_TYPE_REBAR = sys.intern("Donatı Çeliği")
+MATERIAL_TYPES = (MATERIAL_TYPE_CONCRETE, MATERIAL_TYPE_REBAR)
+
+SECTION_TYPE_RECT = sys.intern("Dikdörtgen")
+SECTION_TYPE_CIRCLE = sys.intern("Dairesel")
+SECTION_TYPE_STEEL = sys.intern("Çelik Profil") # Boyut/özellikler steel_catalog'dan, kayıtta profil adı
+SECTION_TYPES = (SECTION_TYPE_RECT, SECTION_TYPE_CIRCLE, SECTION_TYPE_STEEL)
+
+# Her malzeme tipinin JSON'da taşıdığı özellik anahtarları (sıra korunur)
+MATERIAL_PROP_KEYS = {
+    MATERIAL_TYPE_CONCRETE: ("fck",),
+    MATERIAL_TYPE_REBAR: ("fyk", "Es"),
+}
+# Her kesit tipinin JSON'da taşıdığı boyut anahtarları
+SECTION_DIM_KEYS = {
+    SECTION_TYPE_RECT: ("b", "h"),
+    SECTION_TYPE_CIRCLE: ("D",),
+    SECTION_TYPE_STEEL: ("b", "h"), # Dış zarf (liste/çizim için)
+}
+
+_MISSING = float("nan") # Kayıtlarda tanımsız sayısal değer işareti
+
+
+def _intern(value):
+    """Tekrarlayan kısa metinleri (tip/sınıf adları) tek nesnede tutar."""
+    return sys.intern(str(value)) if value is not None else None
+
+def _to_float(value, field_name, allow_missing=True):
+    """Değeri float'a çevirir; sayısal değilse veya negatifse ValueError fırlatır."""
+    if value is None or value == "" or value != value:
+        if allow_missing: return _MISSING
+        raise ValueError(f"'{field_name}' değeri eksik.")
+    try: number = float(value)
+    except (TypeError, ValueError): raise ValueError(f"'{field_name}' sayısal olmalı (değer: {value!r}).")
+    if math.isnan(number) or math.isinf(number): raise ValueError(f"'{field_name}' sonlu bir sayı olmalı.")
+    if number < 0: raise ValueError(f"'{field_name}' negatif olamaz (değer: {number}).")
+    return number
+
+def _check_name(value, what):
+    if not isinstance(value, str) or not value.strip(): raise ValueError(f"{what} adı boş olamaz.")
+    return value
+
+def is_missing(value):
+    """Sayısal alanın tanımsız (NaN) olup olmadığını döndürür."""
+    return value != value
+
+
+# ==================================
+# MALZEME KAYDI
+# ==================================
+class MaterialRecord:
+    """Tek bir malzeme tanımı (Beton veya Donatı Çeliği)."""
+    __slots__ = ("user_name", "type", "class_name", "is_custom", "fck", "fyk", "Es", "Ec")
+
+    def __init__(self, user_name, mat_type, class_name="", is_custom=False, fck=_MISSING, fyk=_MISSING, Es=_MISSING, Ec=_MISSING):
+        self.user_name = _check_name(user_name, "Malzeme")
+        if mat_type not in MATERIAL_TYPES: raise ValueError(f"Bilinmeyen malzeme tipi: {mat_type!r}")
+        self.type = _intern(mat_type)
+        self.class_name = _intern(class_name or "")
+        self.is_custom = bool(is_custom)
+        self.fck = _to_float(fck, "fck"); self.fyk = _to_float(fyk, "fyk")
+        self.Es = _to_float(Es, "Es"); self.Ec = _to_float(Ec, "Ec")
+
+    @classmethod
+    def from_dict(cls, data):
+        """profiles.json'daki malzeme sözlüğünden kayıt oluşturur."""
+        if not isinstance(data, dict): raise ValueError("Malzeme verisi sözlük olmalı.")
+        props = data.get("props") or {}
+        return cls(data.get("user_name"), data.get("type"), data.get("class", ""), data.get("is_custom", False),
+                   fck=props.get("fck"), fyk=props.get("fyk"), Es=props.get("Es"), Ec=props.get("Ec"))
+
+    def to_dict(self):
+        """Kaydı profiles.json biçimine geri çevirir (yalnızca tanımlı özellikler)."""
+        props = {}
+        for key in ("fck", "fyk", "Es", "Ec"):
+            value = getattr(self, key)
+            if not is_missing(value): props[key] = value
+        return {"user_name": self.user_name, "type": self.type, "class": self.class_name, "is_custom": self.is_custom, "props": props}
+
+    @property
+    def is_concrete(self): return self.type is MATERIAL_TYPE_CONCRETE
+
+    def __repr__(self):
+        return f"MaterialRecord({self.user_name!r}, {self.type!r}, {self.class_name!r})"
+
+
+# ==================================
+# KESİT KAYDI
+# ==================================
+class SectionRecord:
+    """Tek bir kesit tanımı (Dikdörtgen, Dairesel veya katalogdan Çelik Profil). Boyutlar mm cinsindendir."""
+    __slots__ = ("user_name", "type", "material_name", "b", "h", "D", "profile")
+
+    def __init__(self, user_name, sec_type, material_name="", b=_MISSING, h=_MISSING, D=_MISSING, profile=""):
+        self.user_name = _check_name(user_name, "Kesit")
+        if sec_type not in SECTION_TYPES: raise ValueError(f"Bilinmeyen kesit tipi: {sec_type!r}")
+        self.type = _intern(sec_type)
+        self.material_name = material_name or ""
+        self.b = _to_float(b, "b"); self.h = _to_float(h, "h"); self.D = _to_float(D, "D")
+        self.profile = _intern(profile or "")
+        if self.type is SECTION_TYPE_STEEL and not self.profile: raise ValueError("Çelik profil kesitinde profil adı boş olamaz.")
+
+    @classmethod
+    def from_dict(cls, data):
+        """profiles.json'daki kesit sözlüğünden kayıt oluşturur."""
+        if not isinstance(data, dict): raise ValueError("Kesit verisi sözlük olmalı.")
+        dims = data.get("dimensions") or {}
+        return cls(data.get("user_name"), data.get("type"), data.get("material_name", ""), b=dims.get("b"), h=dims.get("h"), D=dims.get("D"),
+                   profile=data.get("profile", ""))
+
+    def to_dict(self):
+        """Kaydı profiles.json biçimine geri çevirir."""
+        dims = {key: getattr(self, key) for key in SECTION_DIM_KEYS[self.type] if not is_missing(getattr(self, key))}
+        data = {"user_name": self.user_name, "type": self.type, "material_name": self.material_name, "dimensions": dims}
+        if self.type is SECTION_TYPE_STEEL: data["profile"] = self.profile
+        return data
+
+    @property
+    def area(self):
+        """Brüt kesit alanı (mm²)."""
+        if self.type is SECTION_TYPE_RECT: return self.b * self.h
+        if self.type is SECTION_TYPE_STEEL:
+            import steel_catalog # Katalog yalnızca çelik kesitlerde açılır
+            props = steel_catalog.get_steel_catalog().properties(self.profile)
+            if props is None: raise ValueError(f"Çelik profil '{self.profile}' katalogda bulunamadı.")
+            return props["A"]
+        return math.pi * self.D ** 2 / 4.0
+
+    def __repr__(self):
+        return f"SectionRecord({self.user_name!r}, {self.type!r}, {self.material_name!r})"
+
+
+# ==================================
+# PROJE BİLGİSİ
+# ==================================
+class ProjectInfo:
+    """Profilin proje bilgileri (yönetmelikler, birimler vb.)."""
+    __slots__ = tuple(config.DEFAULT_PROJECT_INFO.keys())
+
+    def __init__(self, **fields):
+        for key, default in config.DEFAULT_PROJECT_INFO.items():
+            value = fields.get(key, default)
+            # Yönetmelik/birim adları tüm profillerde aynıdır -> intern
+            setattr(self, key, _intern(value) if key.endswith("_reg") or key == "units" else str(value))
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{k: v for k, v in (data or {}).items() if k in cls.__slots__})
+
+    def to_dict(self):
+        return {key: getattr(self, key) for key in self.__slots__}
+
+
+
+# ==================================
+# SÜTUN BAZLI TABLOLAR
+# ==================================
+class _ColumnTable:
+    """Sayısal alanları array('d') sütunlarında, metinleri intern edilmiş listelerde tutan temel tablo.
+    Satır i, kaynak listenin i. sözlüğüdür; geçersiz sözlükler hata mesajıyla boş satır olarak tutulur."""
+    _numeric_fields = ()
+    _record_class = None
+    _list_key = None
+
+    def __init__(self):
+        self.names = []
+        self.types = []
+        self.columns = {field: array("d") for field in self._numeric_fields}
+        self.errors = {} # satır -> doğrulama hatası
+        self._sources = [] # Satırların kaynak sözlükleri (eşitleme için yalnızca kimlik karşılaştırılır)
+        self._index = {}
+
+    def __len__(self): return len(self.names)
+
+    def __contains__(self, name): return name in self._index
+
+    def row_of(self, name):
+        """İsmin (ilk) satır numarasını döndürür, yoksa -1."""
+        return self._index.get(name, -1)
+
+    def value(self, name, field):
+        """Tek bir sayısal alanı kayıt nesnesi oluşturmadan float olarak döndürür (tanımsızsa NaN)."""
+        row = self._checked_row(name)
+        if row is None: raise KeyError(name)
+        return self.columns[field][row]
+
+    def get(self, name):
+        """İsme ait tipli kaydı döndürür; yoksa None, kayıt geçersizse ValueError."""
+        row = self._checked_row(name)
+        return None if row is None else self.record(row)
+
+    def column(self, field):
+        """Sütunu kopyalamadan döndürür (memoryview, float64)."""
+        return memoryview(self.columns[field])
+
+    def _checked_row(self, name):
+        row = self._index.get(name)
+        if row is not None and row in self.errors: raise ValueError(f"'{name}': {self.errors[row]}")
+        return row
+
+    def sync(self, items):
+        """Tabloyu profil listesine eşitler: değişmeyen baştaki satırlar korunur, kalanı yeniden okunur.
+        Kayıt sözlükleri yerinde değiştirilmez (düzenleme yeni sözlük koyar), bu yüzden kimlik yeterlidir."""
+        sources = self._sources
+        common = 0
+        limit = min(len(items), len(sources))
+        while common < limit and items[common] is sources[common]: common += 1
+        if common == len(items) == len(sources): return 0
+        self._truncate(common)
+        for data in items[common:]: self._append_source(data)
+        return len(items) - common
+
+    def _truncate(self, rows):
+        for name in self.names[rows:]:
+            if self._index.get(name, -1) >= rows: del self._index[name]
+        del self.names[rows:], self.types[rows:], self._sources[rows:]
+        for values in self.columns.values(): del values[rows:]
+        for row in [row for row in self.errors if row >= rows]: del self.errors[row]
+        self._truncate_extra(rows)
+
+    def _append_source(self, data):
+        try: record = self._record_class.from_dict(data)
+        except ValueError as e:
+            self.errors[len(self.names)] = str(e)
+            name = data.get("user_name") if isinstance(data, dict) and isinstance(data.get("user_name"), str) else ""
+            record = None
+        else: name = record.user_name
+        self._index.setdefault(name, len(self.names))
+        self.names.append(name); self.types.append(record.type if record else "")
+        self._sources.append(data)
+        for field in self._numeric_fields: self.columns[field].append(getattr(record, field) if record else _MISSING)
+        self._append_extra(record)
+
+    def _truncate_extra(self, rows):
+        """Alt sınıfın sayısal olmayan sütunlarını kırpar."""
+        raise NotImplementedError(f"{type(self).__name__} ek sütunlarını kırpmalı.")
+
+    def _append_extra(self, record):
+        """Alt sınıfın sayısal olmayan sütunlarına kaydı (geçersizse None) ekler."""
+        raise NotImplementedError(f"{type(self).__name__} ek sütunlarını doldurmalı.")
+
+    def record(self, row):
+        """Satırdan tipli kaydı oluşturur."""
+        raise NotImplementedError(f"{type(self).__name__} satırdan kayıt oluşturmalı.")
+
+    def records(self):
+        for row in range(len(self.names)):
+            if row not in self.errors: yield self.record(row)
+
+    def to_dicts(self):
+        return [record.to_dict() for record in self.records()]
+
+    @classmethod
+    def from_profile(cls, profile):
+        table = cls()
+        table.sync(profile.get(cls._list_key, []))
+        return table
+
+
+class MaterialTable(_ColumnTable):
+    """Bir profilin malzemelerini sütun bazlı tutar."""
+    _numeric_fields = ("fck", "fyk", "Es", "Ec")
+    _record_class = MaterialRecord
+    _list_key = "materials"
+
+    def __init__(self):
+        super().__init__()
+        self.classes = []
+        self.is_custom = bytearray()
+
+    def _truncate_extra(self, rows):
+        del self.classes[rows:], self.is_custom[rows:]
+
+    def _append_extra(self, record):
+        self.classes.append(record.class_name if record else ""); self.is_custom.append(1 if record and record.is_custom else 0)
+
+    def record(self, row):
+        cols = self.columns
+        return MaterialRecord(self.names[row], self.types[row], self.classes[row], bool(self.is_custom[row]),
+                              fck=cols["fck"][row], fyk=cols["fyk"][row], Es=cols["Es"][row], Ec=cols["Ec"][row])
+
+
+class SectionTable(_ColumnTable):
+    """Bir profilin kesitlerini sütun bazlı tutar."""
+    _numeric_fields = ("b", "h", "D")
+    _record_class = SectionRecord
+    _list_key = "sections"
+
+    def __init__(self):
+        super().__init__()
+        self.material_names = []
+        self.profiles = []
+
+    def _truncate_extra(self, rows):
+        del self.material_names[rows:], self.profiles[rows:]
+
+    def _append_extra(self, record):
+        self.material_names.append(_intern(record.material_name) if record else ""); self.profiles.append(record.profile if record else "")
+
+    def material_of(self, name):
+        """Kesitin beton malzemesi adını kayıt oluşturmadan döndürür."""
+        row = self._checked_row(name)
+        if row is None: raise KeyError(name)
+        return self.material_names[row]
+
+    def record(self, row):
+        cols = self.columns
+        return SectionRecord(self.names[row], self.types[row], self.material_names[row], b=cols["b"][row], h=cols["h"][row], D=cols["D"][row],
+                             profile=self.profiles[row])
+
+
+class ProfileTables:
+    """Bir profilin malzeme ve kesit tabloları."""
+    __slots__ = ("profile", "materials", "sections")
+
+    def __init__(self, profile):
+        self.profile = profile
+        self.materials = MaterialTable.from_profile(profile)
+        self.sections = SectionTable.from_profile(profile)
+
+    def sync(self):
+        """Profil listelerindeki değişiklikleri tablolara yansıtır; yeniden okunan satır sayısını döndürür."""
+        return self.materials.sync(self.profile.get("materials", [])) + self.sections.sync(self.profile.get("sections", []))
+
+
+class TableRegistry:
+    """Profil adı -> ProfileTables. Tablolar ilk kullanımda kurulur, her erişimde eşitlenir."""
+
+    def __init__(self, profiles_data):
+        self.profiles_data = profiles_data
+        self._tables = {}
+
+    def get(self, profile_name):
+        profile = self.profiles_data.get(profile_name)
+        if profile is None: return None
+        tables = self._tables.get(profile_name)
+        if tables is None or tables.profile is not profile: # Profil toptan değiştiyse (geri al, dış yükleme) yeniden kur
+            tables = self._tables[profile_name] = ProfileTables(profile)
+        else: tables.sync()
+        return tables
+
+    def reset(self, profile_name=None):
+        if profile_name is None: self._tables.clear()
+        else: self._tables.pop(profile_name, None)
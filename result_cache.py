@@ -0,0 +1,199 @@
+# result_cache.py
+# Hesap sonuçları için içerik adresli, oturumlar arası kalıcı önbellek.
+# Anahtar; hesap motorunun adı + sürümü, tüm girdiler (malzeme özellikleri dahil) ve
+# yönetmelik parametrelerinin SHA-256 özetidir. Bunlardan biri değişince anahtar da
+# değişir, eski sonuç kendiliğinden kullanılmaz olur ve zamanla LRU ile silinir.
+# Depolama: tek SQLite dosyası (arayüz ve toplu hesaplar aynı dosyayı paylaşır).
+
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import atexit
+import functools
+from collections import OrderedDict
+
+import config
+
+MEMORY_ITEMS = 2048 # Bellek içi LRU'da tutulan sonuç sayısı
+TOUCH_BATCH = 256   # Son kullanım zamanları bu kadar isabette bir toplu yazılır
+
+
+def _normalize(value):
+    """Anahtar için kanonik değer: 3 ile 3.0 aynı sayılır, sözlük sırası önemsizdir."""
+    if isinstance(value, bool) or value is None or isinstance(value, str): return value
+    if isinstance(value, (int, float)): return float(value)
+    if isinstance(value, dict): return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)): return [_normalize(v) for v in value]
+    return str(value)
+
+
+def make_key(engine, version, inputs, parameters=None):
+    payload = {"engine": engine, "version": version, "inputs": _normalize(inputs), "parameters": _normalize(parameters or {})}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Boyut sınırlı (en az kullanılan silinir) kalıcı sonuç önbelleği.
+
+    SQLite önünde bellek içi LRU vardır: sık kullanılan sonuçlar diske gitmeden döner. Son
+    kullanım zamanları bellekte toplanır ve touch_batch adette bir (veya put/close'da) tek
+    işlemde yazılır. Toplam boyut açılışta bir kez okunur, sonra artımlı izlenir."""
+
+    def __init__(self, path, max_bytes=50 * 1024 * 1024, memory_items=MEMORY_ITEMS, touch_batch=TOUCH_BATCH):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self.touch_batch = touch_batch
+        self.hits = 0; self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self._memory = OrderedDict() # bellek anahtarı -> (disk anahtarı, sonuç)
+        self._touched = {}           # disk anahtarı -> son kullanım (henüz yazılmadı)
+        self._total = 0              # Diskteki toplam boyut (bayt)
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            self._conn.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, engine TEXT, value TEXT, size INTEGER, last_used REAL)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results(last_used)")
+            self._conn.commit()
+            self._total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        return self._conn
+
+    # --- Bellek Katmanı ---
+    def _remember(self, memo, key, value):
+        self._memory[memo] = (key, value); self._memory.move_to_end(memo)
+        while len(self._memory) > self.memory_items: self._memory.popitem(last=False)
+
+    def _recall(self, memo):
+        entry = self._memory.get(memo)
+        if entry is None: return None
+        self._memory.move_to_end(memo)
+        self._touched[entry[0]] = time.time()
+        if len(self._touched) >= self.touch_batch: self._flush_touches()
+        self.hits += 1
+        return entry[1]
+
+    def _flush_touches(self, commit=True):
+        if not self._touched: return
+        touched = self._touched; self._touched = {}
+        try:
+            conn = self._connection()
+            conn.executemany("UPDATE results SET last_used = ? WHERE key = ?", [(t, k) for k, t in touched.items()])
+            if commit: conn.commit()
+        except sqlite3.Error as e: print(f"Warning: Result cache update failed ({e}).")
+
+    # --- Okuma/Yazma ---
+    def get(self, key, memo=None):
+        """Sonucu döndürür (yoksa None). memo: bellek katmanı için (hızlı) anahtar; verilmezse key.
+        Dönen sonuç paylaşılır, değiştirilmemelidir."""
+        memo = key if memo is None else memo
+        with self._lock:
+            value = self._recall(memo)
+            if value is not None: return value
+            try:
+                conn = self._connection()
+                row = conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is None: self.misses += 1; return None
+                value = json.loads(row[0])
+            except (sqlite3.Error, ValueError) as e:
+                print(f"Warning: Result cache read failed ({e})."); self.misses += 1; return None
+            self._touched[key] = time.time()
+            self._remember(memo, key, value)
+            self.hits += 1
+            return value
+
+    def put(self, key, engine, value, memo=None):
+        text = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            try:
+                conn = self._connection()
+                old = conn.execute("SELECT size FROM results WHERE key = ?", (key,)).fetchone()
+                conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)", (key, engine, text, len(text), time.time()))
+                self._total += len(text) - (old[0] if old else 0)
+                self._touched.pop(key, None)
+                self._flush_touches(commit=False)
+                self._evict(conn); conn.commit()
+            except sqlite3.Error as e: print(f"Warning: Result cache write failed ({e}).")
+            self._remember(key if memo is None else memo, key, value)
+
+    def _evict(self, conn):
+        if self._total <= self.max_bytes: return
+        # Sınırın %90'ına inene kadar en eski kullanılanları sil (her eklemede silmemek için pay bırak)
+        target = self._total - int(self.max_bytes * 0.9); freed = 0; stale = []
+        for key, size in conn.execute("SELECT key, size FROM results ORDER BY last_used"):
+            stale.append((key,)); freed += size
+            if freed >= target: break
+        conn.executemany("DELETE FROM results WHERE key = ?", stale)
+        self._total -= freed
+        stale_keys = {key for key, in stale}
+        for memo in [memo for memo, (key, _) in self._memory.items() if key in stale_keys]: del self._memory[memo]
+        print(f"Info: Result cache evicted {len(stale)} entries ({freed} bytes).")
+
+    def get_or_compute(self, engine, version, inputs, compute, parameters=None):
+        """(sonuç, önbellekten mi) döndürür. compute() yalnızca önbellekte yoksa çağrılır."""
+        memo = _memo_key(engine, version, inputs, parameters)
+        if memo is not None:
+            with self._lock: cached = self._recall(memo) # Bellekte: SHA-256 anahtarı bile hesaplanmaz
+            if cached is not None: return cached, True
+        key = make_key(engine, version, inputs, parameters)
+        cached = self.get(key, memo)
+        if cached is not None: return cached, True
+        result = compute()
+        self.put(key, engine, result, memo)
+        return result, False
+
+    def flush(self):
+        """Bekleyen son kullanım zamanlarını diske yazar."""
+        with self._lock: self._flush_touches()
+
+    def clear(self):
+        with self._lock:
+            conn = self._connection(); conn.execute("DELETE FROM results"); conn.commit()
+            self._memory.clear(); self._touched = {}; self._total = 0
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._flush_touches()
+                self._conn.close(); self._conn = None
+            self._memory.clear()
+
+
+def _memo_key(engine, version, inputs, parameters):
+    """Bellek katmanı anahtarı: girdiler hashlenebilirse demet (3 == 3.0 Python'da da eşittir), değilse None."""
+    try:
+        key = (engine, version, tuple(sorted(inputs.items())), tuple(sorted(parameters.items())) if parameters else ())
+        hash(key)
+        return key
+    except TypeError: return None
+
+
+_default_cache = None
+
+def get_default_cache():
+    """Uygulama genelinde paylaşılan önbellek (ilk kullanımda açılır)."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache(config.RESULT_CACHE_FILE, config.RESULT_CACHE_MAX_MB * 1024 * 1024)
+        atexit.register(_default_cache.close) # Bekleyen son kullanım zamanları yazılır
+    return _default_cache
+
+
+def cached_engine(engine, version, parameters=None):
+    """Saf hesap fonksiyonunu önbellekle sarar. Fonksiyon yalnızca anahtar kelime argümanları almalı ve
+    JSON'a çevrilebilir sonuç döndürmelidir. Sarılmış fonksiyon sonuca 'from_cache' alanını ekler.
+    parameters: yönetmelik parametrelerini döndüren fonksiyon (çağrı anındaki değerler anahtara girer)."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(use_cache=True, **inputs):
+            if not use_cache: result = func(**inputs); result["from_cache"] = False; return result
+            params = parameters() if callable(parameters) else parameters
+            result, from_cache = get_default_cache().get_or_compute(engine, version, inputs, lambda: func(**inputs), params)
+            result = dict(result); result["from_cache"] = from_cache
+            return result
+        wrapper.uncached = func
+        return wrapper
+    return decorator
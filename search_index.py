@@ -0,0 +1,92 @@
+# search_index.py
+# Malzeme, kesit ve profil listeleri için bellek içi n-gram arama indeksi.
+#
+# Her kaydın arama metninin 1, 2 ve 3 karakterlik tüm alt dizgileri ve kelime başları
+# (yazılırken en sık aranan biçim) -> kayıt anahtarları kümesine eşlenir. En fazla 3
+# karakterlik terim ve kelime başı eşleşmeleri tek sözlük erişimidir; kalan adaylar
+# (terimin en seyrek trigramını içeren diğer kayıtlar) gerçek metinde doğrulanır.
+# Düzenlemede yalnızca metni değişen kayıtlar indekste güncellenir (sync).
+
+_EMPTY = frozenset()
+_FOLD = str.maketrans({"İ": "i", "I": "i", "ı": "i"}) # Türkçe i/ı farkı aramada yok sayılır
+
+
+def normalize(text):
+    """Arama karşılaştırma biçimi: küçük harf, i/ı/İ/I eşdeğer, fazla boşluksuz."""
+    return " ".join(str(text or "").translate(_FOLD).lower().split())
+
+
+_PREFIX = "\0" # Kelime başı anahtarlarının öneki (n-gramlarla karışmaz)
+
+
+def _grams(text):
+    grams = set()
+    for n in (1, 2, 3):
+        for i in range(len(text) - n + 1): grams.add(text[i:i + n])
+    for word in text.split():
+        for n in range(4, len(word) + 1): grams.add(_PREFIX + word[:n])
+    return grams
+
+
+class TrigramIndex:
+    """Anahtar -> arama metni; alt dizgi (içinde geçen) aramalarını indeksle yanıtlar."""
+
+    def __init__(self):
+        self._texts = {}  # anahtar -> normalize metin
+        self._grams = {}  # n-gram -> anahtar kümesi
+
+    def __len__(self): return len(self._texts)
+
+    def __contains__(self, key): return key in self._texts
+
+    def add(self, key, text):
+        """Kaydı ekler veya metni değiştiyse günceller. Değişiklik yoksa bir şey yapmaz."""
+        text = normalize(text)
+        old = self._texts.get(key)
+        if old == text: return
+        if old is not None: self.remove(key)
+        self._texts[key] = text
+        for gram in _grams(text): self._grams.setdefault(gram, set()).add(key)
+
+    def remove(self, key):
+        text = self._texts.pop(key, None)
+        if text is None: return
+        for gram in _grams(text):
+            keys = self._grams.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys: del self._grams[gram]
+
+    def sync(self, items):
+        """İndeksi verilen (anahtar, metin) çiftleriyle eşitler; yalnızca farklar işlenir.
+        Eklenen, güncellenen veya silinen anahtar sayısını döndürür."""
+        current = dict(items)
+        changed = 0
+        for key in [key for key in self._texts if key not in current]: self.remove(key); changed += 1
+        for key, text in current.items():
+            text = normalize(text)
+            if self._texts.get(key) != text: self.add(key, text); changed += 1
+        return changed
+
+    def clear(self):
+        self._texts.clear(); self._grams.clear()
+
+    def _term(self, term):
+        """Terimi içeren anahtarlar: kelime başı eşleşmeleri + trigram adaylarından doğrulananlar."""
+        if len(term) <= 3: return self._grams.get(term, _EMPTY)
+        seed = min((self._grams.get(term[i:i + 3], _EMPTY) for i in range(len(term) - 2)), key=len)
+        starts = self._grams.get(_PREFIX + term, _EMPTY) if " " not in term else _EMPTY
+        rest = seed - starts
+        if not rest: return starts
+        texts = self._texts
+        return starts | {key for key in rest if term in texts[key]}
+
+    def search(self, query):
+        """Sorgudaki tüm kelimeleri içeren anahtarlar kümesi (salt okunur). Boş sorguda None (filtre yok)."""
+        terms = normalize(query).split()
+        if not terms: return None
+        result = None
+        for keys in sorted((self._term(term) for term in terms), key=len):
+            result = keys if result is None else result & keys
+            if not result: break
+        return result
@@ -0,0 +1,292 @@
+# section_catalog.py
+# Büyük standart kesit katalogları (prekast kiriş aileleri, kutu kesitler,
+# binlerce dikdörtgen varyant) için sütun bazlı, mmap ile açılan ikili dosya biçimi.
+#
+# Dosya düzeni (little-endian):
+#   [0:4]   sihirli değer b"EPSC"
+#   [4:8]   sürüm (uint32)
+#   [8:12]  meta JSON uzunluğu (uint32)
+#   [12:..] meta JSON (utf-8) -> satır sayısı, sütunlar, aile adları
+#   (8 bayta hizalanmış) veri bölümü: her sütun ardışık float64 dizisi,
+#   aile kodları (uint16), isim ofsetleri (uint32, n+1 adet) ve isim baytları.
+
+import os
+import re
+import sys
+import json
+import math
+import mmap
+import struct
+from array import array
+
+import config
+
+try:
+    import numpy as np
+except ImportError:
+    np = None # Vektörel filtreler için isteğe bağlı; yoksa saf Python taraması kullanılır
+
+CATALOG_MAGIC = b"EPSC"
+CATALOG_VERSION = 1
+CATALOG_EXTENSION = ".epsc"
+DEFAULT_CATALOG_VERSION = 1 # Varsayılan dikdörtgen kataloğu değişince artırılır (dosya yeniden üretilir)
+_HEADER = struct.Struct("<4sII")
+# Arama metnindeki aralık filtreleri: "h=500-700", "A>=150000", "b<=400", "D=600"
+_RANGE_TOKEN = re.compile(r"^(\w+)(>=|<=|=)(\d+(?:[.,]\d+)?)(?:-(\d+(?:[.,]\d+)?))?$")
+
+# Katalogda bulunabilecek sayısal sütunlar (mm, mm², mm⁴, mm³)
+DIMENSION_COLUMNS = ("b", "h", "D")
+PROPERTY_COLUMNS = ("A", "Iy", "Iz", "Wy", "Wz")
+
+
+def _align8(value):
+    return (value + 7) & ~7
+
+def derived_properties(sec_type, b=None, h=None, D=None):
+    """Kesit tipine göre alan, atalet ve mukavemet momentlerini hesaplar."""
+    if sec_type == "Dairesel":
+        A = math.pi * D ** 2 / 4.0; I = math.pi * D ** 4 / 64.0; W = math.pi * D ** 3 / 32.0
+        return {"A": A, "Iy": I, "Iz": I, "Wy": W, "Wz": W}
+    return {"A": b * h, "Iy": b * h ** 3 / 12.0, "Iz": h * b ** 3 / 12.0, "Wy": b * h ** 2 / 6.0, "Wz": h * b ** 2 / 6.0}
+
+
+# --- Yazma ---
+def write_catalog(path, rows, columns=DIMENSION_COLUMNS + PROPERTY_COLUMNS):
+    """Satır sözlüklerini ({'name', 'family', 'b', 'h', ...}) sütun bazlı katalog dosyasına yazar."""
+    names_blob = bytearray(); name_offsets = array("I", [0])
+    family_codes = array("H"); families = []; family_index = {}
+    column_data = {col: array("d") for col in columns}
+    for row in rows:
+        names_blob += str(row["name"]).encode("utf-8"); name_offsets.append(len(names_blob))
+        family = row.get("family", "")
+        if family not in family_index: family_index[family] = len(families); families.append(family)
+        family_codes.append(family_index[family])
+        for col in columns:
+            value = row.get(col)
+            column_data[col].append(float("nan") if value is None else float(value))
+    row_count = len(family_codes)
+
+    # Veri bölümündeki ofsetler (veri başlangıcına göre)
+    layout = {}; offset = 0
+    for col in columns: layout[col] = offset; offset = _align8(offset + row_count * 8)
+    layout["__family__"] = offset; offset = _align8(offset + row_count * 2)
+    layout["__name_offsets__"] = offset; offset = _align8(offset + (row_count + 1) * 4)
+    layout["__names__"] = offset
+    meta = {"rows": row_count, "columns": list(columns), "offsets": layout, "families": families, "names_size": len(names_blob)}
+    meta_bytes = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+    data_start = _align8(_HEADER.size + len(meta_bytes))
+
+    arrays = [column_data[col] for col in columns] + [family_codes, name_offsets]
+    if sys.byteorder != "little":
+        for arr in arrays: arr.byteswap()
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(CATALOG_MAGIC, CATALOG_VERSION, len(meta_bytes))); f.write(meta_bytes)
+        for key, arr in zip(list(columns) + ["__family__", "__name_offsets__"], arrays):
+            f.write(b"\0" * (data_start + layout[key] - f.tell())); arr.tofile(f)
+        f.write(b"\0" * (data_start + layout["__names__"] - f.tell())); f.write(names_blob)
+    os.replace(tmp_path, path)
+    print(f"Section catalog written: {path} ({row_count} rows)")
+    return row_count
+
+def build_rectangular_catalog(path, b_values, h_values, family="Dikdörtgen"):
+    """b x h kombinasyonlarından türetilmiş özellikleriyle dikdörtgen kesit kataloğu oluşturur."""
+    def rows():
+        for b in b_values:
+            for h in h_values:
+                row = {"name": f"{family} {b:.0f}x{h:.0f}", "family": family, "b": b, "h": h}
+                row.update(derived_properties("Dikdörtgen", b=b, h=h)); yield row
+    return write_catalog(path, rows())
+
+
+# --- Okuma ---
+class SectionCatalog:
+    """mmap ile açılan salt okunur kesit kataloğu. Sütunlar kopyalanmadan okunur."""
+
+    def __init__(self, path):
+        self.path = path
+        self.title = os.path.splitext(os.path.basename(path))[0]
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, meta_len = _HEADER.unpack_from(self._mm, 0)
+        if magic != CATALOG_MAGIC: self.close(); raise ValueError(f"Geçersiz katalog dosyası: {path}")
+        if version > CATALOG_VERSION: self.close(); raise ValueError(f"Desteklenmeyen katalog sürümü ({version}): {path}")
+        meta = json.loads(self._mm[_HEADER.size:_HEADER.size + meta_len].decode("utf-8"))
+        self._data_start = _align8(_HEADER.size + meta_len)
+        self.rows = meta["rows"]; self.columns = tuple(meta["columns"]); self.families = meta["families"]
+        self._offsets = meta["offsets"]; self._names_size = meta["names_size"]
+        self._column_cache = {}
+        self._names = None; self._names_lower = None; self._name_index = None
+
+    def __len__(self): return self.rows
+
+    def __enter__(self): return self
+
+    def __exit__(self, *exc): self.close()
+
+    def close(self):
+        self._column_cache = {}
+        if getattr(self, "_mm", None) is not None:
+            try: self._mm.close()
+            except BufferError: pass # Dışarıda tutulan görünüm varsa GC kapatır
+            self._mm = None
+        if getattr(self, "_file", None) is not None: self._file.close(); self._file = None
+
+    def _raw(self, key, itemsize, count, typecode):
+        start = self._data_start + self._offsets[key]
+        view = memoryview(self._mm)[start:start + itemsize * count]
+        if sys.byteorder == "little": return view.cast(typecode)
+        arr = array(typecode, view.tobytes()); arr.byteswap(); return arr
+
+    def column(self, name):
+        """Sayısal sütunu döndürür (numpy varsa ndarray, yoksa float64 memoryview)."""
+        if name not in self.columns: raise KeyError(f"Katalogda '{name}' sütunu yok.")
+        cached = self._column_cache.get(name)
+        if cached is None:
+            if np is not None:
+                cached = np.frombuffer(self._mm, dtype="<f8", count=self.rows, offset=self._data_start + self._offsets[name])
+            else:
+                cached = self._raw(name, 8, self.rows, "d")
+            self._column_cache[name] = cached
+        return cached
+
+    def family(self, row):
+        return self.families[self._raw("__family__", 2, self.rows, "H")[row]]
+
+    def name(self, row):
+        offsets = self._raw("__name_offsets__", 4, self.rows + 1, "I")
+        start = self._data_start + self._offsets["__names__"]
+        return self._mm[start + offsets[row]:start + offsets[row + 1]].decode("utf-8")
+
+    def names(self):
+        """Tüm isimleri (ilk çağrıda bir kez çözülerek) döndürür."""
+        if self._names is None:
+            start = self._data_start + self._offsets["__names__"]
+            blob = self._mm[start:start + self._names_size]
+            offsets = self._raw("__name_offsets__", 4, self.rows + 1, "I")
+            self._names = [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(self.rows)]
+        return self._names
+
+    def find(self, name):
+        """İsme göre satır numarası döndürür, yoksa -1."""
+        if self._name_index is None: self._name_index = {n: i for i, n in enumerate(self.names())}
+        return self._name_index.get(name, -1)
+
+    def row(self, row):
+        """Satırı sözlük olarak döndürür (tanımsız sütunlar atlanır)."""
+        result = {"name": self.name(row), "family": self.family(row)}
+        for col in self.columns:
+            value = float(self.column(col)[row])
+            if value == value: result[col] = value
+        return result
+
+    def query(self, limit=None, **ranges):
+        """Aralık filtresi uygular: query(h=(500, 700), A=(x, None)). Satır numaralarını döndürür."""
+        for col in ranges:
+            if col not in self.columns: raise KeyError(f"Katalogda '{col}' sütunu yok.")
+        if np is not None:
+            mask = np.ones(self.rows, dtype=bool)
+            for col, (lo, hi) in ranges.items():
+                values = self.column(col)
+                if lo is not None: mask &= values >= lo
+                if hi is not None: mask &= values <= hi
+            rows = np.flatnonzero(mask)
+            return rows[:limit].tolist() if limit is not None else rows.tolist()
+        # Saf Python: her filtre bir önceki adayları daraltır
+        candidates = range(self.rows)
+        for col, (lo, hi) in ranges.items():
+            values = self.column(col)
+            lo = -math.inf if lo is None else lo; hi = math.inf if hi is None else hi
+            candidates = [i for i in candidates if lo <= values[i] <= hi]
+        candidates = list(candidates)
+        return candidates[:limit] if limit is not None else candidates
+
+    def filter(self, text, limit=50):
+        """Arama kutusu metnini uygular: aralık filtreleri query() ile, kalan metin isimde aranır.
+        filter("h=500-700 A>=150000 600") -> h 500..700, A >= 150000 ve isminde "600" geçen kesitler."""
+        needle, ranges = parse_filter(text)
+        if not ranges: return self.search(needle, limit)
+        if any(col not in self.columns for col in ranges): return []
+        rows = self.query(None if needle else limit, **ranges)
+        if not needle: return [self.name(row) for row in rows]
+        names = self.names(); result = []
+        for row in rows:
+            if needle in names[row].lower():
+                result.append(names[row])
+                if len(result) >= limit: break
+        return result
+
+    def search(self, text, limit=50):
+        """İsim içinde geçen metne göre (büyük/küçük harf duyarsız) en fazla 'limit' isim döndürür."""
+        if self._names_lower is None: self._names_lower = [n.lower() for n in self.names()]
+        needle = (text or "").strip().lower(); names = self.names(); result = []
+        for i, lowered in enumerate(self._names_lower):
+            if needle in lowered:
+                result.append(names[i])
+                if len(result) >= limit: break
+        return result
+
+
+def parse_filter(text):
+    """Arama metnini (isim metni, {sütun: (alt, üst)}) olarak ayırır. "=" tek değer veya "alt-üst"
+    aralığı, ">=" ve "<=" tek taraflı sınır verir. İsim metni küçük harfe çevrilir."""
+    words = []; ranges = {}
+    for token in (text or "").split():
+        match = _RANGE_TOKEN.match(token)
+        if not match: words.append(token); continue
+        col, op, first, second = match.groups()
+        first = float(first.replace(",", ".")); second = float(second.replace(",", ".")) if second else None
+        if op == ">=": bounds = (first, None)
+        elif op == "<=": bounds = (None, first)
+        else: bounds = (first, second if second is not None else first)
+        ranges[col] = bounds
+    return " ".join(words).lower(), ranges
+
+
+# --- Katalog Kayıt Defteri ---
+_open_catalogs = None
+
+def default_catalog_path():
+    return os.path.join(config.SECTION_CATALOG_DIR, f"dikdortgen_v{DEFAULT_CATALOG_VERSION}{CATALOG_EXTENSION}")
+
+def build_default_catalog(path=None):
+    """Standart dikdörtgen kesit kataloğunu (b 200..1000, h 200..2000 mm, 25 mm adım) üretir."""
+    path = path or default_catalog_path()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    return build_rectangular_catalog(path, range(200, 1001, 25), range(200, 2001, 25))
+
+def get_catalogs():
+    """config.SECTION_CATALOG_DIR altındaki katalogları ilk kullanımda açar (varsayılan katalog yoksa üretir)."""
+    global _open_catalogs
+    if _open_catalogs is None:
+        _open_catalogs = []
+        catalog_dir = config.SECTION_CATALOG_DIR
+        if not os.path.exists(default_catalog_path()):
+            try: build_default_catalog()
+            except OSError as e: print(f"Error building default section catalog: {e}")
+        if os.path.isdir(catalog_dir):
+            for file_name in sorted(os.listdir(catalog_dir)):
+                if not file_name.endswith(CATALOG_EXTENSION): continue
+                try: _open_catalogs.append(SectionCatalog(os.path.join(catalog_dir, file_name)))
+                except Exception as e: print(f"Error opening section catalog '{file_name}': {e}")
+        print(f"Info: {len(_open_catalogs)} section catalog(s) available.")
+    return _open_catalogs
+
+def search_all(text, limit=50):
+    """Tüm kataloglarda arama yapar (aralık filtreleri dahil, bkz. SectionCatalog.filter); (katalog, isim) çiftleri döndürür."""
+    results = []
+    for catalog in get_catalogs():
+        for name in catalog.filter(text, limit - len(results)): results.append((catalog, name))
+        if len(results) >= limit: break
+    return results
+
+def to_section_dict(catalog, name, material_name=""):
+    """Katalog satırını profil kesiti sözlüğüne (profiles.json biçimi) çevirir."""
+    row = catalog.row(catalog.find(name))
+    if "D" in row: return {"user_name": name, "type": "Dairesel", "material_name": material_name, "dimensions": {"D": row["D"]}}
+    return {"user_name": name, "type": "Dikdörtgen", "material_name": material_name, "dimensions": {"b": row["b"], "h": row["h"]}}
+
+
+if __name__ == "__main__":
+    # Standart dikdörtgen kataloğunu (yeniden) üretir: python section_catalog.py
+    build_default_catalog()
@@ -3,7 +3,7 @@
 
 import tkinter as tk
 from tkinter import ttk
-from tkinter import messagebox, simpledialog
+from tkinter import messagebox, simpledialog, filedialog
 import math
 
 # Diğer modüllerimizi import edelim
@@ -11,6 +11,19 @@ import config
 import ui_components
 import utils
 import autocad_interface # AutoCAD fonksiyonları için
+import com_worker # AutoCAD işleri ayrı COM iş parçacığında (arayüz donmaz)
+import drawing_batch # AutoCAD'e toplu çizim (az COM çağrısı)
+import records # Tipli malzeme/kesit kayıtları
+import section_catalog # Standart kesit katalogları (mmap)
+import steel_catalog # IPE/HEA/HEB/UPN/kutu çelik profil kataloğu
+import bulk_import # CSV/XLSX toplu içe aktarım
+import calculations # Arayüzden bağımsız hesap motorları (önbellekli)
+import dependency_graph # Malzeme -> kesit -> tasarım -> rapor bağımlılıkları
+import record_pool # Profiller arası paylaşılan kayıtlar
+import profile_schema # Kayıt şema doğrulaması
+import profile_snapshots # Sürümlü anlık görüntüler ve fark
+import search_index # Liste filtreleri için n-gram arama indeksi
+from undo_history import undoable # Geri al / yinele adımları
 
 # pyautocad importunu buraya da ekleyelim (APoint için)
 try:
@@ -80,6 +93,7 @@ class AutoCADFrame(ttk.Frame):
         self.connected_doc_name = self.main_app.connected_autocad_doc_name
         self.selected_area_points = None
         self.shape_buttons_references = {}
+        self._acad_job = None # Süren AutoCAD işi (com_worker.ComJob)
         self.osnap_vars = {}
         self._create_widgets()
         self.show_autocad_home()
@@ -162,11 +176,18 @@ class AutoCADFrame(ttk.Frame):
         if grid_frame: all_check_frames.extend(w for w in grid_frame.winfo_children() if isinstance(w, tk.Frame))
         if osnap_options_frame: all_check_frames.extend(w for w in osnap_options_frame.winfo_children() if isinstance(w, tk.Frame))
         if is_connected:
-            current_gridmode = autocad_interface.get_autocad_variable("GRIDMODE", saved_grid_mode); grid_var.set(current_gridmode)
-            current_osmode = autocad_interface.get_autocad_variable("OSMODE", saved_osmode)
-            for bit_value, var in self.osnap_vars.items(): var.set(1) if current_osmode & bit_value else var.set(0)
-            for frame in all_check_frames:
-                 if hasattr(frame, "update_visual_func"): frame.update_visual_func()
+            def apply_variables(variables):
+                # Önbellekteyse hemen, değilse COM okuması bitince çağrılır; sayfa bu arada değiştiyse geçilir
+                try:
+                    if not settings_area_frame.winfo_exists(): return
+                except tk.TclError: return
+                current_gridmode = variables["GRIDMODE"] if variables["GRIDMODE"] is not None else saved_grid_mode; grid_var.set(current_gridmode)
+                current_osmode = variables["OSMODE"] if variables["OSMODE"] is not None else saved_osmode
+                for bit_value, var in self.osnap_vars.items(): var.set(1) if current_osmode & bit_value else var.set(0)
+                for frame in all_check_frames:
+                     if hasattr(frame, "update_visual_func"): frame.update_visual_func()
+            autocad_interface.submit_get_autocad_variables(["GRIDMODE", "OSMODE"], apply_variables,
+                                                           on_error=lambda e: print(f"Error reading AutoCAD variables: {e}"))
 
         # Bağlı dosya adı (sayfa içeriğinin altına)
         if self.connected_doc_name: file_text = f"Bağlı Dosya: {self.connected_doc_name}"
@@ -175,74 +196,84 @@ class AutoCADFrame(ttk.Frame):
         doc_name_label.pack(side=tk.BOTTOM, anchor='se', padx=10, pady=5)
 
     def _toggle_grid_mode(self, variable):
-        autocad_interface.set_autocad_variable("GRIDMODE", variable.get())
+        autocad_interface.stage_autocad_variable("GRIDMODE", variable.get()) # Art arda tıklamalar tek yazmada birleşir
     def _update_osmode(self):
         new_osmode_value = 0
         for bit_value, var in self.osnap_vars.items():
             if var.get() == 1: new_osmode_value |= bit_value
-        autocad_interface.set_autocad_variable("OSMODE", new_osmode_value)
+        autocad_interface.stage_autocad_variable("OSMODE", new_osmode_value)
 
-    def _select_area_in_autocad(self, result_text_widget): # shape_buttons kaldırıldı
-        """Kullanıcıdan AutoCAD'de 4 nokta seçmesini ister."""
-        self.selected_area_points = None
-        result_text_widget.config(state=tk.NORMAL); result_text_widget.delete('1.0', tk.END)
-        acad = autocad_interface.get_acad_instance()
-        if not acad: result_text_widget.insert(tk.END, "Hata: AutoCAD bağlantısı kurulamadı."); result_text_widget.config(state=tk.DISABLED); return
-        result_text_widget.insert(tk.END, "AutoCAD ekranına geçin ve 4 nokta seçin...\n(Arayüz bu sırada donabilir)\n"); self.main_app.root.update_idletasks()
-        points = []; button_state = tk.DISABLED
+    def _write_result(self, result_text_widget, text, clear=False):
+        """Sonuç alanına yazar; pencere bu arada kapandıysa (sayfa değişti) sessizce geçer."""
         try:
-            p1 = autocad_interface.get_point_from_user("Lütfen 1. noktayı seçin (İptal için Esc):")
-            if p1 is None: raise Exception("Kullanıcı iptal etti.")
-            p2 = autocad_interface.get_point_from_user("Lütfen 2. noktayı seçin:")
-            if p2 is None: raise Exception("Kullanıcı iptal etti.")
-            p3 = autocad_interface.get_point_from_user("Lütfen 3. noktayı seçin:")
-            if p3 is None: raise Exception("Kullanıcı iptal etti.")
-            p4 = autocad_interface.get_point_from_user("Lütfen 4. noktayı seçin:")
-            if p4 is None: raise Exception("Kullanıcı iptal etti.")
-            points = [p1, p2, p3, p4]; self.selected_area_points = points
-            result_text_widget.insert(tk.END, "Seçilen Noktalar:\n")
-            for i, p in enumerate(points): result_text_widget.insert(tk.END, f"{i+1}. Nokta: {p}\n")
-            result_text_widget.insert(tk.END, "\nAlan başarıyla seçildi. Şimdi şekil çizebilirsiniz."); button_state = tk.NORMAL
-        except Exception as e: print(f"Nokta seçimi hatası/iptali: {e}"); result_text_widget.insert(tk.END, f"\nHata veya İptal: Nokta seçimi tamamlanamadı.\n{e}"); self.selected_area_points = None; button_state = tk.DISABLED
-        finally:
-            autocad_interface.prompt_user("\n")
+            if not result_text_widget.winfo_exists(): return
+            result_text_widget.config(state=tk.NORMAL)
+            if clear: result_text_widget.delete('1.0', tk.END)
+            result_text_widget.insert(tk.END, text); result_text_widget.see(tk.END)
             result_text_widget.config(state=tk.DISABLED)
-            # self.shape_buttons_references kullanılarak buton durumu güncellenir
-            for btn in self.shape_buttons_references.values():
-                 if btn: btn.configure(state=button_state)
+        except tk.TclError: pass
+
+    def _set_shape_buttons_state(self, state):
+        for btn in self.shape_buttons_references.values():
+            try:
+                if btn and btn.winfo_exists(): btn.configure(state=state)
+            except tk.TclError: pass
+
+    def _acad_busy(self, result_text_widget):
+        if self._acad_job is not None and self._acad_job.state in (com_worker.PENDING, com_worker.RUNNING):
+            self._write_result(result_text_widget, f"\nBekleyin: '{self._acad_job.name}' sürüyor (İptal ile durdurabilirsiniz).\n"); return True
+        return False
+
+    def _cancel_acad_job(self, result_text_widget):
+        if self._acad_job is not None and self._acad_job.cancel():
+            self._write_result(result_text_widget, "\nİptal istendi (nokta bekleniyorsa AutoCAD'de Esc'ye basın).\n")
+
+    def _select_area_in_autocad(self, result_text_widget): # shape_buttons kaldırıldı
+        """Kullanıcıdan AutoCAD'de 4 nokta seçmesini ister. Seçim COM iş parçacığında yürür; arayüz donmaz."""
+        if self._acad_busy(result_text_widget): return
+        self.selected_area_points = None; self._set_shape_buttons_state(tk.DISABLED)
+        self._write_result(result_text_widget, "AutoCAD ekranına geçin ve 4 nokta seçin (İptal için Esc)...\n", clear=True)
+        def on_done(points):
+            self.selected_area_points = points
+            self._write_result(result_text_widget, "\nAlan başarıyla seçildi. Şimdi şekil çizebilirsiniz.")
+            self._set_shape_buttons_state(tk.NORMAL); utils.bring_window_to_front()
+        def on_error(error):
+            print(f"Nokta seçimi hatası/iptali: {error}")
+            self._write_result(result_text_widget, f"\nHata veya İptal: Nokta seçimi tamamlanamadı.\n{error}")
             utils.bring_window_to_front()
+        self._acad_job = com_worker.get_worker().submit(
+            autocad_interface.pick_points, 4, name="Alan seçimi", on_done=on_done, on_error=on_error,
+            on_progress=lambda job, fraction, message: self._write_result(result_text_widget, message + "\n"))
 
     def _draw_shape_in_area(self, shape_type, result_text_widget):
-        """Seçilen alana belirtilen şekli çizer."""
-        result_text_widget.config(state=tk.NORMAL); result_text_widget.delete('1.0', tk.END)
-        if not self.selected_area_points or len(self.selected_area_points) != 4: result_text_widget.insert(tk.END, "Hata: Önce 'Alan Seç' ile 4 nokta belirlemelisiniz."); result_text_widget.config(state=tk.DISABLED); return
-        acad = autocad_interface.get_acad_instance()
-        if not acad: result_text_widget.insert(tk.END, "Hata: AutoCAD bağlantısı kurulamadı."); result_text_widget.config(state=tk.DISABLED); return
-        if not APoint: result_text_widget.insert(tk.END, "Hata: APoint pyautocad'den import edilemedi."); result_text_widget.config(state=tk.DISABLED); return
-        try:
-            xs = [p[0] for p in self.selected_area_points]; ys = [p[1] for p in self.selected_area_points]
-            min_x, max_x = min(xs), max(xs); min_y, max_y = min(ys), max(ys)
-            center_x = (min_x + max_x) / 2; center_y = (min_y + max_y) / 2
-            width = max_x - min_x; height = max_y - min_y
-            size = min(width, height) * 0.8
-            if size <= 0: result_text_widget.insert(tk.END, "Hata: Geçersiz alan boyutu."); result_text_widget.config(state=tk.DISABLED); return
-            radius = size / 2.0
-            result_text_widget.insert(tk.END, f"'{shape_type}' çiziliyor...\nMerkez: ({center_x:.2f}, {center_y:.2f}), Boyut: {size:.2f}\n"); self.main_app.root.update_idletasks()
-
-            success = False
-            if shape_type == 'kare':
-                half_size = size / 2.0; p1 = APoint(center_x - half_size, center_y - half_size); p2 = APoint(center_x + half_size, center_y - half_size); p3 = APoint(center_x + half_size, center_y + half_size); p4 = APoint(center_x - half_size, center_y + half_size)
-                success = autocad_interface.draw_line(p1, p2) and autocad_interface.draw_line(p2, p3) and autocad_interface.draw_line(p3, p4) and autocad_interface.draw_line(p4, p1)
-            elif shape_type == 'daire':
-                success = autocad_interface.draw_circle(APoint(center_x, center_y), radius)
-            elif shape_type == 'üçgen':
-                p1 = APoint(center_x, center_y + radius); p2 = APoint(center_x - radius * math.sqrt(3)/2, center_y - radius/2); p3 = APoint(center_x + radius * math.sqrt(3)/2, center_y - radius/2)
-                success = autocad_interface.draw_line(p1, p2) and autocad_interface.draw_line(p2, p3) and autocad_interface.draw_line(p3, p1)
-
-            if success: result_text_widget.insert(tk.END, f"'{shape_type}' başarıyla çizildi.")
-            else: result_text_widget.insert(tk.END, f"\nHata: '{shape_type}' çizilemedi (bkz. log).")
-        except Exception as e: print(f"Şekil çizme hatası: {e}"); result_text_widget.insert(tk.END, f"\nHata: Şekil çizilemedi.\n{e}")
-        finally: result_text_widget.config(state=tk.DISABLED); utils.bring_window_to_front()
+        """Seçilen alana belirtilen şekli çizer (COM iş parçacığında)."""
+        if self._acad_busy(result_text_widget): return
+        self._write_result(result_text_widget, "", clear=True)
+        if not self.selected_area_points or len(self.selected_area_points) != 4: self._write_result(result_text_widget, "Hata: Önce 'Alan Seç' ile 4 nokta belirlemelisiniz."); return
+        xs = [p[0] for p in self.selected_area_points]; ys = [p[1] for p in self.selected_area_points]
+        min_x, max_x = min(xs), max(xs); min_y, max_y = min(ys), max(ys)
+        center_x = (min_x + max_x) / 2; center_y = (min_y + max_y) / 2
+        width = max_x - min_x; height = max_y - min_y
+        size = min(width, height) * 0.8
+        if size <= 0: self._write_result(result_text_widget, "Hata: Geçersiz alan boyutu."); return
+        radius = size / 2.0
+        self._write_result(result_text_widget, f"'{shape_type}' çiziliyor...\nMerkez: ({center_x:.2f}, {center_y:.2f}), Boyut: {size:.2f}\n")
+
+        batch = drawing_batch.DrawingBatch() # Şekil tek varlık olarak, tek gönderimde çizilir
+        if shape_type == 'kare':
+            half_size = size / 2.0; batch.rectangle(center_x - half_size, center_y - half_size, center_x + half_size, center_y + half_size)
+        elif shape_type == 'daire':
+            batch.circle((center_x, center_y), radius)
+        elif shape_type == 'üçgen':
+            batch.polygon([(center_x, center_y + radius), (center_x - radius * math.sqrt(3)/2, center_y - radius/2), (center_x + radius * math.sqrt(3)/2, center_y - radius/2)])
+        def on_done(handles):
+            if handles and all(handles): self._write_result(result_text_widget, f"'{shape_type}' başarıyla çizildi.")
+            else: self._write_result(result_text_widget, f"\nHata: '{shape_type}' çizilemedi (bkz. log).")
+            utils.bring_window_to_front()
+        def on_error(error):
+            print(f"Şekil çizme hatası: {error}")
+            self._write_result(result_text_widget, f"\nHata: Şekil çizilemedi.\n{error}")
+        self._acad_job = com_worker.get_worker().submit(autocad_interface.submit_batch, batch, name=f"'{shape_type}' çizimi", on_done=on_done, on_error=on_error)
 
     def show_autocad_test_area(self):
         self.main_app.update_current_view(self.show_autocad_test_area)
@@ -265,6 +296,7 @@ class AutoCADFrame(ttk.Frame):
         square_button = ttk.Button(button_area_frame, text="Kare", style='TButton', command=lambda rt=result_text: self._draw_shape_in_area('kare', rt), state=shape_button_state); square_button.pack(side=tk.LEFT, anchor='w', padx=5); self.shape_buttons_references['kare'] = square_button
         triangle_button = ttk.Button(button_area_frame, text="Üçgen", style='TButton', command=lambda rt=result_text: self._draw_shape_in_area('üçgen', rt), state=shape_button_state); triangle_button.pack(side=tk.LEFT, anchor='w', padx=5); self.shape_buttons_references['üçgen'] = triangle_button
         circle_button = ttk.Button(button_area_frame, text="Daire", style='TButton', command=lambda rt=result_text: self._draw_shape_in_area('daire', rt), state=shape_button_state); circle_button.pack(side=tk.LEFT, anchor='w', padx=5); self.shape_buttons_references['daire'] = circle_button
+        cancel_button = ttk.Button(button_area_frame, text="İptal", style='TButton', command=lambda rt=result_text: self._cancel_acad_job(rt), state=control_state); cancel_button.pack(side=tk.LEFT, anchor='w', padx=(10,0))
 
         if self.connected_doc_name: file_text = f"Bağlı Dosya: {self.connected_doc_name}"
         else: file_text = "Bağlı Dosya: Yok"
@@ -287,6 +319,7 @@ class CalculationsFrame(ttk.Frame):
         self.sub_sidebar = None
         self.page_container = None
         self.current_page_frame = None
+        self.current_page_key = None
         self.project_info_vars = {}
         self.material_detail_vars = {}
         self.material_listbox_ref = None
@@ -295,6 +328,11 @@ class CalculationsFrame(ttk.Frame):
         self.section_detail_vars = {}
         self.section_listbox_ref = None
         self.section_detail_widgets = {}
+        # Liste filtreleri: tür ("materials"/"sections"/"profiles") -> indeks / arama kutusu değişkeni / (listbox, satırlar) / görünen satırların veri indeksleri
+        self._list_indexes = {kind: search_index.TrigramIndex() for kind in ("materials", "sections", "profiles")}
+        self._list_filter_vars = {}
+        self._list_rows = {}
+        self._list_views = {}
         self._create_widgets()
         self.show_page("profiles")
 
@@ -328,6 +366,7 @@ class CalculationsFrame(ttk.Frame):
 
     def show_page(self, page_key):
         self.main_app.update_current_view(self.show_page, page_key)
+        self.current_page_key = page_key
         if self.current_page_frame: self.current_page_frame.destroy()
         # page_container'ın var olduğundan emin ol
         if not self.page_container or not self.page_container.winfo_exists():
@@ -346,6 +385,20 @@ class CalculationsFrame(ttk.Frame):
         elif page_key == "profiles": self.populate_profiles_page(self.current_page_frame)
         else: ttk.Label(self.current_page_frame, text=f"Bilinmeyen sayfa: {page_key}").pack()
 
+    def record_undo_step(self, label, touched=None):
+        """Profillerdeki değişikliği (varsa) geri al geçmişine ekler (touched: değişen profil adları)."""
+        self.main_app.record_undo_step(label, touched)
+
+    def _notify_records_changed(self, kind, changes):
+        """Değişen kayıtlardan etkilenen tasarımları kirli işaretler; yeniden hesap arka planda yapılır."""
+        self.main_app.design_graphs.records_changed(self.current_profile_name, kind, changes)
+        self.main_app.schedule_design_recompute()
+
+    def refresh_after_external_change(self):
+        """Aktif profil başka bir süreç tarafından değiştirildiğinde açık sayfayı yeniden oluşturur."""
+        self.current_profile_name = self.main_app.current_profile_name
+        if self.current_page_key: self.show_page(self.current_page_key)
+
     # --- Sayfa İçeriklerini Oluşturan Metotlar ---
     def populate_project_info_page(self, parent_frame):
         self.project_info_vars = { "name": tk.StringVar(), "desc": tk.StringVar(), "engineer": tk.StringVar(), "concrete_reg": tk.StringVar(), "seismic_reg": tk.StringVar(), "load_reg": tk.StringVar(), "units": tk.StringVar() }
@@ -381,11 +434,13 @@ class CalculationsFrame(ttk.Frame):
         mat_pane.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         list_frame = tk.Frame(mat_pane, bg=self.theme['content_bg']); mat_pane.add(list_frame, width=250, stretch="never")
         ttk.Label(list_frame, text="Tanımlı Malzemeler:", style='Header.TLabel').pack(anchor='w', padx=5, pady=(0,5))
+        self._create_list_filter(list_frame, "materials").pack(fill=tk.X, padx=5, pady=(0,5))
         listbox = tk.Listbox(list_frame, height=15, font=("Segoe UI", 13), relief='flat', bd=1, bg=self.theme['listbox_bg'], fg=self.theme['listbox_fg'], selectbackground=self.theme['listbox_select_bg'], selectforeground=self.theme['title_text'], highlightthickness=1, highlightbackground=self.theme['entry_border'], exportselection=False)
         listbox.pack(fill=tk.BOTH, expand=True, padx=5); self.material_listbox_ref = listbox
         listbox.bind('<<ListboxSelect>>', lambda e: self.load_selected_material_to_form())
         button_frame = tk.Frame(list_frame, bg=self.theme['content_bg']); button_frame.pack(fill=tk.X, pady=5, padx=5)
         ttk.Button(button_frame, text="Yeni", style='TButton', width=6, command=self.clear_material_form).pack(side=tk.LEFT, padx=2); ttk.Button(button_frame, text="Düzenle", style='TButton', width=6, command=self.load_selected_material_to_form).pack(side=tk.LEFT, padx=2); ttk.Button(button_frame, text="Sil", style='TButton', width=6, command=self.delete_selected_material).pack(side=tk.LEFT, padx=2)
+        ttk.Button(button_frame, text="İçe Aktar", style='TButton', command=lambda: self.import_records_from_file("materials")).pack(side=tk.LEFT, padx=2)
         detail_frame = tk.Frame(mat_pane, bg=self.theme['content_bg']); mat_pane.add(detail_frame, stretch="always")
         ttk.Label(detail_frame, text="Malzeme Detayları:", style='Header.TLabel').grid(row=0, column=0, columnspan=3, sticky='w', padx=10, pady=(0,10))
         detail_form_frame = tk.Frame(detail_frame, bg=self.theme['content_bg']); detail_form_frame.grid(row=1, column=0, sticky='nsew', padx=10); detail_frame.rowconfigure(1, weight=1); detail_frame.columnconfigure(0, weight=1); detail_form_frame.columnconfigure(1, weight=1)
@@ -412,19 +467,40 @@ class CalculationsFrame(ttk.Frame):
     def populate_section_page(self, parent_frame): ttk.Label(parent_frame, text="Kesit Kütüphanesi (Geliştirilecek)", style='Header.TLabel').pack(padx=10, pady=10)
     def populate_element_design_page(self, parent_frame): ttk.Label(parent_frame, text="Tekil Eleman Tasarımı (Geliştirilecek)", style='Header.TLabel').pack(padx=10, pady=10)
     def populate_seismic_load_page(self, parent_frame): ttk.Label(parent_frame, text="Deprem Yükü Hesaplama (TBDY 2018) (Geliştirilecek)", style='Header.TLabel').pack(padx=10, pady=10)
-    def populate_reporting_page(self, parent_frame): ttk.Label(parent_frame, text="Raporlama Seçenekleri:", style='Header.TLabel').pack(padx=10, pady=10, anchor='w')
+    def populate_reporting_page(self, parent_frame):
+        ttk.Label(parent_frame, text="Raporlama Seçenekleri:", style='Header.TLabel').pack(padx=10, pady=10, anchor='w')
+        # Kayıtlı eleman tasarımlarının özeti (yalnızca değişiklikten etkilenenler yeniden hesaplanır)
+        graph = self.main_app.design_graphs.get(self.current_profile_name)
+        report = graph.report() if graph else None
+        if not report or not report["total"]:
+            ttk.Label(parent_frame, text="Kayıtlı eleman tasarımı yok.", style='TLabel').pack(padx=10, pady=5, anchor='w'); return
+        ttk.Label(parent_frame, text=f"Eleman Tasarımları: {report['total']} adet, {report['failed']} yetersiz, {report['errors']} hatalı", style='TLabel').pack(padx=10, pady=5, anchor='w')
+        report_text = tk.Text(parent_frame, wrap=tk.NONE, height=15, font=("Segoe UI", 12), bg=self.theme['text_area_bg'], fg=self.theme['text_area_fg'], relief='flat', bd=1, highlightthickness=1, highlightbackground=self.theme['entry_border'], padx=5, pady=5)
+        report_text.pack(expand=True, fill='both', padx=10, pady=5)
+        lines = []
+        for name, result in report["rows"]:
+            if "error" in result: lines.append(f"{name}: HATA - {result['error']}")
+            else:
+                ratio = f"{result['ratio']:.3f}" if result["ratio"] is not None else "-"
+                lines.append(f"{name}: {result['status']} (Mr = {result['Mr_kNm']:.2f} kNm, Md = {result['Md_kNm']:.2f} kNm, Mr/Md = {ratio})")
+        report_text.insert(tk.END, "\n".join(lines)); report_text.config(state=tk.DISABLED)
     def populate_profiles_page(self, parent_frame):
         self.profile_listbox_ref = None
         parent_frame.columnconfigure(0, weight=1); parent_frame.rowconfigure(1, weight=1)
         ttk.Label(parent_frame, text="Hesaplama Profilleri", style='Header.TLabel').grid(row=0, column=0, columnspan=2, padx=10, pady=10, sticky='w')
         listbox = tk.Listbox(parent_frame, font=("Segoe UI", 13), relief='flat', bd=1, bg=self.theme['listbox_bg'], fg=self.theme['listbox_fg'], selectbackground=self.theme['listbox_select_bg'], selectforeground=self.theme['title_text'], highlightthickness=1, highlightbackground=self.theme['entry_border'], exportselection=False)
         listbox.grid(row=1, column=0, padx=(10,0), pady=5, sticky='nsew'); self.profile_listbox_ref = listbox
+        self._create_list_filter(parent_frame, "profiles").grid(row=0, column=0, padx=10, pady=10, sticky='e')
         scrollbar = ttk.Scrollbar(parent_frame, orient='vertical', command=listbox.yview); scrollbar.grid(row=1, column=1, padx=(0,10), pady=5, sticky='ns'); listbox['yscrollcommand'] = scrollbar.set
         button_frame = tk.Frame(parent_frame, bg=self.theme['content_bg']); button_frame.grid(row=2, column=0, columnspan=2, pady=10, sticky='ew')
         load_button = ttk.Button(button_frame, text="Seçili Profili Yükle", style='TButton', command=self.load_selected_profile); load_button.pack(side=tk.LEFT, padx=5)
         new_button = ttk.Button(button_frame, text="Yeni Profil", style='TButton', command=self.create_new_profile); new_button.pack(side=tk.LEFT, padx=5)
+        copy_button = ttk.Button(button_frame, text="Profili Kopyala", style='TButton', command=self.copy_selected_profile); copy_button.pack(side=tk.LEFT, padx=5)
         rename_button = ttk.Button(button_frame, text="Yeniden Adlandır", style='TButton', command=self.rename_selected_profile); rename_button.pack(side=tk.LEFT, padx=5)
         delete_button = ttk.Button(button_frame, text="Sil", style='TButton', command=self.delete_selected_profile); delete_button.pack(side=tk.LEFT, padx=5)
+        snapshot_frame = tk.Frame(parent_frame, bg=self.theme['content_bg']); snapshot_frame.grid(row=3, column=0, columnspan=2, pady=(0, 10), sticky='ew')
+        snapshot_button = ttk.Button(snapshot_frame, text="Anlık Görüntü Al", style='TButton', command=self.create_profile_snapshot); snapshot_button.pack(side=tk.LEFT, padx=5)
+        compare_button = ttk.Button(snapshot_frame, text="Sürümleri Karşılaştır", style='TButton', command=self.show_snapshot_diff_dialog); compare_button.pack(side=tk.LEFT, padx=5)
         self.update_profile_listbox()
 
 
@@ -620,8 +696,12 @@ class CalculationsFrame(ttk.Frame):
         row_idx += 1
 
         # --- Hesaplama Butonu ---
-        btn_calculate = ui_components.create_content_button(parent_frame, "Hesapla", self.theme, command=self._calculate_bending_capacity)
-        btn_calculate.grid(row=row_idx, column=0, columnspan=3, padx=10, pady=15)
+        button_frame = tk.Frame(parent_frame, bg=self.theme['content_bg'])
+        button_frame.grid(row=row_idx, column=0, columnspan=3, padx=10, pady=15)
+        btn_calculate = ui_components.create_content_button(button_frame, "Hesapla", self.theme, command=self._calculate_bending_capacity)
+        btn_calculate.pack(side=tk.LEFT, padx=5)
+        btn_save_design = ui_components.create_content_button(button_frame, "Tasarımı Kaydet", self.theme, command=self.save_design_from_form)
+        btn_save_design.pack(side=tk.LEFT, padx=5)
         row_idx += 1
 
         # --- Sonuç Alanı ---
@@ -677,38 +757,33 @@ class CalculationsFrame(ttk.Frame):
             if not selected_section_display or selected_section_display == "Tanımlı Dikdörtgen Kesit Yok":
                 raise ValueError("Lütfen geçerli bir dikdörtgen kesit seçin.")
             selected_section_name = selected_section_display.split(" ")[0]
-            sections = self._get_profile_data("sections")
-            section_data = self._find_item_by_name(sections, selected_section_name)
-            if not section_data or section_data.get("type") != "Dikdörtgen":
+            tables = self.main_app.record_tables.get(self.main_app.current_profile_name) # Sütun bazlı tipli erişim
+            if tables is None: raise ValueError("Aktif profil bulunamadı.")
+            section = tables.sections.get(selected_section_name)
+            if section is None or section.type is not records.SECTION_TYPE_RECT:
                 raise ValueError(f"Seçilen kesit '{selected_section_name}' bulunamadı veya dikdörtgen değil.")
-
-            dims = section_data.get("dimensions", {})
-            b = float(dims.get("b", 0.0)) # mm
-            h = float(dims.get("h", 0.0)) # mm
-            if b <= 0 or h <= 0: raise ValueError("Kesit boyutları (b, h) pozitif olmalı.")
+            b = section.b # mm
+            h = section.h # mm
+            if not (b > 0 and h > 0): raise ValueError("Kesit boyutları (b, h) pozitif olmalı.")
             output.append(f"Kesit: {selected_section_name} (b={b:.0f} mm, h={h:.0f} mm)")
 
             # 2. Beton Malzemesini Al
-            concrete_material_name = section_data.get("material_name")
+            concrete_material_name = section.material_name
             if not concrete_material_name: raise ValueError("Kesit için beton malzemesi atanmamış.")
-            materials = self._get_profile_data("materials")
-            concrete_material_data = self._find_item_by_name(materials, concrete_material_name)
-            if not concrete_material_data: raise ValueError(f"Beton malzemesi '{concrete_material_name}' profil tanımlarında bulunamadı.")
-            concrete_props = concrete_material_data.get("props", {})
-            fck = float(concrete_props.get("fck", 0.0)) # MPa (N/mm²)
-            if fck <= 0: raise ValueError("Beton karakteristik dayanımı (fck) pozitif olmalı.")
+            if concrete_material_name not in tables.materials: raise ValueError(f"Beton malzemesi '{concrete_material_name}' profil tanımlarında bulunamadı.")
+            fck = tables.materials.value(concrete_material_name, "fck") # MPa (N/mm²)
+            if not fck > 0: raise ValueError("Beton karakteristik dayanımı (fck) pozitif olmalı.")
             output.append(f"Beton: {concrete_material_name} (fck = {fck:.1f} MPa)")
 
             # 3. Donatı Malzemesini Al
             selected_rebar_name = self.element_design_vars["selected_rebar_name"].get()
             if not selected_rebar_name or selected_rebar_name == "Tanımlı Donatı Malzemesi Yok":
                 raise ValueError("Lütfen geçerli bir donatı malzemesi seçin.")
-            rebar_material_data = self._find_item_by_name(materials, selected_rebar_name)
-            if not rebar_material_data: raise ValueError(f"Donatı malzemesi '{selected_rebar_name}' profil tanımlarında bulunamadı.")
-            rebar_props = rebar_material_data.get("props", {})
-            fyk = float(rebar_props.get("fyk", 0.0)) # MPa (N/mm²)
-            Es = float(rebar_props.get("Es", 200000.0)) # MPa (N/mm²) - Varsayılan 2e5
-            if fyk <= 0: raise ValueError("Donatı karakteristik akma dayanımı (fyk) pozitif olmalı.")
+            if selected_rebar_name not in tables.materials: raise ValueError(f"Donatı malzemesi '{selected_rebar_name}' profil tanımlarında bulunamadı.")
+            fyk = tables.materials.value(selected_rebar_name, "fyk") # MPa (N/mm²)
+            Es = tables.materials.value(selected_rebar_name, "Es")
+            if records.is_missing(Es): Es = config.TS500_BENDING_PARAMETERS["Es_default"] # MPa (N/mm²)
+            if not fyk > 0: raise ValueError("Donatı karakteristik akma dayanımı (fyk) pozitif olmalı.")
             output.append(f"Donatı: {selected_rebar_name} (fyk = {fyk:.0f} MPa, Es = {Es:.0f} MPa)")
 
             # 4. Donatı ve Diğer Girdileri Al
@@ -720,79 +795,24 @@ class CalculationsFrame(ttk.Frame):
             stirrup_phi = self.element_design_vars["stirrup_phi"].get()
             Md_kNm = self.element_design_vars["design_moment_md"].get() # kNm
 
-            if n_top <= 0 or phi_top <= 0: raise ValueError("Üst donatı adedi ve çapı pozitif olmalı.")
-            if cover < 0: raise ValueError("Paspayı negatif olamaz.")
-            if stirrup_phi < 0: raise ValueError("Etriye çapı negatif olamaz.")
-
             output.append(f"Üst Donatı (Çekme): {n_top} adet, Ø{phi_top:.0f} mm")
             output.append(f"Paspayı: {cover:.0f} mm")
             output.append(f"Etriye Çapı: {stirrup_phi:.0f} mm")
             output.append(f"Tasarım Momenti (Md): {Md_kNm:.2f} kNm")
-            output.append("\n--- HESAPLAMA (TS 500 - Basitleştirilmiş) ---")
-
-            # 5. Hesaplama Sabitleri ve Tasarım Değerleri
-            gamma_mc = 1.5
-            gamma_ms = 1.15
-            fcd = fck / gamma_mc
-            fyd = fyk / gamma_ms
-            epsilon_cu3 = 0.003
-            # k1: Beton basınç bloğu derinliği / Tarafsız eksen derinliği oranı
-            k1 = 0.85 # fck <= 50 MPa için (TS 500 Tablo 3.3) - Daha hassas kontrol eklenebilir
-            output.append(f"fcd = {fck:.1f} / {gamma_mc} = {fcd:.2f} MPa")
-            output.append(f"fyd = {fyk:.0f} / {gamma_ms} = {fyd:.2f} MPa")
-            output.append(f"Es = {Es:.0f} MPa, ε_cu3 = {epsilon_cu3:.4f}, k1 = {k1:.2f}")
-
-            # 6. Donatı Alanı ve Faydalı Yükseklik
-            As_top = n_top * math.pi * (phi_top / 2)**2 # mm² (Çekme donatısı)
-            # As_bot = n_bot * math.pi * (phi_bot / 2)**2 # mm² (Basınç donatısı - Şimdilik yok)
-
-            # Faydalı yükseklik (d) - Çekme donatısının merkezine olan mesafe
-            d = h - cover - stirrup_phi - (phi_top / 2) # mm
-            if d <= 0: raise ValueError(f"Hesaplanan faydalı yükseklik (d={d:.1f} mm) geçersiz.")
-            output.append(f"Çekme Donatı Alanı (As) = {As_top:.2f} mm²")
-            output.append(f"Faydalı Yükseklik (d) = {h:.0f} - {cover:.0f} - {stirrup_phi:.0f} - {phi_top/2:.1f} = {d:.2f} mm")
-
-            # 7. Moment Kapasitesi (Mr) Hesabı (Tek Donatılı)
-            # Basınç bloğu derinliği (a)
-            # As * fyd = 0.85 * fcd * b * a
-            a = (As_top * fyd) / (0.85 * fcd * b)
-            output.append(f"Basınç Bloğu Derinliği (a) = ({As_top:.2f} * {fyd:.2f}) / (0.85 * {fcd:.2f} * {b:.0f}) = {a:.2f} mm")
-
-            # Tarafsız eksen derinliği (c = a/k1)
-            c = a / k1
-            output.append(f"Tarafsız Eksen Derinliği (c) = {a:.2f} / {k1:.2f} = {c:.2f} mm")
-
-            # Kontrol: a, kesit içinde mi? (Basit kontrol)
-            if a <= 0 or a > h: raise ValueError(f"Hesaplanan basınç bloğu derinliği (a={a:.1f}mm) geçersiz.")
-            # Kontrol: Tarafsız eksen faydalı yükseklik içinde mi?
-            if c > d: # Bu aslında çeliğin akmadığı anlamına gelebilir (daha detaylı kontrol lazım)
-                 output.append(f"UYARI: Tarafsız eksen (c={c:.1f}mm) faydalı yüksekliğin (d={d:.1f}mm) dışında. Hesap şüpheli olabilir.")
-                 # Şimdilik devam edelim ama normalde burada farklı hesap gerekir.
-
-            # Moment Kapasitesi (Mr)
-            # Mr = As * fyd * (d - a/2)
-            Mr_Nmm = As_top * fyd * (d - a / 2)
-            Mr_kNm = Mr_Nmm / 1e6 # Nmm'den kNm'ye çevrim
-            output.append(f"Moment Kapasitesi (Mr) = {As_top:.2f} * {fyd:.2f} * ({d:.2f} - {a/2:.2f})")
-            output.append(f"Mr = {Mr_Nmm:.2f} Nmm = {Mr_kNm:.2f} kNm")
-
-            # 8. Karşılaştırma
-            output.append("\n--- SONUÇ ---")
-            Md_Nmm = Md_kNm * 1e6
-            ratio = Mr_Nmm / Md_Nmm if Md_Nmm != 0 else float('inf')
 
-            if Mr_Nmm >= Md_Nmm:
-                status = "YETERLİ"
-                output.append(f"KAPASİTE DURUMU: {status} (Mr = {Mr_kNm:.2f} kNm >= Md = {Md_kNm:.2f} kNm)")
-            else:
-                status = "YETERSİZ"
-                output.append(f"KAPASİTE DURUMU: {status} (Mr = {Mr_kNm:.2f} kNm < Md = {Md_kNm:.2f} kNm)")
-            output.append(f"Kapasite Oranı (Mr / Md): {ratio:.3f}")
+            # 5. Hesap (calculations motoru; aynı girdiler için sonuç önbellekten gelir)
+            result = calculations.calculate_bending_capacity(b=b, h=h, fck=fck, fyk=fyk, Es=Es, n_top=n_top, phi_top=phi_top,
+                                                             cover=cover, stirrup_phi=stirrup_phi, Md_kNm=Md_kNm)
+            output.append("\n--- HESAPLAMA (TS 500 - Basitleştirilmiş) ---" + (" [önbellekten]" if result["from_cache"] else ""))
+            output.extend(result["steps"])
 
-            # TODO: Minimum ve maksimum donatı oranları kontrolü eklenebilir.
-            # As_min = ...
-            # As_max = ...
-            # if not (As_min <= As_top <= As_max): output.append("UYARI: Donatı oranı sınırların dışında!")
+            # 6. Karşılaştırma
+            output.append("\n--- SONUÇ ---")
+            Mr_kNm = result["Mr_kNm"]; status = result["status"]
+            relation = ">=" if status == "YETERLİ" else "<"
+            output.append(f"KAPASİTE DURUMU: {status} (Mr = {Mr_kNm:.2f} kNm {relation} Md = {Md_kNm:.2f} kNm)")
+            ratio = result["ratio"] if result["ratio"] is not None else float('inf')
+            output.append(f"Kapasite Oranı (Mr / Md): {ratio:.3f}")
 
         except ValueError as ve:
             output.append(f"\n!!! HATA: {ve}")
@@ -803,7 +823,33 @@ class CalculationsFrame(ttk.Frame):
             results_widget.insert(tk.END, "\n".join(output))
             results_widget.config(state=tk.DISABLED) # Tekrar düzenlenemez yap
 
+    @undoable("Tasarım kaydet")
+    def save_design_from_form(self):
+        """Tekil eleman formundaki girdileri profile adlandırılmış tasarım olarak kaydeder (aynı isim güncellenir)."""
+        if not self.current_profile_name: messagebox.showerror("Hata", "Aktif profil bulunamadı."); return
+        selected_section_display = self.element_design_vars["selected_section_display"].get()
+        rebar_name = self.element_design_vars["selected_rebar_name"].get()
+        if not selected_section_display or not rebar_name: messagebox.showwarning("Eksik Girdi", "Lütfen kesit ve donatı malzemesi seçin.", parent=self.main_app.root); return
+        section_name = selected_section_display.split(" ")[0]
+        try:
+            design = {"section_name": section_name, "rebar_name": rebar_name,
+                      "n_top": self.element_design_vars["n_top"].get(), "phi_top": self.element_design_vars["phi_top"].get(),
+                      "cover": self.element_design_vars["cover"].get(), "stirrup_phi": self.element_design_vars["stirrup_phi"].get(),
+                      "Md_kNm": self.element_design_vars["design_moment_md"].get()}
+        except tk.TclError: messagebox.showerror("Hata", "Lütfen geçerli sayısal değerler girin.", parent=self.main_app.root); return
+        name = simpledialog.askstring("Tasarımı Kaydet", "Eleman adı (ör. K101):", initialvalue=section_name, parent=self.main_app.root)
+        if not name or not name.strip(): return
+        design = {"user_name": name.strip(), **design}
+        designs = self.profiles_data[self.current_profile_name].setdefault("designs", [])
+        index = next((i for i, d in enumerate(designs) if d.get("user_name") == design["user_name"]), None)
+        if index is None: designs.append(design)
+        else: designs[index] = design
+        designs.sort(key=lambda x: x.get("user_name", "").lower())
+        self._notify_records_changed(dependency_graph.DESIGN, [(design["user_name"], None)])
+        utils.save_profiles(); messagebox.showinfo("Başarılı", f"'{design['user_name']}' tasarımı kaydedildi.", parent=self.main_app.root)
+
     # --- Profil Veri Yönetimi Metotları ---
+    @undoable("Proje bilgileri")
     def save_project_info(self):
         if not self.current_profile_name: messagebox.showwarning("Profil Seçilmedi", "Lütfen önce bir profil seçin veya oluşturun."); return
         profile = self.profiles_data.setdefault(self.current_profile_name, {"project_info": {}, "materials": [], "sections": []})
@@ -854,14 +900,48 @@ class CalculationsFrame(ttk.Frame):
             if selection: self.material_listbox_ref.selection_clear(selection[0])
         self.on_material_type_change(); self.on_custom_material_toggle()
 
+    # --- Liste Filtreleri ---
+    def _create_list_filter(self, parent, kind):
+        """Listbox için arama kutusu; her tuşta liste n-gram indeksinden filtrelenir."""
+        var = tk.StringVar()
+        var.trace_add("write", lambda *args: self._apply_list_filter(kind))
+        self._list_filter_vars[kind] = var
+        return ui_components.create_content_entry(parent, current_theme=self.theme, textvariable=var)
+
+    def _set_list_rows(self, kind, listbox, rows):
+        """rows: veri sırasıyla (anahtar, görünen metin, arama metni). İndekste yalnızca değişen kayıtlar güncellenir."""
+        self._list_rows[kind] = (listbox, rows)
+        self._list_indexes[kind].sync((key, search_text) for key, _, search_text in rows)
+        self._apply_list_filter(kind)
+
+    def _apply_list_filter(self, kind):
+        listbox, rows = self._list_rows.get(kind, (None, []))
+        if listbox is None: return
+        var = self._list_filter_vars.get(kind)
+        matches = self._list_indexes[kind].search(var.get() if var is not None else "")
+        view = [i for i, row in enumerate(rows) if matches is None or row[0] in matches]
+        self._list_views[kind] = view
+        try:
+            listbox.delete(0, tk.END)
+            if view: listbox.insert(tk.END, *[rows[i][1] for i in view])
+        except tk.TclError: pass # Sayfa kapatılmış
+
+    def _selected_list_index(self, kind, listbox):
+        """Listbox seçiminin (filtrelenmiş olabilir) veri listesindeki indeksi; seçim yoksa -1."""
+        selection = listbox.curselection() if listbox else ()
+        view = self._list_views.get(kind)
+        if not selection or view is None or selection[0] >= len(view): return -1
+        return view[selection[0]]
+
     def update_material_listbox(self):
         if self.material_listbox_ref and self.current_profile_name in self.profiles_data:
-            self.material_listbox_ref.delete(0, tk.END)
             materials = self.profiles_data[self.current_profile_name].get("materials", [])
             materials.sort(key=lambda x: x.get("user_name", "").lower())
+            rows = []
             for mat in materials:
                 display_name = f"{mat.get('type', '?')}: {mat.get('user_name', 'İsimsiz')} ({mat.get('class', 'Özel')})"
-                self.material_listbox_ref.insert(tk.END, display_name)
+                rows.append((mat.get("user_name", ""), display_name, display_name))
+            self._set_list_rows("materials", self.material_listbox_ref, rows)
 
     def on_material_type_change(self):
         if not self.material_detail_widgets: return
@@ -915,6 +995,7 @@ class CalculationsFrame(ttk.Frame):
             if is_custom: self.material_detail_vars.get("class", tk.StringVar()).set("Özel")
             else: self.on_material_class_change()
 
+    @undoable("Malzeme kaydet")
     def save_material_from_form(self):
         if not self.current_profile_name: messagebox.showerror("Hata", "Aktif profil bulunamadı."); return
         user_name = self.material_detail_vars.get("user_name", tk.StringVar()).get().strip()
@@ -929,11 +1010,11 @@ class CalculationsFrame(ttk.Frame):
         except tk.TclError: messagebox.showerror("Hata", "Lütfen geçerli sayısal malzeme özellikleri girin."); return
 
         new_material_data = {"user_name": user_name, "type": mat_type, "class": mat_class, "is_custom": is_custom, "props": props}
+        schema_errors = profile_schema.validate_record("materials", new_material_data, path=user_name)
+        if schema_errors: messagebox.showerror("Geçersiz Malzeme", profile_schema.format_errors(schema_errors)); return
         profile = self.profiles_data.setdefault(self.current_profile_name, {"project_info": {}, "materials": [], "sections": []})
         materials = profile.setdefault("materials", [])
-        selected_index = -1
-        if self.material_listbox_ref: selection = self.material_listbox_ref.curselection();
-        if selection: selected_index = selection[0]
+        selected_index = self._selected_list_index("materials", self.material_listbox_ref)
         found_index = -1; original_name_if_editing = None
         if selected_index != -1:
             try: original_name_if_editing = materials[selected_index].get("user_name")
@@ -946,14 +1027,14 @@ class CalculationsFrame(ttk.Frame):
                  try: materials[selected_index] = new_material_data; print(f"Material '{user_name}' updated.")
                  except IndexError: materials.append(new_material_data); print(f"Material '{user_name}' added (update failed, added as new).")
             else: materials.append(new_material_data); print(f"Material '{user_name}' added.")
+            self._notify_records_changed(dependency_graph.MATERIAL, [(user_name, original_name_if_editing)])
             utils.save_profiles(); self.update_material_listbox(); self.clear_material_form(); messagebox.showinfo("Başarılı", f"Malzeme '{user_name}' kaydedildi.")
         else: messagebox.showerror("Hata", f"'{user_name}' adında başka bir malzeme zaten var.")
 
     def load_selected_material_to_form(self):
         if not self.material_listbox_ref: return
-        selection = self.material_listbox_ref.curselection()
-        if not selection: return
-        selected_index = selection[0]
+        selected_index = self._selected_list_index("materials", self.material_listbox_ref)
+        if selected_index < 0: return
         materials = self.profiles_data.get(self.current_profile_name, {}).get("materials", [])
         if selected_index < 0 or selected_index >= len(materials): messagebox.showerror("Hata", "Seçilen malzeme verisi bulunamadı."); return
         material_data = materials[selected_index]
@@ -966,30 +1047,53 @@ class CalculationsFrame(ttk.Frame):
         else: self.material_detail_vars.get("fyk", tk.DoubleVar()).set(props.get("fyk", 0.0)); self.material_detail_vars.get("Es", tk.DoubleVar()).set(props.get("Es", 0.0))
         self.on_material_type_change(); self.on_custom_material_toggle()
 
+    @undoable("Malzeme sil")
     def delete_selected_material(self):
         if not self.material_listbox_ref: return
-        selection = self.material_listbox_ref.curselection()
-        if not selection: messagebox.showwarning("Malzeme Seçilmedi", "Lütfen silinecek malzemeyi seçin."); return
-        selected_index = selection[0]
+        selected_index = self._selected_list_index("materials", self.material_listbox_ref)
+        if selected_index < 0: messagebox.showwarning("Malzeme Seçilmedi", "Lütfen silinecek malzemeyi seçin."); return
         profile = self.profiles_data.get(self.current_profile_name)
         if profile and "materials" in profile and 0 <= selected_index < len(profile["materials"]):
             material_to_delete = profile["materials"][selected_index]
             user_name_to_delete = material_to_delete.get("user_name", "Bilinmeyen")
             if messagebox.askyesno("Malzeme Sil", f"'{user_name_to_delete}' malzemesini silmek istediğinizden emin misiniz?", parent=self.main_app.root):
                 del profile["materials"][selected_index]
+                self._notify_records_changed(dependency_graph.MATERIAL, [(user_name_to_delete, None)])
                 utils.save_profiles(); self.update_material_listbox(); self.clear_material_form()
                 messagebox.showinfo("Başarılı", f"'{user_name_to_delete}' malzemesi silindi.")
         else: messagebox.showerror("Hata", "Malzeme silinemedi.")
 
+    # --- Toplu İçe Aktarım ---
+    @undoable("Toplu içe aktarım")
+    def import_records_from_file(self, kind):
+        """CSV/XLSX dosyasından malzeme veya kesitleri tek işlemde içe aktarır."""
+        if not self.current_profile_name: messagebox.showerror("Hata", "Aktif profil bulunamadı."); return
+        path = filedialog.askopenfilename(parent=self.main_app.root, title="İçe Aktarılacak Dosya",
+                                          filetypes=[("CSV / Excel", "*.csv *.xlsx"), ("CSV", "*.csv"), ("Excel", "*.xlsx"), ("Tümü", "*.*")])
+        if not path: return
+        profile = self.profiles_data.setdefault(self.current_profile_name, utils.new_profile_data())
+        try:
+            if kind == "materials": result = bulk_import.read_materials(path)
+            else: result = bulk_import.read_sections(path, profile)
+        except Exception as e: messagebox.showerror("İçe Aktarım Hatası", f"Dosya okunamadı:\n{e}", parent=self.main_app.root); return
+        if not result.items: messagebox.showerror("İçe Aktarım Hatası", f"Geçerli satır bulunamadı.\n\n{result.error_summary()}", parent=self.main_app.root); return
+        if not result.ok and not messagebox.askyesno("Hatalı Satırlar", f"{len(result.errors)} / {result.row_count} satır hatalı:\n\n{result.error_summary()}\n\nGeçerli {len(result.items)} satır içe aktarılsın mı?", parent=self.main_app.root): return
+        added, updated = bulk_import.commit(profile, result)
+        self._notify_records_changed(dependency_graph.MATERIAL if kind == "materials" else dependency_graph.SECTION, [(item["user_name"], None) for item in result.items])
+        utils.save_profiles() # Tüm parti için tek kayıt
+        if kind == "materials": self.update_material_listbox(); self.clear_material_form()
+        else: self.update_section_listbox(); self.clear_section_form()
+        messagebox.showinfo("Başarılı", f"{added} kayıt eklendi, {updated} kayıt güncellendi.", parent=self.main_app.root)
+
     # --- Profil Yönetimi Sayfası Metotları ---
     def update_profile_listbox(self):
          if self.profile_listbox_ref:
-             self.profile_listbox_ref.delete(0, tk.END)
-             for name in sorted(self.profiles_data.keys()): self.profile_listbox_ref.insert(tk.END, name)
+             names = sorted(self.profiles_data.keys())
+             self._set_list_rows("profiles", self.profile_listbox_ref, [(name, name, name) for name in names])
              try:
-                 idx = list(sorted(self.profiles_data.keys())).index(self.current_profile_name)
+                 idx = self._list_views["profiles"].index(names.index(self.current_profile_name))
                  self.profile_listbox_ref.selection_clear(0, tk.END); self.profile_listbox_ref.select_set(idx); self.profile_listbox_ref.activate(idx)
-             except ValueError: pass
+             except ValueError: pass # Güncel profil filtre dışında
 
     def load_selected_profile(self):
         if not self.profile_listbox_ref: return
@@ -1003,14 +1107,14 @@ class CalculationsFrame(ttk.Frame):
             self.show_page("project_info"); messagebox.showinfo("Profil Yüklendi", f"'{self.current_profile_name}' profili yüklendi.")
         else: messagebox.showerror("Hata", f"Seçilen profil '{selected_name}' bulunamadı.")
 
+    @undoable("Yeni profil")
     def create_new_profile(self):
          new_name = simpledialog.askstring("Yeni Profil", "Yeni profil için bir isim girin:", parent=self.main_app.root)
          if new_name and new_name.strip():
              new_name = new_name.strip()
              if new_name in self.profiles_data: messagebox.showerror("Hata", f"'{new_name}' isimli profil zaten mevcut.")
              else:
-                 default_profile_data = config.DEFAULT_PROFILE_DATA.copy()
-                 default_profile_data["project_info"]["name"] = new_name
+                 default_profile_data = utils.new_profile_data(new_name)
                  self.profiles_data[new_name] = default_profile_data
                  self.current_profile_name = new_name
                  self.main_app.current_profile_name = new_name
@@ -1018,6 +1122,61 @@ class CalculationsFrame(ttk.Frame):
                  messagebox.showinfo("Başarılı", f"'{new_name}' profili oluşturuldu ve aktif hale getirildi.")
          elif new_name is not None: messagebox.showwarning("Geçersiz İsim", "Profil adı boş olamaz.")
 
+    # --- Sürümlü Anlık Görüntüler ---
+    def create_profile_snapshot(self):
+        """Tüm profil kütüphanesinin anlık görüntüsünü alır (yalnızca yeni/değişen kayıtlar depolanır)."""
+        label = simpledialog.askstring("Anlık Görüntü", "Bu sürüm için kısa bir açıklama girin:", parent=self.main_app.root)
+        if label is None: return
+        try: snapshot_id = self.main_app.snapshot_store.create(self.profiles_data, label.strip())
+        except OSError as e: messagebox.showerror("Hata", f"Anlık görüntü kaydedilemedi:\n{e}", parent=self.main_app.root); return
+        messagebox.showinfo("Başarılı", f"'{snapshot_id}' anlık görüntüsü alındı.", parent=self.main_app.root)
+
+    def show_snapshot_diff_dialog(self):
+        """İki sürüm (veya bir sürüm ile güncel durum) arasındaki kayıt değişikliklerini listeler."""
+        store = self.main_app.snapshot_store
+        snapshots = store.list()
+        if not snapshots: messagebox.showinfo("Bilgi", "Henüz anlık görüntü alınmamış.", parent=self.main_app.root); return
+        current_label = "Güncel durum"
+        choices = [f"{sid} - {label or '(açıklamasız)'} [{author}]" for sid, label, created, author in snapshots] + [current_label]
+        dialog = tk.Toplevel(self.main_app.root); dialog.title("Sürümleri Karşılaştır"); dialog.transient(self.main_app.root)
+        dialog.configure(bg=self.theme['content_bg']); dialog.geometry("800x500")
+        top = tk.Frame(dialog, bg=self.theme['content_bg']); top.pack(fill='x', padx=10, pady=10)
+        old_var = tk.StringVar(value=choices[-2]); new_var = tk.StringVar(value=current_label)
+        ttk.Label(top, text="Eski:", style='TLabel').pack(side=tk.LEFT)
+        ui_components.create_content_combobox(top, choices, self.theme, width=35, textvariable=old_var).pack(side=tk.LEFT, padx=5)
+        ttk.Label(top, text="Yeni:", style='TLabel').pack(side=tk.LEFT)
+        ui_components.create_content_combobox(top, choices, self.theme, width=35, textvariable=new_var).pack(side=tk.LEFT, padx=5)
+        result_text = tk.Text(dialog, wrap=tk.WORD, font=("Segoe UI", 12), bg=self.theme['text_area_bg'], fg=self.theme['text_area_fg'], relief='flat', bd=1, highlightthickness=1, highlightbackground=self.theme['entry_border'], padx=5, pady=5)
+        result_text.pack(expand=True, fill='both', padx=10, pady=(0, 10))
+        def manifest_for(choice):
+            if choice == current_label: return store.manifest_of(self.profiles_data)
+            return store.load_manifest(choice.split(" - ")[0])
+        def compare(*_):
+            try:
+                old_manifest = manifest_for(old_var.get()); new_manifest = manifest_for(new_var.get())
+                text = profile_snapshots.format_diff(store.diff(old_manifest, new_manifest, self.profiles_data), old_manifest, new_manifest)
+            except (OSError, ValueError) as e: text = f"Karşılaştırılamadı: {e}"
+            result_text.config(state=tk.NORMAL); result_text.delete("1.0", tk.END); result_text.insert(tk.END, text); result_text.config(state=tk.DISABLED)
+        ui_components.create_content_button(top, "Karşılaştır", self.theme, command=compare).pack(side=tk.LEFT, padx=5)
+        compare()
+
+    @undoable("Profil kopyala")
+    def copy_selected_profile(self):
+        """Seçili profili şablon olarak kopyalar; malzeme/kesit kayıtları iki profil arasında paylaşılır."""
+        if not self.profile_listbox_ref: return
+        selection = self.profile_listbox_ref.curselection()
+        if not selection: messagebox.showwarning("Profil Seçilmedi", "Lütfen listeden kopyalanacak bir profil seçin."); return
+        source_name = self.profile_listbox_ref.get(selection[0])
+        new_name = simpledialog.askstring("Profili Kopyala", f"'{source_name}' kopyası için isim girin:", initialvalue=f"{source_name} - Kopya", parent=self.main_app.root)
+        if new_name and new_name.strip():
+            new_name = new_name.strip()
+            if new_name in self.profiles_data: messagebox.showerror("Hata", f"'{new_name}' isimli profil zaten mevcut."); return
+            self.profiles_data[new_name] = record_pool.copy_profile(self.profiles_data[source_name], new_name)
+            utils.save_profiles(); self.update_profile_listbox()
+            messagebox.showinfo("Başarılı", f"'{source_name}' profili '{new_name}' olarak kopyalandı.")
+        elif new_name is not None: messagebox.showwarning("Geçersiz İsim", "Profil adı boş olamaz.")
+
+    @undoable("Profil yeniden adlandır")
     def rename_selected_profile(self):
          if not self.profile_listbox_ref: return
          selection = self.profile_listbox_ref.curselection()
@@ -1030,6 +1189,7 @@ class CalculationsFrame(ttk.Frame):
              if new_name in self.profiles_data: messagebox.showerror("Hata", f"'{new_name}' isimli profil zaten mevcut.")
              else:
                  self.profiles_data[new_name] = self.profiles_data.pop(old_name)
+                 if old_name in utils.session_profiles: utils.session_profiles[new_name] = utils.session_profiles.pop(old_name)
                  if "project_info" in self.profiles_data[new_name]: self.profiles_data[new_name]["project_info"]["name"] = new_name
                  if self.current_profile_name == old_name:
                      self.current_profile_name = new_name
@@ -1038,6 +1198,7 @@ class CalculationsFrame(ttk.Frame):
                  messagebox.showinfo("Başarılı", f"'{old_name}' profili '{new_name}' olarak yeniden adlandırıldı.")
          elif new_name is not None: messagebox.showwarning("Geçersiz İsim", "Profil adı boş olamaz.")
 
+    @undoable("Profil sil")
     def delete_selected_profile(self):
          if not self.profile_listbox_ref: return
          selection = self.profile_listbox_ref.curselection()
@@ -1046,6 +1207,7 @@ class CalculationsFrame(ttk.Frame):
          if len(self.profiles_data) <= 1: messagebox.showerror("Hata", "Son kalan profil silinemez."); return
          if messagebox.askyesno("Profili Sil", f"'{profile_to_delete}' profilini silmek istediğinizden emin misiniz?", parent=self.main_app.root):
              del self.profiles_data[profile_to_delete]
+             utils.session_profiles.pop(profile_to_delete, None)
              if self.current_profile_name == profile_to_delete:
                  self.current_profile_name = list(self.profiles_data.keys())[0]
                  self.main_app.current_profile_name = self.current_profile_name
@@ -1089,8 +1251,8 @@ class CalculationsFrame(ttk.Frame):
             "material_name": tk.StringVar(), # Malzeme adı (Combobox'tan seçilecek)
             "width_b": tk.DoubleVar(), # Dikdörtgen için genişlik (mm?)
             "height_h": tk.DoubleVar(), # Dikdörtgen için yükseklik (mm?)
-            "diameter_d": tk.DoubleVar() # Dairesel için çap (mm?)
-            # TODO: Gelecekte çelik profil seçimi veya donatı bilgisi eklenebilir
+            "diameter_d": tk.DoubleVar(), # Dairesel için çap (mm?)
+            "profile": tk.StringVar() # Çelik Profil için katalogdaki profil adı (örn: IPE 300)
         }
         self.section_detail_widgets = {} # Widget referanslarını temizle
 
@@ -1103,6 +1265,7 @@ class CalculationsFrame(ttk.Frame):
         section_pane.add(list_frame, width=250, stretch="never") # Sabit genişlik
 
         ttk.Label(list_frame, text="Tanımlı Kesitler:", style='Header.TLabel').pack(anchor='w', padx=5, pady=(0,5))
+        self._create_list_filter(list_frame, "sections").pack(fill=tk.X, padx=5, pady=(0,5))
 
         self.section_listbox_ref = tk.Listbox(list_frame, height=15, font=("Segoe UI", 13), relief='flat', bd=1,
                                               bg=self.theme['listbox_bg'], fg=self.theme['listbox_fg'],
@@ -1120,6 +1283,7 @@ class CalculationsFrame(ttk.Frame):
         # Düzenle butonu da seçili formu yükler, sonra kaydedilir
         ttk.Button(list_button_frame, text="Düzenle", style='TButton', width=8, command=self.load_selected_section_to_form).pack(side=tk.LEFT, padx=2)
         ttk.Button(list_button_frame, text="Sil", style='TButton', width=6, command=self.delete_selected_section).pack(side=tk.LEFT, padx=2)
+        ttk.Button(list_button_frame, text="İçe Aktar", style='TButton', command=lambda: self.import_records_from_file("sections")).pack(side=tk.LEFT, padx=2)
 
         # --- Sağ Bölüm: Kesit Detay Formu ---
         detail_frame = tk.Frame(section_pane, bg=self.theme['content_bg'])
@@ -1144,13 +1308,22 @@ class CalculationsFrame(ttk.Frame):
 
         # Kesit Tipi
         ttk.Label(detail_form_frame, text="Kesit Tipi:", style='Header.TLabel').grid(row=row_idx, column=0, sticky='w', padx=5, pady=5)
-        combo_type = ui_components.create_content_combobox(detail_form_frame, ["Dikdörtgen", "Dairesel"], # Başlangıç tipleri
+        combo_type = ui_components.create_content_combobox(detail_form_frame, list(records.SECTION_TYPES),
                                                           current_theme=self.theme, textvariable=self.section_detail_vars["type"])
         combo_type.bind("<<ComboboxSelected>>", lambda e: self.on_section_type_change())
         combo_type.grid(row=row_idx, column=1, sticky='ew', padx=5, pady=5)
         self.section_detail_widgets["combo_type"] = combo_type
         row_idx += 1
 
+        # Standart Katalog (mmap'li .epsc dosyalarından, yazdıkça filtrelenir; "h=500-700 A>=150000" gibi aralıklar da yazılabilir)
+        self._catalog_matches = {}
+        ttk.Label(detail_form_frame, text="Katalogdan:", style='Header.TLabel').grid(row=row_idx, column=0, sticky='w', padx=5, pady=5)
+        combo_catalog = ui_components.create_typeahead_combobox(detail_form_frame, self._search_section_catalogs, current_theme=self.theme,
+                                                                on_select=self._load_catalog_section_to_form)
+        combo_catalog.grid(row=row_idx, column=1, sticky='ew', padx=5, pady=5)
+        self.section_detail_widgets["combo_catalog"] = combo_catalog
+        row_idx += 1
+
         # Malzeme (Beton Malzemeleri listelenecek)
         ttk.Label(detail_form_frame, text="Malzeme:", style='Header.TLabel').grid(row=row_idx, column=0, sticky='w', padx=5, pady=5)
         combo_material = ui_components.create_content_combobox(detail_form_frame, [], # Başlangıçta boş, sonra doldurulacak
@@ -1187,6 +1360,24 @@ class CalculationsFrame(ttk.Frame):
         self.section_detail_widgets["entry_diameter"] = entry_diameter
         row_idx += 1
 
+        # Çelik Profil - katalogdan seçim (yazdıkça filtrelenir) ve en hafif profil arama
+        lbl_profile = ttk.Label(detail_form_frame, text="Çelik Profil:", style='Header.TLabel')
+        lbl_profile.grid(row=row_idx, column=0, sticky='w', padx=5, pady=5)
+        profile_frame = tk.Frame(detail_form_frame, bg=self.theme['content_bg'])
+        profile_frame.grid(row=row_idx, column=1, sticky='ew', padx=5, pady=5)
+        combo_profile = ui_components.create_typeahead_combobox(profile_frame, lambda text, limit: steel_catalog.get_steel_catalog().search(text, limit),
+                                                                current_theme=self.theme, width=18, textvariable=self.section_detail_vars["profile"],
+                                                                on_select=self._load_steel_profile_to_form)
+        combo_profile.pack(side=tk.LEFT)
+        ttk.Button(profile_frame, text="En Hafif (Wpl ≥ ...)", style='TButton', command=self._find_lightest_steel_profile).pack(side=tk.LEFT, padx=5)
+        self.section_detail_widgets["lbl_profile"] = lbl_profile
+        self.section_detail_widgets["profile_frame"] = profile_frame
+        row_idx += 1
+        lbl_profile_props = ttk.Label(detail_form_frame, text="", style='TLabel', justify=tk.LEFT)
+        lbl_profile_props.grid(row=row_idx, column=1, sticky='w', padx=5)
+        self.section_detail_widgets["lbl_profile_props"] = lbl_profile_props
+        row_idx += 1
+
         # Form Butonları (Vazgeç, Kaydet)
         form_button_frame = tk.Frame(detail_frame, bg=self.theme['content_bg'])
         # Grid içinde sağ alta yerleştirme (detail_frame'in gridine göre)
@@ -1200,6 +1391,51 @@ class CalculationsFrame(ttk.Frame):
         self._update_section_material_combobox() # Malzeme listesini doldur
         self.on_section_type_change() # Boyut alanlarını ayarla
 
+    def _search_section_catalogs(self, text, limit):
+        """Katalog combobox'ı için eşleşen kesit isimlerini döndürür (aralık filtreleri katalog sorgusuyla)."""
+        self._catalog_matches = {name: catalog for catalog, name in section_catalog.search_all(text, limit)}
+        return list(self._catalog_matches.keys())
+
+    def _load_catalog_section_to_form(self, name):
+        """Katalogdan seçilen kesitin tip ve boyutlarını forma aktarır."""
+        catalog = self._catalog_matches.get(name)
+        if not catalog: return
+        section_data = section_catalog.to_section_dict(catalog, name)
+        if not self.section_detail_vars["user_name"].get().strip(): self.section_detail_vars["user_name"].set(name)
+        self.section_detail_vars["type"].set(section_data["type"])
+        dims = section_data["dimensions"]
+        self.section_detail_vars["width_b"].set(dims.get("b", 0.0))
+        self.section_detail_vars["height_h"].set(dims.get("h", 0.0))
+        self.section_detail_vars["diameter_d"].set(dims.get("D", 0.0))
+        self.on_section_type_change()
+
+    def _load_steel_profile_to_form(self, name):
+        """Katalogdan seçilen çelik profili forma aktarır ve özelliklerini gösterir."""
+        props = steel_catalog.get_steel_catalog().properties(name)
+        label = self.section_detail_widgets.get("lbl_profile_props")
+        if props is None:
+            if label: label.config(text="")
+            return
+        self.section_detail_vars["profile"].set(props["name"])
+        if not self.section_detail_vars["user_name"].get().strip(): self.section_detail_vars["user_name"].set(props["name"])
+        self.section_detail_vars["width_b"].set(props["b"]); self.section_detail_vars["height_h"].set(props["h"])
+        if label:
+            label.config(text=f"h/b={props['h']:g}/{props['b']:g} mm, A={props['A'] / 100:.1f} cm², G={props['G']:.1f} kg/m\n"
+                              f"Iy={props['Iy'] / 1e4:.0f} cm⁴, Wpl,y={props['Wply'] / 1e3:.1f} cm³, Iz={props['Iz'] / 1e4:.0f} cm⁴, Wpl,z={props['Wplz'] / 1e3:.1f} cm³")
+
+    def _find_lightest_steel_profile(self):
+        """Gerekli plastik mukavemet momentini sağlayan en hafif profili (seçili aile içinde) bulur."""
+        required = simpledialog.askfloat("En Hafif Profil", "Gerekli Wpl,y (cm³):", minvalue=0.0, parent=self.main_app.root)
+        if required is None: return
+        catalog = steel_catalog.get_steel_catalog()
+        current = catalog.properties(self.section_detail_vars["profile"].get())
+        family = current["family"] if current else None # Seçili profil varsa aynı aile içinde ara
+        name = catalog.lightest("Wply", required * 1e3, family)
+        if name is None:
+            messagebox.showwarning("Bulunamadı", f"Wpl,y ≥ {required:g} cm³ sağlayan {family or ''} profil katalogda yok.".replace("  ", " "), parent=self.main_app.root)
+            return
+        self._load_steel_profile_to_form(name)
+
     def clear_section_form(self):
         """Kesit detay formunu temizler ve başlangıç durumuna getirir."""
         if not self.section_detail_vars: return # Henüz oluşturulmadıysa çık
@@ -1210,6 +1446,8 @@ class CalculationsFrame(ttk.Frame):
         self.section_detail_vars["width_b"].set(0.0)
         self.section_detail_vars["height_h"].set(0.0)
         self.section_detail_vars["diameter_d"].set(0.0)
+        self.section_detail_vars["profile"].set("")
+        if "lbl_profile_props" in self.section_detail_widgets: self.section_detail_widgets["lbl_profile_props"].config(text="")
 
         # Listbox seçimini temizle
         if self.section_listbox_ref:
@@ -1231,8 +1469,8 @@ class CalculationsFrame(ttk.Frame):
         if not self.section_listbox_ref or not self.main_app.current_profile_name:
             return # Listbox veya profil yoksa çık
 
-        self.section_listbox_ref.delete(0, tk.END) # Listeyi temizle
         profile_data = self.main_app.profiles_data.get(self.main_app.current_profile_name)
+        rows = [] # (anahtar, görünen metin, arama metni)
 
         if profile_data and "sections" in profile_data:
             sections = profile_data["sections"]
@@ -1250,8 +1488,10 @@ class CalculationsFrame(ttk.Frame):
                 elif sec_type == "Dairesel":
                     d = dims.get('D', 0)
                     dim_str = f"D={d:.0f}"
-                # TODO: Diğer tipler için gösterim eklenebilir
-                self.section_listbox_ref.insert(tk.END, f"{display_name} ({sec_type}, {dim_str})")
+                elif sec_type == records.SECTION_TYPE_STEEL:
+                    dim_str = section.get("profile", "?")
+                rows.append((section.get("user_name", ""), f"{display_name} ({sec_type}, {dim_str})", f"{display_name} {sec_type} {dim_str} {section.get('material_name', '')}"))
+        self._set_list_rows("sections", self.section_listbox_ref, rows)
 
 
     def on_section_type_change(self):
@@ -1261,6 +1501,7 @@ class CalculationsFrame(ttk.Frame):
         sec_type = self.section_detail_vars.get("type", tk.StringVar()).get()
         is_rectangular = (sec_type == "Dikdörtgen")
         is_circular = (sec_type == "Dairesel")
+        is_steel = (sec_type == records.SECTION_TYPE_STEEL)
 
         # Dikdörtgen boyutları
         for w_name in ["lbl_width", "entry_width", "lbl_height", "entry_height"]:
@@ -1280,16 +1521,22 @@ class CalculationsFrame(ttk.Frame):
                     else: widget.grid_remove()
                 except tk.TclError: pass
 
-        # TODO: Diğer kesit tipleri için alanlar eklendiğinde burası genişletilmeli
+        # Çelik profil seçimi (boyutlar katalogdan gelir)
+        for w_name in ["lbl_profile", "profile_frame", "lbl_profile_props"]:
+            widget = self.section_detail_widgets.get(w_name)
+            if widget:
+                try:
+                    if is_steel: widget.grid()
+                    else: widget.grid_remove()
+                except tk.TclError: pass
 
 
     def load_selected_section_to_form(self):
         """Listbox'tan seçilen kesitin bilgilerini forma yükler."""
         if not self.section_listbox_ref or not self.main_app.current_profile_name: return
-        selection = self.section_listbox_ref.curselection()
-        if not selection: return # Seçim yoksa çık
+        selected_index = self._selected_list_index("sections", self.section_listbox_ref)
+        if selected_index < 0: return # Seçim yoksa çık
 
-        selected_index = selection[0]
         profile_data = self.main_app.profiles_data.get(self.main_app.current_profile_name)
 
         if profile_data and "sections" in profile_data:
@@ -1307,6 +1554,8 @@ class CalculationsFrame(ttk.Frame):
                 self.section_detail_vars["width_b"].set(dims.get("b", 0.0))
                 self.section_detail_vars["height_h"].set(dims.get("h", 0.0))
                 self.section_detail_vars["diameter_d"].set(dims.get("D", 0.0))
+                self.section_detail_vars["profile"].set(section_data.get("profile", ""))
+                if section_data.get("type") == records.SECTION_TYPE_STEEL: self._load_steel_profile_to_form(section_data.get("profile", ""))
 
                 # Widget durumlarını güncelle
                 self.on_section_type_change()
@@ -1323,6 +1572,7 @@ class CalculationsFrame(ttk.Frame):
             messagebox.showerror("Hata", "Profil verisi veya kesitler bulunamadı.", parent=self.main_app.root)
 
 
+    @undoable("Kesit kaydet")
     def save_section_from_form(self):
         """Formdaki bilgileri kullanarak kesiti profile kaydeder (yeni veya güncelleme)."""
         if not self.main_app.current_profile_name:
@@ -1336,7 +1586,9 @@ class CalculationsFrame(ttk.Frame):
 
         sec_type = self.section_detail_vars["type"].get()
         material_name = self.section_detail_vars["material_name"].get()
-        if not material_name or material_name == "Tanımlı Beton Yok":
+        if sec_type == records.SECTION_TYPE_STEEL:
+            if material_name == "Tanımlı Beton Yok": material_name = "" # Çelik profilde malzeme isteğe bağlı
+        elif not material_name or material_name == "Tanımlı Beton Yok":
              messagebox.showerror("Hata", "Lütfen geçerli bir beton malzeme seçin.", parent=self.main_app.root)
              return
 
@@ -1351,7 +1603,10 @@ class CalculationsFrame(ttk.Frame):
                 d = self.section_detail_vars["diameter_d"].get()
                 if d <= 0: raise ValueError("Çap pozitif olmalı")
                 dimensions = {"D": d}
-            # TODO: Diğer tipler için boyut alma eklenebilir
+            elif sec_type == records.SECTION_TYPE_STEEL:
+                props = steel_catalog.get_steel_catalog().properties(self.section_detail_vars["profile"].get())
+                if props is None: raise ValueError("Katalogda bulunan bir çelik profil seçin")
+                dimensions = {"b": props["b"], "h": props["h"]}
         except (tk.TclError, ValueError) as e:
              messagebox.showerror("Hata", f"Lütfen geçerli sayısal boyutlar girin.\n({e})", parent=self.main_app.root)
              return
@@ -1363,18 +1618,22 @@ class CalculationsFrame(ttk.Frame):
             "material_name": material_name,
             "dimensions": dimensions
         }
+        if sec_type == records.SECTION_TYPE_STEEL: new_section_data["profile"] = props["name"]
+        schema_errors = profile_schema.validate_record("sections", new_section_data, path=user_name)
+        if schema_errors:
+            messagebox.showerror("Geçersiz Kesit", profile_schema.format_errors(schema_errors), parent=self.main_app.root)
+            return
 
         # Profil verisine erişim
-        profile = self.main_app.profiles_data.setdefault(self.main_app.current_profile_name, config.DEFAULT_PROFILE_DATA.copy())
+        profile = self.main_app.profiles_data.setdefault(self.main_app.current_profile_name, utils.new_profile_data())
         sections = profile.setdefault("sections", [])
 
         # Düzenleme mi, yeni mi kontrolü
         original_name_if_editing = None
         selected_index = -1
         if self.section_listbox_ref:
-            selection = self.section_listbox_ref.curselection()
-            if selection:
-                selected_index = selection[0]
+            selected_index = self._selected_list_index("sections", self.section_listbox_ref) # Filtreli liste -> veri indeksi
+            if selected_index >= 0:
                  # Sıralanmış listeye göre orijinal veriyi bulmamız lazım
                 sections.sort(key=lambda x: x.get("user_name", "").lower()) # Tekrar sırala (güvenlik için)
                 try:
@@ -1404,7 +1663,8 @@ class CalculationsFrame(ttk.Frame):
                  sections.append(new_section_data)
                  print(f"Section '{user_name}' added.")
 
-            # Değişiklikleri kaydet
+            # Bağımlı tasarımları kirli işaretle ve değişiklikleri kaydet
+            self._notify_records_changed(dependency_graph.SECTION, [(user_name, original_name_if_editing if is_update else None)])
             utils.save_profiles()
             # Arayüzü güncelle
             self.update_section_listbox()
@@ -1412,15 +1672,15 @@ class CalculationsFrame(ttk.Frame):
             messagebox.showinfo("Başarılı", f"Kesit '{user_name}' başarıyla kaydedildi.", parent=self.main_app.root)
 
 
+    @undoable("Kesit sil")
     def delete_selected_section(self):
         """Listbox'tan seçilen kesiti profilden siler."""
         if not self.section_listbox_ref or not self.main_app.current_profile_name: return
-        selection = self.section_listbox_ref.curselection()
-        if not selection:
+        selected_index = self._selected_list_index("sections", self.section_listbox_ref)
+        if selected_index < 0:
              messagebox.showwarning("Kesit Seçilmedi", "Lütfen silinecek kesiti seçin.", parent=self.main_app.root)
              return
 
-        selected_index = selection[0]
         profile = self.main_app.profiles_data.get(self.main_app.current_profile_name)
 
         if profile and "sections" in profile:
@@ -1433,6 +1693,7 @@ class CalculationsFrame(ttk.Frame):
 
                 if messagebox.askyesno("Kesit Sil", f"'{user_name_to_delete}' kesitini silmek istediğinizden emin misiniz?", parent=self.main_app.root):
                     del sections[selected_index]
+                    self._notify_records_changed(dependency_graph.SECTION, [(user_name_to_delete, None)])
                     utils.save_profiles()
                     self.update_section_listbox()
                     self.clear_section_form()
@@ -1,5 +1,4 @@
-import win32com.client
-import pythoncom
+# win32com/pythoncom yalnızca bağlanırken içe aktarılır: modül Linux'ta ve COM olmadan da yüklenebilir
 
 class AutoCADConnector:
     """AutoCAD ile etkileşim için arabirimi sağlar."""
@@ -10,6 +9,8 @@ class AutoCADConnector:
     def connect(self):
         """AutoCAD'e bağlanır."""
         try:
+            import pythoncom
+            import win32com.client
             pythoncom.CoInitialize()
             self.acad = win32com.client.Dispatch("AutoCAD.Application")
             self.acad.Visible = True
@@ -64,6 +65,24 @@ class AutoCADConnector:
         # Poliçizgi oluştur
         return self.acad.ActiveDocument.ModelSpace.AddPolyline(acad_points)
     
+    def draw_circle(self, center, radius):
+        """Daire çizer."""
+        self.ensure_connection()
+        return self.acad.ActiveDocument.ModelSpace.AddCircle(self._make_point(tuple(center) + (0.0,) * (3 - len(center))), float(radius))
+    
+    def draw_lwpolyline(self, vertices, closed=False):
+        """Hafif polyline çizer (vertices: [(x, y), ...])."""
+        self.ensure_connection()
+        flat = tuple(float(c) for point in vertices for c in point[:2])
+        entity = self.acad.ActiveDocument.ModelSpace.AddLightWeightPolyline(self._make_point(flat))
+        if closed: entity.Closed = True
+        return entity
+    
+    def add_text(self, text, position, height):
+        """Tek satır yazı ekler."""
+        self.ensure_connection()
+        return self.acad.ActiveDocument.ModelSpace.AddText(text, self._make_point(tuple(position) + (0.0,) * (3 - len(position))), float(height))
+    
     def _make_point(self, point_tuple):
         """AutoCAD için point variant oluşturur."""
         import win32com.client
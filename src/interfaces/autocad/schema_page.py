@@ -1,5 +1,17 @@
+import math
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
+
+import com_worker
+import drawing_batch
+import drawing_backends
+import handle_registry
+import layout_generator
+import autocad_interface
+
+LAYOUT_SCHEMAS = ("Grid Sistemi", "Kolon Yerleşimi", "Kiriş Yerleşimi")
+_SESSION_DRAWINGS = {} # Proje açık değilken handle kayıtları (oturum boyunca)
+_LAYOUT_JOBS = {} # Çizim anahtarı -> süren güncelleme işinin adı (kayıt geri çağrıda yazılır; o zamana kadar ikinci iş eski kaydı okurdu)
 
 class SchemaPage(ttk.Frame):
     """AutoCAD şema oluşturma sayfası."""
@@ -76,6 +88,9 @@ class SchemaPage(ttk.Frame):
         draw_btn = ttk.Button(button_frame, text="AutoCAD'de Çiz", command=self._draw)
         draw_btn.pack(side=tk.LEFT, padx=5)
         
+        dxf_btn = ttk.Button(button_frame, text="DXF Olarak Kaydet", command=self._export_dxf)
+        dxf_btn.pack(side=tk.LEFT, padx=5)
+        
         # İlk şema türünün parametrelerini göster
         self._update_params()
     
@@ -99,7 +114,16 @@ class SchemaPage(ttk.Frame):
             self._add_param("sides", "Kenar Sayısı:", 0, 0, default="6")
             self._add_param("radius", "Dış Yarıçap (mm):", 1, 0, default="200")
         
-        # Diğer şema türleri...
+        elif schema_type in LAYOUT_SCHEMAS:
+            # Aralıklar: "5000, 3*6000" -> 5000, 6000, 6000, 6000
+            self._add_param("x_spacings", "X Aks Aralıkları (mm):", 0, 0, default="4*6000")
+            self._add_param("y_spacings", "Y Aks Aralıkları (mm):", 1, 0, default="3*5000")
+            self._add_param("overhang", "Aks Taşması (mm):", 2, 0, default="1000")
+            if schema_type != "Grid Sistemi":
+                self._add_param("column_b", "Kolon b (X, mm):", 3, 0, default="400")
+                self._add_param("column_h", "Kolon h (Y, mm):", 4, 0, default="400")
+            if schema_type == "Kiriş Yerleşimi":
+                self._add_param("beam_width", "Kiriş Genişliği (mm):", 5, 0, default="250")
         
         # Önizleme güncelle
         self._preview()
@@ -117,8 +141,48 @@ class SchemaPage(ttk.Frame):
         # Önizleme kodu...
         pass
     
+    def _emit(self, backend):
+        """Seçilen şemayı verilen çizim arka ucuna (AutoCAD veya DXF) çizer."""
+        schema_type = self.selected_schema.get()
+        
+        # Şema türüne göre çizim
+        if schema_type == "Dikdörtgen":
+            width = float(self.param_entries["width"].get())
+            height = float(self.param_entries["height"].get())
+            backend.rectangle(0, 0, width, height)
+            
+        elif schema_type == "Daire":
+            radius = float(self.param_entries["radius"].get())
+            backend.circle((0, 0), radius)
+            
+        elif schema_type == "Çokgen":
+            sides = int(self.param_entries["sides"].get())
+            radius = float(self.param_entries["radius"].get())
+            if sides < 3: raise ValueError("Kenar sayısı en az 3 olmalı.")
+            backend.polygon([(radius * math.cos(2 * math.pi * i / sides), radius * math.sin(2 * math.pi * i / sides)) for i in range(sides)])
+            
+        elif schema_type in LAYOUT_SCHEMAS:
+            layout_generator.emit(self._layout(schema_type), backend)
+            
+        else: raise ValueError(f"'{schema_type}' şeması henüz desteklenmiyor.")
+        return schema_type
+    
+    def _layout(self, schema_type):
+        """Aks/kolon/kiriş parametrelerinden yerleşim üretir (layout_generator)."""
+        def value(key):
+            entry = self.param_entries.get(key)
+            return float(entry.get()) if entry is not None else None
+        return layout_generator.generate(
+            layout_generator.parse_spacings(self.param_entries["x_spacings"].get()),
+            layout_generator.parse_spacings(self.param_entries["y_spacings"].get()),
+            column_b=value("column_b"), column_h=value("column_h"), beam_width=value("beam_width"),
+            overhang=value("overhang"))
+    
     def _draw(self):
         """Seçilen şemayı AutoCAD'de çiz."""
+        if self.selected_schema.get() in LAYOUT_SCHEMAS and autocad_interface.Autocad is not None:
+            self._update_layout(self.selected_schema.get())
+            return
         try:
             # Bağlantı kontrolü
             if not self.connector.is_connected():
@@ -126,23 +190,56 @@ class SchemaPage(ttk.Frame):
                     messagebox.showerror("Hata", "AutoCAD bağlantısı kurulamadı.")
                     return
             
-            schema_type = self.selected_schema.get()
-            
-            # Şema türüne göre çizim fonksiyonunu çağır
-            if schema_type == "Dikdörtgen":
-                width = float(self.param_entries["width"].get())
-                height = float(self.param_entries["height"].get())
-                self.connector.draw_rectangle(width, height)
-                
-            elif schema_type == "Daire":
-                # Daire çizim kodu
-                pass
-                
-            # Diğer şemalar...
+            with drawing_backends.ConnectorBackend(self.connector) as backend:
+                schema_type = self._emit(backend)
             
             # Zoom
             self.connector.acad.ActiveDocument.Utility.Zoom("E")
             messagebox.showinfo("Başarılı", f"{schema_type} çizimi AutoCAD'e gönderildi.")
             
         except Exception as e:
-            messagebox.showerror("Hata", f"AutoCAD'de çizim yapılırken hata oluştu: {str(e)}")
\ No newline at end of file
+            messagebox.showerror("Hata", f"AutoCAD'de çizim yapılırken hata oluştu: {str(e)}")
+    
+    def _drawings(self):
+        """Çizim handle kayıtları: açık projenin "drawings" bölümü (projeyle kaydedilir) veya oturum sözlüğü."""
+        project = getattr(self.main_app, "project", None)
+        return project.get("drawings") if project is not None else _SESSION_DRAWINGS
+    
+    def _update_layout(self, schema_type):
+        """Yerleşimi artımlı çizer: önceki çizimden bu yana yalnızca değişen varlıklar AutoCAD'e gönderilir."""
+        batch = drawing_batch.DrawingBatch()
+        try: self._emit(batch)
+        except Exception as e:
+            messagebox.showerror("Hata", f"Şema parametreleri geçersiz: {str(e)}")
+            return
+        key = f"schema:{schema_type}"
+        if key in _LAYOUT_JOBS: # İş bitse de geri çağrısı (kayıt yazımı) çalışana kadar meşgul
+            messagebox.showwarning("Bekleyin", f"'{_LAYOUT_JOBS[key]}' sürüyor; bitince tekrar deneyin.")
+            return
+        drawings = self._drawings()
+        registry = handle_registry.HandleRegistry.from_dict(drawings.get(key))
+        
+        def done(summary):
+            _LAYOUT_JOBS.pop(key, None)
+            drawings[key] = registry.to_dict()
+            messagebox.showinfo("Başarılı", f"{schema_type} güncellendi: {summary['added']} eklendi, {summary['modified']} değiştirildi, "
+                                            f"{summary['deleted']} silindi, {summary['unchanged']} değişmedi.")
+        
+        def failed(error):
+            _LAYOUT_JOBS.pop(key, None)
+            messagebox.showerror("Hata", f"AutoCAD'de çizim yapılırken hata oluştu: {str(error)}")
+        
+        _LAYOUT_JOBS[key] = job_name = f"{schema_type} çizimi" # Gönderimden önce: geri çağrı hemen çalışabilir
+        try: com_worker.get_worker().submit(autocad_interface.update_batch, batch, registry, name=job_name, on_done=done, on_error=failed)
+        except Exception: _LAYOUT_JOBS.pop(key, None); raise
+    
+    def _export_dxf(self):
+        """Seçilen şemayı AutoCAD gerektirmeden DXF dosyasına yaz."""
+        path = filedialog.asksaveasfilename(title="DXF Olarak Kaydet", defaultextension=".dxf", filetypes=[("DXF Dosyası", "*.dxf")])
+        if not path: return
+        try:
+            with drawing_backends.DxfBackend(path) as backend:
+                schema_type = self._emit(backend)
+            messagebox.showinfo("Başarılı", f"{schema_type} çizimi kaydedildi:\n{path}")
+        except Exception as e:
+            messagebox.showerror("Hata", f"DXF yazılırken hata oluştu: {str(e)}")
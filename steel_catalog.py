@@ -0,0 +1,288 @@
+# steel_catalog.py
+# Standart çelik profil kataloğu (IPE, HEA, HEB, UPN, SHS/RHS kutu kesitler).
+#
+# Boyut tabloları bu modülde gömülüdür; geometrik özellikler (alan, atalet, elastik ve
+# plastik mukavemet momentleri, atalet yarıçapları, birim ağırlık) bunlardan hesaplanıp
+# ilk kullanımda section_catalog biçiminde (.epsc, mmap ile açılan sütun bazlı ikili
+# dosya) config.STEEL_CATALOG_DIR altına yazılır. Sonraki açılışlarda dosya doğrudan açılır.
+# İsim indeksi ve özellik sütunlarının sıralı (aralık) indeksleri ilk sorguda kurulur;
+# "Wpl,y >= x olan en hafif profil" sorgusu önceden hesaplanmış sonek minimumlarıyla
+# ikili aramadan ibarettir.
+#
+# Birimler: mm, mm², mm³, mm⁴; G kg/m. y ekseni güçlü (majör), z ekseni zayıf eksendir.
+# UPN başlık eğimi ortalama kalınlıkla paralel başlık olarak, kutu kesitlerin köşe
+# yarıçapları ihmal edilerek (keskin köşe) hesaplanır.
+
+import os
+import math
+import bisect
+
+import config
+import section_catalog
+
+STEEL_TABLE_VERSION = 1 # Boyut tabloları veya formüller değişince artırılır (katalog dosyası yeniden üretilir)
+STEEL_DENSITY = 7850e-9 # kg/mm³
+STEEL_COLUMNS = ("h", "b", "tw", "tf", "r", "A", "G", "Iy", "Iz", "Wy", "Wz", "Wply", "Wplz", "iy", "iz")
+STEEL_FAMILIES = ("IPE", "HEA", "HEB", "UPN", "SHS", "RHS")
+
+# --- Boyut Tabloları: isim numarası -> (h, b, tw, tf, r) mm ---
+IPE_TABLE = {
+    80: (80, 46, 3.8, 5.2, 5), 100: (100, 55, 4.1, 5.7, 7), 120: (120, 64, 4.4, 6.3, 7), 140: (140, 73, 4.7, 6.9, 7),
+    160: (160, 82, 5.0, 7.4, 9), 180: (180, 91, 5.3, 8.0, 9), 200: (200, 100, 5.6, 8.5, 12), 220: (220, 110, 5.9, 9.2, 12),
+    240: (240, 120, 6.2, 9.8, 15), 270: (270, 135, 6.6, 10.2, 15), 300: (300, 150, 7.1, 10.7, 15), 330: (330, 160, 7.5, 11.5, 18),
+    360: (360, 170, 8.0, 12.7, 18), 400: (400, 180, 8.6, 13.5, 21), 450: (450, 190, 9.4, 14.6, 21), 500: (500, 200, 10.2, 16.0, 21),
+    550: (550, 210, 11.1, 17.2, 24), 600: (600, 220, 12.0, 19.0, 24),
+}
+HEA_TABLE = {
+    100: (96, 100, 5.0, 8.0, 12), 120: (114, 120, 5.0, 8.0, 12), 140: (133, 140, 5.5, 8.5, 12), 160: (152, 160, 6.0, 9.0, 15),
+    180: (171, 180, 6.0, 9.5, 15), 200: (190, 200, 6.5, 10.0, 18), 220: (210, 220, 7.0, 11.0, 18), 240: (230, 240, 7.5, 12.0, 21),
+    260: (250, 260, 7.5, 12.5, 24), 280: (270, 280, 8.0, 13.0, 24), 300: (290, 300, 8.5, 14.0, 27), 320: (310, 300, 9.0, 15.5, 27),
+    340: (330, 300, 9.5, 16.5, 27), 360: (350, 300, 10.0, 17.5, 27), 400: (390, 300, 11.0, 19.0, 27), 450: (440, 300, 11.5, 21.0, 27),
+    500: (490, 300, 12.0, 23.0, 27), 550: (540, 300, 12.5, 24.0, 27), 600: (590, 300, 13.0, 25.0, 27),
+}
+HEB_TABLE = {
+    100: (100, 100, 6.0, 10.0, 12), 120: (120, 120, 6.5, 11.0, 12), 140: (140, 140, 7.0, 12.0, 12), 160: (160, 160, 8.0, 13.0, 15),
+    180: (180, 180, 8.5, 14.0, 15), 200: (200, 200, 9.0, 15.0, 18), 220: (220, 220, 9.5, 16.0, 18), 240: (240, 240, 10.0, 17.0, 21),
+    260: (260, 260, 10.0, 17.5, 24), 280: (280, 280, 10.5, 18.0, 24), 300: (300, 300, 11.0, 19.0, 27), 320: (320, 300, 11.5, 20.5, 27),
+    340: (340, 300, 12.0, 21.5, 27), 360: (360, 300, 12.5, 22.5, 27), 400: (400, 300, 13.5, 24.0, 27), 450: (450, 300, 14.0, 26.0, 27),
+    500: (500, 300, 14.5, 28.0, 27), 550: (550, 300, 15.0, 29.0, 27), 600: (600, 300, 15.5, 30.0, 27),
+}
+UPN_TABLE = {
+    80: (80, 45, 6.0, 8.0, 8), 100: (100, 50, 6.0, 8.5, 8.5), 120: (120, 55, 7.0, 9.0, 9), 140: (140, 60, 7.0, 10.0, 10),
+    160: (160, 65, 7.5, 10.5, 10.5), 180: (180, 70, 8.0, 11.0, 11), 200: (200, 75, 8.5, 11.5, 11.5), 220: (220, 80, 9.0, 12.5, 12.5),
+    240: (240, 85, 9.5, 13.0, 13), 260: (260, 90, 10.0, 14.0, 14), 280: (280, 95, 10.0, 15.0, 15), 300: (300, 100, 10.0, 16.0, 16),
+    320: (320, 100, 14.0, 17.5, 17.5), 350: (350, 100, 14.0, 16.0, 16), 380: (380, 102, 13.5, 16.0, 16), 400: (400, 110, 14.0, 18.0, 18),
+}
+# Kutu kesitler: (h, b) -> et kalınlıkları t (mm)
+SHS_SIZES = {
+    40: (3, 4), 50: (3, 4, 5), 60: (3, 4, 5), 70: (4, 5), 80: (4, 5, 6), 90: (4, 5, 6), 100: (4, 5, 6, 8, 10),
+    120: (5, 6, 8, 10), 140: (5, 6, 8, 10), 150: (5, 6, 8, 10, 12.5), 160: (6, 8, 10, 12.5), 180: (6, 8, 10, 12.5),
+    200: (6, 8, 10, 12.5, 16), 250: (8, 10, 12.5, 16), 300: (10, 12.5, 16),
+}
+RHS_SIZES = {
+    (60, 40): (3, 4), (80, 40): (3, 4), (100, 50): (4, 5, 6), (120, 60): (4, 5, 6), (120, 80): (5, 6, 8), (140, 80): (5, 6, 8),
+    (150, 100): (5, 6, 8, 10), (160, 80): (5, 6, 8), (200, 100): (6, 8, 10), (200, 120): (6, 8, 10), (250, 150): (6, 8, 10, 12.5),
+    (300, 200): (8, 10, 12.5, 16), (400, 200): (8, 10, 12.5, 16),
+}
+
+
+# ==================================
+# ÖZELLİK HESABI
+# ==================================
+def _finish(row):
+    """Türetilen ortak özellikler: birim ağırlık ve atalet yarıçapları."""
+    row["G"] = row["A"] * STEEL_DENSITY * 1000.0
+    row["iy"] = math.sqrt(row["Iy"] / row["A"]); row["iz"] = math.sqrt(row["Iz"] / row["A"])
+    return row
+
+def i_section_properties(h, b, tw, tf, r):
+    """Çift simetrik I/H profil (gövde-başlık birleşim yarıçapları dahil)."""
+    hw = h - 2 * tf
+    A = 2 * b * tf + hw * tw + (4 - math.pi) * r ** 2
+    Iy = (b * h ** 3 - (b - tw) * hw ** 3) / 12.0 + 0.03 * r ** 4 + 0.2146 * r ** 2 * (hw - 0.4468 * r) ** 2
+    Iz = (2 * tf * b ** 3 + hw * tw ** 3) / 12.0 + 0.03 * r ** 4 + 0.2146 * r ** 2 * (tw + 0.4468 * r) ** 2
+    Wply = b * tf * (h - tf) + tw * hw ** 2 / 4.0 + 4 * 0.2146 * r ** 2 * (h / 2.0 - tf - 0.2234 * r)
+    Wplz = tf * b ** 2 / 2.0 + hw * tw ** 2 / 4.0 + 4 * 0.2146 * r ** 2 * (tw / 2.0 + 0.2234 * r)
+    return _finish({"h": h, "b": b, "tw": tw, "tf": tf, "r": r, "A": A, "Iy": Iy, "Iz": Iz,
+                    "Wy": Iy / (h / 2.0), "Wz": Iz / (b / 2.0), "Wply": Wply, "Wplz": Wplz})
+
+def _rect_axis(rects, axis):
+    """Dikdörtgen parçalardan (x0, x1, y0, y1) oluşan kesitin bir eksene göre atalet, elastik
+    ve plastik mukavemet momenti. axis=1: yatay eksen (y koordinatları), axis=0: düşey eksen."""
+    lo_i, hi_i = (2, 3) if axis == 1 else (0, 1)
+    parts = [(r[lo_i], r[hi_i], (r[1] - r[0]) * (r[3] - r[2]) / (r[hi_i] - r[lo_i])) for r in rects] # (alt, üst, genişlik)
+    area = sum((hi - lo) * w for lo, hi, w in parts)
+    centroid = sum((hi - lo) * w * (lo + hi) / 2.0 for lo, hi, w in parts) / area
+    inertia = sum(w * (hi - lo) ** 3 / 12.0 + (hi - lo) * w * ((lo + hi) / 2.0 - centroid) ** 2 for lo, hi, w in parts)
+    extreme = max(max(hi for _, hi, _ in parts) - centroid, centroid - min(lo for lo, _, _ in parts))
+    # Plastik tarafsız eksen alanı ikiye böler (ikiye bölme ile)
+    below = lambda c: sum(max(0.0, min(hi, c) - lo) * w for lo, hi, w in parts)
+    lo_c = min(lo for lo, _, _ in parts); hi_c = max(hi for _, hi, _ in parts)
+    for _ in range(60):
+        mid = (lo_c + hi_c) / 2.0
+        if below(mid) < area / 2.0: lo_c = mid
+        else: hi_c = mid
+    pna = (lo_c + hi_c) / 2.0
+    plastic = 0.0
+    for lo, hi, w in parts:
+        if hi <= pna: plastic += (hi - lo) * w * (pna - (lo + hi) / 2.0)
+        elif lo >= pna: plastic += (hi - lo) * w * ((lo + hi) / 2.0 - pna)
+        else: plastic += w * ((pna - lo) ** 2 + (hi - pna) ** 2) / 2.0
+    return area, inertia, inertia / extreme, plastic
+
+def channel_properties(h, b, tw, tf, r):
+    """U profil: ortalama başlık kalınlığıyla paralel başlıklı kanal (yarıçaplar ihmal)."""
+    rects = [(0, b, 0, tf), (0, b, h - tf, h), (0, tw, tf, h - tf)]
+    A, Iy, Wy, Wply = _rect_axis(rects, 1)
+    _, Iz, Wz, Wplz = _rect_axis(rects, 0)
+    return _finish({"h": h, "b": b, "tw": tw, "tf": tf, "r": r, "A": A, "Iy": Iy, "Iz": Iz, "Wy": Wy, "Wz": Wz, "Wply": Wply, "Wplz": Wplz})
+
+def box_properties(h, b, t):
+    """Kutu kesit (SHS/RHS), keskin köşeli."""
+    hi = h - 2 * t; bi = b - 2 * t
+    A = b * h - bi * hi
+    Iy = (b * h ** 3 - bi * hi ** 3) / 12.0; Iz = (h * b ** 3 - hi * bi ** 3) / 12.0
+    Wply = (b * h ** 2 - bi * hi ** 2) / 4.0; Wplz = (h * b ** 2 - hi * bi ** 2) / 4.0
+    return _finish({"h": h, "b": b, "tw": t, "tf": t, "r": 0.0, "A": A, "Iy": Iy, "Iz": Iz,
+                    "Wy": Iy / (h / 2.0), "Wz": Iz / (b / 2.0), "Wply": Wply, "Wplz": Wplz})
+
+def _format_mm(value):
+    return f"{value:g}"
+
+def standard_rows():
+    """Gömülü tablolardaki tüm profillerin katalog satırları."""
+    for family, table in (("IPE", IPE_TABLE), ("HEA", HEA_TABLE), ("HEB", HEB_TABLE)):
+        for number, dims in table.items():
+            row = i_section_properties(*dims); row.update(name=f"{family} {number}", family=family); yield row
+    for number, dims in UPN_TABLE.items():
+        row = channel_properties(*dims); row.update(name=f"UPN {number}", family="UPN"); yield row
+    for size, thicknesses in SHS_SIZES.items():
+        for t in thicknesses:
+            row = box_properties(size, size, t); row.update(name=f"SHS {size}x{size}x{_format_mm(t)}", family="SHS"); yield row
+    for (h, b), thicknesses in RHS_SIZES.items():
+        for t in thicknesses:
+            row = box_properties(h, b, t); row.update(name=f"RHS {h}x{b}x{_format_mm(t)}", family="RHS"); yield row
+
+
+# ==================================
+# KATALOG VE İNDEKSLER
+# ==================================
+def normalize_name(name):
+    """İsim karşılaştırma anahtarı: 'ipe300', 'IPE 300' ve 'IPE300' aynıdır."""
+    return "".join((name or "").split()).upper()
+
+
+class SteelCatalog:
+    """section_catalog.SectionCatalog üzerinde isim ve aralık indeksleri.
+    İndeksler ilk ihtiyaçta kurulur ve katalog açık kaldıkça tutulur."""
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self._name_index = None
+        self._sorted = {}   # sütun -> (sıralı değerler, aynı sıradaki satırlar)
+        self._lightest = {} # (sütun, aile) -> (sıralı değerler, sonek en hafif satırları)
+        self._family_rows = None
+
+    def __len__(self): return len(self.catalog)
+
+    def names(self): return self.catalog.names()
+
+    def family(self, row): return self.catalog.family(row)
+
+    # --- İsim İndeksi ---
+    def find(self, name):
+        """İsme göre satır numarası (boşluk ve büyük/küçük harf duyarsız), yoksa -1."""
+        if self._name_index is None: self._name_index = {normalize_name(n): i for i, n in enumerate(self.names())}
+        return self._name_index.get(normalize_name(name), -1)
+
+    def properties(self, name):
+        """Profilin tüm özellikleri sözlük olarak; bulunamazsa None."""
+        row = self.find(name)
+        return self.catalog.row(row) if row >= 0 else None
+
+    def search(self, text, limit=50):
+        """Yazarken arama: önce isim başı eşleşenler, sonra içinde geçenler (katalog sırasıyla)."""
+        needle = normalize_name(text)
+        if self._name_index is None: self.find("")
+        keys = list(self._name_index) # Katalog sırası (dict ekleme sırası)
+        names = self.names()
+        if not needle: return names[:limit]
+        prefix = [names[i] for i, key in enumerate(keys) if key.startswith(needle)]
+        if len(prefix) >= limit: return prefix[:limit]
+        rest = [names[i] for i, key in enumerate(keys) if needle in key and not key.startswith(needle)]
+        return (prefix + rest)[:limit]
+
+    # --- Aralık İndeksleri ---
+    def _sorted_column(self, column):
+        index = self._sorted.get(column)
+        if index is None:
+            values = self.catalog.column(column)
+            rows = sorted(range(len(self.catalog)), key=lambda i: values[i])
+            index = self._sorted[column] = ([float(values[i]) for i in rows], rows)
+        return index
+
+    def _rows_of_family(self, family):
+        if self._family_rows is None:
+            self._family_rows = {}
+            for row in range(len(self.catalog)): self._family_rows.setdefault(self.family(row), set()).add(row)
+        return self._family_rows.get(family, set())
+
+    def range(self, column, lo=None, hi=None):
+        """lo <= sütun <= hi olan satırlar (sütuna göre artan sırada)."""
+        values, rows = self._sorted_column(column)
+        start = 0 if lo is None else bisect.bisect_left(values, lo)
+        end = len(values) if hi is None else bisect.bisect_right(values, hi)
+        return rows[start:end]
+
+    def query(self, family=None, **ranges):
+        """Birden çok aralık: query(family="HEB", h=(None, 300), Wply=(5e5, None)). İsimleri G'ye göre artan döndürür."""
+        candidates = None
+        for column, (lo, hi) in ranges.items():
+            rows = self.range(column, lo, hi)
+            candidates = set(rows) if candidates is None else candidates.intersection(rows)
+            if not candidates: return []
+        if candidates is None: candidates = set(range(len(self.catalog)))
+        if family is not None: candidates &= self._rows_of_family(family)
+        weights = self.catalog.column("G")
+        return [self.catalog.name(row) for row in sorted(candidates, key=lambda i: weights[i])]
+
+    def _lightest_index(self, column, family):
+        key = (column, family)
+        index = self._lightest.get(key)
+        if index is None:
+            values, rows = self._sorted_column(column)
+            if family is not None:
+                members = self._rows_of_family(family)
+                pairs = [(v, r) for v, r in zip(values, rows) if r in members]
+                values = [v for v, _ in pairs]; rows = [r for _, r in pairs]
+            weights = self.catalog.column("G")
+            # best[i]: rows[i:] içindeki en hafif satır
+            best = [0] * len(rows); current = -1
+            for i in range(len(rows) - 1, -1, -1):
+                if current < 0 or weights[rows[i]] < weights[current]: current = rows[i]
+                best[i] = current
+            index = self._lightest[key] = (values, best)
+        return index
+
+    def lightest(self, column="Wply", minimum=0.0, family=None):
+        """sütun >= minimum koşulunu sağlayan en hafif (G) profilin adı; yoksa None.
+        İlk çağrıdan sonra her sorgu tek ikili aramadır."""
+        values, best = self._lightest_index(column, family)
+        i = bisect.bisect_left(values, minimum)
+        return self.catalog.name(best[i]) if i < len(best) else None
+
+
+_steel_catalog = None
+
+def catalog_path():
+    return os.path.join(config.STEEL_CATALOG_DIR, f"steel_profiles_v{STEEL_TABLE_VERSION}{section_catalog.CATALOG_EXTENSION}")
+
+def build_catalog(path=None):
+    """Gömülü tablolardan katalog dosyasını (yeniden) üretir."""
+    path = path or catalog_path()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    return section_catalog.write_catalog(path, standard_rows(), STEEL_COLUMNS)
+
+def get_steel_catalog():
+    """Çelik profil kataloğunu ilk kullanımda açar (dosya yoksa üretir)."""
+    global _steel_catalog
+    if _steel_catalog is None:
+        path = catalog_path()
+        if not os.path.exists(path): build_catalog(path)
+        _steel_catalog = SteelCatalog(section_catalog.SectionCatalog(path))
+        print(f"Info: Steel profile catalog loaded ({len(_steel_catalog)} profiles).")
+    return _steel_catalog
+
+def to_section_dict(name, user_name=None, material_name=""):
+    """Katalog profilini profil kesiti sözlüğüne (profiles.json biçimi) çevirir; bulunamazsa None."""
+    catalog = get_steel_catalog()
+    row = catalog.find(name)
+    if row < 0: return None
+    props = catalog.catalog.row(row)
+    return {"user_name": user_name or props["name"], "type": "Çelik Profil", "material_name": material_name,
+            "profile": props["name"], "dimensions": {"b": props["b"], "h": props["h"]}}
+
+
+if __name__ == "__main__":
+    # Katalog dosyasını yeniden üretir: python steel_catalog.py
+    build_catalog()
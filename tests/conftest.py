@@ -0,0 +1,7 @@
+# tests/conftest.py
+# Modüller proje kök dizininde düz (flat) duruyor: testler kökten içe aktarır.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,64 @@
+# tests/test_acad_script.py
+# .scr betik derleyicisi: katman geçişleri, dosya biçimi ve parça parça gönderim.
+
+import pytest
+
+import acad_script
+import autocad_interface
+import drawing_batch
+import fake_autocad
+from drawing_batch import LINE, CIRCLE, TEXT
+
+
+@pytest.fixture
+def fake_acad():
+    recorder = fake_autocad.install(latency=0.0)
+    yield recorder
+    fake_autocad.uninstall()
+
+
+def test_layerless_entity_returns_to_starting_layer():
+    compiler = acad_script.ScriptCompiler()
+    compiler.prologue(layer="0")
+    assert compiler.item(LINE, None, ((0, 0), (1, 0))).startswith("_.LINE") # Zaten başlangıç katmanında
+    assert compiler.item(CIRCLE, "KOLON", ((0, 0), 1.0)).startswith("_.-LAYER\n_M\nKOLON\n\n")
+    assert compiler.item(CIRCLE, "KOLON", ((5, 0), 1.0)).startswith("_.CIRCLE") # Aynı katman tekrar yazılmaz
+    assert compiler.item(LINE, None, ((0, 0), (1, 0))).startswith("_.-LAYER\n_M\n0\n\n")
+
+
+def test_unknown_starting_layer_is_saved_by_the_script():
+    compiler = acad_script.ScriptCompiler()
+    assert '(setq engpy:clayer (getvar "CLAYER"))' in compiler.prologue()
+    compiler.item(TEXT, "AKS", ((0, 0), 2.5, "A"))
+    assert compiler.item(TEXT, None, ((0, 0), 2.5, "B")).startswith('(setvar "CLAYER" engpy:clayer)\n_.TEXT')
+    compiler.epilogue()
+    assert compiler.current_layer is None and compiler.base_layer is None
+
+
+def test_write_script_uses_crlf_and_restores_settings(tmp_path):
+    batch = drawing_batch.DrawingBatch()
+    batch.rectangle(0, 0, 100, 50, layer="KİRİŞ")
+    batch.text((0, 0), 2.5, "Şerit\nAçıklama")
+    path = acad_script.write_script(batch, str(tmp_path / "cizim.scr"), restore={"OSMODE": 4133, "CLAYER": "0"})
+    with open(path, "rb") as f: raw = f.read()
+    assert b"\r\n" in raw and b"\n" not in raw.replace(b"\r\n", b"")
+    script = raw.decode(acad_script.SCRIPT_ENCODING).replace("\r\n", "\n")
+    assert script.startswith("_.SETVAR\nCMDECHO\n0\n_.SETVAR\nOSMODE\n0\n")
+    assert "_.PLINE\n" in script and "_C\n" in script # Uç uca çizgiler kapalı polyline olur
+    assert "KİRİŞ" in script and "Şerit Açıklama" in script
+    assert script.endswith("_.SETVAR\nOSMODE\n4133\n_.SETVAR\nCLAYER\n0\n")
+
+
+def test_stream_commands_sends_in_chunks(fake_acad):
+    batch = drawing_batch.DrawingBatch(merge_lines=False)
+    for i in range(5): batch.circle((i * 10, 0), 1.0, layer="KOLON")
+    worker = autocad_interface.com_worker.get_worker()
+    assert worker.call(acad_script.stream_commands, None, batch, 2) == 5
+    commands = autocad_interface.connection.acad.doc.commands
+    assert len(commands) == 3 # 2 + 2 + (1 + sonlandırma)
+    assert sum(text.count("_.CIRCLE") for text in commands) == 5
+    assert "CLAYER\n0\n" in commands[-1] and "FILEDIA" not in "".join(commands)
+
+
+def test_render_rejects_unknown_target():
+    with pytest.raises(ValueError): acad_script.render(None, drawing_batch.DrawingBatch(), target="pdf")
@@ -0,0 +1,69 @@
+# tests/test_autocad_interface.py
+# Sahte AutoCAD (fake_autocad) ile bağlantı kontrolü ve sistem değişkeni önbelleği.
+
+import threading
+
+import pytest
+
+import fake_autocad
+import autocad_interface
+
+
+@pytest.fixture
+def fake_acad():
+    recorder = fake_autocad.install(latency=0.0)
+    yield recorder
+    fake_autocad.uninstall()
+
+
+def test_connection_check_runs_on_com_worker(fake_acad):
+    done = threading.Event(); result = {}
+    def on_done(message): result["message"] = message; done.set()
+    job = autocad_interface.submit_connection_check(on_done=on_done)
+    assert done.wait(2.0), job
+    assert "Drawing1.dwg" in result["message"]
+    assert autocad_interface.get_connection_state()["doc_name"] == "Drawing1.dwg"
+
+
+def test_submit_get_many_reads_once_then_serves_cache(fake_acad):
+    cache = autocad_interface.SysVarCache(delay=0.01)
+    done = threading.Event(); results = []
+    def on_done(values): results.append(values); done.set()
+    job = cache.submit_get_many(["gridmode", "OSMODE"], on_done)
+    assert job is not None and done.wait(2.0)
+    assert results[0] == {"GRIDMODE": 0, "OSMODE": 4133}
+    reads = fake_acad.calls["Document.GetVariable"]; assert reads == 2
+    assert cache.submit_get_many(["OSMODE"], on_done) is None # Önbellekten, hemen
+    assert results[-1] == {"OSMODE": 4133}
+    assert fake_acad.calls["Document.GetVariable"] == reads
+
+
+def test_document_switch_detected_before_ttl_expires(fake_acad):
+    cache = autocad_interface.SysVarCache(delay=60.0)
+    autocad_interface.connection.ttl = 3600.0 # Bağlantı doğrulaması eskimeden çizim değişir
+    worker = autocad_interface.com_worker.get_worker()
+    assert worker.call(cache.get, "OSMODE") == 4133
+    application = autocad_interface.connection.acad.app
+    second = application.Documents.Add("Plan2.dwg")
+    second.SetVariable("OSMODE", 0)
+    cache.invalidate("GRIDMODE") # Iska: doküman adı yeniden okunur
+    assert worker.call(cache.get_many, ["OSMODE", "GRIDMODE"]) == {"OSMODE": 0, "GRIDMODE": 0}
+    assert autocad_interface.connection.doc_name == "Drawing1.dwg" # Bağlantı durumu hâlâ eski
+
+    cache.stage("OSMODE", 7)
+    application.ActiveDocument = application.Documents.Item(0)
+    assert worker.call(cache.flush) # Yazma işi dokümanı kendisi okur: eski çizime ait yazma atılır
+    assert application.Documents.Item(0).GetVariable("OSMODE") == 4133
+    assert second.GetVariable("OSMODE") == 0
+
+
+def test_script_restores_integer_cmdecho_and_filedia(fake_acad, tmp_path):
+    import acad_script
+    import drawing_batch
+    batch = drawing_batch.DrawingBatch()
+    batch.line((0, 0), (100, 0))
+    worker = autocad_interface.com_worker.get_worker()
+    path = worker.call(acad_script.run_script, None, batch, str(tmp_path / "cizim.scr"))
+    with open(path, encoding=acad_script.SCRIPT_ENCODING) as f: script = f.read()
+    assert "CMDECHO\n1\n" in script and "FILEDIA\n1\n" in script # Gerçek AutoCAD değerleri (tamsayı) geri yüklenir
+    assert "None" not in script
@@ -0,0 +1,68 @@
+# tests/test_block_manager.py
+# Blok tanımı önbelleği: aynı sembol bir kez tanımlanır, örnekler tek INSERT'tir.
+
+import pytest
+
+import block_manager
+import drawing_batch
+import fake_autocad
+from drawing_batch import INSERT, POLYLINE, LINE
+
+
+def test_same_parameters_share_one_definition():
+    batch = drawing_batch.DrawingBatch()
+    blocks = block_manager.BlockManager(batch)
+    first = blocks.define("column_rect", b=300, h=500)
+    assert blocks.define("column_rect", h=500.0, b=300.0000001) == first # Sıra, tip ve kayan nokta gürültüsü önemsiz
+    assert blocks.define("column_rect", b=300, h=600) != first
+    assert first == block_manager.BlockManager(drawing_batch.DrawingBatch()).block_name("column_rect", b=300, h=500) # Kararlı ad
+    assert first.startswith("ENGPY_COLUMN_RECT_")
+    assert len(batch.blocks) == 2
+    with pytest.raises(KeyError): blocks.define("yok")
+
+
+def test_place_many_inserts_instances_with_layer():
+    batch = drawing_batch.DrawingBatch()
+    blocks = block_manager.BlockManager(batch)
+    indices = blocks.place_many("column_circle", [(0, 0), (6000, 0), (12000, 0)], layer="KOLON", d=500)
+    blocks.place("bar_mark", (0, 1000), radius=150)
+    assert indices == [0, 1, 2]
+    items = list(batch.items())
+    assert [(kind, layer) for kind, layer, _ in items] == [(INSERT, "KOLON")] * 3 + [(INSERT, None)]
+    assert blocks.stats() == {"definitions": 2, "instances": 4}
+    definition = batch.blocks[items[0][2][0]]
+    assert [kind for kind, _, _ in definition.items()] == ["circle", LINE, LINE]
+
+
+def test_existing_block_is_not_redefined():
+    batch = drawing_batch.DrawingBatch()
+    name = block_manager.BlockManager(batch).define("axis_bubble", radius=300)
+    marker = batch.blocks[name]
+    block_manager.BlockManager(batch).define("axis_bubble", radius=300) # Yeni yönetici, aynı arka uç
+    assert batch.blocks[name] is marker
+
+
+def test_custom_symbol_and_prefix():
+    batch = drawing_batch.DrawingBatch()
+    def beam_tag(width):
+        symbol = drawing_batch.DrawingBatch(); symbol.rectangle(0, 0, width, width / 2); return symbol
+    blocks = block_manager.BlockManager(batch, prefix="PRJ", symbols={"beam_tag": beam_tag})
+    name = blocks.define("beam_tag", width=200)
+    assert name.startswith("PRJ_BEAM_TAG_")
+    assert [kind for kind, _, _ in batch.blocks[name].items()] == [POLYLINE]
+
+
+def test_repeated_symbols_cost_one_definition_in_autocad():
+    recorder = fake_autocad.CallRecorder(0.0)
+    application = fake_autocad.FakeApplication(recorder)
+    fake_autocad.install(recorder=recorder, application=application)
+    try:
+        acad = fake_autocad.FakePyAutocad(application)
+        batch = drawing_batch.DrawingBatch()
+        blocks = block_manager.BlockManager(batch)
+        blocks.place_many("column_rect", [(x * 5000, y * 5000) for x in range(10) for y in range(10)], layer="KOLON", b=400, h=400)
+        handles = batch.submit(acad)
+        assert len(handles) == 100 and None not in handles
+        assert recorder.calls["Block.InsertBlock"] == 100
+        assert recorder.calls["Blocks.Add"] == 1 and recorder.calls["Block.AddLightWeightPolyline"] == 1
+    finally: fake_autocad.uninstall()
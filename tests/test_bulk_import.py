@@ -0,0 +1,31 @@
+# tests/test_bulk_import.py
+# Toplu içe aktarım: Türkçe satır hataları ve katalogdan çelik profil kesitleri.
+
+import bulk_import
+
+PROFILE = {"materials": [{"user_name": "C30", "type": "Beton", "class": "C30/37", "props": {"fck": 30.0}}]}
+
+
+def _write(tmp_path, text):
+    path = tmp_path / "kesitler.csv"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_non_numeric_cell_reports_turkish_row_error(tmp_path):
+    path = _write(tmp_path, "ad;tip;malzeme;b;h\nK1;Dikdörtgen;C30;30x;500\nK2;Dikdörtgen;C30;300;600,5\n")
+    result = bulk_import.read_sections(path, PROFILE)
+    assert [item["user_name"] for item in result.items] == ["K2"]
+    assert result.items[0]["dimensions"] == {"b": 300.0, "h": 600.5}
+    row_no, message = result.errors[0]
+    assert row_no == 2 and message == "'b' sütunu sayısal olmalı (değer: '30x')."
+    assert "could not convert" not in result.error_summary()
+
+
+def test_steel_profiles_resolved_from_catalog(tmp_path):
+    path = _write(tmp_path, "ad,tip,profil,malzeme\nS1,Çelik Profil,ipe300,\nS2,Çelik Profil,IPE 9999,\nS3,Çelik Profil,,\nS4,Çelik Profil,HEA 200,C25\n")
+    result = bulk_import.read_sections(path, PROFILE)
+    assert result.items == [{"user_name": "S1", "type": "Çelik Profil", "material_name": "", "dimensions": {"b": 150.0, "h": 300.0}, "profile": "IPE 300"}]
+    assert [row for row, _ in result.errors] == [3, 4, 5]
+    assert "katalogda bulunamadı" in result.errors[0][1]
+    assert "C25" in result.errors[2][1]
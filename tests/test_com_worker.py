@@ -0,0 +1,80 @@
+# tests/test_com_worker.py
+# COM iş parçacığı: sıralı yürütme, iptal, hata ve geri çağrıların Tk iş parçacığına taşınması.
+
+import threading
+
+import pytest
+
+import com_worker
+
+
+class _FakeRoot:
+    """root.after() yerine: zamanlanan işlevleri test iş parçacığında elle çalıştırır."""
+    def __init__(self): self.scheduled = []
+    def after(self, ms, func): self.scheduled.append(func); return len(self.scheduled)
+    def run_pending(self):
+        while self.scheduled: self.scheduled.pop(0)()
+
+
+@pytest.fixture
+def worker():
+    instance = com_worker.ComWorker(name="test-com", poll_ms=1)
+    yield instance
+    instance.stop()
+
+
+def test_jobs_run_in_order_on_one_thread(worker):
+    threads = []; order = []
+    def step(job, value): threads.append(threading.current_thread().name); order.append(value); return value * 2
+    jobs = [worker.submit(step, i) for i in range(5)]
+    assert [job.future.result(2.0) for job in jobs] == [0, 2, 4, 6, 8]
+    assert order == list(range(5)) and set(threads) == {"test-com"}
+    assert all(job.state == com_worker.DONE for job in jobs)
+    assert worker.call(lambda: worker.in_worker_thread()) is True
+
+
+def test_cancel_before_start_and_while_running(worker):
+    started = threading.Event(); release = threading.Event(); errors = []
+    def long_job(job):
+        started.set(); release.wait(2.0); job.check_cancelled(); return "bitti"
+    running = worker.submit(long_job, on_error=errors.append)
+    queued = worker.submit(lambda job: pytest.fail("iptal edilen iş çalıştı"), on_error=errors.append)
+    assert started.wait(2.0)
+    assert queued.cancel() and running.cancel()
+    release.set()
+    with pytest.raises(com_worker.JobCancelled): running.future.result(2.0)
+    with pytest.raises(com_worker.JobCancelled): queued.future.result(2.0)
+    assert running.state == queued.state == com_worker.CANCELLED
+    assert len(errors) == 2 and all(isinstance(e, com_worker.JobCancelled) for e in errors)
+
+
+def test_failure_reaches_on_error_and_future(worker):
+    errors = []
+    job = worker.submit(lambda job: 1 / 0, on_error=errors.append)
+    with pytest.raises(ZeroDivisionError): job.future.result(2.0)
+    assert job.state == com_worker.FAILED and isinstance(errors[0], ZeroDivisionError)
+
+
+def test_callbacks_are_delivered_by_root_after(worker):
+    root = _FakeRoot(); worker.attach(root)
+    results = []; progress = []; main_thread = threading.current_thread()
+    def job_func(job):
+        job.progress(0.5, "yarı"); return "tamam"
+    def on_done(value): results.append((value, threading.current_thread() is main_thread))
+    job = worker.submit(job_func, on_done=on_done, on_progress=lambda job, fraction, message: progress.append((fraction, message)))
+    job.future.result(2.0)
+    assert results == [] and progress == [] # Tk pompası çalışmadan teslim edilmez
+    while not results: root.run_pending()
+    assert results == [("tamam", True)] and progress == [(0.5, "yarı")]
+
+
+def test_stop_cancels_queued_jobs(worker):
+    started = threading.Event(); release = threading.Event()
+    def long_job(job): started.set(); release.wait(2.0)
+    running = worker.submit(long_job)
+    queued = worker.submit(lambda job: pytest.fail("kuyruktaki iş çalıştı"))
+    assert started.wait(2.0) and worker.pending == 2
+    threading.Timer(0.05, release.set).start()
+    worker.stop()
+    assert queued.state == com_worker.CANCELLED and running.cancelled
+    assert worker.pending == 0
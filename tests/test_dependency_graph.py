@@ -0,0 +1,61 @@
+# tests/test_dependency_graph.py
+# Malzeme -> kesit -> tasarım -> rapor grafiği: yalnızca etkilenen tasarımlar yeniden hesaplanır.
+
+import dependency_graph
+from dependency_graph import MATERIAL, SECTION, DESIGN
+
+
+def _profile():
+    return {
+        "materials": [{"user_name": "C30", "type": "Beton", "props": {"fck": 30.0}},
+                      {"user_name": "C25", "type": "Beton", "props": {"fck": 25.0}},
+                      {"user_name": "B420C", "type": "Donatı Çeliği", "props": {"fyk": 420.0, "Es": 200000.0}}],
+        "sections": [{"user_name": "K1", "type": "Dikdörtgen", "material_name": "C30", "dimensions": {"b": 300, "h": 500}},
+                     {"user_name": "K2", "type": "Dikdörtgen", "material_name": "C25", "dimensions": {"b": 250, "h": 400}}],
+        "designs": [{"user_name": f"T{i}", "section_name": "K1" if i % 2 else "K2", "rebar_name": "B420C",
+                     "n_top": 3, "phi_top": 16, "cover": 30, "stirrup_phi": 8, "Md_kNm": 50} for i in range(6)],
+    }
+
+
+def test_report_recomputes_only_affected_designs():
+    profile = _profile()
+    graph = dependency_graph.ProfileDesignGraph(profile)
+    report = graph.report()
+    assert report["total"] == 6 and report["errors"] == 0
+    first_count = graph.recompute_count
+
+    profile["materials"][0] = {"user_name": "C30", "type": "Beton", "props": {"fck": 35.0}}
+    affected = graph.record_changed(MATERIAL, "C30")
+    assert {key for key in affected if key[0] == DESIGN} == {(DESIGN, "T1"), (DESIGN, "T3"), (DESIGN, "T5")}
+    graph.report()
+    # C30 + K1 + 3 tasarım + rapor
+    assert graph.recompute_count - first_count == 6
+    assert graph.dirty_count == 0
+
+
+def test_section_material_switch_relinks_designs_and_missing_records_report_errors():
+    profile = _profile()
+    graph = dependency_graph.ProfileDesignGraph(profile)
+    graph.report()
+    profile["sections"][1] = dict(profile["sections"][1], material_name="C30")
+    graph.records_changed(SECTION, [("K2", None)])
+    graph.report()
+    profile["materials"][0] = {"user_name": "C30", "type": "Beton", "props": {"fck": 40.0}}
+    affected = graph.record_changed(MATERIAL, "C30")
+    assert sum(1 for key in affected if key[0] == DESIGN) == 6 # K2 artık C30'a bağlı
+
+    del profile["sections"][0]
+    graph.record_changed(SECTION, "K1")
+    rows = dict(graph.report()["rows"])
+    assert rows["T1"] == {"error": "Kesit 'K1' bulunamadı."}
+    assert "error" not in rows["T0"]
+
+
+def test_registry_rebuilds_graph_when_profile_is_replaced():
+    profiles = {"P": _profile()}
+    registry = dependency_graph.GraphRegistry(profiles)
+    graph = registry.get("P")
+    assert registry.get("P") is graph
+    profiles["P"] = _profile() # Geri al / dış yükleme profili toptan değiştirir
+    assert registry.records_changed("P", MATERIAL, [("C30", None)]) == set()
+    assert registry.get("P") is not graph
@@ -0,0 +1,86 @@
+# tests/test_drawing_backends.py
+# DxfBackend çıktısının gidiş-dönüş (yaz -> ayrıştır) testleri.
+
+import io
+import math
+
+import block_manager
+import drawing_backends
+
+
+def _parse(text):
+    """R12 ASCII DXF'i (grup kodu, değer) çiftlerine ayırır; bozuk grup kodunda hata verir."""
+    lines = text.split("\n")
+    if lines[-1] == "": lines.pop()
+    assert len(lines) % 2 == 0, "Grup kodu/değer satırları çift olmalı"
+    return [(int(lines[i]), lines[i + 1]) for i in range(0, len(lines), 2)]
+
+
+def _entities(pairs, section):
+    """Bölümdeki varlıkları [(tür, {kod: [değerler]})] olarak döndürür."""
+    start = pairs.index((2, section)) + 1
+    entities = []
+    for code, value in pairs[start:]:
+        if code == 0:
+            if value == "ENDSEC": break
+            entities.append((value, {}))
+        else: entities[-1][1].setdefault(code, []).append(value)
+    return entities
+
+
+def _draw(backend):
+    blocks = block_manager.BlockManager(backend)
+    backend.line((0, 0), (100, 50), layer="AKS")
+    backend.rectangle(0, 0, 300, 200, layer="KIRIS")
+    backend.circle((50, 50), 25)
+    backend.text((10, 10), 2.5, "Kolon Ş1 çizimi", layer="YAZI")
+    blocks.place_many("column_rect", [(0, 0), (6000, 0)], layer="KOLON", b=400, h=600)
+    blocks.place("axis_bubble", (0, -1500), rotation=math.pi / 2, radius=300)
+
+
+def test_dxf_file_round_trip(tmp_path):
+    path = str(tmp_path / "plan.dxf")
+    with drawing_backends.DxfBackend(path) as backend: _draw(backend)
+    with open(path, "rb") as f: raw = f.read()
+    assert b"\r\r" not in raw
+    assert raw.count(b"\r\n") == raw.count(b"\n") # Her satır tam olarak CRLF ile biter
+    pairs = _parse(raw.decode(drawing_backends.DXF_ENCODING).replace("\r\n", "\n"))
+    assert pairs[-1] == (0, "EOF")
+    assert [value for code, value in pairs if code == 2 and value in ("HEADER", "BLOCKS", "ENTITIES")] == ["HEADER", "BLOCKS", "ENTITIES"]
+
+    entities = _entities(pairs, "ENTITIES")
+    kinds = [kind for kind, _ in entities]
+    assert kinds.count("INSERT") == 3 and kinds.count("LINE") == 1 and kinds.count("CIRCLE") == 1 and kinds.count("TEXT") == 1
+    text = next(codes for kind, codes in entities if kind == "TEXT")
+    assert text[1] == ["Kolon Ş1 çizimi"]
+
+    defined = {codes[2][0] for kind, codes in _entities(pairs, "BLOCKS") if kind == "BLOCK"}
+    assert {codes[2][0] for kind, codes in entities if kind == "INSERT"} <= defined
+    assert len(defined) == 2
+
+    seed = int(pairs[pairs.index((9, "$HANDSEED")) + 1][1], 16)
+    entity_handles = [int(codes[5][0], 16) for _, codes in entities + _entities(pairs, "BLOCKS") if 5 in codes]
+    assert len(set(entity_handles)) == len(entity_handles)
+    assert seed > max(entity_handles)
+
+
+def test_dxf_stream_target_uses_plain_newlines():
+    buf = io.StringIO()
+    backend = drawing_backends.DxfBackend(buf, keep_handles=True)
+    _draw(backend)
+    handles = backend.close()
+    text = buf.getvalue()
+    assert "\r" not in text
+    pairs = _parse(text)
+    assert pairs[-1] == (0, "EOF")
+    assert len(handles) == backend.count
+
+
+def test_dxf_abort_leaves_no_file(tmp_path):
+    path = tmp_path / "yarim.dxf"
+    try:
+        with drawing_backends.DxfBackend(str(path)) as backend:
+            backend.line((0, 0), (1, 1))
+            raise RuntimeError("iptal")
+    except RuntimeError: pass
+    assert not path.exists()
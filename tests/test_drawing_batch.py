@@ -0,0 +1,101 @@
+# tests/test_drawing_batch.py
+# Toplu çizim tamponu: plan (birleştirme, katman gruplama) ve sahte AutoCAD'e gönderim.
+
+import math
+
+import pytest
+
+import com_worker
+import drawing_batch
+import fake_autocad
+from drawing_batch import LINE, CIRCLE, POLYLINE
+
+
+@pytest.fixture
+def acad():
+    recorder = fake_autocad.CallRecorder(0.0)
+    application = fake_autocad.FakeApplication(recorder)
+    fake_autocad.install(recorder=recorder, application=application)
+    yield fake_autocad.FakePyAutocad(application), recorder
+    fake_autocad.uninstall()
+
+
+def test_plan_merges_chained_lines_and_groups_layers():
+    batch = drawing_batch.DrawingBatch()
+    batch.line((0, 0), (10, 0), layer="A"); batch.line((10, 0), (10, 10), layer="A")
+    batch.circle((5, 5), 1, layer="B")
+    batch.line((10, 10), (0, 10), layer="A"); batch.line((0, 10), (0, 0), layer="A") # Kare kapandı
+    batch.line((20, 0), (30, 0), layer="A")
+    planned = batch.plan()
+    assert [(layer, kind) for layer, kind, _, _ in planned] == [("A", POLYLINE), ("A", LINE), ("B", CIRCLE)]
+    layer, kind, (points, closed), indices = planned[0]
+    assert closed and points == ((0.0, 0.0), (10.0, 0.0), (10.0, 10.0), (0.0, 10.0)) and indices == (0, 1, 3, 4)
+    unmerged = drawing_batch.DrawingBatch(merge_lines=False)
+    unmerged.line((0, 0), (1, 0)); unmerged.line((1, 0), (2, 0))
+    assert [kind for _, kind, _, _ in unmerged.plan()] == [LINE, LINE]
+
+
+def test_rectangle_is_one_closed_polyline():
+    batch = drawing_batch.DrawingBatch(default_layer="KOLON")
+    batch.rectangle(0, 0, 300, 500)
+    batch.polygon([(0, 0), (1, 0), (1, 1), (0, 0)]) # Kapanış noktası bayrakla verilir
+    planned = batch.plan()
+    assert [(layer, kind, data[1], len(data[0])) for layer, kind, data, _ in planned] == [("KOLON", POLYLINE, True, 4), ("KOLON", POLYLINE, True, 3)]
+    with pytest.raises(ValueError): batch.polyline([(0, 0)])
+
+
+def test_submit_returns_handles_and_sets_each_layer_once(acad):
+    acad, recorder = acad
+    batch = drawing_batch.DrawingBatch()
+    batch.line((0, 0), (10, 0), layer="A"); batch.line((10, 0), (20, 0), layer="A")
+    batch.circle((0, 0), 5, layer="B"); batch.text((0, 0), 2.5, "K1", layer="B")
+    batch.rectangle(0, 0, 1, 1, layer="A")
+    handles = batch.submit(acad)
+    assert len(handles) == 5 and handles[0] == handles[1] and len(set(handles)) == 4
+    assert len(batch) == 0 # Tampon boşaltılır
+    doc = acad.doc
+    assert recorder.calls["Document.ActiveLayer="] == 3 # A, B ve geri yükleme
+    assert doc.GetVariable("CLAYER") == "0"
+    assert recorder.calls["Document.ModelSpace"] == 1
+    assert [doc.HandleToObject(h).ObjectName for h in handles[1:]] == ["AcDbPolyline", "AcDbCircle", "AcDbText", "AcDbPolyline"]
+
+
+def test_submit_stops_after_consecutive_errors(acad, monkeypatch):
+    acad, _ = acad
+    batch = drawing_batch.DrawingBatch(merge_lines=False)
+    for i in range(drawing_batch.MAX_CONSECUTIVE_ERRORS + 3): batch.circle((i, 0), -1 if i else 1)
+    real_create = drawing_batch._create
+    def create(target, kind, data):
+        if data[1] < 0: raise RuntimeError("Bağlantı koptu")
+        return real_create(target, kind, data)
+    monkeypatch.setattr(drawing_batch, "_create", create)
+    handles = batch.submit(acad)
+    assert handles[0] is not None and handles[1:] == [None] * (len(handles) - 1)
+
+
+def test_submit_honours_job_cancellation(acad):
+    acad, _ = acad
+    batch = drawing_batch.DrawingBatch()
+    for i in range(10): batch.circle((i, 0), 1)
+    worker = com_worker.ComWorker(name="test-batch")
+    try:
+        job = worker.submit(lambda job: (job.cancel(), batch.submit(acad, job=job)))
+        with pytest.raises(com_worker.JobCancelled): job.future.result(2.0)
+        assert acad.doc.ModelSpace.Count == 0
+    finally: worker.stop()
+
+
+def test_blocks_are_defined_once_and_expand_with_transform(acad):
+    acad, _ = acad
+    symbol = drawing_batch.DrawingBatch()
+    symbol.line((0, 0), (10, 0))
+    batch = drawing_batch.DrawingBatch()
+    batch.define_block("SEMBOL", symbol)
+    for i in range(3): batch.insert("SEMBOL", (i * 100, 0), layer="S")
+    with pytest.raises(KeyError): batch.insert("YOK", (0, 0))
+    batch.submit(acad)
+    doc = acad.doc
+    assert doc.Blocks.Item("SEMBOL").Count == 1 and doc.ModelSpace.Count == 3
+    expanded = drawing_batch.expand_block(symbol, (5, 5), scale=2.0, rotation=math.pi / 2)
+    (kind, (start, end)), = expanded
+    assert kind == LINE and start == pytest.approx((5, 5)) and end == pytest.approx((5, 25))
@@ -0,0 +1,99 @@
+# tests/test_handle_registry.py
+# Handle kaydı: plan farkı ve sahte AutoCAD'de yalnızca değişen varlıkların güncellenmesi.
+
+import json
+
+import pytest
+
+import drawing_batch
+import fake_autocad
+import handle_registry
+import layout_generator
+
+
+def _batch(x_spacings, y_spacings="5000 5000"):
+    layout = layout_generator.generate(layout_generator.parse_spacings(x_spacings), layout_generator.parse_spacings(y_spacings),
+                                       column_b=400, beam_width=250)
+    batch = drawing_batch.DrawingBatch()
+    layout_generator.emit(layout, batch)
+    return batch
+
+
+@pytest.fixture
+def acad():
+    application = fake_autocad.FakeApplication(fake_autocad.CallRecorder(0.0))
+    fake_autocad.install(latency=0.0, application=application)
+    yield fake_autocad.FakePyAutocad(application)
+    fake_autocad.uninstall()
+
+
+def test_diff_classifies_entities():
+    registry = handle_registry.HandleRegistry()
+    old = drawing_batch.DrawingBatch()
+    old.line((0, 0), (10, 0), layer="A"); old.line((0, 5), (10, 5), layer="A"); old.circle((0, 0), 5, layer="B")
+    diff = registry.diff(old.plan())
+    registry.document = "x.dwg"
+    registry.entries = [[sig, group, f"H{i}"] for i, (sig, group) in enumerate(zip(diff.signatures, diff.groups))]
+
+    new = drawing_batch.DrawingBatch()
+    new.line((0, 0), (10, 0), layer="A"); new.line((0, 7), (10, 7), layer="A"); new.text((0, 0), 2.5, "yeni", layer="B")
+    diff = registry.diff(new.plan())
+    assert diff.unchanged == [(0, "H0")] and diff.modified == [(1, "H1")]
+    assert diff.added == [2] and diff.deleted == ["H2"] # Daire yazıya dönüştürülemez
+    restored = handle_registry.HandleRegistry.from_dict(json.loads(json.dumps(registry.to_dict())))
+    assert restored.entries == registry.entries and restored.document == "x.dwg"
+
+
+def test_update_sends_only_changed_entities(acad):
+    registry = handle_registry.HandleRegistry()
+    first = handle_registry.update(acad, _batch("3*6000"), registry)
+    total = first["added"]
+    assert first == {"unchanged": 0, "modified": 0, "added": total, "deleted": 0}
+    assert len(registry) == total == len(acad.doc._entities)
+    handles = set(registry.handles())
+
+    second = handle_registry.update(acad, _batch("6000 6000 7000"), registry)
+    assert second["added"] == second["deleted"] == 0
+    assert 0 < second["modified"] < total / 2 and second["unchanged"] + second["modified"] == total
+    assert set(registry.handles()) == handles # Değiştirilen varlıklar handle'larını korur
+    assert handle_registry.update(acad, _batch("6000 6000 7000"), registry)["unchanged"] == total
+
+    smaller = handle_registry.update(acad, _batch("6000 6000"), registry)
+    assert smaller["deleted"] > 0 and len(acad.doc._entities) == len(registry)
+
+
+def test_registry_from_other_document_redraws_fully(acad):
+    registry = handle_registry.HandleRegistry()
+    handle_registry.update(acad, _batch("6000"), registry)
+    acad.app.Documents.Add("Plan2.dwg")
+    summary = handle_registry.update(acad, _batch("6000"), registry)
+    assert summary["unchanged"] == summary["modified"] == 0 and summary["added"] == len(registry)
+    assert registry.document == "Plan2.dwg"
+
+
+def test_second_update_waits_for_registry_write(monkeypatch):
+    import os, types, importlib.util
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "interfaces", "autocad", "schema_page.py")
+    spec = importlib.util.spec_from_file_location("schema_page_under_test", path)
+    schema_page = importlib.util.module_from_spec(spec); spec.loader.exec_module(schema_page)
+    submitted = []; shown = []
+    worker = types.SimpleNamespace(submit=lambda func, *args, **kwargs: submitted.append(kwargs))
+    monkeypatch.setattr(schema_page.com_worker, "get_worker", lambda: worker)
+    for name in ("showwarning", "showinfo", "showerror"):
+        monkeypatch.setattr(schema_page.messagebox, name, lambda *a, _name=name, **k: shown.append(_name))
+    page = object.__new__(schema_page.SchemaPage)
+    page.main_app = types.SimpleNamespace(project=None)
+    page._emit = lambda batch: batch.line((0, 0), (1000, 0))
+
+    page._update_layout("Grid Sistemi")
+    page._update_layout("Grid Sistemi") # Kayıt henüz yazılmadı: ikinci iş aynı varlıkları yeniden çizerdi
+    assert len(submitted) == 1 and shown == ["showwarning"]
+    page._update_layout("Kolon Yerleşimi") # Başka çizim beklemez
+    assert len(submitted) == 2
+    submitted[0]["on_done"]({"added": 1, "modified": 0, "deleted": 0, "unchanged": 0})
+    assert "schema:Grid Sistemi" in schema_page._SESSION_DRAWINGS
+    page._update_layout("Grid Sistemi")
+    assert len(submitted) == 3
+    submitted[2]["on_error"](RuntimeError("iptal edildi")) # Hata/iptal de anahtarı serbest bırakır
+    page._update_layout("Grid Sistemi")
+    assert len(submitted) == 4
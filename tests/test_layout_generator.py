@@ -0,0 +1,50 @@
+# tests/test_layout_generator.py
+# Parametrik aks / kolon / kiriş yerleşimi: aralık ayrıştırma, geometri ve blokla çizim.
+
+import pytest
+
+import drawing_batch
+import layout_generator
+from drawing_batch import INSERT, POLYLINE
+
+
+def test_parse_spacings_and_axis_labels():
+    assert layout_generator.parse_spacings("5000, 2*6000; 4500") == [5000.0, 6000.0, 6000.0, 4500.0]
+    for text in ("", "0", "2*-100", "abc", "x*300"):
+        with pytest.raises(ValueError): layout_generator.parse_spacings(text)
+    assert layout_generator.axis_labels(3) == ["1", "2", "3"]
+    labels = layout_generator.axis_labels(28, letters=True)
+    assert labels[:2] == ["A", "B"] and labels[25:] == ["Z", "AA", "AB"]
+
+
+def test_generate_grid_columns_and_beams():
+    layout = layout_generator.generate([6000, 4000], [5000], column_b=400, column_h=600, beam_width=250, overhang=1000)
+    assert layout.x_axes == [0.0, 6000.0, 10000.0] and layout.y_axes == [0.0, 5000.0]
+    assert layout.counts() == {"axes": 5, "columns": 6, "beams": 7}
+    lines = [tuple(row) for row in layout_generator._rows(layout.grid_lines)]
+    assert lines[0] == (0.0, -1000.0, 0.0, 6000.0) and lines[-1] == (-1000.0, 5000.0, 11000.0, 5000.0)
+    beams = [tuple(row) for row in layout_generator._rows(layout.beams)]
+    assert (200.0, -125.0, 5800.0, 125.0) in beams       # X doğrultusu: kolon yüzünden kolon yüzüne
+    assert (5875.0, 300.0, 6125.0, 4700.0) in beams      # Y doğrultusu
+    assert layout.labels == ["1", "2", "3", "A", "B"]
+
+
+def test_columns_covering_span_drop_beam_and_no_columns_without_size():
+    layout = layout_generator.generate([300], [5000], column_b=400, beam_width=200)
+    # 300 mm X açıklığı kolonlarla örtülür: yalnızca Y doğrultusundaki iki kiriş kalır
+    assert [tuple(beam) for beam in layout_generator._rows(layout.beams)] == [(-100.0, 200.0, 100.0, 4800.0), (200.0, 200.0, 400.0, 4800.0)]
+    bare = layout_generator.generate([6000], [6000])
+    assert bare.counts() == {"axes": 4, "columns": 0, "beams": 0} and bare.column_b is None
+
+
+def test_emit_places_columns_and_bubbles_as_blocks():
+    layout = layout_generator.generate([6000] * 3, [5000] * 2, column_b=400, beam_width=250)
+    batch = drawing_batch.DrawingBatch()
+    counts = layout_generator.emit(layout, batch)
+    assert counts["blocks"] == 2 and len(batch.blocks) == 2
+    kinds = [kind for _, kind, _, _ in batch.plan()]
+    assert kinds.count(INSERT) == counts["columns"] + len(layout.bubbles) == 12 + 7
+    assert kinds.count(POLYLINE) == counts["beams"]
+    expanded = drawing_batch.DrawingBatch()
+    layout_generator.emit(layout, expanded, use_blocks=False)
+    assert INSERT not in [kind for _, kind, _, _ in expanded.plan()] and not expanded.blocks
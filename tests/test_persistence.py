@@ -0,0 +1,84 @@
+# tests/test_persistence.py
+# WriteBehindWriter: istek birleştirme ve arayüz iş parçacığında alınan anlık görüntü.
+
+import json
+import time
+import threading
+
+import persistence
+
+
+def test_snapshot_is_taken_when_scheduled(tmp_path):
+    data = {"items": [1, 2, 3]}
+    written = []
+    started = threading.Event(); release = threading.Event()
+
+    def write(snapshot):
+        started.set(); release.wait(2.0) # Yazma sürerken veri değiştirilir
+        written.append(json.dumps(snapshot))
+
+    writer = persistence.WriteBehindWriter("test", write, delay=0.01, snapshot=lambda: json.loads(json.dumps(data)))
+    writer.schedule()
+    assert started.wait(2.0)
+    data["items"].extend(range(1000)); data["other"] = True # Arayüz veriyi değiştirmeye devam eder
+    release.set()
+    assert writer.flush(timeout=2.0)
+    assert written == [json.dumps({"items": [1, 2, 3]})]
+
+
+def test_requests_are_coalesced_and_flush_writes_latest():
+    data = {"value": 0}
+    written = []
+    writer = persistence.WriteBehindWriter("test", written.append, delay=10.0, snapshot=lambda: dict(data))
+    for i in range(1, 6):
+        data["value"] = i
+        writer.schedule()
+    assert writer.pending
+    assert writer.flush(timeout=2.0)
+    assert written == [{"value": 5}]
+    assert not writer.pending
+
+
+def test_writer_without_snapshot_reads_live_data():
+    calls = []
+    writer = persistence.WriteBehindWriter("test", lambda: calls.append(time.monotonic()), delay=0.01)
+    writer.schedule()
+    deadline = time.monotonic() + 2.0
+    while not calls and time.monotonic() < deadline: time.sleep(0.01)
+    assert len(calls) == 1
+
+
+def test_write_text_atomic_replaces_file(tmp_path):
+    path = str(tmp_path / "settings.json")
+    persistence.write_text_atomic(path, "eski")
+    persistence.write_text_atomic(path, "yeni")
+    with open(path, encoding="utf-8") as f: assert f.read() == "yeni"
+    assert not (tmp_path / "settings.json.tmp").exists()
+
+
+def test_session_profiles_are_not_shared(monkeypatch, tmp_path):
+    import utils
+    monkeypatch.setattr(utils, "profiles_data", {"Ortak": {"a": 1}, "Proje": {"b": 2}})
+    monkeypatch.setattr(utils, "session_profiles", {"Proje": str(tmp_path / "proje.engpy")})
+    monkeypatch.setattr(utils, "_snapshot_cache", {})
+    assert utils._profiles_snapshot() == {"Ortak": {"a": 1}}
+    assert utils.session_profile_for(str(tmp_path / "." / "proje.engpy")) == "Proje"
+    assert utils.session_profile_for(str(tmp_path / "diger.engpy")) is None
+
+
+def test_profiles_snapshot_is_copy_on_write(monkeypatch):
+    import utils
+    record = {"user_name": "C30", "props": {"fck": 30.0}}
+    profile = {"project_info": {"name": "A"}, "materials": [record], "sections": []}
+    other = {"project_info": {"name": "B"}, "materials": [], "sections": []}
+    monkeypatch.setattr(utils, "profiles_data", {"A": profile, "B": other})
+    monkeypatch.setattr(utils, "session_profiles", {})
+    monkeypatch.setattr(utils, "_snapshot_cache", {})
+    first = utils._profiles_snapshot()
+    assert first["A"]["materials"][0] is record # Kayıtlar paylaşılır, JSON'a çevrilmez
+    profile["project_info"]["name"] = "A2"; profile["materials"].append({"user_name": "C35"})
+    assert first["A"] == {"project_info": {"name": "A"}, "materials": [record], "sections": []}
+    second = utils._profiles_snapshot()
+    assert second["B"] is first["B"] # Değişmeyen profil yeniden kopyalanmaz
+    assert second["A"] is not first["A"] and second["A"]["project_info"]["name"] == "A2"
+    assert len(second["A"]["materials"]) == 2
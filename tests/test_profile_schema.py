@@ -0,0 +1,27 @@
+# tests/test_profile_schema.py
+# Derlenmiş profil şeması: kayıt doğrulama ve artımlı profil doğrulaması.
+
+import profile_schema
+
+
+def test_validate_record_reports_paths_and_type_specific_fields():
+    assert profile_schema.validate_record("materials", {"user_name": "C30", "type": "Beton", "class": "C30/37", "is_custom": False, "props": {"fck": 30}}) == []
+    errors = profile_schema.validate_record("sections", {"user_name": "K1", "type": "Dikdörtgen", "material_name": "C30", "dimensions": {"b": -5}})
+    paths = [path for path, _ in errors]
+    assert any(path.endswith("b") for path in paths) and any(path.endswith("h") for path in paths)
+    assert profile_schema.validate_record("sections", {"user_name": "K2", "type": "Altıgen", "material_name": "", "dimensions": {}})
+
+
+def test_incremental_validator_skips_known_good_records():
+    good = {"user_name": "C30", "type": "Beton", "class": "C30/37", "is_custom": False, "props": {"fck": 30}}
+    profiles = {"A": {"materials": [good]}, "B": {"materials": [good, dict(good)]}}
+    validator = profile_schema.IncrementalValidator()
+    errors = validator.validate_profiles(profiles)
+    assert errors == [("B.materials[C30]", "aynı isimli kayıt birden fazla kez tanımlı")]
+    checked = validator.checked
+    assert checked == 2 # Paylaşılan nesne bir kez kontrol edilir
+    validator.validate_profiles(profiles)
+    assert validator.checked == checked
+    profiles["A"]["materials"].append({"user_name": "X", "type": "Beton", "props": {"fck": "yüksek"}})
+    assert [path for path, _ in validator.validate_profiles(profiles) if path.startswith("A.")]
+    assert validator.checked == checked + 1
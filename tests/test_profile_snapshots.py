@@ -0,0 +1,39 @@
+# tests/test_profile_snapshots.py
+# Profil kütüphanesi anlık görüntüleri: içerik adresli depo ve manifest farkları.
+
+import profile_snapshots
+
+
+def _profiles():
+    return {"A": {"project_info": {"name": "A"},
+                  "materials": [{"user_name": "C30", "type": "Beton", "props": {"fck": 30.0}}],
+                  "sections": [{"user_name": "K1", "type": "Dikdörtgen", "material_name": "C30", "dimensions": {"b": 300, "h": 500}}]}}
+
+
+def test_snapshots_store_each_record_once_and_diff_fields(tmp_path):
+    store = profile_snapshots.SnapshotStore(str(tmp_path))
+    profiles = _profiles()
+    first = store.create(profiles, "ilk")
+    pack_size = (tmp_path / "objects.pack").stat().st_size
+    second = store.create(profiles, "aynı")
+    assert (tmp_path / "objects.pack").stat().st_size == pack_size # Değişmeyen kayıtlar yeniden yazılmaz
+    assert [entry[1] for entry in store.list()] == ["ilk", "aynı"] and first != second
+    assert store.diff(store.load_manifest(first), store.load_manifest(second)) == []
+
+    profiles["A"]["sections"][0] = dict(profiles["A"]["sections"][0], dimensions={"b": 300, "h": 600})
+    profiles["A"]["materials"].append({"user_name": "C25", "type": "Beton", "props": {"fck": 25.0}})
+    profiles["B"] = {"project_info": {"name": "B"}}
+    changes = store.diff(store.load_manifest(first), store.manifest_of(profiles), profiles)
+    assert changes == [("B", "profile", "B", "eklendi", ""),
+                       ("A", "materials", "C25", "eklendi", ""),
+                       ("A", "sections", "K1", "değişti", "dimensions.h: 500 → 600")]
+    text = profile_snapshots.format_diff(changes)
+    assert "[A] Kesit 'K1' değişti: dimensions.h: 500 → 600" in text and "Toplam 3 değişiklik." in text
+
+
+def test_store_reopened_from_disk_resolves_objects(tmp_path):
+    store = profile_snapshots.SnapshotStore(str(tmp_path))
+    snapshot = store.create(_profiles())
+    reopened = profile_snapshots.SnapshotStore(str(tmp_path))
+    digest = reopened.load_manifest(snapshot)["profiles"]["A"]["materials"]["C30"]
+    assert reopened.load_object(digest) == _profiles()["A"]["materials"][0]
@@ -0,0 +1,99 @@
+# tests/test_profile_store.py
+# ProfileStore: ayrı süreçlerden eşzamanlı kayıt, değişiklik algılama (poll) ve çakışma çözümü.
+
+import json
+import multiprocessing
+
+import profile_store
+
+_SPAWN = multiprocessing.get_context("spawn") # Alt süreçler üst sürecin durumunu (kilit, önbellek) devralmasın
+
+
+def _profile(name, value=0):
+    return {"project_info": {"name": name}, "value": value,
+            "materials": [{"user_name": "C30", "type": "Beton", "class": "C30/37", "is_custom": False, "props": {"fck": 30.0}}],
+            "sections": []}
+
+
+def _writer(path, prefix, count, start):
+    # Ayrı süreç: her turda dosyayı yeniden okur, kendi profilini ekler/değiştirir ve kaydeder
+    start.wait(10)
+    store = profile_store.ProfileStore(path)
+    profiles = store.load()
+    for i in range(count):
+        store.poll(profiles)
+        profiles[f"{prefix}-{i}"] = _profile(prefix, i)
+        profiles[f"{prefix}-son"] = _profile(prefix, i)
+        written = store.save(profiles)
+        if f"{prefix}-{i}" not in written: raise SystemExit(f"{prefix}-{i} yazılamadı")
+
+
+def _edit(path, name, value):
+    store = profile_store.ProfileStore(path)
+    profiles = store.load()
+    profiles[name] = _profile(name, value)
+    store.save(profiles)
+
+
+def _run(target, *args):
+    process = _SPAWN.Process(target=target, args=args)
+    process.start(); process.join(30)
+    assert process.exitcode == 0
+
+
+def _disk(path):
+    with open(path, encoding="utf-8") as f: return json.load(f)
+
+
+def test_concurrent_processes_do_not_lose_updates(tmp_path):
+    path = str(tmp_path / "profiles.json")
+    start = _SPAWN.Event()
+    writers = [_SPAWN.Process(target=_writer, args=(path, f"S{n}", 15, start)) for n in range(4)]
+    for process in writers: process.start()
+    start.set()
+    for process in writers: process.join(60)
+    assert [process.exitcode for process in writers] == [0, 0, 0, 0]
+
+    profiles = profile_store.ProfileStore(path).load()
+    assert len(profiles) == 4 * 16
+    for n in range(4):
+        assert profiles[f"S{n}-son"]["value"] == 14
+        assert all(profiles[f"S{n}-{i}"]["value"] == i for i in range(15))
+    revisions = {name: entry[profile_store.REV_KEY] for name, entry in _disk(path).items() if not name.startswith("_")}
+    assert all(revisions[f"S{n}-son"] == 15 for n in range(4))
+
+
+def test_poll_picks_up_other_process_changes(tmp_path):
+    path = str(tmp_path / "profiles.json")
+    store = profile_store.ProfileStore(path)
+    profiles = {"A": _profile("A"), "B": _profile("B")}
+    store.save(profiles)
+    _run(_edit, path, "B", 7)
+    _run(_edit, path, "C", 1)
+    applied, conflicts = store.poll(profiles)
+    assert applied == {"B", "C"} and not conflicts
+    assert profiles["B"]["value"] == 7 and profiles["C"]["value"] == 1
+    assert store.save(profiles) == set() # Alınan sürümler yerel değişiklik sayılmaz
+
+
+def test_conflicting_edit_is_held_until_resolved(tmp_path):
+    path = str(tmp_path / "profiles.json")
+    store = profile_store.ProfileStore(path)
+    profiles = {"A": _profile("A")}
+    store.save(profiles)
+    _run(_edit, path, "A", 5)   # Başka süreç A'yı değiştirir
+    profiles["A"] = _profile("A", 9) # Biz de (henüz görmeden) değiştiririz
+    assert store.save(profiles) == set()
+    assert store.conflicts == {"A"} and _disk(path)["A"]["value"] == 5
+
+    store.resolve_conflict(profiles, "A", keep_local=True)
+    assert store.save(profiles) == {"A"}
+    disk = _disk(path)
+    assert disk["A"]["value"] == 9 and disk["A"][profile_store.REV_KEY] == 3 and not store.conflicts
+
+    _run(_edit, path, "A", 11)
+    profiles["A"] = _profile("A", 12)
+    assert store.poll(profiles) == (set(), {"A"}) # Kaydedilmemiş yerel değişiklik diskteki sürümle çakışır
+    store.resolve_conflict(profiles, "A", keep_local=False)
+    assert profiles["A"]["value"] == 11 and not store.conflicts
+    assert store.save(profiles) == set()
@@ -0,0 +1,124 @@
+# tests/test_project_file.py
+# Proje dosyası (.engpy): tembel bölüm yükleme, artımlı kayıt ve ana penceredeki proje/profil bağlantısı.
+
+import os
+import types
+import zipfile
+
+import pytest
+
+import main_app
+import project_file
+import utils
+
+
+def _profile(name):
+    profile = utils.new_profile_data(name)
+    profile["materials"].append({"user_name": "C30", "type": "Beton", "class": "C30/37", "is_custom": False, "props": {"fck": 30.0}})
+    return profile
+
+
+def test_incremental_save_appends_only_changed_chunks(tmp_path):
+    path = str(tmp_path / "a.engpy")
+    project = project_file.new_project(_profile("A"))
+    project.set("drawings", {"schema:Aks": {"handles": ["1F"]}})
+    project.save(path)
+    opened = project_file.ProjectFile.open(path)
+    assert not opened.is_loaded("drawings") and opened.to_profile()["project_info"]["name"] == "A"
+    assert not opened.is_dirty
+    opened.get("materials").append({"user_name": "C35", "type": "Beton", "class": "C35/45", "is_custom": False, "props": {"fck": 35.0}})
+    assert opened.save() == 1
+    with zipfile.ZipFile(path) as zf: assert [n for n in zf.namelist() if n.startswith("chunks/materials.")] == ["chunks/materials.1.json", "chunks/materials.2.json"]
+    reopened = project_file.ProjectFile.open(path)
+    assert len(reopened.get("materials")) == 2 and reopened.get("drawings") == {"schema:Aks": {"handles": ["1F"]}}
+
+
+def test_save_as_copies_unloaded_chunks(tmp_path):
+    project = project_file.new_project(_profile("A"))
+    project.set("results", {"K1": 1.5})
+    project.save(str(tmp_path / "a.engpy"))
+    opened = project_file.ProjectFile.open(str(tmp_path / "a.engpy"))
+    opened.save(str(tmp_path / "b.engpy"))
+    assert opened.path == str(tmp_path / "b.engpy") and not opened.is_loaded("results")
+    assert project_file.ProjectFile.open(str(tmp_path / "b.engpy")).get("results") == {"K1": 1.5}
+
+
+def test_invalid_file_is_rejected(tmp_path):
+    path = tmp_path / "bos.engpy"
+    with zipfile.ZipFile(path, "w") as zf: zf.writestr("x.txt", "")
+    with pytest.raises(ValueError): project_file.ProjectFile.open(str(path))
+
+
+# --- Ana pencere: proje <-> profil ---
+class _App:
+    """MainApp'in proje yöntemlerini Tk penceresi olmadan çalıştırır."""
+    _unique_profile_name = main_app.MainApp._unique_profile_name
+    _project_for = main_app.MainApp._project_for
+    _write_project = main_app.MainApp._write_project
+    _confirm_unsaved_project = main_app.MainApp._confirm_unsaved_project
+    new_project = main_app.MainApp.new_project
+
+    def __init__(self, profiles, current):
+        self.profiles_data = profiles; self.current_profile_name = current
+        self.project = None; self.project_profile_name = None
+        self.root = types.SimpleNamespace(title=lambda text: None)
+
+    def _activate_project_profile(self, profile_name, label):
+        self.current_profile_name = self.project_profile_name = profile_name
+
+
+@pytest.fixture
+def app(monkeypatch):
+    profiles = {"Ortak": _profile("Ortak")}
+    monkeypatch.setattr(utils, "profiles_data", profiles)
+    monkeypatch.setattr(utils, "session_profiles", {})
+    monkeypatch.setattr(utils, "_snapshot_cache", {})
+    monkeypatch.setattr(utils, "save_profiles", lambda: None)
+    answers = []
+    monkeypatch.setattr(main_app.messagebox, "askyesnocancel", lambda *a, **k: answers.pop(0))
+    monkeypatch.setattr(main_app.messagebox, "showerror", lambda *a, **k: pytest.fail(a))
+    application = _App(profiles, "Ortak"); application.answers = answers
+    return application
+
+
+def test_new_project_profile_stays_out_of_profiles_json(app):
+    app.new_project()
+    assert app.current_profile_name == "Yeni Proje" and utils.session_profiles == {"Yeni Proje": None}
+    assert set(utils._profiles_snapshot()) == {"Ortak"}
+
+
+def test_saving_library_profile_keeps_open_projects_drawings(app, tmp_path):
+    path_a = str(tmp_path / "a.engpy"); path_b = str(tmp_path / "b.engpy")
+    app.new_project()
+    app.project.get("drawings")["schema:Aks"] = {"handles": ["1F"]}
+    app._write_project(path_a)
+    assert utils.session_profiles["Yeni Proje"] == os.path.abspath(path_a)
+
+    library = app.profiles_data["Ortak"]
+    app.current_profile_name = "Ortak"
+    app._write_project(path_b) # Kütüphane profili projeye kopyalanır, kendisi değişmez
+    assert app.profiles_data["Ortak"] is library and "Ortak" not in utils.session_profiles
+    assert app.current_profile_name == "Ortak (2)" and utils.session_profiles["Ortak (2)"] == os.path.abspath(path_b)
+    assert set(utils._profiles_snapshot()) == {"Ortak"}
+
+    app.current_profile_name = "Yeni Proje"
+    app.profiles_data["Yeni Proje"]["project_info"]["name"] = "Değişti"
+    app._write_project(path_a) # Proje diskten yeniden açılır: çizim bölümü korunur
+    reopened = project_file.ProjectFile.open(path_a)
+    assert reopened.get("drawings") == {"schema:Aks": {"handles": ["1F"]}}
+    assert reopened.get("project_info")["name"] == "Değişti"
+
+
+def test_rebinding_asks_before_dropping_unsaved_chunks(app, tmp_path):
+    app.new_project()
+    app._write_project(str(tmp_path / "a.engpy"))
+    app.project.get("drawings")["schema:Aks"] = {"handles": ["2A"]} # Kaydedilmemiş çizim kaydı
+    app.current_profile_name = "Ortak"
+    app.answers.append(None) # Vazgeç
+    app._write_project(str(tmp_path / "b.engpy"))
+    assert app.project_profile_name == "Yeni Proje" and not os.path.exists(tmp_path / "b.engpy")
+    assert set(app.profiles_data) == {"Ortak", "Yeni Proje"}
+    app.answers.append(True) # Önce açık projeyi kaydet
+    app._write_project(str(tmp_path / "b.engpy"))
+    assert project_file.ProjectFile.open(str(tmp_path / "a.engpy")).get("drawings") == {"schema:Aks": {"handles": ["2A"]}}
+    assert app.project_profile_name == "Ortak (2)"
@@ -0,0 +1,43 @@
+# tests/test_record_pool.py
+# Ortak kayıt havuzu: diskte tek kopya, bellekte paylaşılan nesneler.
+
+import json
+
+import pytest
+
+import record_pool
+
+
+def _profiles():
+    shared = {"user_name": "C30", "type": "Beton", "props": {"fck": 30.0}}
+    return {"A": {"materials": [shared, {"user_name": "C25", "type": "Beton", "props": {"fck": 25.0}}]},
+            "B": {"materials": [dict(shared)], "sections": []}}
+
+
+def test_encode_decode_round_trip_pools_repeated_records():
+    profiles = _profiles()
+    encoded = record_pool.encode_profiles(profiles)
+    assert list(encoded[record_pool.POOL_KEY]) == [record_pool.record_id(profiles["A"]["materials"][0])]
+    assert encoded["A"]["materials"][0] == {record_pool.REF_KEY: record_pool.record_id(profiles["A"]["materials"][0])}
+    assert encoded["A"]["materials"][1] == profiles["A"]["materials"][1] # Tek geçen kayıt satır içi kalır
+    assert profiles["A"]["materials"][0]["user_name"] == "C30" # Girdi değişmez
+
+    decoded = record_pool.decode_profiles(json.loads(json.dumps(encoded)))
+    assert decoded == profiles
+    assert decoded["A"]["materials"][0] is decoded["B"]["materials"][0]
+
+
+def test_unresolved_reference_raises():
+    data = {record_pool.POOL_KEY: {"x": {}}, "A": {"materials": [{record_pool.REF_KEY: "yok"}]}}
+    with pytest.raises(ValueError, match="çözülemeyen"):
+        record_pool.decode_profiles(data)
+
+
+def test_intern_and_copy_share_record_objects():
+    profiles = _profiles()
+    assert record_pool.intern_profiles(profiles) == 1
+    assert profiles["A"]["materials"][0] is profiles["B"]["materials"][0]
+    copy = record_pool.copy_profile(profiles["A"], new_name="Kopya")
+    assert copy["materials"] is not profiles["A"]["materials"]
+    assert copy["materials"][0] is profiles["A"]["materials"][0]
+    assert copy["project_info"] == {"name": "Kopya"} and "project_info" not in profiles["A"]
@@ -0,0 +1,90 @@
+# tests/test_records.py
+# Tipli kayıtlar ve sütun bazlı malzeme/kesit tabloları: eşitleme, geçersiz satırlar, bellek.
+
+import sys
+
+import pytest
+
+import records
+
+
+def _concrete(name, fck):
+    return {"user_name": name, "type": "Beton", "class": "C30/37", "is_custom": False, "props": {"fck": fck}}
+
+def _rebar(name, fyk, Es=None):
+    props = {"fyk": fyk}
+    if Es is not None: props["Es"] = Es
+    return {"user_name": name, "type": "Donatı Çeliği", "class": "B420C", "is_custom": False, "props": props}
+
+def _rect(name, b, h, material="C30"):
+    return {"user_name": name, "type": "Dikdörtgen", "material_name": material, "dimensions": {"b": b, "h": h}}
+
+
+def test_table_reads_profile_columns():
+    profile = {"materials": [_concrete("C30", 30), _rebar("S420", 420, 200000)], "sections": [_rect("K1", 300, 500)]}
+    tables = records.ProfileTables(profile)
+    assert tables.materials.value("C30", "fck") == 30.0
+    assert records.is_missing(tables.materials.value("C30", "fyk"))
+    assert tables.materials.get("S420").Es == 200000.0
+    section = tables.sections.get("K1")
+    assert (section.b, section.h, section.material_name) == (300.0, 500.0, "C30")
+    assert tables.sections.material_of("K1") == "C30"
+    assert tables.sections.get("yok") is None
+    with pytest.raises(KeyError): tables.materials.value("yok", "fck")
+    assert list(tables.sections.column("b")) == [300.0]
+    assert tables.materials.to_dicts()[0] == _concrete("C30", 30.0)
+
+
+def test_sync_follows_replaced_appended_and_removed_records():
+    materials = [_concrete("C25", 25), _concrete("C30", 30), _concrete("C35", 35)]
+    profile = {"materials": materials, "sections": []}
+    tables = records.ProfileTables(profile)
+    assert tables.sync() == 0 # Değişiklik yok -> yeniden okuma yok
+    materials.append(_concrete("C40", 40))
+    assert tables.sync() == 1 # Yalnızca eklenen satır okunur
+    materials[1] = _concrete("C30", 32) # Düzenleme yeni sözlük koyar
+    assert tables.sync() == 3
+    assert tables.materials.value("C30", "fck") == 32.0
+    del materials[0]
+    tables.sync()
+    assert "C25" not in tables.materials and tables.materials.row_of("C40") == 2
+    assert [r.user_name for r in tables.materials.records()] == ["C30", "C35", "C40"]
+
+
+def test_invalid_record_is_kept_as_error_row():
+    profile = {"materials": [_concrete("C30", 30), _concrete("Bozuk", "abc"), _rebar("S420", 420)], "sections": []}
+    tables = records.ProfileTables(profile)
+    assert len(tables.materials) == 3 and tables.materials.row_of("S420") == 2
+    with pytest.raises(ValueError): tables.materials.get("Bozuk")
+    assert [r.user_name for r in tables.materials.records()] == ["C30", "S420"]
+
+
+def test_registry_rebuilds_when_profile_is_replaced():
+    profiles = {"A": {"materials": [_concrete("C30", 30)], "sections": []}}
+    registry = records.TableRegistry(profiles)
+    first = registry.get("A")
+    assert registry.get("A") is first
+    profiles["A"] = {"materials": [_concrete("C30", 40)], "sections": []} # Geri al / dış yükleme
+    second = registry.get("A")
+    assert second is not first and second.materials.value("C30", "fck") == 40.0
+    assert registry.get("yok") is None
+
+
+def _deep_size(obj, seen):
+    if id(obj) in seen: return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict): size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, list): size += sum(_deep_size(v, seen) for v in obj)
+    elif hasattr(obj, "__slots__"): size += sum(_deep_size(getattr(obj, k), seen) for k in obj.__slots__)
+    return size
+
+
+def test_table_is_several_times_smaller_than_record_dicts():
+    count = 5000
+    dicts = [_concrete(f"C{i}", 20 + i % 40 + i / 7.0) for i in range(count)]
+    table = records.MaterialTable.from_profile({"materials": dicts})
+    shared = set(id(name) for name in table.names) # İsimler her iki yapıda da paylaşılır
+    table_size = sum(sys.getsizeof(part) for part in (table.names, table.types, table.classes, table.is_custom, table._index, table._sources))
+    table_size += sum(sys.getsizeof(column) for column in table.columns.values())
+    assert table_size * 3 < _deep_size(dicts, shared)
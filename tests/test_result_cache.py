@@ -0,0 +1,50 @@
+# tests/test_result_cache.py
+# ResultCache: bellek katmanı, toplu son kullanım yazımı ve artımlı boyut takibi.
+
+import result_cache
+
+
+def _disk_total(cache):
+    return cache._connection().execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+
+def test_hits_are_served_from_memory_and_persist(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = result_cache.ResultCache(path)
+    calls = []
+    compute = lambda: calls.append(1) or {"Mr_kNm": 120.5}
+    inputs = {"b": 300, "h": 500}
+    assert cache.get_or_compute("eng", "1", inputs, compute, {"gamma": 1.5}) == ({"Mr_kNm": 120.5}, False)
+    assert cache.get_or_compute("eng", "1", {"h": 500.0, "b": 300.0}, compute, {"gamma": 1.5}) == ({"Mr_kNm": 120.5}, True)
+    assert len(calls) == 1
+    cache.close()
+
+    reopened = result_cache.ResultCache(path)
+    assert reopened.get_or_compute("eng", "1", inputs, compute, {"gamma": 1.5})[1] is True
+    assert reopened.get_or_compute("eng", "2", inputs, compute, {"gamma": 1.5})[1] is False # Sürüm anahtara girer
+    reopened.close()
+
+
+def test_last_used_updates_are_batched(tmp_path):
+    cache = result_cache.ResultCache(str(tmp_path / "cache.sqlite"), touch_batch=3)
+    key = result_cache.make_key("eng", "1", {"x": 1})
+    cache.put(key, "eng", {"v": 1})
+    stamp = lambda: cache._connection().execute("SELECT last_used FROM results WHERE key = ?", (key,)).fetchone()[0]
+    before = stamp()
+    cache.get(key); cache.get(key)
+    assert stamp() == before and len(cache._touched) == 1 # Henüz yazılmadı
+    cache.flush()
+    assert stamp() >= before and not cache._touched
+    cache.close()
+
+
+def test_total_size_is_tracked_and_eviction_keeps_limit(tmp_path):
+    cache = result_cache.ResultCache(str(tmp_path / "cache.sqlite"), max_bytes=2000)
+    for i in range(100):
+        cache.put(result_cache.make_key("eng", "1", {"i": i}), "eng", {"i": i, "pad": "x" * 50})
+        assert cache._total == _disk_total(cache)
+    cache.put(result_cache.make_key("eng", "1", {"i": 99}), "eng", {"i": 99}) # Aynı anahtar: boyut yer değiştirir
+    assert cache._total == _disk_total(cache) <= 2000
+    assert cache.get(result_cache.make_key("eng", "1", {"i": 0})) is None # En eski silindi
+    assert cache.get(result_cache.make_key("eng", "1", {"i": 99})) == {"i": 99}
+    cache.close()
@@ -0,0 +1,28 @@
+# tests/test_search_index.py
+# n-gram arama indeksi: alt dizgi/kelime başı eşleşmeleri ve artımlı eşitleme.
+
+import search_index
+
+
+def _brute(items, query):
+    terms = search_index.normalize(query).split()
+    return {key for key, text in items.items() if all(term in search_index.normalize(text) for term in terms)}
+
+
+def test_search_matches_substring_scan():
+    items = {i: f"Kesit {name} {i}" for i, name in enumerate(["Kolon K1", "Kiriş B-12", "IPE 300", "Perde ışık", "HEA 200 kolon", "Döşeme"] * 5)}
+    index = search_index.TrigramIndex()
+    index.sync(items.items())
+    for query in ("k", "ko", "kol", "kolon", "KOLON k1", "olo", "ipe 3", "ışık", "IŞIK", "isik", "12", "yok", "esit 2"):
+        assert index.search(query) == _brute(items, query), query
+    assert index.search("   ") is None
+
+
+def test_sync_updates_only_changed_entries():
+    index = search_index.TrigramIndex()
+    assert index.sync([("a", "C30 beton"), ("b", "B420C donatı")]) == 2
+    assert index.sync([("a", "C30 beton"), ("b", "B500C donatı"), ("c", "C25 beton")]) == 2
+    assert index.search("b420") == set() and index.search("b500") == {"b"}
+    assert index.sync([("c", "C25 beton")]) == 2
+    assert len(index) == 1 and index.search("beton") == {"c"}
+    assert not index._grams.get("b5") # Silinen kaydın n-gramları temizlenir
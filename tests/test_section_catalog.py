@@ -0,0 +1,71 @@
+# tests/test_section_catalog.py
+# Sütun bazlı (.epsc) kesit kataloğu: yazma/okuma, aralık sorguları, arama metni ve varsayılan katalog.
+
+import math
+
+import pytest
+
+import config
+import section_catalog
+
+
+ROWS = [
+    {"name": "KUTU 300x500", "family": "Kutu", "b": 300, "h": 500, "A": 60000},
+    {"name": "KUTU 400x600", "family": "Kutu", "b": 400, "h": 600, "A": 90000},
+    {"name": "YUVARLAK 600", "family": "Dairesel", "D": 600, "A": math.pi * 600 ** 2 / 4},
+    {"name": "Ön Gerilmeli TT 700", "family": "Prekast", "b": 2400, "h": 700, "A": 420000},
+]
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    path = str(tmp_path / ("deneme" + section_catalog.CATALOG_EXTENSION))
+    assert section_catalog.write_catalog(path, ROWS, ("b", "h", "D", "A")) == len(ROWS)
+    with section_catalog.SectionCatalog(path) as opened: yield opened
+
+
+def test_written_catalog_reads_back(catalog):
+    assert len(catalog) == 4 and catalog.columns == ("b", "h", "D", "A") and catalog.title == "deneme"
+    assert catalog.names() == [row["name"] for row in ROWS]
+    assert catalog.families == ["Kutu", "Dairesel", "Prekast"]
+    assert catalog.row(1) == {"name": "KUTU 400x600", "family": "Kutu", "b": 400.0, "h": 600.0, "A": 90000.0}
+    assert "b" not in catalog.row(2) # Tanımsız sütunlar atlanır
+    assert catalog.find("Ön Gerilmeli TT 700") == 3 and catalog.find("yok") == -1
+    assert list(catalog.column("h"))[:2] == [500.0, 600.0]
+    with pytest.raises(KeyError): catalog.column("Iy")
+
+
+def test_invalid_file_is_rejected(tmp_path):
+    path = tmp_path / "bozuk.epsc"
+    path.write_bytes(b"XXXX" + b"\0" * 16)
+    with pytest.raises(ValueError): section_catalog.SectionCatalog(str(path))
+
+
+def test_query_filters_ranges(catalog):
+    assert catalog.query(h=(500, 700)) == [0, 1, 3]
+    assert catalog.query(h=(500, 700), A=(80000, None)) == [1, 3]
+    assert catalog.query(limit=1, h=(None, 650)) == [0]
+    assert catalog.query(D=(0, None)) == [2] # NaN hiçbir aralığa girmez
+    with pytest.raises(KeyError): catalog.query(Wy=(0, 1))
+
+
+def test_filter_text_uses_ranges_and_name(catalog):
+    assert section_catalog.parse_filter("Kutu h=500-700 b<=400 D=600") == ("kutu", {"h": (500.0, 700.0), "b": (None, 400.0), "D": (600.0, 600.0)})
+    assert catalog.filter("h=500-700") == ["KUTU 300x500", "KUTU 400x600", "Ön Gerilmeli TT 700"]
+    assert catalog.filter("kutu h>=550") == ["KUTU 400x600"]
+    assert catalog.filter("h=500-700", limit=2) == ["KUTU 300x500", "KUTU 400x600"]
+    assert catalog.filter("ön") == ["Ön Gerilmeli TT 700"]
+    assert catalog.filter("Wpl>=1") == [] # Katalogda olmayan sütun
+
+
+def test_default_catalog_built_on_first_use(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "SECTION_CATALOG_DIR", str(tmp_path / "catalogs"))
+    monkeypatch.setattr(section_catalog, "_open_catalogs", None)
+    catalogs = section_catalog.get_catalogs()
+    assert [c.path for c in catalogs] == [section_catalog.default_catalog_path()]
+    results = section_catalog.search_all("h=600 b>=975")
+    assert [name for _, name in results] == ["Dikdörtgen 975x600", "Dikdörtgen 1000x600"]
+    catalog, name = results[0]
+    assert section_catalog.to_section_dict(catalog, name, "C30") == {"user_name": name, "type": "Dikdörtgen", "material_name": "C30",
+                                                                      "dimensions": {"b": 975.0, "h": 600.0}}
+    for catalog in catalogs: catalog.close()
@@ -0,0 +1,36 @@
+# tests/test_steel_catalog.py
+# Çelik profil kataloğu: isim indeksi, aralık sorguları ve en hafif profil araması.
+
+import pytest
+
+import section_catalog
+import steel_catalog
+
+
+@pytest.fixture(scope="module")
+def catalog(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("steel") / ("steel" + section_catalog.CATALOG_EXTENSION))
+    steel_catalog.build_catalog(path)
+    return steel_catalog.SteelCatalog(section_catalog.SectionCatalog(path))
+
+
+def test_name_lookup_and_computed_properties(catalog):
+    assert catalog.find("ipe300") == catalog.find(" IPE 300 ") >= 0
+    assert catalog.find("IPE 301") == -1
+    props = catalog.properties("IPE 300")
+    assert props["family"] == "IPE" and (props["h"], props["b"]) == (300.0, 150.0)
+    assert props["A"] == pytest.approx(5381, rel=0.01) # Tablo değeri 53.8 cm²
+    assert props["Wply"] == pytest.approx(628.4e3, rel=0.01)
+    assert catalog.search("hea 2", limit=3) == ["HEA 200", "HEA 220", "HEA 240"]
+
+
+def test_range_queries_match_brute_force(catalog):
+    rows = [catalog.catalog.row(i) for i in range(len(catalog))]
+    expected = sorted((r for r in rows if r["family"] == "HEB" and r["h"] <= 300 and r["Wply"] >= 5e5), key=lambda r: r["G"])
+    assert catalog.query(family="HEB", h=(None, 300), Wply=(5e5, None)) == [r["name"] for r in expected]
+    for minimum in (0.0, 1e5, 7.5e5, 3e6):
+        for family in (None, "IPE", "HEA"):
+            fits = [r for r in rows if r["Wply"] >= minimum and (family is None or r["family"] == family)]
+            best = min(fits, key=lambda r: r["G"])["name"] if fits else None
+            assert catalog.lightest("Wply", minimum, family) == best
+    assert catalog.lightest("Wply", 1e12) is None
@@ -0,0 +1,74 @@
+# tests/test_undo_history.py
+# UndoHistory: yapısal paylaşım, yalnızca dokunulan profillerin dondurulması ve geri al / yinele.
+
+import undo_history
+
+
+def _profile(n, info="P"):
+    return {"project_info": {"name": info}, "designs": [],
+            "materials": [{"user_name": f"C{i}", "type": "Beton", "props": {"fck": 20 + i}} for i in range(n)],
+            "sections": [{"user_name": "K1", "type": "Dikdörtgen", "dimensions": {"b": 300, "h": 500}}]}
+
+
+def test_untouched_profiles_are_not_refrozen(monkeypatch):
+    profiles = {"A": _profile(50), "B": _profile(50)}
+    history = undo_history.UndoHistory()
+    history.commit("Başlangıç", profiles)
+    first = history._states[0][1]
+
+    frozen = []
+    real_freeze = undo_history._freeze
+    monkeypatch.setattr(undo_history, "_freeze", lambda record: frozen.append(record) or real_freeze(record))
+    profiles["A"]["materials"][0] = {"user_name": "C0", "type": "Beton", "props": {"fck": 99}}
+    assert history.commit("Malzeme kaydet", profiles, touched={"A"})
+    # Yalnızca değişen kayıt + A'nın proje bilgisi ve ek alanları dondurulur; B'ye hiç bakılmaz
+    assert len(frozen) == 3
+    second = history._states[1][1]
+    assert second.get("B") is first.get("B")
+    assert second.get("A").sections is first.get("A").sections
+    assert second.get("A").project_info is first.get("A").project_info
+    assert history._states[1][2] < history._states[0][2] / 10 # Yalnızca değişen kısım sayılır
+
+
+def test_undo_redo_and_renamed_untouched_profile():
+    profiles = {"A": _profile(3), "B": _profile(2)}
+    history = undo_history.UndoHistory()
+    history.commit("Başlangıç", profiles)
+    profiles["B2"] = profiles.pop("B") # Aktif olmayan profil yeniden adlandırılır
+    assert history.commit("Profil yeniden adlandır", profiles, touched={"A"})
+    profiles["A"]["project_info"]["name"] = "Yeni"
+    assert history.commit("Proje bilgileri", profiles, touched={"A"})
+    assert not history.commit("Değişiklik yok", profiles, touched={"A"})
+
+    history.undo(); history.apply(profiles)
+    assert profiles["A"]["project_info"]["name"] == "P" and set(profiles) == {"A", "B2"}
+    history.undo(); history.apply(profiles)
+    assert set(profiles) == {"A", "B"} and [m["user_name"] for m in profiles["B"]["materials"]] == ["C0", "C1"]
+    history.redo(); history.redo(); history.apply(profiles)
+    assert set(profiles) == {"A", "B2"} and profiles["A"]["project_info"]["name"] == "Yeni"
+
+
+def test_undo_of_design_only_change_restores_designs():
+    profiles = {"A": _profile(2)}
+    history = undo_history.UndoHistory()
+    history.commit("Başlangıç", profiles)
+    profiles["A"]["designs"].append({"user_name": "T1", "section_name": "K1", "rebar_name": "B420C"})
+    assert history.commit("Tasarım kaydet", profiles, touched={"A"})
+    history.undo(); history.apply(profiles)
+    assert profiles["A"]["designs"] == []
+    history.redo(); history.apply(profiles)
+    assert [d["user_name"] for d in profiles["A"]["designs"]] == ["T1"]
+
+
+def test_memory_limit_recounts_new_base_step_at_full_size():
+    profiles = {"A": _profile(200)}
+    history = undo_history.UndoHistory()
+    history.commit("Başlangıç", profiles)
+    full = history.memory_used
+    history.memory_limit_bytes = full + 1000
+    for i in range(5):
+        profiles["A"]["materials"][0] = {"user_name": "C0", "type": "Beton", "props": {"fck": 30 + i}}
+        history.commit(f"Adım {i}", profiles, touched={"A"})
+    assert history.labels()[0] != "Başlangıç" # Eski adımlar atıldı
+    assert history._states[0][2] == undo_history._state_size(history._states[0][1]) >= full
+    assert history.memory_used <= history.memory_limit_bytes
@@ -39,6 +39,20 @@ def create_content_combobox(parent, values, current_theme, state='readonly', wid
     combo = ttk.Combobox(parent, values=values, state=state, width=width, style='TCombobox', textvariable=textvariable)
     return combo
 
+def create_typeahead_combobox(parent, search_func, current_theme, limit=50, width=None, textvariable=None, on_select=None):
+    """Yazıldıkça search_func(metin, limit) sonuçlarıyla dolan combobox oluşturur.
+    Tüm liste Tk'ya yüklenmez; yalnızca eşleşen ilk 'limit' değer gösterilir."""
+    combo = ttk.Combobox(parent, values=[], state='normal', width=width, style='TCombobox', textvariable=textvariable)
+
+    def refresh_values(event=None):
+        if event is not None and event.keysym in ("Up", "Down", "Return", "Escape", "Tab"): return
+        combo['values'] = search_func(combo.get(), limit)
+
+    combo.bind("<KeyRelease>", refresh_values)
+    combo.configure(postcommand=refresh_values) # Açılır liste açılırken de güncelle
+    if on_select: combo.bind("<<ComboboxSelected>>", lambda e: on_select(combo.get()))
+    return combo
+
 def create_custom_checkbutton(parent, text, variable, current_theme, command=None, state=tk.NORMAL):
     """Unicode karakterler kullanarak özel bir checkbutton oluşturur."""
     check_frame = tk.Frame(parent, bg=current_theme['content_bg'])
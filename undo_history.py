@@ -0,0 +1,326 @@
+# undo_history.py
+# Profil düzenlemeleri için geri al / yinele geçmişi.
+# Her anlık görüntü kalıcı (persistent, yapısal paylaşımlı) veri yapılarıyla tutulur:
+# bir düzenleme yalnızca değişen kayıtları ve onlara giden yol düğümlerini kopyalar,
+# geri kalan her şey önceki anlık görüntüyle paylaşılır.
+
+import json
+import functools
+
+
+# ==================================
+# KALICI SÖZLÜK (HAMT)
+# ==================================
+_BITS = 5
+_WIDTH = 1 << _BITS
+_MASK = _WIDTH - 1
+_MAX_SHIFT = 60 # hash() 64 bit; bu derinlikten sonra çakışma düğümü kullanılır
+
+
+def _popcount(value): return bin(value).count("1")
+
+
+class _Node:
+    """Bitmap indeksli dal düğümü. entries: (hash, key, value) yaprakları, _Node veya _Collision."""
+    __slots__ = ("bitmap", "entries")
+    def __init__(self, bitmap, entries): self.bitmap = bitmap; self.entries = entries
+
+
+class _Collision:
+    """Aynı hash değerine sahip anahtarlar."""
+    __slots__ = ("hash", "pairs")
+    def __init__(self, h, pairs): self.hash = h; self.pairs = pairs
+
+
+def _merge_leaves(shift, leaf1, leaf2):
+    if shift > _MAX_SHIFT: return _Collision(leaf1[0], ((leaf1[1], leaf1[2]), (leaf2[1], leaf2[2])))
+    i1 = (leaf1[0] >> shift) & _MASK; i2 = (leaf2[0] >> shift) & _MASK
+    if i1 == i2: return _Node(1 << i1, (_merge_leaves(shift + _BITS, leaf1, leaf2),))
+    ordered = (leaf1, leaf2) if i1 < i2 else (leaf2, leaf1)
+    return _Node((1 << i1) | (1 << i2), ordered)
+
+
+def _assoc(node, shift, h, key, value):
+    """(yeni düğüm, eklendi mi, oluşturulan düğüm sayısı) döndürür."""
+    if isinstance(node, _Collision):
+        pairs = tuple(p for p in node.pairs if p[0] != key)
+        return _Collision(h, pairs + ((key, value),)), len(pairs) == len(node.pairs), 1
+    bit = 1 << ((h >> shift) & _MASK)
+    pos = _popcount(node.bitmap & (bit - 1))
+    if not node.bitmap & bit:
+        entries = node.entries[:pos] + ((h, key, value),) + node.entries[pos:]
+        return _Node(node.bitmap | bit, entries), True, 1
+    entry = node.entries[pos]
+    if isinstance(entry, tuple):
+        if entry[0] == h and entry[1] == key:
+            if entry[2] is value: return node, False, 0
+            new_entry = (h, key, value); added = False; created = 0
+        else:
+            new_entry = _merge_leaves(shift + _BITS, entry, (h, key, value)); added = True; created = 2
+    else:
+        new_entry, added, created = _assoc(entry, shift + _BITS, h, key, value)
+        if new_entry is entry: return node, False, 0
+    return _Node(node.bitmap, node.entries[:pos] + (new_entry,) + node.entries[pos + 1:]), added, created + 1
+
+
+def _dissoc(node, shift, h, key):
+    """(yeni düğüm veya None, silindi mi) döndürür."""
+    if isinstance(node, _Collision):
+        pairs = tuple(p for p in node.pairs if p[0] != key)
+        if len(pairs) == len(node.pairs): return node, False
+        if len(pairs) == 1: return (h, pairs[0][0], pairs[0][1]), True
+        return _Collision(h, pairs), True
+    bit = 1 << ((h >> shift) & _MASK)
+    if not node.bitmap & bit: return node, False
+    pos = _popcount(node.bitmap & (bit - 1))
+    entry = node.entries[pos]
+    if isinstance(entry, tuple):
+        if entry[0] != h or entry[1] != key: return node, False
+        new_entry = None
+    else:
+        new_entry, removed = _dissoc(entry, shift + _BITS, h, key)
+        if not removed: return node, False
+        # Tek yaprak kalan alt düğümü yukarı taşı
+        if isinstance(new_entry, _Node) and len(new_entry.entries) == 1 and isinstance(new_entry.entries[0], tuple): new_entry = new_entry.entries[0]
+    if new_entry is None:
+        if node.bitmap == bit: return None, True
+        return _Node(node.bitmap & ~bit, node.entries[:pos] + node.entries[pos + 1:]), True
+    return _Node(node.bitmap, node.entries[:pos] + (new_entry,) + node.entries[pos + 1:]), True
+
+
+def _iter_node(node):
+    if isinstance(node, _Collision):
+        yield from node.pairs; return
+    for entry in node.entries:
+        if isinstance(entry, tuple): yield entry[1], entry[2]
+        else: yield from _iter_node(entry)
+
+
+class PersistentMap:
+    """Değiştirilemez sözlük. assoc/dissoc yeni bir harita döndürür; eskisi aynen kalır."""
+    __slots__ = ("_root", "_size")
+
+    def __init__(self, root=None, size=0): self._root = root; self._size = size
+
+    def __len__(self): return self._size
+
+    def get(self, key, default=None):
+        node = self._root; h = hash(key); shift = 0
+        while node is not None:
+            if isinstance(node, _Collision):
+                for k, v in node.pairs:
+                    if k == key: return v
+                return default
+            bit = 1 << ((h >> shift) & _MASK)
+            if not node.bitmap & bit: return default
+            entry = node.entries[_popcount(node.bitmap & (bit - 1))]
+            if isinstance(entry, tuple): return entry[2] if entry[0] == h and entry[1] == key else default
+            node = entry; shift += _BITS
+        return default
+
+    def __contains__(self, key):
+        return self.get(key, _ABSENT) is not _ABSENT
+
+    def assoc(self, key, value):
+        h = hash(key)
+        if self._root is None: return PersistentMap(_Node(1 << (h & _MASK), ((h, key, value),)), 1)
+        root, added, _ = _assoc(self._root, 0, h, key, value)
+        return self if root is self._root else PersistentMap(root, self._size + (1 if added else 0))
+
+    def dissoc(self, key):
+        if self._root is None: return self
+        root, removed = _dissoc(self._root, 0, hash(key), key)
+        if not removed: return self
+        if isinstance(root, tuple): root = _Node(1 << (root[0] & _MASK), (root,))
+        return PersistentMap(root, self._size - 1)
+
+    def items(self):
+        return _iter_node(self._root) if self._root is not None else iter(())
+
+    def keys(self): return (k for k, _ in self.items())
+
+_ABSENT = object()
+
+
+# ==================================
+# PROFİL ANLIK GÖRÜNTÜLERİ
+# ==================================
+class ProfileState:
+    """Tek profilin donmuş hali: proje bilgisi + isim -> kayıt haritaları (kayıtlar JSON metni olarak)."""
+    __slots__ = ("project_info", "materials", "sections", "extra")
+
+    def __init__(self, project_info, materials, sections, extra):
+        self.project_info = project_info; self.materials = materials; self.sections = sections; self.extra = extra
+
+    def same_as(self, other):
+        return (other is not None and self.project_info == other.project_info and self.materials is other.materials
+                and self.sections is other.sections and self.extra == other.extra)
+
+
+def _freeze(record):
+    return json.dumps(record, sort_keys=True, ensure_ascii=False)
+
+
+class UndoHistory:
+    """Sınırsız adımlı, bellek sınırlı geri al / yinele geçmişi."""
+
+    def __init__(self, memory_limit_bytes=64 * 1024 * 1024):
+        self.memory_limit_bytes = memory_limit_bytes
+        self._states = [] # (etiket, PersistentMap[profil adı -> ProfileState], tahmini bayt)
+        self._pos = -1
+        # Kayıt sözlüğü nesnesi -> donmuş metni. Uygulama malzeme/kesit sözlüklerini yerinde
+        # değiştirmez (yenisiyle değiştirir), bu yüzden aynı nesne = aynı içerik.
+        self._frozen_by_id = {}
+
+    # --- Durum Sorguları ---
+    @property
+    def can_undo(self): return self._pos > 0
+
+    @property
+    def can_redo(self): return self._pos < len(self._states) - 1
+
+    def labels(self):
+        return [label for label, _, _ in self._states]
+
+    @property
+    def position(self): return self._pos
+
+    @property
+    def memory_used(self): return sum(size for _, _, size in self._states)
+
+    # --- Kayıt ---
+    def _freeze_list(self, previous_map, items, seen):
+        """Listeyi isim -> donmuş kayıt haritasına çevirir; yalnızca değişen kayıtlar kopyalanır."""
+        result = previous_map if previous_map is not None else PersistentMap()
+        new_bytes = 0; names = set()
+        for record in items:
+            if not isinstance(record, dict): continue
+            name = record.get("user_name", "")
+            names.add(name)
+            cached = self._frozen_by_id.get(id(record))
+            if cached is not None and cached[0] is record: frozen = cached[1]
+            else:
+                frozen = _freeze(record); self._frozen_by_id[id(record)] = (record, frozen)
+            seen.add(id(record))
+            if result.get(name) == frozen: continue # Değişmemiş kayıt önceki görüntüyle paylaşılır
+            result = result.assoc(name, frozen); new_bytes += len(frozen) + 200
+        for name in [n for n in result.keys() if n not in names]: result = result.dissoc(name); new_bytes += 200
+        return result, new_bytes
+
+    def _freeze_profile(self, old, profile, seen):
+        """Profili ProfileState'e çevirir; değişmeyen parçalar (kayıt haritaları, metinler) eskisinden alınır.
+        (durum, yeni bayt) döndürür; hiçbir şey değişmediyse durum old'un kendisidir."""
+        materials, b1 = self._freeze_list(old.materials if old else None, profile.get("materials", []), seen)
+        sections, b2 = self._freeze_list(old.sections if old else None, profile.get("sections", []), seen)
+        project_info = _freeze(profile.get("project_info", {}))
+        extra = _freeze({k: v for k, v in profile.items() if k not in ("project_info", "materials", "sections")})
+        new_bytes = b1 + b2
+        if old is not None and project_info == old.project_info: project_info = old.project_info
+        else: new_bytes += len(project_info)
+        if old is not None and extra == old.extra: extra = old.extra
+        else: new_bytes += len(extra)
+        new_state = ProfileState(project_info, materials, sections, extra)
+        if new_state.same_as(old): return old, 0
+        return new_state, new_bytes + 300
+
+    def commit(self, label, profiles_data, touched=None):
+        """profiles_data'nın güncel halini yeni adım olarak kaydeder (değişiklik yoksa kaydetmez).
+        touched: değişmiş olabilecek profil adları; yalnızca bunlar (ve yeni eklenen profiller)
+        dondurulur, diğerlerinin durumu önceki adımdan aynen alınır. None ise hepsi taranır."""
+        previous = self._states[self._pos][1] if self._pos >= 0 else PersistentMap()
+        if self._pos < 0: touched = None
+        state = previous; total_bytes = 0; seen = set()
+        names = profiles_data.keys() if touched is None else [n for n in profiles_data if n in touched or n not in previous]
+        for name in names:
+            old = previous.get(name)
+            new_state, new_bytes = self._freeze_profile(old, profiles_data[name], seen)
+            if new_state is old: continue
+            state = state.assoc(name, new_state); total_bytes += new_bytes
+        for name in [n for n in previous.keys() if n not in profiles_data]: state = state.dissoc(name); total_bytes += 200
+        # Artık hiçbir profilde bulunmayan kayıt nesnelerini önbellekten çıkar (yalnızca tam taramada bilinir)
+        if touched is None and len(self._frozen_by_id) > 2 * max(len(seen), 1024):
+            self._frozen_by_id = {k: v for k, v in self._frozen_by_id.items() if k in seen}
+        if state is previous and self._pos >= 0: return False
+        del self._states[self._pos + 1:] # Yinele geçmişi geçersiz
+        self._states.append((label, state, total_bytes)); self._pos = len(self._states) - 1
+        self._enforce_memory_limit()
+        print(f"Undo step recorded: {label} ({len(self._states)} steps)")
+        return True
+
+    def _enforce_memory_limit(self):
+        used = self.memory_used
+        while used > self.memory_limit_bytes and self._pos > 0:
+            # En eski adım atılır; ilk durum olarak bir sonraki adım kalır. Adımlar yalnızca önceki
+            # adıma göre farkı sayar; yeni ilk adım artık tek başına tuttuğu her şeyle sayılır.
+            _, _, size = self._states.pop(0); self._pos -= 1
+            label, state, delta = self._states[0]
+            full = _state_size(state)
+            self._states[0] = (label, state, full)
+            used += full - delta - size
+
+    # --- Gezinme ---
+    def undo(self): return self.goto(self._pos - 1) if self.can_undo else None
+
+    def redo(self): return self.goto(self._pos + 1) if self.can_redo else None
+
+    def goto(self, index):
+        """İstenen adıma sabit zamanda geçer ve o adımın etiketini döndürür (uygulamak için apply())."""
+        if not 0 <= index < len(self._states): raise IndexError(index)
+        self._pos = index
+        return self._states[index][0]
+
+    def apply(self, profiles_data):
+        """Geçerli adımı profiles_data'ya yerinde uygular. Yalnızca farklı olan profiller yeniden kurulur."""
+        state = self._states[self._pos][1]
+        for name in [n for n in profiles_data if n not in state]: del profiles_data[name]
+        for name, profile_state in state.items():
+            current = profiles_data.get(name)
+            if current is not None and self._matches(current, profile_state): continue
+            profile = json.loads(profile_state.extra)
+            profile["project_info"] = json.loads(profile_state.project_info)
+            for key, pmap in (("materials", profile_state.materials), ("sections", profile_state.sections)):
+                items = []
+                for _, frozen in pmap.items():
+                    record = json.loads(frozen); self._frozen_by_id[id(record)] = (record, frozen); items.append(record)
+                items.sort(key=lambda x: x.get("user_name", "").lower())
+                profile[key] = items
+            profiles_data[name] = profile
+
+    def _matches(self, profile, profile_state):
+        """Profilin bellekteki hali anlık görüntüyle aynı mı (kayıtlar nesne kimliğiyle hızlı kontrol edilir)?"""
+        if _freeze(profile.get("project_info", {})) != profile_state.project_info: return False
+        if _freeze({k: v for k, v in profile.items() if k not in ("project_info", "materials", "sections")}) != profile_state.extra: return False
+        for key, pmap in (("materials", profile_state.materials), ("sections", profile_state.sections)):
+            items = profile.get(key, [])
+            if len(items) != len(pmap): return False
+            for record in items:
+                cached = self._frozen_by_id.get(id(record))
+                if cached is None or cached[0] is not record or pmap.get(record.get("user_name", "")) != cached[1]: return False
+        return True
+
+
+def _state_size(state):
+    """Adımın paylaşımsız tahmini boyutu (commit'teki fark sayımıyla aynı birimler)."""
+    total = 0
+    for _, profile_state in state.items():
+        total += len(profile_state.project_info) + len(profile_state.extra) + 300
+        for pmap in (profile_state.materials, profile_state.sections):
+            total += sum(len(frozen) + 200 for _, frozen in pmap.items())
+    return total
+
+
+def undoable(label):
+    """Metodu sarmalar; metot bittikten sonra self.record_undo_step(label, touched) çağrılır.
+    touched: metottan önceki ve sonraki aktif profil (self.current_profile_name); geçmiş yalnızca
+    bunları ve eklenen/silinen profilleri yeniden dondurur. Metot değişiklik yapmadan dönerse
+    (doğrulama hatası vb.) adım kaydedilmez."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            touched = {getattr(self, "current_profile_name", None)}
+            try: return method(self, *args, **kwargs)
+            finally:
+                touched.add(getattr(self, "current_profile_name", None))
+                self.record_undo_step(label, touched - {None})
+        return wrapper
+    return decorator
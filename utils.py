@@ -5,6 +5,8 @@ import sys
 import ctypes
 import json
 import os
+import copy
+import atexit
 try:
     import winreg
 except ImportError:
@@ -12,12 +14,18 @@ except ImportError:
 
 # Yapılandırma sabitlerini config dosyasından import et
 import config
+import persistence
+import profile_store
+import record_pool
+import profile_schema
 
 # --- Global Değişken Referansları (Geçici - Sınıflara Taşınacak) ---
 app_settings = {}
 profiles_data = {}
 root = None
 current_profile_name = config.DEFAULT_PROFILE_NAME
+profile_validation_errors = [] # Son yüklemede bulunan şema hataları: (yol, mesaj)
+session_profiles = {} # Profil adı -> .engpy yolu: açılan projelerin profilleri yalnızca bu oturumda yaşar, profiles.json'a yazılmaz
 
 # --- DPI Ölçekleme Faktörünü Alma ---
 def get_dpi_scale_factor():
@@ -55,35 +63,114 @@ def load_settings():
         except Exception as e: print(f"Error loading settings: {e}. Using defaults."); app_settings = default_settings
     else: print(f"Info: Settings file not found. Using defaults."); app_settings = default_settings
 
+def _settings_snapshot():
+    return { "theme": app_settings.get("theme", "dark"), "window_geometry": app_settings.get("window_geometry", config.DEFAULT_WINDOW_GEOMETRY) }
+
+def _write_settings_now(settings_to_save):
+    persistence.write_text_atomic(config.SETTINGS_FILE, json.dumps(settings_to_save, indent=4, ensure_ascii=False))
+    print(f"Settings saved to {config.SETTINGS_FILE}")
+
 def save_settings():
-    global app_settings
-    try:
-        settings_to_save = { "theme": app_settings.get("theme", "dark"), "window_geometry": app_settings.get("window_geometry", config.DEFAULT_WINDOW_GEOMETRY) }
-        with open(config.SETTINGS_FILE, 'w', encoding='utf-8') as f: json.dump(settings_to_save, f, indent=4, ensure_ascii=False)
-        print(f"Settings saved to {config.SETTINGS_FILE}")
-    except Exception as e: print(f"Error saving settings: {e}")
+    """Ayarların kaydını arka plana bırakır (art arda çağrılar tek yazmada birleşir)."""
+    _settings_writer.schedule()
 
 # --- Profilleri Yükleme/Kaydetme ---
+def new_profile_data(project_name=None):
+    """Varsayılan profil verisinin bağımsız (derin) bir kopyasını döndürür."""
+    # DEFAULT_PROFILE_DATA.copy() iç sözlük/listeleri paylaşır; her profil kendi kopyasını almalı
+    profile = copy.deepcopy(config.DEFAULT_PROFILE_DATA)
+    if project_name is not None: profile["project_info"]["name"] = project_name
+    return profile
+
 def load_profiles():
     global profiles_data, current_profile_name
-    default_profile_data = config.DEFAULT_PROFILE_DATA.copy()
+    default_profile_data = new_profile_data()
     default_profile_name = config.DEFAULT_PROFILE_NAME
     if os.path.exists(config.PROFILE_FILE):
         try:
-            with open(config.PROFILE_FILE, 'r', encoding='utf-8') as f: profiles_data = json.load(f)
+            profiles_data = shared_profile_store.load() # Kilitli okuma, sürüm damgaları ayıklanır
+            merged = record_pool.intern_profiles(profiles_data) # Eski (havuzsuz) dosyalardaki tekrarları bellekte birleştir
+            if merged: print(f"Info: {merged} duplicate records shared between profiles.")
             if not isinstance(profiles_data, dict) or not profiles_data: print(f"Warning: Profile file empty/invalid. Creating default."); profiles_data = {default_profile_name: default_profile_data}; save_profiles()
+            validate_loaded_profiles() # İç içe kayıtlar: tüm hatalar tek geçişte raporlanır
             if current_profile_name not in profiles_data:
                 if profiles_data: current_profile_name = list(profiles_data.keys())[0]
                 else: profiles_data = {default_profile_name: default_profile_data}; save_profiles()
             print(f"Profiles loaded from {config.PROFILE_FILE}. Active: {current_profile_name}")
         except Exception as e: print(f"Error loading profiles: {e}. Creating default."); profiles_data = {default_profile_name: default_profile_data}; current_profile_name = default_profile_name; save_profiles()
     else: print(f"Info: Profile file not found. Creating default."); profiles_data = {default_profile_name: default_profile_data}; current_profile_name = default_profile_name; save_profiles()
+
+def validate_loaded_profiles():
+    """Tüm profilleri şemaya göre doğrular (daha önce geçerli bulunan kayıtlar atlanır).
+    Hatalar profile_validation_errors'a yazılır; veri değiştirilmez."""
+    global profile_validation_errors
+    profile_validation_errors = profile_validator.validate_profiles(profiles_data)
+    if profile_validation_errors:
+        print(f"Warning: {len(profile_validation_errors)} problem(s) found in profiles:\n{profile_schema.format_errors(profile_validation_errors, max_lines=10)}")
+    return profile_validation_errors
+
+_snapshot_cache = {} # profil adı -> önceki anlık görüntü (değişmeyen profiller yeniden kopyalanmaz)
+
+def _profile_unchanged(profile, snapshot):
+    # Kayıt sözlükleri yerinde değiştirilmez (her düzenleme yeni sözlük koyar); kimlik karşılaştırması yeterli.
+    if profile.keys() != snapshot.keys(): return False
+    for key, value in profile.items():
+        old = snapshot[key]
+        if key in record_pool.POOLED_LISTS and isinstance(value, list):
+            if len(value) != len(old) or any(a is not b for a, b in zip(value, old)): return False
+        elif value != old: return False
+    return True
+
+def _profiles_snapshot():
+    # Arayüz iş parçacığında (save_profiles çağrısında) alınır: JSON'a çevirme ve yazma arka plan yazıcısında yapılır.
+    # Yazarken kopyala: listeler ve proje bilgisi ayrılır, kayıtlar paylaşılır; değişmeyen profilin önceki görüntüsü kullanılır.
+    snapshot = {}
+    for name, profile in profiles_data.items():
+        if name in session_profiles: continue
+        previous = _snapshot_cache.get(name)
+        snapshot[name] = previous if previous is not None and _profile_unchanged(profile, previous) else record_pool.copy_profile(profile)
+    _snapshot_cache.clear()
+    _snapshot_cache.update(snapshot)
+    return snapshot
+
+def _write_profiles_now(snapshot):
+    # Yalnızca değişen profiller kilit altında diskteki güncel dosyayla birleştirilir
+    shared_profile_store.save(snapshot)
+
 def save_profiles():
-    global profiles_data
-    try:
-        with open(config.PROFILE_FILE, 'w', encoding='utf-8') as f: json.dump(profiles_data, f, indent=4, ensure_ascii=False)
-        print(f"Profiles saved to {config.PROFILE_FILE}")
-    except Exception as e: print(f"Error saving profiles: {e}")
+    """Profillerin kaydını arka plana bırakır (art arda çağrılar tek yazmada birleşir)."""
+    _profiles_writer.schedule()
+
+def poll_shared_profiles():
+    """Başka bir EngPY süreci profiles.json'u değiştirdiyse etkilenen profilleri yeniden yükler.
+    (yeniden yüklenen profil isimleri, yeni çakışan profil isimleri) döndürür. Arayüz iş parçacığından çağrılır."""
+    global current_profile_name
+    try: reloaded, conflicts = shared_profile_store.poll(profiles_data)
+    except Exception as e: print(f"Error checking shared profiles: {e}"); return set(), set()
+    if current_profile_name not in profiles_data and profiles_data: current_profile_name = list(profiles_data.keys())[0]
+    if reloaded: validate_loaded_profiles() # Yalnızca yeni gelen kayıtlar kontrol edilir
+    return reloaded, conflicts
+
+def session_profile_for(path):
+    """Bu oturumda zaten açılmış proje dosyasının profil adı (yoksa None)."""
+    path = os.path.abspath(path)
+    return next((name for name, project_path in session_profiles.items() if project_path == path), None)
+
+def resolve_profile_conflict(profile_name, keep_local):
+    """Çakışan profil için yerel sürümü koru (ve kaydet) ya da diskteki sürümü yükle."""
+    shared_profile_store.resolve_conflict(profiles_data, profile_name, keep_local)
+    if keep_local: save_profiles()
+
+def flush_pending_writes():
+    """Bekleyen ayar/profil kayıtlarını hemen diske yazar (kapanışta çağrılır)."""
+    ok = _profiles_writer.flush()
+    return _settings_writer.flush() and ok
+
+_settings_writer = persistence.WriteBehindWriter("settings", _write_settings_now, delay=config.SAVE_DEBOUNCE_SECONDS, snapshot=_settings_snapshot)
+_profiles_writer = persistence.WriteBehindWriter("profiles", _write_profiles_now, delay=config.SAVE_DEBOUNCE_SECONDS, snapshot=_profiles_snapshot)
+shared_profile_store = profile_store.ProfileStore(config.PROFILE_FILE)
+profile_validator = profile_schema.IncrementalValidator()
+atexit.register(flush_pending_writes)
 
 # --- Sistem Teması Algılama ---
 def get_system_theme():